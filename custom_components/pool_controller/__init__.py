@@ -90,6 +90,7 @@ from .const import (
     CONF_BLUERIIOT_NIGHT_INTERVAL_MINUTES,
     CONF_BLUERIIOT_NIGHT_START,
     CONF_BLUERIIOT_NIGHT_END,
+    CONF_BLUERIIOT_KEEP_CONNECTED,
     CONF_NOTIFY_SERVICE,
     CONF_NOTIFY_SENSOR_HEALTH,
     CONF_NOTIFY_WATER_QUALITY,
@@ -112,8 +113,14 @@ from .const import (
     CONF_DYNAMIC_TARGET_MAX_STEP_PER_HOUR,
     OPT_KEY_HEAT_LOSS_W_PER_C,
     OPT_KEY_HEAT_STARTUP_OFFSET_MINUTES,
+    CONF_ENABLE_EVENT_DRIVEN_UPDATES,
+    CONF_ENABLE_PERF_INSTRUMENTATION,
+    CONF_ENABLE_PUBLISH_DEADBANDS,
+    CONF_PUBLISH_POLICIES,
 )
 from .coordinator import PoolControllerDataCoordinator
+from .profiling import DEFAULT_PROFILE_CYCLES, DEFAULT_PROFILE_TOP, MAX_PROFILE_CYCLES, async_profile_refreshes
+from .state_store import RuntimeStateStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -121,6 +128,8 @@ _SERVICES_REGISTERED_KEY = "__services_registered"
 _LAST_OPTIONS_KEY = "__last_options"
 
 # Option keys that are updated frequently by the coordinator (timers).
+# They now live in the runtime state store; listed here for legacy entries
+# and manual `set_options` calls that still write them to entry.options.
 _TRANSIENT_OPTION_KEYS = {
     OPT_KEY_AWAY_ACTIVE,
     OPT_KEY_AWAY_PREV_TARGET,
@@ -206,6 +215,7 @@ _NO_RELOAD_OPTION_KEYS = {
     CONF_BLUERIIOT_NIGHT_INTERVAL_MINUTES,
     CONF_BLUERIIOT_NIGHT_START,
     CONF_BLUERIIOT_NIGHT_END,
+    CONF_BLUERIIOT_KEEP_CONNECTED,
     CONF_NOTIFY_SERVICE,
     CONF_NOTIFY_SENSOR_HEALTH,
     CONF_NOTIFY_WATER_QUALITY,
@@ -229,6 +239,10 @@ _NO_RELOAD_OPTION_KEYS = {
     OPT_KEY_HEAT_LOSS_W_PER_C,
     OPT_KEY_HEAT_STARTUP_OFFSET_MINUTES,
     OPT_KEY_AUX_ALLOWED,
+    CONF_ENABLE_EVENT_DRIVEN_UPDATES,
+    CONF_ENABLE_PERF_INSTRUMENTATION,
+    CONF_ENABLE_PUBLISH_DEADBANDS,
+    CONF_PUBLISH_POLICIES,
 }
 
 # "button" wurde hier hinzugefügt (timer ist keine Entity-Plattform)
@@ -252,6 +266,7 @@ SERVICE_SET_DYNAMIC_TARGET = "set_dynamic_target"
 SERVICE_SET_OPTIONS = "set_options"
 SERVICE_GET_OPTIONS = "get_options"
 SERVICE_READ_BLUERIIOT = "read_blueriiot"
+SERVICE_PROFILE = "profile"
 
 
 # Korrektes Schema: target wird von HA automatisch hinzugefügt, nicht im Schema definieren!
@@ -284,6 +299,17 @@ START_CHLORINE_SCHEMA = vol.Schema(
 )
 
 STOP_SCHEMA = vol.Schema({}, extra=vol.ALLOW_EXTRA)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("cycles", default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILE_CYCLES)
+        ),
+        vol.Optional("tracemalloc", default=False): cv.boolean,
+        vol.Optional("top", default=DEFAULT_PROFILE_TOP): vol.All(vol.Coerce(int), vol.Range(min=1, max=200)),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
 SET_OPTIONS_SCHEMA = vol.Schema({}, extra=vol.ALLOW_EXTRA)
 
 SET_DYNAMIC_TARGET_SCHEMA = vol.Schema(
@@ -548,7 +574,7 @@ def _ensure_services_registered(hass: HomeAssistant):
             _LOGGER.warning("pool_controller.set_dynamic_target called without update fields")
             return
 
-        new_opts = {**(coordinator.entry.options or {})}
+        new_opts = coordinator._options_snapshot()
         new_opts.update(updates)
         await coordinator._async_update_entry_options(new_opts)
         await coordinator.async_request_refresh()
@@ -567,7 +593,7 @@ def _ensure_services_registered(hass: HomeAssistant):
             _LOGGER.warning("pool_controller.set_options called without option fields")
             return
 
-        new_opts = {**(coordinator.entry.options or {})}
+        new_opts = coordinator._options_snapshot()
         new_opts.update(data)
         await coordinator._async_update_entry_options(new_opts)
         await coordinator.async_request_refresh()
@@ -580,7 +606,13 @@ def _ensure_services_registered(hass: HomeAssistant):
 
         data = dict(coordinator.entry.data or {})
         options = dict(coordinator.entry.options or {})
-        effective = {**data, **options}
+        # Without the 48 h chemistry history (thousands of samples).
+        runtime_state = {
+            key: value
+            for key, value in coordinator._runtime_state.data.items()
+            if key != OPT_KEY_CHEMISTRY_HISTORY
+        }
+        effective = {**data, **options, **runtime_state}
         persistent_options = {
             key: value
             for key, value in options.items()
@@ -592,6 +624,7 @@ def _ensure_services_registered(hass: HomeAssistant):
             "data": data,
             "options": options,
             "persistent_options": persistent_options,
+            "runtime_state": runtime_state,
             "effective": effective,
         }
 
@@ -604,6 +637,28 @@ def _ensure_services_registered(hass: HomeAssistant):
             _LOGGER.warning("pool_controller.read_blueriiot: reader is not configured or did not return data")
         await coordinator.async_request_refresh()
 
+    async def handle_profile(call):
+        coordinator = _resolve_coordinator(hass, call)
+        if not coordinator:
+            _warn_no_target("profile", call)
+            return {"error": "no_target"}
+
+        result = await async_profile_refreshes(
+            hass,
+            coordinator,
+            call.data.get("cycles", DEFAULT_PROFILE_CYCLES),
+            trace_allocations=bool(call.data.get("tracemalloc", False)),
+            top=call.data.get("top", DEFAULT_PROFILE_TOP),
+        )
+        if result.get("profile_path"):
+            _LOGGER.info(
+                "pool_controller.profile: %s refreshes in %.1f ms, report %s",
+                result.get("cycles"),
+                result.get("duration_ms") or 0.0,
+                result.get("profile_path"),
+            )
+        return result
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_START_PAUSE,
@@ -718,6 +773,13 @@ def _ensure_services_registered(hass: HomeAssistant):
         handle_read_blueriiot,
         schema=STOP_SCHEMA,
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
     hass.data[DOMAIN][_SERVICES_REGISTERED_KEY] = True
 
@@ -778,8 +840,21 @@ async def _migrate_aux_allowed_switch_unique_id(hass: HomeAssistant, entry: Conf
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Setup der Integration."""
     _LOGGER.info("Setting up pool_controller entry %s", entry.entry_id)
-    coordinator = PoolControllerDataCoordinator(hass, entry)
+    # Runtime state (timers, modes, counters) is kept in its own store so that
+    # frequent updates do not rewrite the config entries file.
+    runtime_state = RuntimeStateStore(hass, entry.entry_id)
+    await runtime_state.async_load()
+    migrated = await runtime_state.async_migrate_from_options(entry.options)
+    coordinator = PoolControllerDataCoordinator(hass, entry, runtime_state=runtime_state)
+    if migrated:
+        # Drop the moved runtime keys from entry.options (one-time).
+        _LOGGER.info("Moved runtime state of %s from config entry options to its own store", entry.entry_id)
+        await coordinator._async_update_entry_options(coordinator._options_snapshot())
     
+    # Listeners, calendar tracking, actuator tasks and the BlueRiiot callback/session are
+    # created by the first refresh: release them on unload and when setup fails (retry).
+    entry.async_on_unload(coordinator.async_release)
+
     # Den ersten Datenabruf triggern
     await coordinator.async_config_entry_first_refresh()
     
@@ -841,6 +916,7 @@ async def update_listener(hass: HomeAssistant, entry: ConfigEntry):
             _LOGGER.info("Skip config reload for PV-related option update: %s", sorted(changed_keys))
             coord = hass.data.get(DOMAIN, {}).get(entry.entry_id)
             if coord:
+                coord.invalidate_config()
                 await coord.async_request_refresh()
             return
     except Exception:
@@ -948,4 +1024,14 @@ async def _ensure_registry_translation_keys(hass: HomeAssistant, entry: ConfigEn
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Entladen der Integration."""
     _LOGGER.warning("Unloading pool_controller entry %s", entry.entry_id)
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
\ No newline at end of file
+    coord = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    # Listeners and the BlueRiiot session are released by coordinator.async_release (on_unload).
+    unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unloaded and isinstance(coord, PoolControllerDataCoordinator):
+        await coord.async_flush_runtime_state()
+    return unloaded
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Runtime-State-Datei beim Entfernen der Integration löschen."""
+    await RuntimeStateStore(hass, entry.entry_id).async_remove()
\ No newline at end of file
@@ -0,0 +1,334 @@
+"""Concurrent actuator reconciliation (main/pump/aux switches) with confirmation tracking."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .instrumentation import RollingStats
+
+_LOGGER = logging.getLogger(__name__)
+
+# Hard limit for one turn_on/turn_off call; the command counts as failed afterwards.
+ACTUATOR_CALL_TIMEOUT_SECONDS = 30.0
+# The update cycle waits at most this long; slower calls finish in the background.
+ACTUATOR_WAIT_SECONDS = 10.0
+# A command whose switch state did not follow within this time counts as failed. Switches
+# with a learned (median) switching delay get ACTUATOR_CONFIRM_DELAY_FACTOR times that, capped.
+ACTUATOR_CONFIRM_TIMEOUT_SECONDS = 90.0
+ACTUATOR_CONFIRM_DELAY_FACTOR = 3.0
+ACTUATOR_CONFIRM_TIMEOUT_MAX_SECONDS = 600.0
+# Retry delay after repeated failures: base (toggle debounce) * 2^(n-1), capped, +-jitter.
+ACTUATOR_BACKOFF_MAX_SECONDS = 1800.0
+ACTUATOR_BACKOFF_JITTER = 0.2
+
+ROLE_MAIN = "main"
+ROLE_PUMP = "pump"
+ROLE_AUX = "aux"
+_PRIMARY_ROLES = (ROLE_MAIN, ROLE_PUMP)
+
+STATE_IDLE = "idle"
+STATE_COMMANDED = "commanded"
+STATE_CONFIRMED = "confirmed"
+STATE_FAILED = "failed"
+
+
+@dataclass(frozen=True, slots=True)
+class ActuatorCommand:
+    role: str
+    entity_id: str
+    turn_on: bool
+
+
+class _Actuator:
+    __slots__ = (
+        "entity_id",
+        "state",
+        "task",
+        "task_turn_on",
+        "desired",
+        "commanded_at",
+        "retry_at",
+        "consecutive_failures",
+        "commands",
+        "confirmed",
+        "recovered",
+        "failures",
+        "timeouts",
+        "unconfirmed",
+        "call_seconds",
+        "confirm_seconds",
+    )
+
+    def __init__(self, entity_id: str) -> None:
+        self.entity_id = entity_id
+        self.state = STATE_IDLE
+        self.task: asyncio.Task | None = None
+        self.task_turn_on: bool | None = None
+        self.desired: bool | None = None
+        self.commanded_at: datetime | None = None
+        self.retry_at: datetime | None = None
+        self.consecutive_failures = 0
+        self.commands = 0
+        self.confirmed = 0
+        # Confirmed after having been counted as failed (moved from failures to confirmed).
+        self.recovered = 0
+        # Commands that ended failed (call error/timeout, unconfirmed) and were not confirmed later;
+        # timeouts/unconfirmed count the events.
+        self.failures = 0
+        self.timeouts = 0
+        self.unconfirmed = 0
+        self.call_seconds = RollingStats(64)
+        self.confirm_seconds = RollingStats(64)
+
+
+class ActuatorManager:
+    """Issues independent switch commands concurrently, keeping the aux ordering.
+
+    Aux heating needs circulation: it is switched on after and switched off
+    before the main/pump switches commanded in the same batch.
+
+    Each switch runs through idle -> commanded -> confirmed | failed. A command
+    is confirmed by the switch's state change (listener, with a per-cycle poll
+    as fallback) and fails on a call error/timeout or when the state does not
+    follow within the confirmation timeout, which adapts to the switching delay
+    learned per switch. A late confirmation turns the failure into a success.
+    Repeated failures back off exponentially with jitter, so a flaky relay is
+    not called every cycle.
+    """
+
+    def __init__(self, hass: HomeAssistant, turn: Callable[[str, bool], Awaitable[None]]) -> None:
+        self._hass = hass
+        self._turn = turn
+        self._actuators: dict[str, _Actuator] = {}
+        self._unsub_state: dict[str, Callable[[], None]] = {}
+        self.retry_base_seconds = 120.0
+        self.batches = 0
+        self.background = 0
+
+    def _get(self, entity_id: str) -> _Actuator:
+        actuator = self._actuators.get(entity_id)
+        if actuator is None:
+            actuator = self._actuators[entity_id] = _Actuator(entity_id)
+        return actuator
+
+    def in_flight(self, entity_id: str | None) -> bool:
+        actuator = self._actuators.get(entity_id) if entity_id else None
+        return actuator is not None and actuator.task is not None
+
+    def may_command(self, entity_id: str, turn_on: bool, now: datetime, min_interval: timedelta) -> tuple[bool, str | None]:
+        """(allowed, reason) for commanding `entity_id` now; a new direction is always allowed."""
+        actuator = self._actuators.get(entity_id)
+        if actuator is None:
+            return True, None
+        if actuator.task is not None:
+            return False, "previous command still in flight"
+        if actuator.desired is None or actuator.desired != bool(turn_on) or actuator.commanded_at is None:
+            return True, None
+        if actuator.state == STATE_FAILED and actuator.retry_at is not None and now < actuator.retry_at:
+            return False, f"backing off after {actuator.consecutive_failures} failed attempt(s), next in {int((actuator.retry_at - now).total_seconds())} s"
+        if actuator.state == STATE_COMMANDED:
+            return False, "waiting for state confirmation"
+        if now - actuator.commanded_at < min_interval:
+            return False, f"last attempt {int((now - actuator.commanded_at).total_seconds())} seconds ago"
+        return True, None
+
+    def switching_delay(self, entity_id: str | None) -> float | None:
+        """Median command-to-confirmation latency (seconds) learned for a switch."""
+        actuator = self._actuators.get(entity_id) if entity_id else None
+        return actuator.confirm_seconds.percentile(50) if actuator is not None else None
+
+    def confirm_timeout(self, entity_id: str | None) -> float:
+        """Seconds a command may stay unconfirmed, from the learned switching delay."""
+        delay = self.switching_delay(entity_id)
+        if delay is None:
+            return ACTUATOR_CONFIRM_TIMEOUT_SECONDS
+        return min(ACTUATOR_CONFIRM_TIMEOUT_MAX_SECONDS, max(ACTUATOR_CONFIRM_TIMEOUT_SECONDS, ACTUATOR_CONFIRM_DELAY_FACTOR * delay))
+
+    @staticmethod
+    def _must_wait_for(cmd: ActuatorCommand, other: ActuatorCommand) -> bool:
+        if cmd.turn_on:
+            return cmd.role == ROLE_AUX and other.role in _PRIMARY_ROLES and other.turn_on
+        return cmd.role in _PRIMARY_ROLES and other.role == ROLE_AUX and not other.turn_on
+
+    async def async_apply(self, commands: Iterable[ActuatorCommand], wait: float = ACTUATOR_WAIT_SECONDS) -> None:
+        """Start all commands and wait up to `wait` seconds.
+
+        Commands for an entity that is still in flight are dropped, except a turn-off
+        behind a running turn-on (e.g. pause hard-off): it is queued behind that call.
+        """
+        batch = []
+        for cmd in commands:
+            running = self._actuators.get(cmd.entity_id)
+            if running is None or running.task is None or (not cmd.turn_on and running.task_turn_on):
+                batch.append(cmd)
+        if not batch:
+            return
+        self.batches += 1
+        for cmd in batch:
+            self._async_listen(cmd.entity_id)
+        # Commands without predecessors first, so each task can reference the tasks it waits for.
+        ordered = sorted(batch, key=lambda cmd: any(self._must_wait_for(cmd, other) for other in batch))
+        tasks: dict[ActuatorCommand, asyncio.Task] = {}
+        for cmd in ordered:
+            deps = [tasks[other] for other in ordered if other in tasks and self._must_wait_for(cmd, other)]
+            actuator = self._get(cmd.entity_id)
+            if actuator.task is not None:
+                # Queued turn-off: runs after the pending call for the same entity.
+                deps.append(actuator.task)
+            actuator.task = tasks[cmd] = self._hass.async_create_task(self._async_run(actuator, cmd, deps))
+            actuator.task_turn_on = cmd.turn_on
+        _done, pending = await asyncio.wait(tasks.values(), timeout=wait)
+        if pending:
+            self.background += len(pending)
+            _LOGGER.debug(
+                "Actuator commands still running after %ss: %s",
+                wait,
+                sorted(cmd.entity_id for cmd, task in tasks.items() if task in pending),
+            )
+
+    async def _async_run(self, actuator: _Actuator, cmd: ActuatorCommand, deps: list[asyncio.Task]) -> bool:
+        try:
+            if deps:
+                results = await asyncio.gather(*deps, return_exceptions=True)
+                if cmd.turn_on and not all(result is True for result in results):
+                    # No aux heating without a confirmed call to start circulation.
+                    _LOGGER.warning("Not switching %s on: main/pump switch command failed", cmd.entity_id)
+                    return False
+            actuator.commands += 1
+            actuator.desired = cmd.turn_on
+            actuator.commanded_at = dt_util.utcnow()
+            actuator.state = STATE_COMMANDED
+            started = asyncio.get_running_loop().time()
+            try:
+                await asyncio.wait_for(self._turn(cmd.entity_id, cmd.turn_on), ACTUATOR_CALL_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                actuator.timeouts += 1
+                self._fail(actuator, f"timed out after {ACTUATOR_CALL_TIMEOUT_SECONDS:g} s")
+                return False
+            except Exception as err:
+                self._fail(actuator, f"failed: {err}")
+                return False
+            actuator.call_seconds.add(asyncio.get_running_loop().time() - started)
+            # A blocking call usually returns with the new state already written.
+            if actuator.state == STATE_COMMANDED:
+                self._confirm_from_state(actuator, self._hass.states.get(actuator.entity_id))
+            return True
+        finally:
+            if actuator.task is asyncio.current_task():
+                actuator.task = None
+                actuator.task_turn_on = None
+
+    def check_confirmations(self) -> None:
+        """Poll commanded switches and fail those whose state did not follow in time (called every cycle)."""
+        now = dt_util.utcnow()
+        for actuator in self._actuators.values():
+            if actuator.state != STATE_COMMANDED or actuator.task is not None:
+                continue
+            if self._confirm_from_state(actuator, self._hass.states.get(actuator.entity_id)):
+                continue
+            timeout = self.confirm_timeout(actuator.entity_id)
+            if actuator.commanded_at is not None and (now - actuator.commanded_at).total_seconds() >= timeout:
+                actuator.unconfirmed += 1
+                self._fail(actuator, f"not confirmed within {timeout:g} s")
+
+    def _confirm_from_state(self, actuator: _Actuator, state) -> bool:
+        if state is None or state.state not in ("on", "off") or (state.state == "on") != actuator.desired:
+            return False
+        latency = None
+        changed = getattr(state, "last_changed", None)
+        # A state that already matched before the command carries no latency.
+        if isinstance(changed, datetime) and actuator.commanded_at is not None and changed >= actuator.commanded_at:
+            latency = (changed - actuator.commanded_at).total_seconds()
+        self._confirm(actuator, latency)
+        return True
+
+    def _confirm(self, actuator: _Actuator, latency: float | None) -> None:
+        if actuator.state == STATE_FAILED:
+            # Late confirmation: the command did work, count it once (as confirmed).
+            actuator.failures = max(0, actuator.failures - 1)
+            actuator.recovered += 1
+        actuator.state = STATE_CONFIRMED
+        actuator.confirmed += 1
+        actuator.consecutive_failures = 0
+        actuator.retry_at = None
+        if latency is not None:
+            actuator.confirm_seconds.add(latency)
+
+    def _fail(self, actuator: _Actuator, reason: str) -> None:
+        actuator.state = STATE_FAILED
+        actuator.failures += 1
+        actuator.consecutive_failures += 1
+        delay = min(
+            ACTUATOR_BACKOFF_MAX_SECONDS,
+            max(1.0, float(self.retry_base_seconds)) * 2 ** (actuator.consecutive_failures - 1),
+        )
+        delay *= random.uniform(1.0 - ACTUATOR_BACKOFF_JITTER, 1.0 + ACTUATOR_BACKOFF_JITTER)
+        actuator.retry_at = dt_util.utcnow() + timedelta(seconds=delay)
+        _LOGGER.warning(
+            "Switching %s %s %s (%d in a row); next attempt in %d s",
+            actuator.entity_id,
+            "on" if actuator.desired else "off",
+            reason,
+            actuator.consecutive_failures,
+            int(delay),
+        )
+
+    @callback
+    def _async_listen(self, entity_id: str) -> None:
+        if entity_id not in self._unsub_state:
+            self._unsub_state[entity_id] = async_track_state_change_event(
+                self._hass, [entity_id], self._async_handle_state_event
+            )
+
+    @callback
+    def _async_handle_state_event(self, event) -> None:
+        actuator = self._actuators.get(event.data.get("entity_id"))
+        # Late confirmations also clear a failure (e.g. a relay that reports slowly).
+        if actuator is None or actuator.state not in (STATE_COMMANDED, STATE_FAILED):
+            return
+        self._confirm_from_state(actuator, event.data.get("new_state"))
+
+    @callback
+    def async_stop(self) -> None:
+        """Remove the state listeners (called on unload)."""
+        for unsub in self._unsub_state.values():
+            unsub()
+        self._unsub_state.clear()
+
+    def stats(self) -> dict:
+        now = dt_util.utcnow()
+        actuators = {}
+        for entity_id, actuator in self._actuators.items():
+            finished = actuator.confirmed + actuator.failures
+            actuators[entity_id] = {
+                "state": actuator.state,
+                "in_flight": actuator.task is not None,
+                "desired": actuator.desired,
+                "commands": actuator.commands,
+                "confirmed": actuator.confirmed,
+                "recovered": actuator.recovered,
+                "failures": actuator.failures,
+                "timeouts": actuator.timeouts,
+                "unconfirmed": actuator.unconfirmed,
+                "consecutive_failures": actuator.consecutive_failures,
+                "success_rate": round(actuator.confirmed / finished, 3) if finished else None,
+                "retry_in_seconds": (
+                    max(0, int((actuator.retry_at - now).total_seconds())) if actuator.retry_at is not None else None
+                ),
+                "median_confirm_seconds": (
+                    round(actuator.confirm_seconds.percentile(50), 3) if actuator.confirm_seconds.count else None
+                ),
+                "confirm_timeout_seconds": round(self.confirm_timeout(entity_id), 1),
+                "call_seconds": actuator.call_seconds.as_dict(),
+                "confirm_seconds": actuator.confirm_seconds.as_dict(),
+            }
+        return {"batches": self.batches, "background": self.background, "actuators": actuators}
@@ -1,6 +1,14 @@
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN, MANUFACTURER, CONF_ENABLE_AUX_HEATING, CONF_AUX_HEATING_SWITCH
+from .entity import PoolCoordinatorEntity
+
+# Derived binary sensors and the data keys they are computed from.
+_DERIVED_DATA_KEYS = {
+    "low_chlor": frozenset({"low_chlor", "chlor_val"}),
+    "ph_alert": frozenset({"ph_alert", "ph_val"}),
+    # Config-only (enable flag); options changes publish all entities.
+    "aux_present": frozenset({"aux_present"}),
+}
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]
@@ -34,12 +42,13 @@ async def async_setup_entry(hass, entry, async_add_entities):
         PoolBinary(coordinator, "event_rain_blocked", "Event wegen Regen blockiert", BinarySensorDeviceClass.PROBLEM),
     ])
 
-class PoolBinary(CoordinatorEntity, BinarySensorEntity):
+class PoolBinary(PoolCoordinatorEntity, BinarySensorEntity):
     _attr_has_entity_name = True
     def __init__(self, coordinator, key, name=None, d_class=None):
         super().__init__(coordinator)
         self.coordinator = coordinator
         self._key = key
+        self._data_keys = _DERIVED_DATA_KEYS.get(key, frozenset({key}))
         self._attr_translation_key = key
         self._attr_device_class = d_class
         self._attr_unique_id = f"{coordinator.entry.entry_id}_{key}"
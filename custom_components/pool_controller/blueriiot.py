@@ -3,19 +3,45 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import itertools
+import time
+import zlib
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import timedelta
 
 from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
 from homeassistant.components import bluetooth
-from homeassistant.core import HomeAssistant
+from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher,
+    BluetoothChange,
+    BluetoothScanningMode,
+    BluetoothServiceInfoBleak,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.util import dt as dt_util
 
+from .blueriiot_codec import FRAME_SIZE, decode_frame
+
 
 SERVICE_UUID = "F3300001-F0A2-9B06-0C59-1BC4763B5C00"
 COMMAND_CHARACTERISTIC_UUID = "F3300002-F0A2-9B06-0C59-1BC4763B5C00"
 NOTIFY_CHARACTERISTIC_UUID = "F3300003-F0A2-9B06-0C59-1BC4763B5C00"
 
+NOTIFICATION_TIMEOUT_SECONDS = 20
+# Session mode: reconnect backoff after failed connects/reads.
+SESSION_BACKOFF_MIN_SECONDS = 15
+SESSION_BACKOFF_MAX_SECONDS = 600
+
+# Shared connection budget (all entries of this integration in one HA instance).
+DATA_BLUERIIOT_SCHEDULER = "pool_controller_blueriiot_scheduler"
+MAX_CONNECTIONS_PER_SOURCE = 2
+SLOT_TIMEOUT_SECONDS = 30
+# First read after start/address change is staggered by up to this many seconds.
+FIRST_READ_STAGGER_SECONDS = 60
+
 
 @dataclass(frozen=True, slots=True)
 class BlueRiiotReading:
@@ -29,17 +55,294 @@ class BlueRiiotReading:
     battery: float
 
 
+class BlueRiiotSlotTimeout(Exception):
+    """No connection slot became free on the adapter/proxy in time."""
+
+
+class BlueRiiotScheduler:
+    """hass-wide budget of concurrent BlueRiiot GATT connections per adapter/proxy.
+
+    Waiting readers are served most-overdue first; queue depth and wait times are
+    tracked for diagnostics. A kept-open session holds its slot while idle, but a
+    reader queueing on the same source asks the longest idle session to close.
+    """
+
+    def __init__(self, max_per_source: int = MAX_CONNECTIONS_PER_SOURCE) -> None:
+        self.max_per_source = max(1, int(max_per_source))
+        self._active: dict[str, int] = {}
+        self._waiters: dict[str, list] = {}
+        # Idle kept sessions per source (oldest first): holder -> close request.
+        self._idle: dict[str, dict[object, Callable[[], None]]] = {}
+        self._order = itertools.count()
+        self.grants = 0
+        self.timeouts = 0
+        self.preemptions = 0
+        self.max_queue_depth = 0
+        self.last_wait_seconds: float | None = None
+        self.max_wait_seconds = 0.0
+        self._wait_seconds_total = 0.0
+
+    @classmethod
+    def for_hass(cls, hass: HomeAssistant) -> BlueRiiotScheduler:
+        scheduler = hass.data.get(DATA_BLUERIIOT_SCHEDULER)
+        if scheduler is None:
+            scheduler = hass.data[DATA_BLUERIIOT_SCHEDULER] = cls()
+        return scheduler
+
+    def queue_depth(self, source: str | None = None) -> int:
+        if source is not None:
+            return sum(1 for *_, fut in self._waiters.get(source, ()) if not fut.done())
+        return sum(self.queue_depth(name) for name in self._waiters)
+
+    def active(self, source: str | None = None) -> int:
+        if source is not None:
+            return self._active.get(source, 0)
+        return sum(self._active.values())
+
+    async def async_acquire(self, source: str, priority: float, timeout: float = SLOT_TIMEOUT_SECONDS) -> float:
+        """Wait for a connection slot on `source`; returns the wait time in seconds."""
+        started = time.monotonic()
+        if self._active.get(source, 0) < self.max_per_source and not self.queue_depth(source):
+            self._active[source] = self._active.get(source, 0) + 1
+            return self._record_grant(started)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters.setdefault(source, []), (-float(priority), next(self._order), future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth())
+        self._preempt_idle(source)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if not future.done():
+                future.cancel()
+                self.timeouts += 1
+                raise BlueRiiotSlotTimeout(source) from None
+        except asyncio.CancelledError:
+            # Granted while being cancelled: hand the slot on instead of leaking it.
+            if future.done() and not future.cancelled():
+                self.release(source)
+            else:
+                future.cancel()
+            raise
+        return self._record_grant(started)
+
+    def release(self, source: str) -> None:
+        self._active[source] = max(0, self._active.get(source, 0) - 1)
+        waiters = self._waiters.get(source)
+        while waiters and self._active[source] < self.max_per_source:
+            *_, future = heapq.heappop(waiters)
+            if future.done():
+                continue
+            self._active[source] += 1
+            future.set_result(None)
+
+    def set_idle(self, source: str, holder: object, close: Callable[[], None]) -> None:
+        """`holder` keeps its slot for an idle session; `close` is called when a reader queues."""
+        self._idle.setdefault(source, {})[holder] = close
+        if self.queue_depth(source):
+            self._preempt_idle(source)
+
+    def clear_idle(self, source: str, holder: object) -> None:
+        idle = self._idle.get(source)
+        if idle is not None:
+            idle.pop(holder, None)
+
+    def _preempt_idle(self, source: str) -> None:
+        idle = self._idle.get(source)
+        if not idle:
+            return
+        holder = next(iter(idle))
+        close = idle.pop(holder)
+        self.preemptions += 1
+        close()
+
+    def _record_grant(self, started: float) -> float:
+        waited = time.monotonic() - started
+        self.grants += 1
+        self.last_wait_seconds = round(waited, 3)
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self._wait_seconds_total += waited
+        return waited
+
+    def stats(self) -> dict:
+        return {
+            "max_per_source": self.max_per_source,
+            "active": dict(self._active),
+            "queue_depth": self.queue_depth(),
+            "max_queue_depth": self.max_queue_depth,
+            "grants": self.grants,
+            "timeouts": self.timeouts,
+            "preemptions": self.preemptions,
+            "idle_sessions": sum(len(idle) for idle in self._idle.values()),
+            "last_wait_seconds": self.last_wait_seconds,
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "average_wait_seconds": round(self._wait_seconds_total / self.grants, 3) if self.grants else None,
+        }
+
+
 class BlueRiiotReader:
-    """Fetch one BlueRiiot notification at a controlled polling interval."""
+    """Fetch one BlueRiiot notification at a controlled polling interval.
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    By default every reading connects, subscribes, requests and disconnects. In
+    session mode (`configure_session(True, ...)`) the GATT connection and the
+    notification subscription are kept across readings until the idle timeout.
+    """
+
+    def __init__(self, hass: HomeAssistant, scheduler: BlueRiiotScheduler | None = None) -> None:
         self._hass = hass
+        self._scheduler = scheduler or BlueRiiotScheduler.for_hass(hass)
         self._address: str | None = None
         self._last_attempt = None
+        self._first_read_not_before: float | None = None
+        self._priority = 0.0
+        self._slot_source: str | None = None
+        self.last_slot_wait_seconds: float | None = None
         self.last_success = None
         self.last_error: str | None = None
         self.reading: BlueRiiotReading | None = None
         self._lock = asyncio.Lock()
+        # Session mode
+        self.keep_connected = False
+        self.idle_timeout = timedelta(minutes=20)
+        self._client: BleakClientWithServiceCache | None = None
+        self._notification: asyncio.Future | None = None
+        self._unsub_idle = None
+        self._backoff_seconds = 0.0
+        self._reconnect_not_before: float | None = None
+        # Counters (connection setup latency / session reuse)
+        self.connects = 0
+        self.connect_failures = 0
+        self.reads = 0
+        self.reused_reads = 0
+        self.preempted = 0
+        self.last_connect_seconds: float | None = None
+        self._connect_seconds_total = 0.0
+        # Passive mode: measurement frames carried in advertisements/scan responses.
+        self._unsub_passive = None
+        self._passive_address: str | None = None
+        self.passive_reading: BlueRiiotReading | None = None
+        self.passive_at = None
+        self.last_advertisement = None
+        self.rssi: int | None = None
+        self.passive_reads = 0
+        self.last_source: str | None = None
+        self._on_passive_reading = None
+
+    @property
+    def reuse_rate(self) -> float | None:
+        """Share of successful readings served by an already open session."""
+        if not self.reads:
+            return None
+        return self.reused_reads / self.reads
+
+    @property
+    def average_connect_seconds(self) -> float | None:
+        if not self.connects:
+            return None
+        return self._connect_seconds_total / self.connects
+
+    def stats(self) -> dict:
+        return {
+            "keep_connected": self.keep_connected,
+            "connected": self._client is not None,
+            "connects": self.connects,
+            "connect_failures": self.connect_failures,
+            "reads": self.reads,
+            "reused_reads": self.reused_reads,
+            "reuse_rate": self.reuse_rate,
+            "preempted": self.preempted,
+            "last_connect_seconds": self.last_connect_seconds,
+            "average_connect_seconds": self.average_connect_seconds,
+            "backoff_seconds": self._backoff_seconds,
+            "passive_listening": self._unsub_passive is not None,
+            "passive_reads": self.passive_reads,
+            "last_advertisement": self.last_advertisement,
+            "rssi": self.rssi,
+            "last_source": self.last_source,
+            "slot_source": self._slot_source,
+            "last_slot_wait_seconds": self.last_slot_wait_seconds,
+            "scheduler": self._scheduler.stats(),
+        }
+
+    @callback
+    def async_start_passive(self, address: str, on_reading=None) -> None:
+        """Listen for advertisements of the probe (no connection slot, no airtime).
+
+        `on_reading` is called when an advertisement carries changed measurement data.
+        """
+        normalized_address = address.upper()
+        self._on_passive_reading = on_reading
+        if self._unsub_passive is not None and self._passive_address == normalized_address:
+            return
+        self.async_stop_passive()
+        self._passive_address = normalized_address
+        self._unsub_passive = bluetooth.async_register_callback(
+            self._hass,
+            self._async_handle_advertisement,
+            BluetoothCallbackMatcher(address=normalized_address, connectable=False),
+            BluetoothScanningMode.PASSIVE,
+        )
+
+    @callback
+    def async_stop_passive(self) -> None:
+        if self._unsub_passive is not None:
+            self._unsub_passive()
+            self._unsub_passive = None
+        self._passive_address = None
+        self.passive_reading = None
+        self.passive_at = None
+
+    @callback
+    def _async_handle_advertisement(
+        self, service_info: BluetoothServiceInfoBleak, _change: BluetoothChange
+    ) -> None:
+        now = dt_util.now()
+        self.last_advertisement = now
+        self.rssi = service_info.rssi
+        reading = self._decode_advertisement(service_info)
+        if reading is None:
+            return
+        changed = reading != self.passive_reading
+        self.passive_reading = reading
+        self.passive_at = now
+        if changed and self._on_passive_reading is not None:
+            self._on_passive_reading()
+
+    @classmethod
+    def _decode_advertisement(cls, service_info: BluetoothServiceInfoBleak) -> BlueRiiotReading | None:
+        """Decode a measurement frame from BlueRiiot service data, if present.
+
+        Manufacturer data is ignored: there is no documented company ID/header, and
+        foreign payloads can decode to values that pass the plausibility ranges.
+        """
+        for uuid, payload in (service_info.service_data or {}).items():
+            if str(uuid).upper() != SERVICE_UUID or len(payload) != FRAME_SIZE:
+                continue
+            try:
+                reading = cls._decode(bytes(payload))
+            except ValueError:
+                continue
+            if cls._is_plausible(reading):
+                return reading
+        return None
+
+    @staticmethod
+    def _is_plausible(reading: BlueRiiotReading) -> bool:
+        return bool(
+            -5.0 <= reading.temperature <= 50.0
+            and 0.0 <= reading.ph <= 14.0
+            and -1000.0 <= reading.orp <= 1500.0
+            and reading.salt >= 0.0
+            and reading.conductivity >= 0.0
+            and 0.0 <= reading.battery <= 100.0
+        )
+
+    def configure_session(self, keep_connected: bool, idle_timeout: timedelta | None = None) -> None:
+        """Enable/disable the kept-alive session mode."""
+        if idle_timeout is not None:
+            self.idle_timeout = idle_timeout
+        if self.keep_connected and not keep_connected and self._client is not None:
+            self._hass.async_create_task(self.async_close())
+        self.keep_connected = bool(keep_connected)
 
     async def async_read_if_due(
         self, address: str, minimum_interval: timedelta, *, force: bool = False
@@ -48,19 +351,64 @@ class BlueRiiotReader:
         normalized_address = address.upper()
         now = dt_util.now()
         if normalized_address != self._address:
+            if self._client is not None:
+                await self.async_close()
             self._address = normalized_address
             self._last_attempt = None
             self.last_success = None
             self.last_error = None
             self.reading = None
+            # Entries starting together must not all connect in the same cycle.
+            self._first_read_not_before = time.monotonic() + (
+                zlib.crc32(normalized_address.encode()) % FIRST_READ_STAGGER_SECONDS
+            )
+
+        # Fresh passive data replaces the connect-and-notify path; checked before the connect
+        # throttles so a new advertisement is taken over right away.
+        if (
+            not force
+            and self.passive_reading is not None
+            and self._passive_address == normalized_address
+            and self.passive_at is not None
+            and now - self.passive_at < minimum_interval
+        ):
+            if self.passive_at != self.last_success:
+                self.reading = self.passive_reading
+                self.last_success = self.passive_at
+                self.last_error = None
+                self.last_source = "passive"
+                self.passive_reads += 1
+            return self.reading
 
         if not force and self._last_attempt and now - self._last_attempt < minimum_interval:
             return self.reading
+        if (
+            not force
+            and self._last_attempt is None
+            and self._first_read_not_before is not None
+            and time.monotonic() < self._first_read_not_before
+        ):
+            return self.reading
 
         async with self._lock:
             now = dt_util.now()
             if not force and self._last_attempt and now - self._last_attempt < minimum_interval:
                 return self.reading
+            if (
+                self.keep_connected
+                and self._client is None
+                and self._reconnect_not_before is not None
+                and time.monotonic() < self._reconnect_not_before
+            ):
+                self.last_error = "reconnect_backoff"
+                return self.reading
+            # Most overdue reads get the next free connection slot first.
+            if force:
+                self._priority = float("inf")
+            elif self._last_attempt is not None:
+                self._priority = (now - self._last_attempt - minimum_interval).total_seconds()
+            else:
+                self._priority = minimum_interval.total_seconds()
             self._last_attempt = now
 
             device = bluetooth.async_ble_device_from_address(
@@ -70,39 +418,171 @@ class BlueRiiotReader:
                 self.last_error = "device_not_found"
                 return self.reading
 
-            notification = self._hass.loop.create_future()
-
-            def _handle_notification(_: int, payload: bytearray) -> None:
-                if not notification.done():
-                    notification.set_result(bytes(payload))
-
-            client = None
+            failed = True
             try:
-                client = await establish_connection(
-                    BleakClientWithServiceCache,
-                    device,
-                    "Pool Controller BlueRiiot",
-                )
-                await client.start_notify(NOTIFY_CHARACTERISTIC_UUID, _handle_notification)
-                await client.write_gatt_char(
-                    COMMAND_CHARACTERISTIC_UUID, b"\x01", response=True
-                )
-                payload = await asyncio.wait_for(notification, timeout=20)
+                payload = await self._async_request_payload(device)
                 self.reading = self._decode(payload)
                 self.last_success = dt_util.now()
                 self.last_error = None
+                self.last_source = "gatt"
+                failed = False
+            except BlueRiiotSlotTimeout:
+                self.last_error = "connection_slot_timeout"
             except asyncio.TimeoutError:
                 self.last_error = "notification_timeout"
             except Exception as err:  # BLE backends expose several backend-specific errors.
                 self.last_error = type(err).__name__
             finally:
-                if client is not None:
-                    try:
-                        await client.disconnect()
-                    except Exception:
-                        pass
+                if failed or not self.keep_connected:
+                    await self._async_disconnect()
+                else:
+                    self._arm_idle_timer()
+                    if self._slot_source is not None:
+                        self._scheduler.set_idle(self._slot_source, self, self._request_close)
+            if self.keep_connected:
+                self._update_backoff(failed)
         return self.reading
 
+    async def _async_request_payload(self, device) -> bytes:
+        """Request one notification, reusing the open session when possible."""
+        reused = self._client is not None and self._client.is_connected
+        if not reused:
+            await self._async_connect(device)
+        elif self._slot_source is not None:
+            self._scheduler.clear_idle(self._slot_source, self)
+        notification = self._hass.loop.create_future()
+        self._notification = notification
+        try:
+            try:
+                await self._client.write_gatt_char(
+                    COMMAND_CHARACTERISTIC_UUID, b"\x01", response=True
+                )
+            except Exception:
+                if not reused:
+                    raise
+                # The kept session went stale (e.g. proxy dropped it): reconnect once.
+                await self._async_disconnect()
+                reused = False
+                await self._async_connect(device)
+                await self._client.write_gatt_char(
+                    COMMAND_CHARACTERISTIC_UUID, b"\x01", response=True
+                )
+            payload = await asyncio.wait_for(notification, timeout=NOTIFICATION_TIMEOUT_SECONDS)
+        finally:
+            self._notification = None
+        self.reads += 1
+        if reused:
+            self.reused_reads += 1
+        return payload
+
+    async def _async_connect(self, device) -> None:
+        service_info = bluetooth.async_last_service_info(self._hass, device.address, connectable=True)
+        source = service_info.source if service_info is not None else "default"
+        self.last_slot_wait_seconds = round(
+            await self._scheduler.async_acquire(source, self._priority), 3
+        )
+        self._slot_source = source
+        started = time.monotonic()
+        try:
+            client = await establish_connection(
+                BleakClientWithServiceCache,
+                device,
+                "Pool Controller BlueRiiot",
+                disconnected_callback=self._handle_disconnect,
+            )
+        except Exception:
+            self.connect_failures += 1
+            self._release_slot()
+            raise
+        self._client = client
+        await client.start_notify(NOTIFY_CHARACTERISTIC_UUID, self._handle_notification)
+        elapsed = time.monotonic() - started
+        self.connects += 1
+        self.last_connect_seconds = round(elapsed, 3)
+        self._connect_seconds_total += elapsed
+
+    def _handle_notification(self, _: int, payload: bytearray) -> None:
+        notification = self._notification
+        if notification is not None and not notification.done():
+            notification.set_result(bytes(payload))
+
+    def _handle_disconnect(self, client) -> None:
+        if client is self._client:
+            self._client = None
+            self._cancel_idle_timer()
+            self._release_slot()
+
+    def _release_slot(self) -> None:
+        source = self._slot_source
+        self._slot_source = None
+        if source is not None:
+            self._scheduler.clear_idle(source, self)
+            self._scheduler.release(source)
+
+    @callback
+    def _request_close(self) -> None:
+        """Another reader waits for this source: close the idle session to free its slot."""
+        self._hass.async_create_task(self._async_close_for_waiter())
+
+    async def _async_close_for_waiter(self) -> None:
+        async with self._lock:
+            source = self._slot_source
+            # Still needed? The waiter may have been served or timed out meanwhile.
+            if self._client is None or source is None or not self._scheduler.queue_depth(source):
+                if self._client is not None and source is not None:
+                    self._scheduler.set_idle(source, self, self._request_close)
+                return
+            self.preempted += 1
+            await self._async_disconnect()
+
+    def _update_backoff(self, failed: bool) -> None:
+        if not failed:
+            self._backoff_seconds = 0.0
+            self._reconnect_not_before = None
+            return
+        self._backoff_seconds = min(
+            SESSION_BACKOFF_MAX_SECONDS,
+            max(SESSION_BACKOFF_MIN_SECONDS, self._backoff_seconds * 2),
+        )
+        self._reconnect_not_before = time.monotonic() + self._backoff_seconds
+
+    def _arm_idle_timer(self) -> None:
+        self._cancel_idle_timer()
+        self._unsub_idle = async_call_later(
+            self._hass, self.idle_timeout.total_seconds(), self._async_idle_timeout
+        )
+
+    def _cancel_idle_timer(self) -> None:
+        if self._unsub_idle is not None:
+            self._unsub_idle()
+            self._unsub_idle = None
+
+    async def _async_idle_timeout(self, _now) -> None:
+        self._unsub_idle = None
+        if self._lock.locked():
+            return
+        await self._async_disconnect()
+
+    async def _async_disconnect(self) -> None:
+        self._cancel_idle_timer()
+        client = self._client
+        self._client = None
+        if client is not None:
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+        self._release_slot()
+
+    async def async_close(self) -> None:
+        """Close a kept-alive session (unload, address or mode change)."""
+        async with self._lock:
+            await self._async_disconnect()
+
+    async def async_shutdown(self) -> None:
+        self.async_stop_passive()
+        await self.async_close()
+
     def is_recently_reachable(self, maximum_age: timedelta) -> bool:
         """Return whether a successful direct measurement is still recent."""
         return bool(
@@ -112,18 +592,4 @@ class BlueRiiotReader:
 
     @staticmethod
     def _decode(payload: bytes) -> BlueRiiotReading:
-        if len(payload) < 12:
-            raise ValueError(f"incomplete_payload_{len(payload)}")
-
-        def _int16(offset: int) -> int:
-            return int.from_bytes(payload[offset : offset + 2], "little", signed=True)
-
-        raw_ph = float(_int16(3))
-        return BlueRiiotReading(
-            temperature=_int16(1) / 100.0,
-            ph=(2048.0 - raw_ph) / 232.0 + 7.0,
-            orp=_int16(5) / 3.86 - 21.57826,
-            salt=_int16(7) / 25.0,
-            conductivity=_int16(9) / 4.134,
-            battery=float(payload[11]),
-        )
\ No newline at end of file
+        return BlueRiiotReading(*decode_frame(payload))
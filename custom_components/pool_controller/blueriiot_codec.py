@@ -0,0 +1,103 @@
+"""BlueRiiot notification codec, batch decoder and capture-file format.
+
+This module has no Home Assistant dependencies so recorded payloads can be
+replayed offline (calibration work, benchmarks).
+"""
+
+from __future__ import annotations
+
+import struct
+from array import array
+from collections.abc import Iterable
+from typing import BinaryIO
+
+# Notification frame: 1 header byte, int16 LE temperature/pH/ORP/salt/conductivity, battery byte.
+FRAME = struct.Struct("<xhhhhhB")
+FRAME_SIZE = FRAME.size
+
+READING_FIELDS = ("temperature", "ph", "orp", "salt", "conductivity", "battery")
+
+# Raw value conversion (shared by the single-frame and the batch decoder).
+TEMP_SCALE = 100.0
+PH_ZERO = 2048.0
+PH_SLOPE = 232.0
+PH_NEUTRAL = 7.0
+ORP_SCALE = 3.86
+ORP_OFFSET = 21.57826
+SALT_SCALE = 25.0
+CONDUCTIVITY_SCALE = 4.134
+
+# Capture file: header (magic, version, frame size) followed by fixed-size records
+# of (epoch seconds as float64, raw frame).
+CAPTURE_MAGIC = b"BRCP"
+CAPTURE_VERSION = 1
+CAPTURE_HEADER = struct.Struct("<4sHH")
+CAPTURE_RECORD = struct.Struct(f"<d{FRAME_SIZE}s")
+
+
+def _convert(
+    raw_temp: int, raw_ph: int, raw_orp: int, raw_salt: int, raw_cond: int, battery: int
+) -> tuple[float, float, float, float, float, float]:
+    return (
+        raw_temp / TEMP_SCALE,
+        (PH_ZERO - raw_ph) / PH_SLOPE + PH_NEUTRAL,
+        raw_orp / ORP_SCALE - ORP_OFFSET,
+        raw_salt / SALT_SCALE,
+        raw_cond / CONDUCTIVITY_SCALE,
+        float(battery),
+    )
+
+
+def decode_frame(payload: bytes) -> tuple[float, float, float, float, float, float]:
+    """Decode one notification (extra trailing bytes are ignored)."""
+    if len(payload) < FRAME_SIZE:
+        raise ValueError(f"incomplete_payload_{len(payload)}")
+    return _convert(*FRAME.unpack_from(payload))
+
+
+def decode_batch(buffer: bytes | bytearray | memoryview) -> dict[str, array]:
+    """Decode concatenated frames into one float column per reading field."""
+    view = memoryview(buffer)
+    if len(view) % FRAME_SIZE:
+        raise ValueError(f"buffer_not_multiple_of_{FRAME_SIZE}")
+    columns = {name: array("d") for name in READING_FIELDS}
+    if not len(view):
+        return columns
+    raw = list(zip(*FRAME.iter_unpack(view)))
+    columns["temperature"] = array("d", [v / TEMP_SCALE for v in raw[0]])
+    columns["ph"] = array("d", [(PH_ZERO - v) / PH_SLOPE + PH_NEUTRAL for v in raw[1]])
+    columns["orp"] = array("d", [v / ORP_SCALE - ORP_OFFSET for v in raw[2]])
+    columns["salt"] = array("d", [v / SALT_SCALE for v in raw[3]])
+    columns["conductivity"] = array("d", [v / CONDUCTIVITY_SCALE for v in raw[4]])
+    columns["battery"] = array("d", raw[5])
+    return columns
+
+
+def write_capture(fp: BinaryIO, records: Iterable[tuple[float, bytes]]) -> int:
+    """Write (timestamp, payload) records; returns the number of records written."""
+    fp.write(CAPTURE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, FRAME_SIZE))
+    count = 0
+    for ts, payload in records:
+        if len(payload) < FRAME_SIZE:
+            continue
+        fp.write(CAPTURE_RECORD.pack(float(ts), bytes(payload[:FRAME_SIZE])))
+        count += 1
+    return count
+
+
+def read_capture(fp: BinaryIO) -> tuple[array, bytes]:
+    """Read a capture file; returns (timestamps, concatenated frames for decode_batch)."""
+    header = fp.read(CAPTURE_HEADER.size)
+    if len(header) != CAPTURE_HEADER.size:
+        raise ValueError("capture_header_missing")
+    magic, version, frame_size = CAPTURE_HEADER.unpack(header)
+    if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION or frame_size != FRAME_SIZE:
+        raise ValueError("capture_format_unsupported")
+    body = fp.read()
+    usable = len(body) - (len(body) % CAPTURE_RECORD.size)
+    timestamps = array("d")
+    frames = bytearray()
+    for ts, frame in CAPTURE_RECORD.iter_unpack(memoryview(body)[:usable]):
+        timestamps.append(ts)
+        frames += frame
+    return timestamps, bytes(frames)
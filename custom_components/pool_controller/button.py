@@ -1,6 +1,6 @@
 from homeassistant.components.button import ButtonEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN, MANUFACTURER
+from .entity import PoolCoordinatorEntity
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]
@@ -16,8 +16,10 @@ async def async_setup_entry(hass, entry, async_add_entities):
         BlueRiiotReadButton(coordinator),
     ])
 
-class PoolButton(CoordinatorEntity, ButtonEntity):
+class PoolButton(PoolCoordinatorEntity, ButtonEntity):
     _attr_has_entity_name = True
+    # Button state (last press) does not depend on coordinator data.
+    _data_keys = frozenset()
     def __init__(self, coordinator, name=None):
         super().__init__(coordinator)
         self.coordinator = coordinator
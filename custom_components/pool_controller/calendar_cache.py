@@ -0,0 +1,347 @@
+"""hass-wide calendar event cache: parsed, sorted event intervals per calendar entity."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CALENDAR_CACHE = "pool_controller_calendar_cache"
+
+# Edits far ahead do not change the calendar entity's state; the TTL picks them up.
+CALENDAR_TTL_SECONDS = 900
+# Failed fetches are not retried before this delay.
+CALENDAR_RETRY_SECONDS = 60
+# A slow (cloud) calendar must not hold a fetch open indefinitely.
+CALENDAR_FETCH_TIMEOUT_SECONDS = 30
+# Next-event lookahead; the fetched window starts yesterday (quiet calendar) and
+# reaches one day past the lookahead, so it stays valid until the next midnight.
+CALENDAR_LOOKAHEAD_DAYS = 7
+CALENDAR_PAST_DAYS = 1
+
+
+def _parse_boundary(raw) -> tuple[datetime | None, bool]:
+    """(UTC datetime, all-day flag); all-day dates start at local midnight."""
+    if not raw:
+        return None, False
+    if isinstance(raw, datetime):
+        return dt_util.as_utc(raw), False
+    if isinstance(raw, date):
+        return dt_util.as_utc(dt_util.start_of_local_day(raw)), True
+    try:
+        parsed = dt_util.parse_datetime(str(raw))
+        if parsed is not None:
+            return dt_util.as_utc(parsed), False
+        day = dt_util.parse_date(str(raw))
+    except (TypeError, ValueError):
+        return None, False
+    if day is None:
+        return None, False
+    return dt_util.as_utc(dt_util.start_of_local_day(day)), True
+
+
+@dataclass(frozen=True, slots=True)
+class CalendarEvent:
+    start: datetime
+    end: datetime | None
+    summary: str
+    all_day: bool
+
+    def as_dict(self) -> dict:
+        # Keep keys stable; omit empty summary.
+        out = {"start": self.start, "end": self.end}
+        if self.summary:
+            out["summary"] = self.summary
+        return out
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedCalendar:
+    """Events sorted by start; `max_ends[i]` is the latest end among events 0..i (epoch seconds)."""
+
+    entity_id: str
+    window_start: float
+    window_end: float
+    events: tuple[CalendarEvent, ...]
+    starts: array
+    ends: array
+    max_ends: array
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @classmethod
+    def from_items(cls, entity_id: str, items: list, window_start: float, window_end: float) -> ParsedCalendar:
+        events = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            start, all_day = _parse_boundary(item.get("start"))
+            if start is None:
+                continue
+            end, _ = _parse_boundary(item.get("end"))
+            events.append(CalendarEvent(start, end, str(item.get("summary") or ""), all_day))
+        events.sort(key=lambda ev: ev.start)
+        starts = array("d")
+        ends = array("d")
+        max_ends = array("d")
+        latest = float("-inf")
+        for ev in events:
+            start_ts = ev.start.timestamp()
+            end_ts = max(start_ts, ev.end.timestamp()) if ev.end is not None else start_ts
+            latest = max(latest, end_ts)
+            starts.append(start_ts)
+            ends.append(end_ts)
+            max_ends.append(latest)
+        return cls(entity_id, window_start, window_end, tuple(events), starts, ends, max_ends)
+
+    def covers(self, start_ts: float, end_ts: float) -> bool:
+        return self.window_start <= start_ts and end_ts <= self.window_end
+
+    def next_event(self, now: datetime, until: datetime | None = None, *, timed_only: bool = True) -> CalendarEvent | None:
+        """First event starting at or after `now` (and before `until`)."""
+        until_ts = until.timestamp() if until is not None else None
+        for i in range(bisect_left(self.starts, now.timestamp()), len(self.events)):
+            if until_ts is not None and self.starts[i] >= until_ts:
+                break
+            if timed_only and self.events[i].all_day:
+                continue
+            return self.events[i]
+        return None
+
+    def ongoing_event(self, now: datetime, *, timed_only: bool = True) -> CalendarEvent | None:
+        """Running event (start <= now < end) that ends first."""
+        now_ts = now.timestamp()
+        hi = bisect_right(self.starts, now_ts)
+        if hi == 0 or self.max_ends[hi - 1] <= now_ts:
+            return None
+        best = None
+        for i in range(hi):
+            ev = self.events[i]
+            if ev.end is None or self.ends[i] <= now_ts or (timed_only and ev.all_day):
+                continue
+            if best is None or self.ends[i] < self.ends[best]:
+                best = i
+        return self.events[best] if best is not None else None
+
+    def has_event_between(self, start_ts: float, end_ts: float) -> bool:
+        """Any event overlapping [start_ts, end_ts), including zero-length events inside it."""
+        hi = bisect_left(self.starts, end_ts)
+        if hi == 0:
+            return False
+        return self.max_ends[hi - 1] > start_ts or self.starts[hi - 1] >= start_ts
+
+    def event_days(self, first_day: date, days: int) -> frozenset[date]:
+        """Local dates in [first_day, first_day + days) with at least one event (holidays)."""
+        found = set()
+        day_start = dt_util.start_of_local_day(first_day).timestamp()
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            day_end = dt_util.start_of_local_day(day + timedelta(days=1)).timestamp()
+            if self.has_event_between(day_start, day_end):
+                found.add(day)
+            day_start = day_end
+        return frozenset(found)
+
+
+def calendar_window(now: datetime) -> tuple[datetime, datetime]:
+    """Fetch window for `now`: local midnight yesterday .. one day past the lookahead."""
+    today = dt_util.as_local(now).date()
+    return (
+        dt_util.start_of_local_day(today - timedelta(days=CALENDAR_PAST_DAYS)),
+        dt_util.start_of_local_day(today + timedelta(days=CALENDAR_LOOKAHEAD_DAYS + 1)),
+    )
+
+
+class _Entry:
+    __slots__ = ("calendar", "fetched_at", "good_at", "failed", "task", "owners", "unsub")
+
+    def __init__(self) -> None:
+        self.calendar: ParsedCalendar | None = None
+        # Last fetch attempt / last successful fetch (monotonic seconds).
+        self.fetched_at: float | None = None
+        self.good_at: float | None = None
+        self.failed = False
+        self.task: asyncio.Task | None = None
+        self.owners: set[str] = set()
+        self.unsub = None
+
+
+class CalendarCache:
+    """Calendar events keyed by calendar entity, shared by all entries.
+
+    Entries referenced by a coordinator (`async_track`) are invalidated when the
+    calendar entity reports a different upcoming/current event.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._entries: dict[str, _Entry] = {}
+        self.hits = 0
+        self.fetches = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.failures = 0
+        self.timeouts = 0
+
+    @classmethod
+    def for_hass(cls, hass: HomeAssistant) -> CalendarCache:
+        cache = hass.data.get(DATA_CALENDAR_CACHE)
+        if cache is None:
+            cache = hass.data[DATA_CALENDAR_CACHE] = cls(hass)
+        return cache
+
+    @callback
+    def async_track(self, owner: str, entity_ids: Iterable[str | None]) -> None:
+        """Set the calendars `owner` uses; subscribes to state changes while referenced."""
+        wanted = {eid for eid in entity_ids if eid and isinstance(eid, str)}
+        for entity_id, entry in list(self._entries.items()):
+            if owner in entry.owners and entity_id not in wanted:
+                entry.owners.discard(owner)
+                if not entry.owners:
+                    self._async_drop(entity_id)
+        for entity_id in wanted:
+            entry = self._entries.setdefault(entity_id, _Entry())
+            entry.owners.add(owner)
+            if entry.unsub is None:
+                entry.unsub = async_track_state_change_event(self._hass, [entity_id], self._async_handle_state_event)
+
+    @callback
+    def async_release(self, owner: str) -> None:
+        self.async_track(owner, ())
+
+    @callback
+    def _async_drop(self, entity_id: str) -> None:
+        entry = self._entries.pop(entity_id, None)
+        if entry is not None and entry.unsub is not None:
+            entry.unsub()
+            entry.unsub = None
+
+    @callback
+    def _async_handle_state_event(self, event) -> None:
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        # on/off at the boundaries of an already known event: nothing to refetch.
+        if old_state is not None and new_state is not None and old_state.attributes == new_state.attributes:
+            return
+        entry = self._entries.get(event.data.get("entity_id"))
+        if entry is not None and entry.fetched_at is not None:
+            entry.fetched_at = None
+            self.invalidations += 1
+
+    def _is_fresh(self, entry: _Entry, now: datetime) -> bool:
+        if entry.fetched_at is None:
+            return False
+        age = time.monotonic() - entry.fetched_at
+        if entry.calendar is None or entry.failed:
+            return age < CALENDAR_RETRY_SECONDS
+        window_start, window_end = calendar_window(now)
+        return age < CALENDAR_TTL_SECONDS and entry.calendar.covers(window_start.timestamp(), window_end.timestamp())
+
+    async def async_get(self, entity_id: str) -> ParsedCalendar | None:
+        """Return the cached events; fetch at most once concurrently per calendar."""
+        entry = self._entries.setdefault(entity_id, _Entry())
+        if self._is_fresh(entry, dt_util.now()):
+            self.hits += 1
+            return self._usable(entry, dt_util.now())
+        if entry.task is None:
+            self._start_fetch(entry, entity_id)
+        else:
+            self.coalesced += 1
+        await asyncio.shield(entry.task)
+        return self._usable(entry, dt_util.now())
+
+    def peek(self, entity_id: str) -> tuple[ParsedCalendar | None, float | None]:
+        """Last good events and their age in seconds, without waiting.
+
+        A due refresh is started in the background. Events are handed out as long
+        as their fetched window still contains now.
+        """
+        entry = self._entries.setdefault(entity_id, _Entry())
+        now = dt_util.now()
+        if self._is_fresh(entry, now):
+            self.hits += 1
+        elif entry.task is None:
+            self._start_fetch(entry, entity_id)
+        if entry.good_at is None:
+            return None, None
+        return self._usable(entry, now), time.monotonic() - entry.good_at
+
+    def pending(self, entity_id: str) -> asyncio.Task | None:
+        entry = self._entries.get(entity_id)
+        return entry.task if entry is not None else None
+
+    @staticmethod
+    def _usable(entry: _Entry, now: datetime) -> ParsedCalendar | None:
+        now_ts = now.timestamp()
+        if entry.calendar is None or not entry.calendar.covers(now_ts, now_ts):
+            return None
+        return entry.calendar
+
+    def _start_fetch(self, entry: _Entry, entity_id: str) -> None:
+        entry.task = self._hass.async_create_task(self._async_fetch(entry, entity_id))
+
+    async def _async_fetch(self, entry: _Entry, entity_id: str) -> None:
+        self.fetches += 1
+        try:
+            try:
+                calendar = await asyncio.wait_for(self._async_call_service(entity_id), CALENDAR_FETCH_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                _LOGGER.warning("Calendar fetch for %s timed out after %ss", entity_id, CALENDAR_FETCH_TIMEOUT_SECONDS)
+                calendar = None
+            entry.fetched_at = time.monotonic()
+            entry.failed = calendar is None
+            if calendar is None:
+                # Keep the last good events; they stay usable while their window contains now.
+                self.failures += 1
+            else:
+                entry.calendar = calendar
+                entry.good_at = entry.fetched_at
+        finally:
+            entry.task = None
+
+    async def _async_call_service(self, entity_id: str) -> ParsedCalendar | None:
+        window_start, window_end = calendar_window(dt_util.now())
+        try:
+            res = await self._hass.services.async_call(
+                "calendar",
+                "get_events",
+                {"entity_id": entity_id, "start_date_time": window_start, "end_date_time": window_end},
+                blocking=True,
+                return_response=True,
+            )
+        except Exception as err:
+            _LOGGER.warning("Calendar fetch failed for %s: %s", entity_id, err)
+            return None
+        try:
+            items = res.get(entity_id, {}).get("events", [])
+        except Exception:
+            items = None
+        if not isinstance(items, list):
+            return None
+        return ParsedCalendar.from_items(entity_id, items, window_start.timestamp(), window_end.timestamp())
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "tracked": sorted(eid for eid, entry in self._entries.items() if entry.owners),
+            "hits": self.hits,
+            "fetches": self.fetches,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "pending": sum(1 for entry in self._entries.values() if entry.task is not None),
+        }
@@ -0,0 +1,414 @@
+"""Fixed-capacity, array-backed ring buffer for chemistry history samples."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+# Measurement columns (float, NaN = missing value).
+CHEM_COLUMNS = ("ph", "chlor", "tds_effective", "alk_raw")
+
+# Sample reasons are stored as small integer codes.
+CHEM_REASONS = (
+    "",
+    "ok",
+    "activity",
+    "activity_cooldown",
+    "sensor_jump",
+    "missing_data",
+    "insufficient_history",
+)
+_REASON_CODES = {reason: code for code, reason in enumerate(CHEM_REASONS)}
+
+_STORAGE_FORMAT = 1
+
+_NAN = float("nan")
+
+
+def _to_float(value: Any) -> float:
+    if value is None:
+        return _NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _NAN
+
+
+class ChemistryHistory:
+    """Chemistry samples with epoch timestamps, one column per measurement.
+
+    Samples are kept in timestamp order, so windowed lookups are a binary search
+    over the ring. `seq` increases with every change and serves as a cheap change
+    marker for caches and persistence.
+    """
+
+    __slots__ = (
+        "capacity",
+        "seq",
+        "appended",
+        "truncations",
+        "_ts",
+        "_cols",
+        "_stable",
+        "_reason",
+        "_start",
+        "_size",
+    )
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, int(capacity))
+        self.seq = 0
+        # Total number of appends and of tail truncations; lets windows consume
+        # only the newly appended samples.
+        self.appended = 0
+        self.truncations = 0
+        self._ts = array("d", bytes(8 * self.capacity))
+        self._cols = {name: array("d", [_NAN]) * self.capacity for name in CHEM_COLUMNS}
+        self._stable = array("B", bytes(self.capacity))
+        self._reason = array("B", bytes(self.capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _phys(self, logical: int) -> int:
+        return (self._start + logical) % self.capacity
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+        self.truncations += 1
+        self.seq += 1
+
+    def append(
+        self,
+        ts: float,
+        ph: float | None,
+        chlor: float | None,
+        tds_effective: float | None,
+        alk_raw: float | None,
+        stable: bool,
+        reason: str,
+    ) -> None:
+        """Append a sample; the oldest sample is overwritten when the ring is full."""
+        ts = float(ts)
+        # Keep the ring sorted: after a clock jump backwards the "future" samples
+        # would never be in any window again, drop them.
+        if self._size and self._ts[self._phys(self._size - 1)] > ts:
+            while self._size and self._ts[self._phys(self._size - 1)] > ts:
+                self._size -= 1
+            self.truncations += 1
+        if self._size == self.capacity:
+            idx = self._start
+            self._start = (self._start + 1) % self.capacity
+        else:
+            idx = self._phys(self._size)
+            self._size += 1
+        self._ts[idx] = ts
+        self._cols["ph"][idx] = _to_float(ph)
+        self._cols["chlor"][idx] = _to_float(chlor)
+        self._cols["tds_effective"][idx] = _to_float(tds_effective)
+        self._cols["alk_raw"][idx] = _to_float(alk_raw)
+        self._stable[idx] = 1 if stable else 0
+        self._reason[idx] = _REASON_CODES.get(str(reason or ""), 0)
+        self.appended += 1
+        self.seq += 1
+
+    def bisect_left(self, ts: float) -> int:
+        """Logical index of the first sample with timestamp >= ts."""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts[self._phys(mid)] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def bisect_right(self, ts: float) -> int:
+        """Logical index of the first sample with timestamp > ts."""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts[self._phys(mid)] <= ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def timestamp(self, logical: int) -> float:
+        return self._ts[self._phys(logical)]
+
+    def window(self, since_ts: float, until_ts: float) -> range:
+        """Logical index range of samples with since_ts <= ts <= until_ts."""
+        return range(self.bisect_left(since_ts), self.bisect_right(until_ts))
+
+    def row(self, logical: int) -> tuple[float, bool, tuple[float, ...]]:
+        """(ts, stable, column values in CHEM_COLUMNS order, NaN = missing)."""
+        idx = self._phys(logical)
+        return (
+            self._ts[idx],
+            bool(self._stable[idx]),
+            tuple(self._cols[name][idx] for name in CHEM_COLUMNS),
+        )
+
+    def sample(self, logical: int) -> dict:
+        """Sample as dict (legacy shape, `ts` as epoch seconds)."""
+        idx = self._phys(logical)
+        out: dict[str, Any] = {"ts": self._ts[idx]}
+        for name in CHEM_COLUMNS:
+            value = self._cols[name][idx]
+            out[name] = value if value == value else None
+        out["stable"] = bool(self._stable[idx])
+        out["reason"] = CHEM_REASONS[self._reason[idx]]
+        return out
+
+    def last(self) -> dict | None:
+        if not self._size:
+            return None
+        return self.sample(self._size - 1)
+
+    def as_dict(self) -> dict:
+        """Columnar JSON-serializable representation (oldest first)."""
+        idx = [self._phys(i) for i in range(self._size)]
+
+        def _col(values: array, digits: int | None) -> list:
+            out = []
+            for i in idx:
+                v = values[i]
+                if v != v:
+                    out.append(None)
+                elif digits is None:
+                    out.append(int(round(v)))
+                else:
+                    out.append(round(v, digits))
+            return out
+
+        return {
+            "format": _STORAGE_FORMAT,
+            "ts": [int(self._ts[i]) for i in idx],
+            "ph": _col(self._cols["ph"], 3),
+            "chlor": _col(self._cols["chlor"], 1),
+            "tds_effective": _col(self._cols["tds_effective"], None),
+            "alk_raw": _col(self._cols["alk_raw"], None),
+            "stable": [int(self._stable[i]) for i in idx],
+            "reason": [int(self._reason[i]) for i in idx],
+        }
+
+    @classmethod
+    def from_stored(cls, raw: Any, capacity: int) -> ChemistryHistory:
+        """Restore from the columnar format or from the legacy list of ISO-timestamp dicts."""
+        history = cls(capacity)
+        try:
+            if isinstance(raw, Mapping) and raw.get("format") == _STORAGE_FORMAT:
+                ts_list = list(raw.get("ts") or [])
+                n = len(ts_list)
+
+                def _get(name: str) -> list:
+                    values = list(raw.get(name) or [])
+                    return values + [None] * (n - len(values))
+
+                ph, chlor, tds, alk = _get("ph"), _get("chlor"), _get("tds_effective"), _get("alk_raw")
+                stable, reason = _get("stable"), _get("reason")
+                for i in range(n):
+                    code = reason[i] if isinstance(reason[i], int) and 0 <= reason[i] < len(CHEM_REASONS) else 0
+                    history.append(ts_list[i], ph[i], chlor[i], tds[i], alk[i], bool(stable[i]), CHEM_REASONS[code])
+            elif isinstance(raw, list):
+                for item in raw:
+                    if not isinstance(item, Mapping) or not item.get("ts"):
+                        continue
+                    ts = cls._parse_ts(item.get("ts"))
+                    if ts is None:
+                        continue
+                    history.append(
+                        ts,
+                        item.get("ph"),
+                        item.get("chlor"),
+                        item.get("tds_effective"),
+                        item.get("alk_raw"),
+                        bool(item.get("stable", False)),
+                        str(item.get("reason") or ""),
+                    )
+        except Exception:
+            history = cls(capacity)
+        return history
+
+    @staticmethod
+    def _parse_ts(value: Any) -> float | None:
+        if isinstance(value, (int, float)) and math.isfinite(value):
+            return float(value)
+        try:
+            parsed = dt_util.parse_datetime(str(value))
+        except Exception:
+            return None
+        if not isinstance(parsed, datetime):
+            return None
+        return parsed.timestamp()
+
+
+class RollingMedian:
+    """Median of a multiset with O(log n) insert/remove (two heaps, lazy deletion)."""
+
+    __slots__ = ("_low", "_high", "_low_size", "_high_size", "_delayed")
+
+    def __init__(self) -> None:
+        self._low: list[float] = []  # max-heap (negated values)
+        self._high: list[float] = []  # min-heap
+        self._low_size = 0
+        self._high_size = 0
+        self._delayed: dict[float, int] = {}
+
+    def __len__(self) -> int:
+        return self._low_size + self._high_size
+
+    def clear(self) -> None:
+        self._low.clear()
+        self._high.clear()
+        self._low_size = 0
+        self._high_size = 0
+        self._delayed.clear()
+
+    def add(self, value: float) -> None:
+        if not self._low or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+        self._rebalance()
+
+    def remove(self, value: float) -> None:
+        """Remove one occurrence of a value previously added."""
+        self._delayed[value] = self._delayed.get(value, 0) + 1
+        if self._low and value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune(self._low, -1.0)
+        else:
+            self._high_size -= 1
+            if self._high and value == self._high[0]:
+                self._prune(self._high, 1.0)
+        self._rebalance()
+        # Lazily deleted entries buried in the heaps: compact once they dominate.
+        if len(self._low) + len(self._high) > 2 * len(self) + 64:
+            self._compact()
+
+    def median(self) -> float | None:
+        if not len(self):
+            return None
+        if self._low_size > self._high_size:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2.0
+
+    def _prune(self, heap: list[float], sign: float) -> None:
+        while heap:
+            value = heap[0] * sign
+            count = self._delayed.get(value)
+            if not count:
+                break
+            if count == 1:
+                del self._delayed[value]
+            else:
+                self._delayed[value] = count - 1
+            heapq.heappop(heap)
+
+    def _rebalance(self) -> None:
+        if self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, -1.0)
+        elif self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._low_size += 1
+            self._high_size -= 1
+            self._prune(self._high, 1.0)
+
+    def _compact(self) -> None:
+        delayed = dict(self._delayed)
+        values = []
+        for value in [-v for v in self._low] + self._high:
+            count = delayed.get(value)
+            if count:
+                delayed[value] = count - 1
+                continue
+            values.append(value)
+        self.clear()
+        for value in values:
+            self.add(value)
+
+
+class ChemistryWindow:
+    """Sliding time window over the stable samples of a ChemistryHistory.
+
+    Keeps one RollingMedian per column; each cycle only admits the newly
+    appended samples and expires the ones that left the lookback window.
+    """
+
+    __slots__ = ("_history", "_lookback_s", "_appended_seen", "_truncations", "_entries", "_medians")
+
+    def __init__(self) -> None:
+        self._history: ChemistryHistory | None = None
+        self._lookback_s: float | None = None
+        self._appended_seen = 0
+        self._truncations = 0
+        self._entries: deque[tuple[float, tuple[float, ...]]] = deque()
+        self._medians = {name: RollingMedian() for name in CHEM_COLUMNS}
+
+    def advance(self, history: ChemistryHistory, now_ts: float, lookback_s: float) -> None:
+        lookback_s = float(lookback_s)
+        new = history.appended - self._appended_seen
+        if (
+            history is not self._history
+            or lookback_s != self._lookback_s
+            or history.truncations != self._truncations
+            or new > len(history)
+        ):
+            self._rebuild(history, now_ts, lookback_s)
+            return
+        for logical in range(len(history) - new, len(history)):
+            self._admit(history, logical)
+        self._appended_seen = history.appended
+        self._expire(now_ts - lookback_s)
+
+    def count(self, key: str) -> int:
+        return len(self._medians[key])
+
+    def median(self, key: str) -> float | None:
+        return self._medians[key].median()
+
+    def _rebuild(self, history: ChemistryHistory, now_ts: float, lookback_s: float) -> None:
+        self._history = history
+        self._lookback_s = lookback_s
+        self._truncations = history.truncations
+        self._appended_seen = history.appended
+        self._entries.clear()
+        for tracker in self._medians.values():
+            tracker.clear()
+        for logical in history.window(now_ts - lookback_s, now_ts):
+            self._admit(history, logical)
+
+    def _admit(self, history: ChemistryHistory, logical: int) -> None:
+        ts, stable, values = history.row(logical)
+        if not stable:
+            return
+        self._entries.append((ts, values))
+        for name, value in zip(CHEM_COLUMNS, values):
+            if value == value:
+                self._medians[name].add(value)
+
+    def _expire(self, since_ts: float) -> None:
+        entries = self._entries
+        while entries and entries[0][0] < since_ts:
+            _, values = entries.popleft()
+            for name, value in zip(CHEM_COLUMNS, values):
+                if value == value:
+                    self._medians[name].remove(value)
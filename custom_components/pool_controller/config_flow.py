@@ -50,6 +50,15 @@ def _normalize_blueriiot_options(data: dict) -> tuple[dict, dict]:
     if not re.fullmatch(r"[0-9A-F]{2}(?::[0-9A-F]{2}){5}", address):
         return normalized, {CONF_BLUERIIOT_MAC: "invalid_mac"}
 
+    # Intervals below 5 min are only allowed with a kept-open session (each read costs a connection otherwise).
+    if not bool(normalized.get(CONF_BLUERIIOT_KEEP_CONNECTED, DEFAULT_BLUERIIOT_KEEP_CONNECTED)):
+        try:
+            interval = float(normalized.get(CONF_BLUERIIOT_INTERVAL_MINUTES, DEFAULT_BLUERIIOT_INTERVAL_MINUTES))
+        except (TypeError, ValueError):
+            interval = DEFAULT_BLUERIIOT_INTERVAL_MINUTES
+        if interval < BLUERIIOT_MIN_INTERVAL_MINUTES:
+            return normalized, {CONF_BLUERIIOT_INTERVAL_MINUTES: "interval_requires_session"}
+
     normalized[CONF_BLUERIIOT_MAC] = address
     return normalized, {}
 
@@ -154,13 +163,14 @@ def _blueriiot_schema(hass, curr: dict | None = None):
             )
         ),
         vol.Optional(CONF_BLUERIIOT_INTERVAL_MINUTES, default=c.get(CONF_BLUERIIOT_INTERVAL_MINUTES, DEFAULT_BLUERIIOT_INTERVAL_MINUTES)): selector.NumberSelector(
-            selector.NumberSelectorConfig(min=5, max=120, step=1, mode=selector.NumberSelectorMode.BOX, unit_of_measurement="min")
+            selector.NumberSelectorConfig(min=BLUERIIOT_SESSION_MIN_INTERVAL_MINUTES, max=120, step=1, mode=selector.NumberSelectorMode.BOX, unit_of_measurement="min")
         ),
         vol.Optional(CONF_BLUERIIOT_NIGHT_INTERVAL_MINUTES, default=c.get(CONF_BLUERIIOT_NIGHT_INTERVAL_MINUTES, DEFAULT_BLUERIIOT_NIGHT_INTERVAL_MINUTES)): selector.NumberSelector(
             selector.NumberSelectorConfig(min=5, max=240, step=1, mode=selector.NumberSelectorMode.BOX, unit_of_measurement="min")
         ),
         vol.Optional(CONF_BLUERIIOT_NIGHT_START, default=c.get(CONF_BLUERIIOT_NIGHT_START, DEFAULT_BLUERIIOT_NIGHT_START)): selector.TimeSelector(),
         vol.Optional(CONF_BLUERIIOT_NIGHT_END, default=c.get(CONF_BLUERIIOT_NIGHT_END, DEFAULT_BLUERIIOT_NIGHT_END)): selector.TimeSelector(),
+        vol.Optional(CONF_BLUERIIOT_KEEP_CONNECTED, default=c.get(CONF_BLUERIIOT_KEEP_CONNECTED, DEFAULT_BLUERIIOT_KEEP_CONNECTED)): bool,
     })
 
 def _sensor_health_schema(curr: dict | None = None, blueriiot_enabled: bool = False):
@@ -257,7 +267,7 @@ def _chemistry_schema(curr: dict | None = None):
         vol.Optional(CONF_CHEM_HISTORY_LOOKBACK_MINUTES, default=c.get(CONF_CHEM_HISTORY_LOOKBACK_MINUTES, DEFAULT_CHEM_HISTORY_LOOKBACK_MINUTES)):
             selector.NumberSelector(selector.NumberSelectorConfig(min=120, max=24 * 60, step=30, mode=selector.NumberSelectorMode.BOX, unit_of_measurement="min")),
         vol.Optional(CONF_CHEM_MIN_STABLE_SAMPLES, default=c.get(CONF_CHEM_MIN_STABLE_SAMPLES, DEFAULT_CHEM_MIN_STABLE_SAMPLES)):
-            selector.NumberSelector(selector.NumberSelectorConfig(min=2, max=12, step=1, mode=selector.NumberSelectorMode.BOX)),
+            selector.NumberSelector(selector.NumberSelectorConfig(min=2, max=CHEM_MIN_STABLE_SAMPLES_MAX, step=1, mode=selector.NumberSelectorMode.BOX)),
     })
 
 def _climate_schema(curr: dict | None = None):
@@ -314,6 +324,17 @@ def _costs_schema(curr: dict | None = None):
         else vol.Optional(CONF_ELECTRICITY_PRICE_ENTITY)
     ] = selector.EntitySelector(selector.EntitySelectorConfig(domain=["sensor", "input_number"]))
 
+    schema[
+        vol.Optional(CONF_ENABLE_COST_OPTIMIZATION, default=c.get(CONF_ENABLE_COST_OPTIMIZATION, DEFAULT_ENABLE_COST_OPTIMIZATION))
+    ] = bool
+
+    pv_forecast_default = c.get(CONF_PV_FORECAST_ENTITY) if c.get(CONF_PV_FORECAST_ENTITY) else None
+    schema[
+        vol.Optional(CONF_PV_FORECAST_ENTITY, default=pv_forecast_default)
+        if pv_forecast_default is not None
+        else vol.Optional(CONF_PV_FORECAST_ENTITY)
+    ] = selector.EntitySelector(selector.EntitySelectorConfig(domain=["sensor"]))
+
     schema[
         vol.Optional(CONF_FEED_IN_TARIFF, default=tariff_default)
         if tariff_default is not None
@@ -665,7 +686,7 @@ class PoolControllerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="blueriiot",
             errors=errors if user_input is not None else {},
-            data_schema=_blueriiot_schema(self.hass, {}),
+            data_schema=_blueriiot_schema(self.hass, user_input or {}),
             last_step=False,
         )
 
@@ -1047,7 +1068,7 @@ class PoolControllerOptionsFlowHandler(config_entries.OptionsFlow):
                     return await self.async_step_sensor_health()
                 return await self.async_step_water_quality()
 
-        curr = {**self._config_entry.data, **self._config_entry.options, **self.options}
+        curr = {**self._config_entry.data, **self._config_entry.options, **self.options, **(user_input or {})}
         return self.async_show_form(
             step_id="blueriiot",
             errors=errors if user_input is not None else {},
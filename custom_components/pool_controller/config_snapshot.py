@@ -0,0 +1,199 @@
+"""Typed, immutable view of the numeric configuration used on every update cycle."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .const import *
+
+
+def _int(conf: Mapping[str, Any], key: str, default: int) -> int:
+    try:
+        return int(conf.get(key, default))
+    except Exception:
+        return default
+
+
+def _float(conf: Mapping[str, Any], key: str, default: float) -> float:
+    try:
+        return float(conf.get(key, default))
+    except Exception:
+        return default
+
+
+def _float_group(conf: Mapping[str, Any], items: tuple[tuple[str, float], ...]) -> tuple[float, ...]:
+    """Parse related values together; any invalid value resets the whole group to defaults."""
+    try:
+        return tuple(float(conf.get(key, default)) for key, default in items)
+    except Exception:
+        return tuple(default for _, default in items)
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """Validated and defaulted configuration values (entry data + options).
+
+    Built once per options change; runtime state (timers, modes, history) is not
+    part of the snapshot.
+    """
+
+    # Temperature range / dynamic target
+    min_temp: float
+    max_temp: float
+    enable_dynamic_target: bool
+    season_offsets: tuple[float, float, float, float]  # winter, spring, summer, autumn
+    dynamic_offset_min: float
+    dynamic_offset_max: float
+    dynamic_weather_limit: float
+    # temp, feels_like, wind, uv, cloud, forecast
+    dynamic_weather_weights: tuple[float, float, float, float, float, float]
+    dynamic_ema_alpha: float
+    dynamic_max_step_per_hour: float
+    cold_tolerance: float
+    hot_tolerance: float
+
+    # Heater power
+    enable_aux_heating: bool
+    heater_base_power_w: int
+    heater_aux_power_w: int
+    heater_legacy_power_w: int
+
+    # Chemistry
+    target_salt_g_l: float
+    chem_target_tds_ppm: int
+    chem_target_alkalinity_ppm: int
+    chem_min_stable_samples: int
+    chem_history_lookback_minutes: int
+    chem_cooldown_minutes: int
+
+    # Run credit / merge optimization
+    merge_window_minutes: int
+    min_gap_minutes: int
+    max_merge_run_minutes: int
+    min_credit_minutes: float
+
+    # Frost protection
+    enable_frost_protection: bool
+    frost_start_temp: float
+    frost_severe_temp: float
+    frost_quiet_override_below: float
+    frost_mild_interval: int
+    frost_mild_run: int
+    frost_severe_interval: int
+    frost_severe_run: int
+
+    # PV
+    pv_smooth_window_seconds: int
+    pv_on_threshold: int
+    pv_off_threshold: int
+    pv_stability_seconds: int
+    pv_min_run_minutes: int
+
+    # Calendar / power saving
+    event_rain_probability: int
+    power_saving_filter_deadline_hour: int
+
+    @classmethod
+    def from_conf(cls, conf: Mapping[str, Any]) -> ConfigSnapshot:
+        min_t = _float(conf, CONF_MIN_TEMP, DEFAULT_MIN_TEMP)
+        max_t = _float(conf, CONF_MAX_TEMP, DEFAULT_MAX_TEMP)
+        if max_t < min_t:
+            min_t, max_t = max_t, min_t
+
+        offset_min = _float(conf, CONF_DYNAMIC_TARGET_MIN_OFFSET, DEFAULT_DYNAMIC_TARGET_MIN_OFFSET)
+        offset_max = _float(conf, CONF_DYNAMIC_TARGET_MAX_OFFSET, DEFAULT_DYNAMIC_TARGET_MAX_OFFSET)
+        if offset_max < offset_min:
+            offset_min, offset_max = offset_max, offset_min
+
+        try:
+            weather_limit = abs(float(conf.get(CONF_DYNAMIC_TARGET_WEATHER_MAX_OFFSET, DEFAULT_DYNAMIC_TARGET_WEATHER_MAX_OFFSET)))
+        except Exception:
+            weather_limit = DEFAULT_DYNAMIC_TARGET_WEATHER_MAX_OFFSET
+
+        weights = _float_group(
+            conf,
+            (
+                (CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_TEMP, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_TEMP),
+                (CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_FEELS_LIKE, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_FEELS_LIKE),
+                (CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_WIND, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_WIND),
+                (CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_UV, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_UV),
+                (CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_CLOUD, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_CLOUD),
+                (CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_FORECAST, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_FORECAST),
+            ),
+        )
+
+        base_w = max(0, int(_int(conf, CONF_HEATER_BASE_POWER_W, DEFAULT_HEATER_BASE_POWER_W) or 0))
+        aux_w = max(0, int(_int(conf, CONF_HEATER_AUX_POWER_W, DEFAULT_HEATER_AUX_POWER_W) or 0))
+        try:
+            legacy_present = CONF_HEATER_POWER_W in conf and conf.get(CONF_HEATER_POWER_W) is not None
+            if legacy_present and base_w + aux_w <= 0:
+                base_w = max(0, int(float(conf.get(CONF_HEATER_POWER_W))))
+        except Exception:
+            pass
+
+        return cls(
+            min_temp=min_t,
+            max_temp=max_t,
+            enable_dynamic_target=bool(conf.get(CONF_ENABLE_DYNAMIC_TARGET, DEFAULT_ENABLE_DYNAMIC_TARGET)),
+            season_offsets=_float_group(
+                conf,
+                (
+                    (CONF_DYNAMIC_TARGET_WINTER_OFFSET, DEFAULT_DYNAMIC_TARGET_WINTER_OFFSET),
+                    (CONF_DYNAMIC_TARGET_SPRING_OFFSET, DEFAULT_DYNAMIC_TARGET_SPRING_OFFSET),
+                    (CONF_DYNAMIC_TARGET_SUMMER_OFFSET, DEFAULT_DYNAMIC_TARGET_SUMMER_OFFSET),
+                    (CONF_DYNAMIC_TARGET_AUTUMN_OFFSET, DEFAULT_DYNAMIC_TARGET_AUTUMN_OFFSET),
+                ),
+            ),
+            dynamic_offset_min=offset_min,
+            dynamic_offset_max=offset_max,
+            dynamic_weather_limit=weather_limit,
+            dynamic_weather_weights=tuple(max(0.0, w) for w in weights),
+            dynamic_ema_alpha=max(0.0, min(1.0, _float(conf, CONF_DYNAMIC_TARGET_EMA_ALPHA, DEFAULT_DYNAMIC_TARGET_EMA_ALPHA))),
+            dynamic_max_step_per_hour=max(
+                0.0, _float(conf, CONF_DYNAMIC_TARGET_MAX_STEP_PER_HOUR, DEFAULT_DYNAMIC_TARGET_MAX_STEP_PER_HOUR)
+            ),
+            cold_tolerance=_float(conf, CONF_COLD_TOLERANCE, DEFAULT_COLD_TOLERANCE),
+            hot_tolerance=_float(conf, CONF_HOT_TOLERANCE, DEFAULT_HOT_TOLERANCE),
+            enable_aux_heating=bool(conf.get(CONF_ENABLE_AUX_HEATING, False)),
+            heater_base_power_w=base_w,
+            heater_aux_power_w=aux_w,
+            heater_legacy_power_w=_int(conf, CONF_HEATER_POWER_W, DEFAULT_HEATER_POWER_W),
+            target_salt_g_l=_float(conf, CONF_TARGET_SALT_G_L, DEFAULT_TARGET_SALT_G_L),
+            chem_target_tds_ppm=max(500, min(3500, _int(conf, CONF_CHEM_TARGET_TDS_PPM, DEFAULT_CHEM_TARGET_TDS_PPM))),
+            chem_target_alkalinity_ppm=max(
+                70, min(160, _int(conf, CONF_CHEM_TARGET_ALKALINITY_PPM, DEFAULT_CHEM_TARGET_ALKALINITY_PPM))
+            ),
+            chem_min_stable_samples=max(
+                2, min(CHEM_MIN_STABLE_SAMPLES_MAX, _int(conf, CONF_CHEM_MIN_STABLE_SAMPLES, DEFAULT_CHEM_MIN_STABLE_SAMPLES))
+            ),
+            chem_history_lookback_minutes=max(
+                120, min(24 * 60, _int(conf, CONF_CHEM_HISTORY_LOOKBACK_MINUTES, DEFAULT_CHEM_HISTORY_LOOKBACK_MINUTES))
+            ),
+            chem_cooldown_minutes=max(0, min(24 * 60, _int(conf, CONF_CHEM_COOLDOWN_MINUTES, DEFAULT_CHEM_COOLDOWN_MINUTES))),
+            merge_window_minutes=_int(conf, CONF_MERGE_WINDOW_MINUTES, DEFAULT_MERGE_WINDOW_MINUTES),
+            min_gap_minutes=_int(conf, CONF_MIN_GAP_MINUTES, DEFAULT_MIN_GAP_MINUTES),
+            max_merge_run_minutes=_int(conf, CONF_MAX_MERGE_RUN_MINUTES, DEFAULT_MAX_MERGE_RUN_MINUTES),
+            min_credit_minutes=_float(conf, CONF_MIN_CREDIT_MINUTES, DEFAULT_MIN_CREDIT_MINUTES),
+            enable_frost_protection=bool(conf.get(CONF_ENABLE_FROST_PROTECTION, True)),
+            frost_start_temp=_float(conf, CONF_FROST_START_TEMP, DEFAULT_FROST_START_TEMP),
+            frost_severe_temp=_float(conf, CONF_FROST_SEVERE_TEMP, DEFAULT_FROST_SEVERE_TEMP),
+            frost_quiet_override_below=_float(
+                conf, CONF_FROST_QUIET_OVERRIDE_BELOW_TEMP, DEFAULT_FROST_QUIET_OVERRIDE_BELOW_TEMP
+            ),
+            frost_mild_interval=_int(conf, CONF_FROST_MILD_INTERVAL, DEFAULT_FROST_MILD_INTERVAL),
+            frost_mild_run=_int(conf, CONF_FROST_MILD_RUN, DEFAULT_FROST_MILD_RUN),
+            frost_severe_interval=_int(conf, CONF_FROST_SEVERE_INTERVAL, DEFAULT_FROST_SEVERE_INTERVAL),
+            frost_severe_run=_int(conf, CONF_FROST_SEVERE_RUN, DEFAULT_FROST_SEVERE_RUN),
+            pv_smooth_window_seconds=_int(conf, CONF_PV_SMOOTH_WINDOW_SECONDS, DEFAULT_PV_SMOOTH_WINDOW_SECONDS),
+            pv_on_threshold=_int(conf, CONF_PV_ON_THRESHOLD, DEFAULT_PV_ON),
+            pv_off_threshold=_int(conf, CONF_PV_OFF_THRESHOLD, DEFAULT_PV_OFF),
+            pv_stability_seconds=_int(conf, CONF_PV_STABILITY_SECONDS, DEFAULT_PV_STABILITY_SECONDS),
+            pv_min_run_minutes=_int(conf, CONF_PV_MIN_RUN_MINUTES, DEFAULT_PV_MIN_RUN_MINUTES),
+            event_rain_probability=_int(conf, CONF_EVENT_RAIN_PROBABILITY, DEFAULT_EVENT_RAIN_PROBABILITY),
+            power_saving_filter_deadline_hour=max(
+                0,
+                min(23, _int(conf, CONF_POWER_SAVING_FILTER_DEADLINE_HOUR, DEFAULT_POWER_SAVING_FILTER_DEADLINE_HOUR)),
+            ),
+        )
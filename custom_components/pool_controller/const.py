@@ -26,6 +26,7 @@ CONF_BLUERIIOT_INTERVAL_MINUTES = "blueriiot_interval_minutes"
 CONF_BLUERIIOT_NIGHT_INTERVAL_MINUTES = "blueriiot_night_interval_minutes"
 CONF_BLUERIIOT_NIGHT_START = "blueriiot_night_start"
 CONF_BLUERIIOT_NIGHT_END = "blueriiot_night_end"
+CONF_BLUERIIOT_KEEP_CONNECTED = "blueriiot_keep_connected"
 CONF_ENABLE_SENSOR_HEALTH = "enable_sensor_health"
 CONF_SENSOR_HEALTH_ESP32_DEVICE = "sensor_health_esp32_device"
 CONF_SENSOR_HEALTH_WATER_SENSOR = "sensor_health_water_sensor"
@@ -77,6 +78,9 @@ CONF_DYNAMIC_TARGET_MAX_STEP_PER_HOUR = "dynamic_target_max_step_per_hour"
 # Electricity price (cost estimation)
 CONF_ELECTRICITY_PRICE = "electricity_price"
 CONF_ELECTRICITY_PRICE_ENTITY = "electricity_price_entity"
+# Cost-optimal scheduling over price forecast attributes and an optional PV forecast
+CONF_ENABLE_COST_OPTIMIZATION = "enable_cost_optimization"
+CONF_PV_FORECAST_ENTITY = "pv_forecast_entity"
 CONF_FEED_IN_TARIFF = "feed_in_tariff"
 CONF_FEED_IN_TARIFF_ENTITY = "feed_in_tariff_entity"
 
@@ -115,6 +119,11 @@ DEFAULT_BLUERIIOT_INTERVAL_MINUTES = 15
 DEFAULT_BLUERIIOT_NIGHT_INTERVAL_MINUTES = 60
 DEFAULT_BLUERIIOT_NIGHT_START = "22:00:00"
 DEFAULT_BLUERIIOT_NIGHT_END = "07:00:00"
+DEFAULT_BLUERIIOT_KEEP_CONNECTED = False
+# Session mode: idle timeout of the kept connection; allows shorter read intervals.
+DEFAULT_BLUERIIOT_SESSION_IDLE_MINUTES = 20
+BLUERIIOT_MIN_INTERVAL_MINUTES = 5
+BLUERIIOT_SESSION_MIN_INTERVAL_MINUTES = 1
 
 # Sanitizer / Desinfektion
 # NOTE: `CONF_ENABLE_SALTWATER` is kept for backward compatibility.
@@ -128,6 +137,8 @@ CONF_CHEM_TARGET_ALKALINITY_PPM = "chem_target_alkalinity_ppm"
 CONF_CHEM_COOLDOWN_MINUTES = "chem_cooldown_minutes"
 CONF_CHEM_HISTORY_LOOKBACK_MINUTES = "chem_history_lookback_minutes"
 CONF_CHEM_MIN_STABLE_SAMPLES = "chem_min_stable_samples"
+# Upper bound for noisy probes (stable-sample window with rolling medians).
+CHEM_MIN_STABLE_SAMPLES_MAX = 120
 
 # Frost protection (duty-cycle) tuning
 # Below CONF_FROST_START_TEMP the pump may run periodically to prevent freezing.
@@ -190,6 +201,29 @@ DEFAULT_POWER_SAVING_MIN_RUN_MINUTES = 10
 CONF_TOGGLE_DEBOUNCE_SECONDS = "toggle_debounce_seconds"
 DEFAULT_TOGGLE_DEBOUNCE_SECONDS = 120
 
+# Update scheduling: event-driven recompute on input state changes.
+# In event-driven mode the fixed poll becomes a slow heartbeat (timer expiry,
+# time-weighted cost accumulation); bursts of state changes are coalesced.
+CONF_ENABLE_EVENT_DRIVEN_UPDATES = "enable_event_driven_updates"
+DEFAULT_ENABLE_EVENT_DRIVEN_UPDATES = True
+DEFAULT_UPDATE_INTERVAL_SECONDS = 30
+DEFAULT_HEARTBEAT_INTERVAL_SECONDS = 120
+DEFAULT_EVENT_DEBOUNCE_SECONDS = 1.0
+# The PV surplus meter reports every few seconds: only changes of at least this much trigger
+# a recompute (smaller drifts are picked up by the heartbeat).
+EVENT_PV_SURPLUS_DEADBAND_W = 100.0
+
+# Diagnostics: per-section timing of the update cycle (rolling p50/p95/max).
+# Options-only toggle (set_options); all markers are no-ops while disabled.
+CONF_ENABLE_PERF_INSTRUMENTATION = "enable_perf_instrumentation"
+DEFAULT_ENABLE_PERF_INSTRUMENTATION = False
+
+# Publishing policies: deadband/min interval/heartbeat per data key for high-churn sensors
+# (built-in defaults in publish_policy.py; `publish_policies` overrides per key).
+CONF_ENABLE_PUBLISH_DEADBANDS = "enable_publish_deadbands"
+DEFAULT_ENABLE_PUBLISH_DEADBANDS = True
+CONF_PUBLISH_POLICIES = "publish_policies"
+
 # Persisted option keys for timers
 # Manual timer (shared for bathing/chlorine/filter)
 OPT_KEY_MANUAL_UNTIL = "manual_timer_until"
@@ -328,6 +362,7 @@ DEFAULT_HOT_TOLERANCE = 0.5
 
 # Electricity price default (currency per kWh)
 DEFAULT_ELECTRICITY_PRICE = 0.30
+DEFAULT_ENABLE_COST_OPTIMIZATION = False
 DEFAULT_FEED_IN_TARIFF = 0.08
 
 # Frost duty-cycle defaults (intentionally conservative / neighbor-friendly)
@@ -356,6 +391,9 @@ OPT_KEY_CREDIT_STREAK_MINUTES = "credit_streak_minutes"
 
 # Chemistry history (robust recommendations across HA restarts)
 OPT_KEY_CHEMISTRY_HISTORY = "chemistry_history"
+# Ring buffer capacity: 48 h at the 30 s sampling cadence.
+CHEM_HISTORY_CAPACITY = 5760
+CHEM_HISTORY_PERSIST_SECONDS = 600
 OPT_KEY_CHEM_BLOCK_UNTIL = "chem_block_until"
 
 # Derived energy aggregation (when only daily sensors are provided)
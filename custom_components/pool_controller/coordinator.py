@@ -3,27 +3,104 @@ import re
 import inspect
 import asyncio
 import math
-from statistics import median
-from datetime import timedelta, datetime
+from datetime import date, timedelta, datetime
+from dataclasses import replace
+from homeassistant.core import callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_state_change_event, async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 from homeassistant.helpers import entity_registry as er
 from .const import *
 from .blueriiot import BlueRiiotReader
+from .chem_history import ChemistryHistory, ChemistryWindow
+from .config_snapshot import ConfigSnapshot
+from .cost_optimizer import SLOT_MINUTES, CostOptimizer, CostPlan, CostPlanInputs, price_points, pv_points
+from .actuators import ROLE_AUX, ROLE_MAIN, ROLE_PUMP, ActuatorCommand, ActuatorManager
+from .calendar_cache import CALENDAR_LOOKAHEAD_DAYS, CalendarCache, ParsedCalendar
+from .forecast_cache import ForecastCache, ParsedForecast
+from .instrumentation import CycleProfiler
+from .pipeline import StagedPipeline, UpdateCycle, cycle_stage
+from .publish_policy import PublishPolicy, publish_policies
+from .quiet_calendar import QUIET_CALENDAR_DAYS, QuietCalendar
+from .timeline import ScheduleTimeline, TimelineInputs, preheat_lead_minutes
+from .state_store import RUNTIME_STATE_KEYS, RuntimeStateStore
 
 _LOGGER = logging.getLogger(__name__)
 
 class PoolControllerDataCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, entry):
+    def __init__(self, hass, entry, runtime_state: RuntimeStateStore | None = None):
         self.entry = entry
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=timedelta(seconds=30))
+        # Runtime state (timers, modes, counters) lives in its own store, not in entry.options.
+        # The caller passes an already loaded store (see async_setup_entry).
+        self._runtime_state = runtime_state or RuntimeStateStore(hass, getattr(entry, "entry_id", "") or "")
+        try:
+            merged_ev = {**(entry.data or {}), **self._options_snapshot()} if entry else {}
+            self.event_driven = bool(merged_ev.get(CONF_ENABLE_EVENT_DRIVEN_UPDATES, DEFAULT_ENABLE_EVENT_DRIVEN_UPDATES))
+        except Exception:
+            self.event_driven = DEFAULT_ENABLE_EVENT_DRIVEN_UPDATES
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=self._update_interval_for_mode(self.event_driven),
+            # Coalesce bursts of input events (and button presses) into a single recompute.
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=DEFAULT_EVENT_DEBOUNCE_SECONDS,
+                immediate=True,
+            ),
+        )
+        # Event-driven mode: state-change subscriptions on configured inputs.
+        self._input_listener_entities: frozenset[str] = frozenset()
+        self._unsub_input_listener = None
+        # Numeric inputs that only trigger on significant changes (deadband and value at the last trigger).
+        self._input_deadbands: dict[str, float] = {}
+        self._input_trigger_values: dict[str, float] = {}
+        self._unsub_deadline_wakeup = None
+        self._deadline_wakeup_at = None
+        self._pv_smoothed_at = None
+        self._chem_history_last_append = None
+        # Staged update pipeline: stages reuse their output while inputs are unchanged.
+        self._pipeline = StagedPipeline()
+        # Opt-in per-section timing of the update cycle (diagnostic sensors / diagnostics download).
+        self._perf = CycleProfiler()
+        # Change-based publishing: keys of `data` that changed since the last listener fan-out
+        # (None = publish all, e.g. first refresh, availability or config change).
+        self.changed_keys: frozenset[str] | None = None
+        self._published_data: dict | None = None
+        self._published_success: bool | None = None
+        self.publish_writes = 0
+        self.publish_skips = 0
+        self.publish_deadband_skips = 0
+        # Deadband/heartbeat policies applied by the entities (per data key).
+        self.publish_policies: dict[str, PublishPolicy] = {}
+        self._publish_policies_key = None
+        # Typed config snapshot, rebuilt after options changes (see `config`).
+        self._config: ConfigSnapshot | None = None
+        self._config_source = None
+        self._quiet_calendar: QuietCalendar | None = None
+        self._timeline: ScheduleTimeline | None = None
+        # Cost plan cache; the heuristic filter start is kept as the comparison baseline.
+        self._cost_plan: CostPlan | None = None
+        self._cost_plan_key = None
+        self._cost_baseline: ScheduleTimeline | None = None
+        self._cost_plan_heuristic_start: datetime | None = None
+        self._cost_plan_applied_start: datetime | None = None
+        # Planned preheat that has started: (event start, preheat start), kept until the event.
+        self._cost_plan_preheat: tuple[datetime, datetime] | None = None
+        # (event start, heating) of a started preheat: it runs until the target is reached and only
+        # restarts below target - cold_tolerance (same hysteresis as the PV heat demand).
+        self._preheat_latch: tuple[datetime, bool] | None = None
+        self._chem_window = ChemistryWindow()
         self._blueriiot_reader = BlueRiiotReader(hass)
         self._active_notification_alerts: set[str] = set()
         # Target temperature: prefer persisted option, else config value, else default.
         self.target_temp = DEFAULT_TARGET_TEMP
         if entry:
             try:
-                merged = {**(entry.data or {}), **(entry.options or {})}
+                merged = {**(entry.data or {}), **self._options_snapshot()}
                 if merged.get(OPT_KEY_TARGET_TEMP) is not None:
                     self.target_temp = float(merged.get(OPT_KEY_TARGET_TEMP))
                 elif merged.get(CONF_TARGET_TEMP) is not None:
@@ -40,12 +117,12 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         self._last_should_main_on = None
         self._last_should_pump_on = None
         self._last_should_aux_on = None
-        # Track last toggle attempts per entity to avoid rapid retry loops
-        # when an entity becomes unavailable after a toggle (prevents oscillation).
-        self._last_toggle_attempts = {}
+        # Concurrent switch commands with per-switch state machine (idle/commanded/confirmed/failed),
+        # confirmation listener and retry backoff (prevents rapid retry loops / oscillation).
+        self._actuators = ActuatorManager(hass, self._async_turn_entity)
         # Master-Enable für Zusatzheizung (aux allowed): vom gemergten config/options lesen (default: False)
         try:
-            merged = {**(entry.data or {}), **(entry.options or {})} if entry else {}
+            merged = {**(entry.data or {}), **self._options_snapshot()} if entry else {}
             aux_feature_enabled = bool(merged.get(CONF_ENABLE_AUX_HEATING, False))
             persisted_aux_allowed = merged.get(OPT_KEY_AUX_ALLOWED)
             if persisted_aux_allowed is None:
@@ -59,7 +136,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
             self.aux_enabled = False
         # Toggle debounce seconds (configurable via entry.options or defaults)
         try:
-            merged_td = {**(entry.data or {}), **(entry.options or {})} if entry else {}
+            merged_td = {**(entry.data or {}), **self._options_snapshot()} if entry else {}
             self.toggle_debounce_seconds = int(merged_td.get(CONF_TOGGLE_DEBOUNCE_SECONDS, DEFAULT_TOGGLE_DEBOUNCE_SECONDS))
         except Exception:
             self.toggle_debounce_seconds = DEFAULT_TOGGLE_DEBOUNCE_SECONDS
@@ -83,7 +160,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         self.boost_until = None
         if entry:
             try:
-                merged = {**(entry.data or {}), **(entry.options or {})}
+                merged = {**(entry.data or {}), **self._options_snapshot()}
                 if merged.get(CONF_AWAY_TEMP) is not None:
                     self.away_temp = float(merged.get(CONF_AWAY_TEMP))
             except Exception:
@@ -96,13 +173,15 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         self._pv_allows_effective = False
         self._pv_candidate_since = None
         self._pv_last_start = None
-        # Weather forecast cache (for calendar weather guard)
-        self._weather_forecast_cache = {
-            "entity_id": None,
-            "fetched_at": None,
-            "forecast": None,
-        }
-        # Wiederherstellung von Timern aus entry.options (falls vorhanden)
+        # Weather forecasts are shared by all entries (calendar weather guard, dynamic target)
+        self._forecast_cache = ForecastCache.for_hass(hass)
+        # Pool/holiday calendar events, likewise shared and kept in sync via state changes
+        self._calendar_cache = CalendarCache.for_hass(hass)
+        self._calendar_owner = getattr(entry, "entry_id", None) or str(id(self))
+        # Age (s) of the calendar/forecast snapshots used in the current cycle
+        self._snapshot_ages: dict[str, float] = {}
+        self._snapshot_waits: set[asyncio.Task] = set()
+        # Wiederherstellung von Timern aus dem Runtime-State (falls vorhanden)
         self.manual_timer_until = None
         self.manual_timer_type = None
         self.manual_timer_duration = None
@@ -147,7 +226,6 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         self._heat_start_temp = None
         self._heat_start_reached = False
         self._last_heat_active = False
-        self._heat_tuning_last_saved = None
 
         # Derived energy aggregation (month/year from daily sensors)
         self._derived_grid_daily_last_value = None
@@ -199,22 +277,23 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         self._derived_cost_snapshot = None
 
         # Chemistry history for robust dosing recommendations.
-        # Stored in entry.options to survive HA restarts.
-        self._chem_history = []
+        # Stored in the runtime state store to survive HA restarts.
+        self._chem_history = ChemistryHistory(CHEM_HISTORY_CAPACITY)
         self._chem_history_last_saved = None
-        self._chem_history_snapshot = None
+        self._chem_history_saved_seq = 0
         self.chem_block_until = None
 
         self._did_migrate_timers = False
-        if entry and entry.options:
-            self.maintenance_active = bool(entry.options.get(OPT_KEY_MAINTENANCE_ACTIVE, False))
-            self.hvac_enabled = bool(entry.options.get(OPT_KEY_HVAC_ENABLED, True))
-            self.away_active = bool(entry.options.get(OPT_KEY_AWAY_ACTIVE, False))
-            self.power_saving_active = bool(entry.options.get(OPT_KEY_POWER_SAVING_ACTIVE, False))
-            self.manual_mode_active = bool(entry.options.get(OPT_KEY_MANUAL_MODE_ACTIVE, False))
-            self.boost_active = bool(entry.options.get(OPT_KEY_BOOST_ACTIVE, False))
+        restored = self._options_snapshot() if entry else {}
+        if entry and restored:
+            self.maintenance_active = bool(restored.get(OPT_KEY_MAINTENANCE_ACTIVE, False))
+            self.hvac_enabled = bool(restored.get(OPT_KEY_HVAC_ENABLED, True))
+            self.away_active = bool(restored.get(OPT_KEY_AWAY_ACTIVE, False))
+            self.power_saving_active = bool(restored.get(OPT_KEY_POWER_SAVING_ACTIVE, False))
+            self.manual_mode_active = bool(restored.get(OPT_KEY_MANUAL_MODE_ACTIVE, False))
+            self.boost_active = bool(restored.get(OPT_KEY_BOOST_ACTIVE, False))
             # Restore boost timer if present
-            bu = entry.options.get(OPT_KEY_BOOST_UNTIL)
+            bu = restored.get(OPT_KEY_BOOST_UNTIL)
             if bu:
                 try:
                     self.boost_until = dt_util.parse_datetime(bu)
@@ -223,294 +302,279 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
 
             # Chemistry history persisted values (best effort)
             try:
-                raw_chem_history = entry.options.get(OPT_KEY_CHEMISTRY_HISTORY) or []
-                if isinstance(raw_chem_history, list):
-                    cleaned = []
-                    for item in raw_chem_history[-160:]:
-                        if not isinstance(item, dict):
-                            continue
-                        ts = item.get("ts")
-                        if not ts:
-                            continue
-                        cleaned.append(
-                            {
-                                "ts": str(ts),
-                                "ph": item.get("ph"),
-                                "chlor": item.get("chlor"),
-                                "tds_effective": item.get("tds_effective"),
-                                "alk_raw": item.get("alk_raw"),
-                                "stable": bool(item.get("stable", False)),
-                                "reason": str(item.get("reason") or ""),
-                            }
-                        )
-                    self._chem_history = cleaned[-120:]
+                self._chem_history = ChemistryHistory.from_stored(
+                    restored.get(OPT_KEY_CHEMISTRY_HISTORY), CHEM_HISTORY_CAPACITY
+                )
+                # Legacy list format is rewritten on the next persist.
+                if isinstance(restored.get(OPT_KEY_CHEMISTRY_HISTORY), dict):
+                    self._chem_history_saved_seq = self._chem_history.seq
             except Exception:
-                self._chem_history = []
+                self._chem_history = ChemistryHistory(CHEM_HISTORY_CAPACITY)
             try:
-                chem_block_raw = entry.options.get(OPT_KEY_CHEM_BLOCK_UNTIL)
+                chem_block_raw = restored.get(OPT_KEY_CHEM_BLOCK_UNTIL)
                 self.chem_block_until = dt_util.parse_datetime(chem_block_raw) if chem_block_raw else None
             except Exception:
                 self.chem_block_until = None
             # Adaptive tuning persisted values (best effort)
             try:
-                if entry.options.get(OPT_KEY_HEAT_LOSS_W_PER_C) is not None:
-                    self.heat_loss_w_per_c = float(entry.options.get(OPT_KEY_HEAT_LOSS_W_PER_C))
+                if restored.get(OPT_KEY_HEAT_LOSS_W_PER_C) is not None:
+                    self.heat_loss_w_per_c = float(restored.get(OPT_KEY_HEAT_LOSS_W_PER_C))
                     self.heat_loss_w_per_c = max(0.0, min(80.0, self.heat_loss_w_per_c))
             except Exception:
                 self.heat_loss_w_per_c = DEFAULT_HEAT_LOSS_W_PER_C
             try:
-                if entry.options.get(OPT_KEY_HEAT_STARTUP_OFFSET_MINUTES) is not None:
-                    self.heat_startup_offset_minutes = float(entry.options.get(OPT_KEY_HEAT_STARTUP_OFFSET_MINUTES))
+                if restored.get(OPT_KEY_HEAT_STARTUP_OFFSET_MINUTES) is not None:
+                    self.heat_startup_offset_minutes = float(restored.get(OPT_KEY_HEAT_STARTUP_OFFSET_MINUTES))
             except Exception:
                 self.heat_startup_offset_minutes = DEFAULT_HEAT_STARTUP_OFFSET_MINUTES
             # Derived energy aggregation (best effort)
             try:
-                if entry.options.get(OPT_KEY_DERIVED_GRID_DAILY_LAST_VALUE) is not None:
-                    self._derived_grid_daily_last_value = float(entry.options.get(OPT_KEY_DERIVED_GRID_DAILY_LAST_VALUE))
+                if restored.get(OPT_KEY_DERIVED_GRID_DAILY_LAST_VALUE) is not None:
+                    self._derived_grid_daily_last_value = float(restored.get(OPT_KEY_DERIVED_GRID_DAILY_LAST_VALUE))
             except Exception:
                 self._derived_grid_daily_last_value = None
             try:
-                self._derived_grid_daily_last_date = entry.options.get(OPT_KEY_DERIVED_GRID_DAILY_LAST_DATE) or None
+                self._derived_grid_daily_last_date = restored.get(OPT_KEY_DERIVED_GRID_DAILY_LAST_DATE) or None
             except Exception:
                 self._derived_grid_daily_last_date = None
             try:
-                if entry.options.get(OPT_KEY_DERIVED_GRID_MONTH_TOTAL) is not None:
-                    self._derived_grid_month_total = float(entry.options.get(OPT_KEY_DERIVED_GRID_MONTH_TOTAL))
+                if restored.get(OPT_KEY_DERIVED_GRID_MONTH_TOTAL) is not None:
+                    self._derived_grid_month_total = float(restored.get(OPT_KEY_DERIVED_GRID_MONTH_TOTAL))
             except Exception:
                 self._derived_grid_month_total = 0.0
             try:
-                if entry.options.get(OPT_KEY_DERIVED_GRID_YEAR_TOTAL) is not None:
-                    self._derived_grid_year_total = float(entry.options.get(OPT_KEY_DERIVED_GRID_YEAR_TOTAL))
+                if restored.get(OPT_KEY_DERIVED_GRID_YEAR_TOTAL) is not None:
+                    self._derived_grid_year_total = float(restored.get(OPT_KEY_DERIVED_GRID_YEAR_TOTAL))
             except Exception:
                 self._derived_grid_year_total = 0.0
             try:
-                self._derived_grid_month_id = entry.options.get(OPT_KEY_DERIVED_GRID_MONTH_ID) or None
+                self._derived_grid_month_id = restored.get(OPT_KEY_DERIVED_GRID_MONTH_ID) or None
             except Exception:
                 self._derived_grid_month_id = None
             try:
-                self._derived_grid_year_id = entry.options.get(OPT_KEY_DERIVED_GRID_YEAR_ID) or None
+                self._derived_grid_year_id = restored.get(OPT_KEY_DERIVED_GRID_YEAR_ID) or None
             except Exception:
                 self._derived_grid_year_id = None
 
             try:
-                if entry.options.get(OPT_KEY_DERIVED_SOLAR_DAILY_LAST_VALUE) is not None:
-                    self._derived_solar_daily_last_value = float(entry.options.get(OPT_KEY_DERIVED_SOLAR_DAILY_LAST_VALUE))
+                if restored.get(OPT_KEY_DERIVED_SOLAR_DAILY_LAST_VALUE) is not None:
+                    self._derived_solar_daily_last_value = float(restored.get(OPT_KEY_DERIVED_SOLAR_DAILY_LAST_VALUE))
             except Exception:
                 self._derived_solar_daily_last_value = None
             try:
-                self._derived_solar_daily_last_date = entry.options.get(OPT_KEY_DERIVED_SOLAR_DAILY_LAST_DATE) or None
+                self._derived_solar_daily_last_date = restored.get(OPT_KEY_DERIVED_SOLAR_DAILY_LAST_DATE) or None
             except Exception:
                 self._derived_solar_daily_last_date = None
             try:
-                if entry.options.get(OPT_KEY_DERIVED_SOLAR_MONTH_TOTAL) is not None:
-                    self._derived_solar_month_total = float(entry.options.get(OPT_KEY_DERIVED_SOLAR_MONTH_TOTAL))
+                if restored.get(OPT_KEY_DERIVED_SOLAR_MONTH_TOTAL) is not None:
+                    self._derived_solar_month_total = float(restored.get(OPT_KEY_DERIVED_SOLAR_MONTH_TOTAL))
             except Exception:
                 self._derived_solar_month_total = 0.0
             try:
-                if entry.options.get(OPT_KEY_DERIVED_SOLAR_YEAR_TOTAL) is not None:
-                    self._derived_solar_year_total = float(entry.options.get(OPT_KEY_DERIVED_SOLAR_YEAR_TOTAL))
+                if restored.get(OPT_KEY_DERIVED_SOLAR_YEAR_TOTAL) is not None:
+                    self._derived_solar_year_total = float(restored.get(OPT_KEY_DERIVED_SOLAR_YEAR_TOTAL))
             except Exception:
                 self._derived_solar_year_total = 0.0
             try:
-                self._derived_solar_month_id = entry.options.get(OPT_KEY_DERIVED_SOLAR_MONTH_ID) or None
+                self._derived_solar_month_id = restored.get(OPT_KEY_DERIVED_SOLAR_MONTH_ID) or None
             except Exception:
                 self._derived_solar_month_id = None
             try:
-                self._derived_solar_year_id = entry.options.get(OPT_KEY_DERIVED_SOLAR_YEAR_ID) or None
+                self._derived_solar_year_id = restored.get(OPT_KEY_DERIVED_SOLAR_YEAR_ID) or None
             except Exception:
                 self._derived_solar_year_id = None
 
             # Cost accumulation persisted values (best effort)
             try:
-                if entry.options.get(OPT_KEY_COST_DAILY_LAST_GRID_KWH) is not None:
-                    self._cost_daily_last_grid_kwh = float(entry.options.get(OPT_KEY_COST_DAILY_LAST_GRID_KWH))
+                if restored.get(OPT_KEY_COST_DAILY_LAST_GRID_KWH) is not None:
+                    self._cost_daily_last_grid_kwh = float(restored.get(OPT_KEY_COST_DAILY_LAST_GRID_KWH))
             except Exception:
                 self._cost_daily_last_grid_kwh = None
             try:
-                if entry.options.get(OPT_KEY_COST_DAILY_LAST_SOLAR_KWH) is not None:
-                    self._cost_daily_last_solar_kwh = float(entry.options.get(OPT_KEY_COST_DAILY_LAST_SOLAR_KWH))
+                if restored.get(OPT_KEY_COST_DAILY_LAST_SOLAR_KWH) is not None:
+                    self._cost_daily_last_solar_kwh = float(restored.get(OPT_KEY_COST_DAILY_LAST_SOLAR_KWH))
             except Exception:
                 self._cost_daily_last_solar_kwh = None
             try:
-                self._cost_daily_date = entry.options.get(OPT_KEY_COST_DAILY_DATE) or None
+                self._cost_daily_date = restored.get(OPT_KEY_COST_DAILY_DATE) or None
             except Exception:
                 self._cost_daily_date = None
             try:
-                if entry.options.get(OPT_KEY_COST_DAILY_ACCUM) is not None:
-                    self._cost_daily_accum = float(entry.options.get(OPT_KEY_COST_DAILY_ACCUM))
+                if restored.get(OPT_KEY_COST_DAILY_ACCUM) is not None:
+                    self._cost_daily_accum = float(restored.get(OPT_KEY_COST_DAILY_ACCUM))
             except Exception:
                 self._cost_daily_accum = 0.0
             try:
-                if entry.options.get(OPT_KEY_COST_DAILY_FEED_IN_LOSS_ACCUM) is not None:
-                    self._cost_daily_feed_in_loss_accum = float(entry.options.get(OPT_KEY_COST_DAILY_FEED_IN_LOSS_ACCUM))
+                if restored.get(OPT_KEY_COST_DAILY_FEED_IN_LOSS_ACCUM) is not None:
+                    self._cost_daily_feed_in_loss_accum = float(restored.get(OPT_KEY_COST_DAILY_FEED_IN_LOSS_ACCUM))
             except Exception:
                 self._cost_daily_feed_in_loss_accum = 0.0
             try:
-                if entry.options.get(OPT_KEY_COST_DAILY_PV_CREDIT_ACCUM) is not None:
-                    self._cost_daily_pv_credit_accum = float(entry.options.get(OPT_KEY_COST_DAILY_PV_CREDIT_ACCUM))
+                if restored.get(OPT_KEY_COST_DAILY_PV_CREDIT_ACCUM) is not None:
+                    self._cost_daily_pv_credit_accum = float(restored.get(OPT_KEY_COST_DAILY_PV_CREDIT_ACCUM))
             except Exception:
                 self._cost_daily_pv_credit_accum = 0.0
             try:
-                if entry.options.get(OPT_KEY_COST_DAILY_NET_ACCUM) is not None:
-                    self._cost_daily_net_accum = float(entry.options.get(OPT_KEY_COST_DAILY_NET_ACCUM))
+                if restored.get(OPT_KEY_COST_DAILY_NET_ACCUM) is not None:
+                    self._cost_daily_net_accum = float(restored.get(OPT_KEY_COST_DAILY_NET_ACCUM))
             except Exception:
                 self._cost_daily_net_accum = 0.0
 
             # Derived cost aggregation (best effort)
             try:
-                if entry.options.get(OPT_KEY_DERIVED_COST_DAILY_LAST_VALUE) is not None:
-                    self._derived_cost_daily_last_value = float(entry.options.get(OPT_KEY_DERIVED_COST_DAILY_LAST_VALUE))
+                if restored.get(OPT_KEY_DERIVED_COST_DAILY_LAST_VALUE) is not None:
+                    self._derived_cost_daily_last_value = float(restored.get(OPT_KEY_DERIVED_COST_DAILY_LAST_VALUE))
             except Exception:
                 self._derived_cost_daily_last_value = None
             try:
-                self._derived_cost_daily_last_date = entry.options.get(OPT_KEY_DERIVED_COST_DAILY_LAST_DATE) or None
+                self._derived_cost_daily_last_date = restored.get(OPT_KEY_DERIVED_COST_DAILY_LAST_DATE) or None
             except Exception:
                 self._derived_cost_daily_last_date = None
             try:
-                if entry.options.get(OPT_KEY_DERIVED_COST_MONTH_TOTAL) is not None:
-                    self._derived_cost_month_total = float(entry.options.get(OPT_KEY_DERIVED_COST_MONTH_TOTAL))
+                if restored.get(OPT_KEY_DERIVED_COST_MONTH_TOTAL) is not None:
+                    self._derived_cost_month_total = float(restored.get(OPT_KEY_DERIVED_COST_MONTH_TOTAL))
             except Exception:
                 self._derived_cost_month_total = 0.0
             try:
-                if entry.options.get(OPT_KEY_DERIVED_COST_YEAR_TOTAL) is not None:
-                    self._derived_cost_year_total = float(entry.options.get(OPT_KEY_DERIVED_COST_YEAR_TOTAL))
+                if restored.get(OPT_KEY_DERIVED_COST_YEAR_TOTAL) is not None:
+                    self._derived_cost_year_total = float(restored.get(OPT_KEY_DERIVED_COST_YEAR_TOTAL))
             except Exception:
                 self._derived_cost_year_total = 0.0
             try:
-                self._derived_cost_month_id = entry.options.get(OPT_KEY_DERIVED_COST_MONTH_ID) or None
+                self._derived_cost_month_id = restored.get(OPT_KEY_DERIVED_COST_MONTH_ID) or None
             except Exception:
                 self._derived_cost_month_id = None
             try:
-                self._derived_cost_year_id = entry.options.get(OPT_KEY_DERIVED_COST_YEAR_ID) or None
+                self._derived_cost_year_id = restored.get(OPT_KEY_DERIVED_COST_YEAR_ID) or None
             except Exception:
                 self._derived_cost_year_id = None
 
             try:
-                if entry.options.get(OPT_KEY_DERIVED_COST_NET_DAILY_LAST_VALUE) is not None:
-                    self._derived_cost_net_daily_last_value = float(entry.options.get(OPT_KEY_DERIVED_COST_NET_DAILY_LAST_VALUE))
+                if restored.get(OPT_KEY_DERIVED_COST_NET_DAILY_LAST_VALUE) is not None:
+                    self._derived_cost_net_daily_last_value = float(restored.get(OPT_KEY_DERIVED_COST_NET_DAILY_LAST_VALUE))
             except Exception:
                 self._derived_cost_net_daily_last_value = None
             try:
-                self._derived_cost_net_daily_last_date = entry.options.get(OPT_KEY_DERIVED_COST_NET_DAILY_LAST_DATE) or None
+                self._derived_cost_net_daily_last_date = restored.get(OPT_KEY_DERIVED_COST_NET_DAILY_LAST_DATE) or None
             except Exception:
                 self._derived_cost_net_daily_last_date = None
             try:
-                if entry.options.get(OPT_KEY_DERIVED_COST_NET_MONTH_TOTAL) is not None:
-                    self._derived_cost_net_month_total = float(entry.options.get(OPT_KEY_DERIVED_COST_NET_MONTH_TOTAL))
+                if restored.get(OPT_KEY_DERIVED_COST_NET_MONTH_TOTAL) is not None:
+                    self._derived_cost_net_month_total = float(restored.get(OPT_KEY_DERIVED_COST_NET_MONTH_TOTAL))
             except Exception:
                 self._derived_cost_net_month_total = 0.0
             try:
-                if entry.options.get(OPT_KEY_DERIVED_COST_NET_YEAR_TOTAL) is not None:
-                    self._derived_cost_net_year_total = float(entry.options.get(OPT_KEY_DERIVED_COST_NET_YEAR_TOTAL))
+                if restored.get(OPT_KEY_DERIVED_COST_NET_YEAR_TOTAL) is not None:
+                    self._derived_cost_net_year_total = float(restored.get(OPT_KEY_DERIVED_COST_NET_YEAR_TOTAL))
             except Exception:
                 self._derived_cost_net_year_total = 0.0
             try:
-                self._derived_cost_net_month_id = entry.options.get(OPT_KEY_DERIVED_COST_NET_MONTH_ID) or None
+                self._derived_cost_net_month_id = restored.get(OPT_KEY_DERIVED_COST_NET_MONTH_ID) or None
             except Exception:
                 self._derived_cost_net_month_id = None
             try:
-                self._derived_cost_net_year_id = entry.options.get(OPT_KEY_DERIVED_COST_NET_YEAR_ID) or None
+                self._derived_cost_net_year_id = restored.get(OPT_KEY_DERIVED_COST_NET_YEAR_ID) or None
             except Exception:
                 self._derived_cost_net_year_id = None
             # New timers
-            mu = entry.options.get(OPT_KEY_MANUAL_UNTIL)
+            mu = restored.get(OPT_KEY_MANUAL_UNTIL)
             if mu:
                 try:
                     self.manual_timer_until = dt_util.parse_datetime(mu)
                 except Exception:
                     self.manual_timer_until = None
-            self.manual_timer_type = entry.options.get(OPT_KEY_MANUAL_TYPE) or None
+            self.manual_timer_type = restored.get(OPT_KEY_MANUAL_TYPE) or None
             try:
-                self.manual_timer_duration = int(entry.options.get(OPT_KEY_MANUAL_DURATION)) if entry.options.get(OPT_KEY_MANUAL_DURATION) is not None else None
+                self.manual_timer_duration = int(restored.get(OPT_KEY_MANUAL_DURATION)) if restored.get(OPT_KEY_MANUAL_DURATION) is not None else None
             except Exception:
                 self.manual_timer_duration = None
 
             # Run credit persisted values (best effort)
             try:
-                if entry.options.get(OPT_KEY_FILTER_CREDIT_MINUTES) is not None:
-                    self._filter_credit_minutes = float(entry.options.get(OPT_KEY_FILTER_CREDIT_MINUTES))
+                if restored.get(OPT_KEY_FILTER_CREDIT_MINUTES) is not None:
+                    self._filter_credit_minutes = float(restored.get(OPT_KEY_FILTER_CREDIT_MINUTES))
             except Exception:
                 self._filter_credit_minutes = 0.0
             try:
-                fc_exp = entry.options.get(OPT_KEY_FILTER_CREDIT_EXPIRES_AT)
+                fc_exp = restored.get(OPT_KEY_FILTER_CREDIT_EXPIRES_AT)
                 self._filter_credit_expires_at = dt_util.parse_datetime(fc_exp) if fc_exp else None
             except Exception:
                 self._filter_credit_expires_at = None
             try:
-                if entry.options.get(OPT_KEY_FROST_CREDIT_MINUTES) is not None:
-                    self._frost_credit_minutes = float(entry.options.get(OPT_KEY_FROST_CREDIT_MINUTES))
+                if restored.get(OPT_KEY_FROST_CREDIT_MINUTES) is not None:
+                    self._frost_credit_minutes = float(restored.get(OPT_KEY_FROST_CREDIT_MINUTES))
             except Exception:
                 self._frost_credit_minutes = 0.0
             try:
-                fr_exp = entry.options.get(OPT_KEY_FROST_CREDIT_EXPIRES_AT)
+                fr_exp = restored.get(OPT_KEY_FROST_CREDIT_EXPIRES_AT)
                 self._frost_credit_expires_at = dt_util.parse_datetime(fr_exp) if fr_exp else None
             except Exception:
                 self._frost_credit_expires_at = None
             try:
-                self._credit_streak_source = entry.options.get(OPT_KEY_CREDIT_STREAK_SOURCE) or None
+                self._credit_streak_source = restored.get(OPT_KEY_CREDIT_STREAK_SOURCE) or None
             except Exception:
                 self._credit_streak_source = None
             try:
-                if entry.options.get(OPT_KEY_CREDIT_STREAK_MINUTES) is not None:
-                    self._credit_streak_minutes = float(entry.options.get(OPT_KEY_CREDIT_STREAK_MINUTES))
+                if restored.get(OPT_KEY_CREDIT_STREAK_MINUTES) is not None:
+                    self._credit_streak_minutes = float(restored.get(OPT_KEY_CREDIT_STREAK_MINUTES))
             except Exception:
                 self._credit_streak_minutes = 0.0
 
-            au = entry.options.get(OPT_KEY_AUTO_FILTER_UNTIL)
+            au = restored.get(OPT_KEY_AUTO_FILTER_UNTIL)
             if au:
                 try:
                     self.auto_filter_until = dt_util.parse_datetime(au)
                 except Exception:
                     self.auto_filter_until = None
             try:
-                self.auto_filter_duration = int(entry.options.get(OPT_KEY_AUTO_FILTER_DURATION)) if entry.options.get(OPT_KEY_AUTO_FILTER_DURATION) is not None else None
+                self.auto_filter_duration = int(restored.get(OPT_KEY_AUTO_FILTER_DURATION)) if restored.get(OPT_KEY_AUTO_FILTER_DURATION) is not None else None
             except Exception:
                 self.auto_filter_duration = None
 
-            pu = entry.options.get(OPT_KEY_PAUSE_UNTIL)
+            pu = restored.get(OPT_KEY_PAUSE_UNTIL)
             if pu:
                 try:
                     self.pause_until = dt_util.parse_datetime(pu)
                 except Exception:
                     self.pause_until = None
             try:
-                self.pause_duration = int(entry.options.get(OPT_KEY_PAUSE_DURATION)) if entry.options.get(OPT_KEY_PAUSE_DURATION) is not None else None
+                self.pause_duration = int(restored.get(OPT_KEY_PAUSE_DURATION)) if restored.get(OPT_KEY_PAUSE_DURATION) is not None else None
             except Exception:
                 self.pause_duration = None
 
-            bu = entry.options.get(OPT_KEY_BATHING_BLOCK_UNTIL)
+            bu = restored.get(OPT_KEY_BATHING_BLOCK_UNTIL)
             if bu:
                 try:
                     self.bathing_block_until = dt_util.parse_datetime(bu)
                 except Exception:
                     self.bathing_block_until = None
 
-            nf = entry.options.get(OPT_KEY_FILTER_NEXT)
+            nf = restored.get(OPT_KEY_FILTER_NEXT)
             if nf:
                 try:
                     self.next_filter_start = dt_util.parse_datetime(nf)
                 except Exception:
                     self.next_filter_start = None
             # PV thresholds and filter config
-            self.filter_minutes = int(entry.options.get(CONF_FILTER_DURATION, entry.data.get(CONF_FILTER_DURATION, DEFAULT_FILTER_DURATION)))
-            self.filter_interval = int(entry.options.get(CONF_FILTER_INTERVAL, entry.data.get(CONF_FILTER_INTERVAL, DEFAULT_FILTER_INTERVAL)))
+            self.filter_minutes = int(restored.get(CONF_FILTER_DURATION, entry.data.get(CONF_FILTER_DURATION, DEFAULT_FILTER_DURATION)))
+            self.filter_interval = int(restored.get(CONF_FILTER_INTERVAL, entry.data.get(CONF_FILTER_INTERVAL, DEFAULT_FILTER_INTERVAL)))
             # Filterlauf darf nie länger als das Intervall sein
             if self.filter_minutes > self.filter_interval:
                 self.filter_minutes = self.filter_interval
-            self.chlorine_duration = int(entry.options.get(CONF_CHLORINE_DURATION, entry.data.get(CONF_CHLORINE_DURATION, DEFAULT_CHLORINE_DURATION)))
-            self.pv_on_threshold = int(entry.options.get(CONF_PV_ON_THRESHOLD, entry.data.get(CONF_PV_ON_THRESHOLD, DEFAULT_PV_ON)))
-            self.pv_off_threshold = int(entry.options.get(CONF_PV_OFF_THRESHOLD, entry.data.get(CONF_PV_OFF_THRESHOLD, DEFAULT_PV_OFF)))
+            self.chlorine_duration = int(restored.get(CONF_CHLORINE_DURATION, entry.data.get(CONF_CHLORINE_DURATION, DEFAULT_CHLORINE_DURATION)))
+            self.pv_on_threshold = int(restored.get(CONF_PV_ON_THRESHOLD, entry.data.get(CONF_PV_ON_THRESHOLD, DEFAULT_PV_ON)))
+            self.pv_off_threshold = int(restored.get(CONF_PV_OFF_THRESHOLD, entry.data.get(CONF_PV_OFF_THRESHOLD, DEFAULT_PV_OFF)))
             # PV smoothing / stability defaults from options or data
             try:
-                self.pv_smooth_window = int(entry.options.get(CONF_PV_SMOOTH_WINDOW_SECONDS, entry.data.get(CONF_PV_SMOOTH_WINDOW_SECONDS, DEFAULT_PV_SMOOTH_WINDOW_SECONDS)))
+                self.pv_smooth_window = int(restored.get(CONF_PV_SMOOTH_WINDOW_SECONDS, entry.data.get(CONF_PV_SMOOTH_WINDOW_SECONDS, DEFAULT_PV_SMOOTH_WINDOW_SECONDS)))
             except Exception:
                 self.pv_smooth_window = DEFAULT_PV_SMOOTH_WINDOW_SECONDS
             try:
-                self.pv_stability_seconds = int(entry.options.get(CONF_PV_STABILITY_SECONDS, entry.data.get(CONF_PV_STABILITY_SECONDS, DEFAULT_PV_STABILITY_SECONDS)))
+                self.pv_stability_seconds = int(restored.get(CONF_PV_STABILITY_SECONDS, entry.data.get(CONF_PV_STABILITY_SECONDS, DEFAULT_PV_STABILITY_SECONDS)))
             except Exception:
                 self.pv_stability_seconds = DEFAULT_PV_STABILITY_SECONDS
             try:
-                self.pv_min_run_minutes = int(entry.options.get(CONF_PV_MIN_RUN_MINUTES, entry.data.get(CONF_PV_MIN_RUN_MINUTES, DEFAULT_PV_MIN_RUN_MINUTES)))
+                self.pv_min_run_minutes = int(restored.get(CONF_PV_MIN_RUN_MINUTES, entry.data.get(CONF_PV_MIN_RUN_MINUTES, DEFAULT_PV_MIN_RUN_MINUTES)))
             except Exception:
                 self.pv_min_run_minutes = DEFAULT_PV_MIN_RUN_MINUTES
         else:
@@ -665,7 +729,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         return derived_month, derived_year, changed
 
     async def _maybe_persist_derived_energy_state(self, now: datetime) -> None:
-        if not self.entry or self.entry.options is None:
+        if not self.entry:
             return
 
         snapshot = (
@@ -685,34 +749,28 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         if self._derived_energy_snapshot == snapshot:
             return
 
-        try:
-            last_saved = self._derived_energy_last_saved
-            if last_saved and (now - last_saved).total_seconds() < 30:
-                return
-        except Exception:
-            pass
-
-        opts = {**self.entry.options}
-        opts[OPT_KEY_DERIVED_GRID_DAILY_LAST_VALUE] = self._derived_grid_daily_last_value
-        opts[OPT_KEY_DERIVED_GRID_DAILY_LAST_DATE] = self._derived_grid_daily_last_date
-        opts[OPT_KEY_DERIVED_GRID_MONTH_TOTAL] = self._derived_grid_month_total
-        opts[OPT_KEY_DERIVED_GRID_YEAR_TOTAL] = self._derived_grid_year_total
-        opts[OPT_KEY_DERIVED_GRID_MONTH_ID] = self._derived_grid_month_id
-        opts[OPT_KEY_DERIVED_GRID_YEAR_ID] = self._derived_grid_year_id
-
-        opts[OPT_KEY_DERIVED_SOLAR_DAILY_LAST_VALUE] = self._derived_solar_daily_last_value
-        opts[OPT_KEY_DERIVED_SOLAR_DAILY_LAST_DATE] = self._derived_solar_daily_last_date
-        opts[OPT_KEY_DERIVED_SOLAR_MONTH_TOTAL] = self._derived_solar_month_total
-        opts[OPT_KEY_DERIVED_SOLAR_YEAR_TOTAL] = self._derived_solar_year_total
-        opts[OPT_KEY_DERIVED_SOLAR_MONTH_ID] = self._derived_solar_month_id
-        opts[OPT_KEY_DERIVED_SOLAR_YEAR_ID] = self._derived_solar_year_id
-
-        await self._async_update_entry_options(opts)
+        # Disk writes are coalesced by the runtime state store (flush window).
+        self._runtime_state.update(
+            {
+                OPT_KEY_DERIVED_GRID_DAILY_LAST_VALUE: self._derived_grid_daily_last_value,
+                OPT_KEY_DERIVED_GRID_DAILY_LAST_DATE: self._derived_grid_daily_last_date,
+                OPT_KEY_DERIVED_GRID_MONTH_TOTAL: self._derived_grid_month_total,
+                OPT_KEY_DERIVED_GRID_YEAR_TOTAL: self._derived_grid_year_total,
+                OPT_KEY_DERIVED_GRID_MONTH_ID: self._derived_grid_month_id,
+                OPT_KEY_DERIVED_GRID_YEAR_ID: self._derived_grid_year_id,
+                OPT_KEY_DERIVED_SOLAR_DAILY_LAST_VALUE: self._derived_solar_daily_last_value,
+                OPT_KEY_DERIVED_SOLAR_DAILY_LAST_DATE: self._derived_solar_daily_last_date,
+                OPT_KEY_DERIVED_SOLAR_MONTH_TOTAL: self._derived_solar_month_total,
+                OPT_KEY_DERIVED_SOLAR_YEAR_TOTAL: self._derived_solar_year_total,
+                OPT_KEY_DERIVED_SOLAR_MONTH_ID: self._derived_solar_month_id,
+                OPT_KEY_DERIVED_SOLAR_YEAR_ID: self._derived_solar_year_id,
+            }
+        )
         self._derived_energy_last_saved = now
         self._derived_energy_snapshot = snapshot
 
     async def _maybe_persist_cost_daily_state(self, now: datetime) -> None:
-        if not self.entry or self.entry.options is None:
+        if not self.entry:
             return
 
         snapshot = (
@@ -727,28 +785,22 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         if self._cost_persist_snapshot == snapshot:
             return
 
-        try:
-            last_saved = self._cost_persist_last_saved
-            if last_saved and (now - last_saved).total_seconds() < 30:
-                return
-        except Exception:
-            pass
-
-        opts = {**self.entry.options}
-        opts[OPT_KEY_COST_DAILY_LAST_GRID_KWH] = self._cost_daily_last_grid_kwh
-        opts[OPT_KEY_COST_DAILY_LAST_SOLAR_KWH] = self._cost_daily_last_solar_kwh
-        opts[OPT_KEY_COST_DAILY_DATE] = self._cost_daily_date
-        opts[OPT_KEY_COST_DAILY_ACCUM] = self._cost_daily_accum
-        opts[OPT_KEY_COST_DAILY_FEED_IN_LOSS_ACCUM] = self._cost_daily_feed_in_loss_accum
-        opts[OPT_KEY_COST_DAILY_PV_CREDIT_ACCUM] = self._cost_daily_pv_credit_accum
-        opts[OPT_KEY_COST_DAILY_NET_ACCUM] = self._cost_daily_net_accum
-
-        await self._async_update_entry_options(opts)
+        self._runtime_state.update(
+            {
+                OPT_KEY_COST_DAILY_LAST_GRID_KWH: self._cost_daily_last_grid_kwh,
+                OPT_KEY_COST_DAILY_LAST_SOLAR_KWH: self._cost_daily_last_solar_kwh,
+                OPT_KEY_COST_DAILY_DATE: self._cost_daily_date,
+                OPT_KEY_COST_DAILY_ACCUM: self._cost_daily_accum,
+                OPT_KEY_COST_DAILY_FEED_IN_LOSS_ACCUM: self._cost_daily_feed_in_loss_accum,
+                OPT_KEY_COST_DAILY_PV_CREDIT_ACCUM: self._cost_daily_pv_credit_accum,
+                OPT_KEY_COST_DAILY_NET_ACCUM: self._cost_daily_net_accum,
+            }
+        )
         self._cost_persist_last_saved = now
         self._cost_persist_snapshot = snapshot
 
     async def _maybe_persist_derived_cost_state(self, now: datetime) -> None:
-        if not self.entry or self.entry.options is None:
+        if not self.entry:
             return
 
         snapshot = (
@@ -768,29 +820,22 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         if getattr(self, "_derived_cost_snapshot", None) == snapshot:
             return
 
-        try:
-            last_saved = getattr(self, "_derived_cost_last_saved", None)
-            if last_saved and (now - last_saved).total_seconds() < 5 * 60:
-                return
-        except Exception:
-            pass
-
-        opts = {**self.entry.options}
-        opts[OPT_KEY_DERIVED_COST_DAILY_LAST_VALUE] = self._derived_cost_daily_last_value
-        opts[OPT_KEY_DERIVED_COST_DAILY_LAST_DATE] = self._derived_cost_daily_last_date
-        opts[OPT_KEY_DERIVED_COST_MONTH_TOTAL] = self._derived_cost_month_total
-        opts[OPT_KEY_DERIVED_COST_YEAR_TOTAL] = self._derived_cost_year_total
-        opts[OPT_KEY_DERIVED_COST_MONTH_ID] = self._derived_cost_month_id
-        opts[OPT_KEY_DERIVED_COST_YEAR_ID] = self._derived_cost_year_id
-
-        opts[OPT_KEY_DERIVED_COST_NET_DAILY_LAST_VALUE] = self._derived_cost_net_daily_last_value
-        opts[OPT_KEY_DERIVED_COST_NET_DAILY_LAST_DATE] = self._derived_cost_net_daily_last_date
-        opts[OPT_KEY_DERIVED_COST_NET_MONTH_TOTAL] = self._derived_cost_net_month_total
-        opts[OPT_KEY_DERIVED_COST_NET_YEAR_TOTAL] = self._derived_cost_net_year_total
-        opts[OPT_KEY_DERIVED_COST_NET_MONTH_ID] = self._derived_cost_net_month_id
-        opts[OPT_KEY_DERIVED_COST_NET_YEAR_ID] = self._derived_cost_net_year_id
-
-        await self._async_update_entry_options(opts)
+        self._runtime_state.update(
+            {
+                OPT_KEY_DERIVED_COST_DAILY_LAST_VALUE: self._derived_cost_daily_last_value,
+                OPT_KEY_DERIVED_COST_DAILY_LAST_DATE: self._derived_cost_daily_last_date,
+                OPT_KEY_DERIVED_COST_MONTH_TOTAL: self._derived_cost_month_total,
+                OPT_KEY_DERIVED_COST_YEAR_TOTAL: self._derived_cost_year_total,
+                OPT_KEY_DERIVED_COST_MONTH_ID: self._derived_cost_month_id,
+                OPT_KEY_DERIVED_COST_YEAR_ID: self._derived_cost_year_id,
+                OPT_KEY_DERIVED_COST_NET_DAILY_LAST_VALUE: self._derived_cost_net_daily_last_value,
+                OPT_KEY_DERIVED_COST_NET_DAILY_LAST_DATE: self._derived_cost_net_daily_last_date,
+                OPT_KEY_DERIVED_COST_NET_MONTH_TOTAL: self._derived_cost_net_month_total,
+                OPT_KEY_DERIVED_COST_NET_YEAR_TOTAL: self._derived_cost_net_year_total,
+                OPT_KEY_DERIVED_COST_NET_MONTH_ID: self._derived_cost_net_month_id,
+                OPT_KEY_DERIVED_COST_NET_YEAR_ID: self._derived_cost_net_year_id,
+            }
+        )
         setattr(self, "_derived_cost_last_saved", now)
         setattr(self, "_derived_cost_snapshot", snapshot)
 
@@ -836,92 +881,223 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         stable: bool,
         reason: str,
     ) -> None:
-        sample = {
-            "ts": now.isoformat(),
-            "ph": round(float(ph_val), 3) if ph_val is not None else None,
-            "chlor": round(float(chlor_val), 1) if chlor_val is not None else None,
-            "tds_effective": int(round(float(tds_effective))) if tds_effective is not None else None,
-            "alk_raw": int(alk_raw) if alk_raw is not None else None,
-            "stable": bool(stable),
-            "reason": str(reason or ""),
+        # Keep the sampling cadence independent of how often the coordinator runs
+        # (event-driven updates may fire in bursts).
+        try:
+            last = self._chem_history_last_append
+            if last is not None and 0 <= (now - last).total_seconds() < DEFAULT_UPDATE_INTERVAL_SECONDS:
+                return
+        except Exception:
+            pass
+        self._chem_history_last_append = now
+        self._chem_history.append(
+            now.timestamp(),
+            round(float(ph_val), 3) if ph_val is not None else None,
+            round(float(chlor_val), 1) if chlor_val is not None else None,
+            int(round(float(tds_effective))) if tds_effective is not None else None,
+            int(alk_raw) if alk_raw is not None else None,
+            bool(stable),
+            str(reason or ""),
+        )
+
+    def _chem_history_window(self, now: datetime, lookback_minutes: int) -> ChemistryWindow:
+        """Advance the incremental stable-sample window (rolling medians per column)."""
+        window = self._chem_window
+        window.advance(self._chem_history, now.timestamp(), float(lookback_minutes) * 60.0)
+        return window
+
+    @staticmethod
+    def _stage_water_quality(
+        tds_for_maintenance: float | None,
+        target_tds: int,
+        vol_l,
+        ph_val: float | None,
+        chlor_val: float | None,
+    ) -> dict:
+        """TDS maintenance status and water-safety classification."""
+        tds_status = None
+        tds_water_change_liters = 0
+        tds_water_change_percent = 0
+        tds_high = False
+        water_safety_status = "unknown"
+        water_safety_reason = "missing_data"
+        water_safety_risk = False
+
+        if tds_for_maintenance is not None:
+            if tds_for_maintenance < 1500:
+                tds_status = "optimal"
+            elif tds_for_maintenance < 2000:
+                tds_status = "good"
+            elif tds_for_maintenance < 2500:
+                tds_status = "high"
+                tds_high = True
+            elif tds_for_maintenance < 3000:
+                tds_status = "critical"
+                tds_high = True
+            else:
+                tds_status = "urgent"
+                tds_high = True
+
+            # Wasserwechsel-Berechnung: Liter = Volumen × (TDS_aktuell - Ziel) / TDS_aktuell
+            if vol_l and tds_for_maintenance > target_tds:
+                tds_water_change_liters = round(vol_l * (tds_for_maintenance - target_tds) / tds_for_maintenance)
+                tds_water_change_percent = round((tds_water_change_liters / vol_l) * 100)
+
+        try:
+            ph_float = float(ph_val) if ph_val is not None else None
+        except Exception:
+            ph_float = None
+        try:
+            chlor_float = float(chlor_val) if chlor_val is not None else None
+        except Exception:
+            chlor_float = None
+        if ph_float is not None and chlor_float is not None:
+            ph_outside_comfort = ph_float < 7.1 or ph_float > 7.6
+            ph_high = ph_float > 7.8
+            orp_low = chlor_float < 650
+            orp_very_low = chlor_float < 450
+            if orp_very_low:
+                water_safety_status = "critical"
+                water_safety_reason = "very_low_orp"
+            elif ph_high and orp_low:
+                water_safety_status = "critical"
+                water_safety_reason = "high_ph_low_orp"
+            elif orp_low:
+                water_safety_status = "warning"
+                water_safety_reason = "low_orp"
+            elif ph_outside_comfort:
+                water_safety_status = "warning"
+                water_safety_reason = "ph_out_of_range"
+            else:
+                water_safety_status = "ok"
+                water_safety_reason = "ok"
+            water_safety_risk = water_safety_status in {"warning", "critical"}
+
+        return {
+            "tds_status": tds_status,
+            "tds_water_change_liters": tds_water_change_liters,
+            "tds_water_change_percent": tds_water_change_percent,
+            "tds_high": tds_high,
+            "water_safety_status": water_safety_status,
+            "water_safety_reason": water_safety_reason,
+            "water_safety_risk": water_safety_risk,
         }
-        self._chem_history.append(sample)
-        if len(self._chem_history) > 120:
-            self._chem_history = self._chem_history[-120:]
-
-    def _recent_chem_samples(self, now: datetime, lookback_minutes: int, stable_only: bool = True) -> list[dict]:
-        out = []
-        for sample in list(self._chem_history or []):
-            if stable_only and not bool(sample.get("stable")):
-                continue
-            ts_raw = sample.get("ts")
-            if not ts_raw:
-                continue
+
+    @staticmethod
+    def _stage_alkalinity(
+        alkalinity_estimated_ppm: int | None,
+        measurement_valid: bool,
+        alkalinity_target_ppm: int,
+        alk_low_threshold: int,
+        alk_high_threshold: int,
+        vol_l,
+        tds_high: bool,
+        tds_water_change_percent: int,
+    ) -> dict:
+        """Alkalinity status, dosing hints and the resulting recommended action."""
+        alkalinity_status = "unknown"
+        alkalinity_raise_dose_g = 0
+        alkalinity_lower_dose_g = 0
+        alkalinity_action = "measure_first"
+        alkalinity_total_dose_g = 0
+        alkalinity_step_dose_g = 0
+        alkalinity_steps = 0
+        alkalinity_water_change_percent = 0
+
+        if alkalinity_estimated_ppm is not None:
+            if alkalinity_estimated_ppm < max(60, alk_low_threshold - 20):
+                alkalinity_status = "very_low"
+            elif alkalinity_estimated_ppm < alk_low_threshold:
+                alkalinity_status = "low"
+            elif alkalinity_estimated_ppm <= alk_high_threshold:
+                alkalinity_status = "optimal"
+            elif alkalinity_estimated_ppm <= min(220, alk_high_threshold + 40):
+                alkalinity_status = "high"
+            else:
+                alkalinity_status = "critical_high"
+
+            # Dosier-Hinweise (grobe Praxiswerte, in g):
+            # - Erhöhen mit Natriumhydrogencarbonat: ~18 g je m³ pro +10 ppm
+            # - Senken mit pH-Minus (Natriumbisulfat): ~15 g je m³ pro -10 ppm
             try:
-                ts = dt_util.parse_datetime(str(ts_raw))
-                if ts is None:
-                    continue
-                age_s = (now - ts).total_seconds()
-                if age_s < 0:
-                    continue
-                if age_s <= float(lookback_minutes) * 60.0:
-                    out.append(sample)
+                volume_m3 = (float(vol_l) / 1000.0) if vol_l else 0.0
+                if volume_m3 > 0:
+                    if alkalinity_estimated_ppm < alk_low_threshold:
+                        delta_up = max(0.0, float(alkalinity_target_ppm) - float(alkalinity_estimated_ppm))
+                        alkalinity_raise_dose_g = int(round(volume_m3 * (delta_up / 10.0) * 18.0))
+                    elif alkalinity_estimated_ppm > alk_high_threshold:
+                        delta_down = max(0.0, float(alkalinity_estimated_ppm) - float(alkalinity_target_ppm))
+                        alkalinity_lower_dose_g = int(round(volume_m3 * (delta_down / 10.0) * 15.0))
             except Exception:
-                continue
-        return out
+                alkalinity_raise_dose_g = 0
+                alkalinity_lower_dose_g = 0
 
-    def _history_median(self, samples: list[dict], key: str) -> float | None:
-        values = []
-        for sample in samples:
-            value = sample.get(key)
-            if value is None:
-                continue
+        # Konkrete Handlungsempfehlung aus Alkalinitäts-/TDS-Lage ableiten.
+        # Empfehlung nur bei stabiler, historisch abgesicherter Messlage.
+        if not measurement_valid:
+            alkalinity_action = "measure_first"
+        elif tds_high and int(tds_water_change_percent or 0) >= 10:
+            alkalinity_action = "water_change_then_adjust"
+            alkalinity_water_change_percent = int(tds_water_change_percent or 0)
+        elif alkalinity_estimated_ppm < alk_low_threshold:
+            alkalinity_action = "raise_bicarbonate"
+            alkalinity_total_dose_g = int(alkalinity_raise_dose_g or 0)
             try:
-                values.append(float(value))
+                v_m3 = (float(vol_l) / 1000.0) if vol_l else 0.0
             except Exception:
-                continue
-        if not values:
-            return None
-        try:
-            return float(median(values))
-        except Exception:
-            return None
+                v_m3 = 0.0
+            # Maximal ~20 g/m³ pro Schritt, damit Änderungen kontrollierbar bleiben.
+            step_cap = max(100, int(round(v_m3 * 20.0))) if v_m3 > 0 else 100
+            if alkalinity_total_dose_g > 0:
+                alkalinity_steps = max(1, (alkalinity_total_dose_g + step_cap - 1) // step_cap)
+                alkalinity_step_dose_g = max(1, (alkalinity_total_dose_g + alkalinity_steps - 1) // alkalinity_steps)
+        elif alkalinity_estimated_ppm > alk_high_threshold:
+            alkalinity_action = "lower_ph_minus"
+            alkalinity_total_dose_g = int(alkalinity_lower_dose_g or 0)
+            try:
+                v_m3 = (float(vol_l) / 1000.0) if vol_l else 0.0
+            except Exception:
+                v_m3 = 0.0
+            # Maximal ~15 g/m³ pro Schritt, konservativ wegen pH-Untergrenze.
+            step_cap = max(80, int(round(v_m3 * 15.0))) if v_m3 > 0 else 80
+            if alkalinity_total_dose_g > 0:
+                alkalinity_steps = max(1, (alkalinity_total_dose_g + step_cap - 1) // step_cap)
+                alkalinity_step_dose_g = max(1, (alkalinity_total_dose_g + alkalinity_steps - 1) // alkalinity_steps)
+        else:
+            alkalinity_action = "none"
+
+        return {
+            "alkalinity_status": alkalinity_status,
+            "alkalinity_raise_dose_g": alkalinity_raise_dose_g,
+            "alkalinity_lower_dose_g": alkalinity_lower_dose_g,
+            "alkalinity_action": alkalinity_action,
+            "alkalinity_total_dose_g": alkalinity_total_dose_g,
+            "alkalinity_step_dose_g": alkalinity_step_dose_g,
+            "alkalinity_steps": alkalinity_steps,
+            "alkalinity_water_change_percent": alkalinity_water_change_percent,
+        }
 
     async def _maybe_persist_chemistry_history(self, now: datetime) -> None:
-        if not self.entry or self.entry.options is None:
+        if not self.entry:
             return
 
-        snapshot = tuple(
-            (
-                sample.get("ts"),
-                sample.get("alk_raw"),
-                sample.get("stable"),
-                sample.get("reason"),
-            )
-            for sample in (self._chem_history or [])
-        )
-        if self._chem_history_snapshot == snapshot:
+        history = self._chem_history
+        if history.seq == self._chem_history_saved_seq:
+            return
+        last = self._chem_history_last_saved
+        if last is not None and 0 <= (now - last).total_seconds() < CHEM_HISTORY_PERSIST_SECONDS:
             return
 
-        try:
-            last_saved = self._chem_history_last_saved
-            if last_saved and (now - last_saved).total_seconds() < 60:
-                return
-        except Exception:
-            pass
-
-        opts = {**self.entry.options}
-        opts[OPT_KEY_CHEMISTRY_HISTORY] = list(self._chem_history or [])
-        await self._async_update_entry_options(opts)
+        self._runtime_state.update({OPT_KEY_CHEMISTRY_HISTORY: history.as_dict()})
         self._chem_history_last_saved = now
-        self._chem_history_snapshot = snapshot
+        self._chem_history_saved_seq = history.seq
 
     async def _set_chem_block_until(self, until: datetime | None) -> None:
         self.chem_block_until = until
         if not self.entry:
             return
         try:
-            opts = {**(self.entry.options or {})}
+            opts = self._options_snapshot()
             if until is not None:
                 opts[OPT_KEY_CHEM_BLOCK_UNTIL] = until.isoformat()
             else:
@@ -960,8 +1136,14 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
 
     def _blueriiot_interval_for_time(self, conf: dict, now: datetime) -> tuple[int, bool]:
         """Select the configured day or night interval for a local time."""
-        day_interval = max(5, int(conf.get(CONF_BLUERIIOT_INTERVAL_MINUTES, DEFAULT_BLUERIIOT_INTERVAL_MINUTES)))
-        night_interval = max(5, int(conf.get(CONF_BLUERIIOT_NIGHT_INTERVAL_MINUTES, DEFAULT_BLUERIIOT_NIGHT_INTERVAL_MINUTES)))
+        # A kept-alive session makes short intervals cheap; otherwise each read costs a connection.
+        minimum = (
+            BLUERIIOT_SESSION_MIN_INTERVAL_MINUTES
+            if bool(conf.get(CONF_BLUERIIOT_KEEP_CONNECTED, DEFAULT_BLUERIIOT_KEEP_CONNECTED))
+            else BLUERIIOT_MIN_INTERVAL_MINUTES
+        )
+        day_interval = max(minimum, int(conf.get(CONF_BLUERIIOT_INTERVAL_MINUTES, DEFAULT_BLUERIIOT_INTERVAL_MINUTES)))
+        night_interval = max(minimum, int(conf.get(CONF_BLUERIIOT_NIGHT_INTERVAL_MINUTES, DEFAULT_BLUERIIOT_NIGHT_INTERVAL_MINUTES)))
         night_start = self._blueriiot_clock_minutes(conf.get(CONF_BLUERIIOT_NIGHT_START), DEFAULT_BLUERIIOT_NIGHT_START)
         night_end = self._blueriiot_clock_minutes(conf.get(CONF_BLUERIIOT_NIGHT_END), DEFAULT_BLUERIIOT_NIGHT_END)
         current = now.hour * 60 + now.minute
@@ -975,9 +1157,33 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         )
         return (night_interval if is_night else day_interval), is_night
 
+    def _configure_blueriiot_session(self, conf: dict) -> None:
+        self._blueriiot_reader.configure_session(
+            bool(conf.get(CONF_BLUERIIOT_KEEP_CONNECTED, DEFAULT_BLUERIIOT_KEEP_CONNECTED)),
+            timedelta(minutes=DEFAULT_BLUERIIOT_SESSION_IDLE_MINUTES),
+        )
+
+    @callback
+    def _async_handle_blueriiot_advertisement(self) -> None:
+        """Passive BlueRiiot data changed: recompute (coalesced by the refresh debouncer)."""
+        if self.event_driven:
+            self.hass.async_create_task(self.async_request_refresh())
+
+    async def async_close_blueriiot(self) -> None:
+        """Stop passive listening and close a kept-alive BlueRiiot session."""
+        try:
+            await self._blueriiot_reader.async_shutdown()
+        except Exception:
+            pass
+
+    async def async_release(self) -> None:
+        """Drop input listeners, wake-ups and the BlueRiiot session (unload or failed setup)."""
+        self.async_stop_input_listeners()
+        await self.async_close_blueriiot()
+
     async def async_read_blueriiot_now(self) -> bool:
         """Perform one immediate native BlueRiiot measurement when configured."""
-        conf = {**(self.entry.data or {}), **(self.entry.options or {})}
+        conf = {**(self.entry.data or {}), **self._options_snapshot()}
         if not bool(conf.get(CONF_ENABLE_BLUERIIOT, DEFAULT_ENABLE_BLUERIIOT)):
             self._blueriiot_reader.last_error = "not_enabled"
             return False
@@ -988,6 +1194,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
             return False
 
         interval, _ = self._blueriiot_interval_for_time(conf, dt_util.now())
+        self._configure_blueriiot_session(conf)
         await self._blueriiot_reader.async_read_if_due(
             address, timedelta(minutes=interval), force=True
         )
@@ -1018,6 +1225,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         orp, orp_valid = _display_value("chlor_val")
         power, power_valid = _display_value("power")
         try:
+            self._perf.count("service_calls")
             await self.hass.services.async_call(
                 "esphome",
                 matching_services[0],
@@ -1128,6 +1336,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         messages.extend(resolved_messages.get(key, f"Entwarnung: {key}") for key in sorted(resolved_alert_keys))
         title = "Pool Controller: Wartung erforderlich" if new_alert_keys else "Pool Controller: Entwarnung"
         try:
+            self._perf.count("service_calls")
             await self.hass.services.async_call(
                 "notify",
                 notify_service,
@@ -1171,19 +1380,11 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
 
     async def _compute_dynamic_target(self, conf: dict, water_temp: float | None, outdoor_temp: float | None, now: datetime) -> dict:
         """Compute base/effective target temperature with optional season+weather offset."""
-        try:
-            min_t = float(conf.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP))
-        except Exception:
-            min_t = DEFAULT_MIN_TEMP
-        try:
-            max_t = float(conf.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP))
-        except Exception:
-            max_t = DEFAULT_MAX_TEMP
-        if max_t < min_t:
-            min_t, max_t = max_t, min_t
+        cfg = self.config
+        min_t, max_t = cfg.min_temp, cfg.max_temp
 
         base = self._clamp(float(getattr(self, "target_temp", DEFAULT_TARGET_TEMP)), min_t, max_t)
-        enabled = bool(conf.get(CONF_ENABLE_DYNAMIC_TARGET, DEFAULT_ENABLE_DYNAMIC_TARGET))
+        enabled = cfg.enable_dynamic_target
         if not enabled:
             self._dynamic_target_prev_enabled = False
             return {
@@ -1196,16 +1397,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
                 "profile": "off",
             }
 
-        try:
-            season_winter = float(conf.get(CONF_DYNAMIC_TARGET_WINTER_OFFSET, DEFAULT_DYNAMIC_TARGET_WINTER_OFFSET))
-            season_spring = float(conf.get(CONF_DYNAMIC_TARGET_SPRING_OFFSET, DEFAULT_DYNAMIC_TARGET_SPRING_OFFSET))
-            season_summer = float(conf.get(CONF_DYNAMIC_TARGET_SUMMER_OFFSET, DEFAULT_DYNAMIC_TARGET_SUMMER_OFFSET))
-            season_autumn = float(conf.get(CONF_DYNAMIC_TARGET_AUTUMN_OFFSET, DEFAULT_DYNAMIC_TARGET_AUTUMN_OFFSET))
-        except Exception:
-            season_winter = DEFAULT_DYNAMIC_TARGET_WINTER_OFFSET
-            season_spring = DEFAULT_DYNAMIC_TARGET_SPRING_OFFSET
-            season_summer = DEFAULT_DYNAMIC_TARGET_SUMMER_OFFSET
-            season_autumn = DEFAULT_DYNAMIC_TARGET_AUTUMN_OFFSET
+        season_winter, season_spring, season_summer, season_autumn = cfg.season_offsets
 
         season_offset, season_profile = self._seasonal_dynamic_offset(
             now,
@@ -1215,21 +1407,8 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
             season_autumn,
         )
 
-        try:
-            offset_min = float(conf.get(CONF_DYNAMIC_TARGET_MIN_OFFSET, DEFAULT_DYNAMIC_TARGET_MIN_OFFSET))
-        except Exception:
-            offset_min = DEFAULT_DYNAMIC_TARGET_MIN_OFFSET
-        try:
-            offset_max = float(conf.get(CONF_DYNAMIC_TARGET_MAX_OFFSET, DEFAULT_DYNAMIC_TARGET_MAX_OFFSET))
-        except Exception:
-            offset_max = DEFAULT_DYNAMIC_TARGET_MAX_OFFSET
-        if offset_max < offset_min:
-            offset_min, offset_max = offset_max, offset_min
-
-        try:
-            weather_limit = abs(float(conf.get(CONF_DYNAMIC_TARGET_WEATHER_MAX_OFFSET, DEFAULT_DYNAMIC_TARGET_WEATHER_MAX_OFFSET)))
-        except Exception:
-            weather_limit = DEFAULT_DYNAMIC_TARGET_WEATHER_MAX_OFFSET
+        offset_min, offset_max = cfg.dynamic_offset_min, cfg.dynamic_offset_max
+        weather_limit = cfg.dynamic_weather_limit
 
         weather_entity = conf.get(CONF_DYNAMIC_TARGET_WEATHER_ENTITY) or conf.get(CONF_EVENT_WEATHER_ENTITY)
         weather_state = self.hass.states.get(weather_entity) if weather_entity else None
@@ -1244,19 +1423,13 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         forecast_temp = None
         if weather_entity:
             try:
-                forecast = await self._get_hourly_forecast(weather_entity)
+                forecast = self._snapshot(self._forecast_cache, "forecast", weather_entity, "hourly")
             except Exception:
                 forecast = None
-            if isinstance(forecast, list) and forecast:
-                vals = []
-                for item in forecast[:24]:
-                    if not isinstance(item, dict):
-                        continue
-                    v = self._num_or_none(item.get("temperature"))
-                    if v is not None:
-                        vals.append(float(v))
-                if vals:
-                    forecast_temp = float(sum(vals) / len(vals))
+            if forecast is not None:
+                # Next 24 forecast hours by time, so an older background snapshot does not average past hours.
+                hour_ts = now.timestamp() // 3600 * 3600
+                forecast_temp = forecast.query("temperature", hour_ts, hour_ts + 23 * 3600, "mean")
 
         # Normalize factors to roughly [-1, 1]. Positive means "warmer preference".
         # Prefer the local pool-side outdoor sensor for temperature comfort; official
@@ -1286,20 +1459,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
                 return None
             return self._clamp((float(v) - 50.0) / 50.0, -1.0, 1.0)
 
-        try:
-            w_temp = max(0.0, float(conf.get(CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_TEMP, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_TEMP)))
-            w_feels = max(0.0, float(conf.get(CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_FEELS_LIKE, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_FEELS_LIKE)))
-            w_wind = max(0.0, float(conf.get(CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_WIND, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_WIND)))
-            w_uv = max(0.0, float(conf.get(CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_UV, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_UV)))
-            w_cloud = max(0.0, float(conf.get(CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_CLOUD, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_CLOUD)))
-            w_forecast = max(0.0, float(conf.get(CONF_DYNAMIC_TARGET_WEATHER_WEIGHT_FORECAST, DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_FORECAST)))
-        except Exception:
-            w_temp = DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_TEMP
-            w_feels = DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_FEELS_LIKE
-            w_wind = DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_WIND
-            w_uv = DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_UV
-            w_cloud = DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_CLOUD
-            w_forecast = DEFAULT_DYNAMIC_TARGET_WEATHER_WEIGHT_FORECAST
+        w_temp, w_feels, w_wind, w_uv, w_cloud, w_forecast = cfg.dynamic_weather_weights
 
         temp_input = outdoor_temp if outdoor_temp is not None else weather_temp
         use_official_weather_temperature = outdoor_temp is None
@@ -1338,16 +1498,8 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         # so the user sees the correct value without a long rate-limited ramp from 0.
         re_enabled = not bool(getattr(self, "_dynamic_target_prev_enabled", False))
 
-        try:
-            alpha = float(conf.get(CONF_DYNAMIC_TARGET_EMA_ALPHA, DEFAULT_DYNAMIC_TARGET_EMA_ALPHA))
-        except Exception:
-            alpha = DEFAULT_DYNAMIC_TARGET_EMA_ALPHA
-        alpha = self._clamp(alpha, 0.0, 1.0)
-        try:
-            max_step_h = float(conf.get(CONF_DYNAMIC_TARGET_MAX_STEP_PER_HOUR, DEFAULT_DYNAMIC_TARGET_MAX_STEP_PER_HOUR))
-        except Exception:
-            max_step_h = DEFAULT_DYNAMIC_TARGET_MAX_STEP_PER_HOUR
-        max_step_h = max(0.0, max_step_h)
+        alpha = cfg.dynamic_ema_alpha
+        max_step_h = cfg.dynamic_max_step_per_hour
 
         prev = self._num_or_none(getattr(self, "target_temp_offset", None))
         if re_enabled or prev is None or self._dynamic_target_last_calc is None:
@@ -1382,33 +1534,11 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         include_aux: bool | None = None,
     ) -> float:
         """Return effective heating power in W after subtracting estimated heat loss."""
-        power_w = None
-        try:
-            base_w = int(conf.get(CONF_HEATER_BASE_POWER_W, DEFAULT_HEATER_BASE_POWER_W))
-        except Exception:
-            base_w = DEFAULT_HEATER_BASE_POWER_W
-        try:
-            aux_w = int(conf.get(CONF_HEATER_AUX_POWER_W, DEFAULT_HEATER_AUX_POWER_W))
-        except Exception:
-            aux_w = DEFAULT_HEATER_AUX_POWER_W
-        base_w = max(0, int(base_w or 0))
-        aux_w = max(0, int(aux_w or 0))
-
-        try:
-            legacy_present = CONF_HEATER_POWER_W in conf and conf.get(CONF_HEATER_POWER_W) is not None
-            split_effective_raw = base_w + aux_w
-            if legacy_present and split_effective_raw <= 0:
-                base_w = max(0, int(float(conf.get(CONF_HEATER_POWER_W))))
-        except Exception:
-            pass
-
-        enable_aux = bool(conf.get(CONF_ENABLE_AUX_HEATING, False)) if include_aux is None else bool(include_aux)
-        power_w = base_w + (aux_w if enable_aux else 0)
+        cfg = self.config
+        enable_aux = cfg.enable_aux_heating if include_aux is None else bool(include_aux)
+        power_w = cfg.heater_base_power_w + (cfg.heater_aux_power_w if enable_aux else 0)
         if not power_w or power_w <= 0:
-            try:
-                power_w = int(conf.get(CONF_HEATER_POWER_W, DEFAULT_HEATER_POWER_W))
-            except Exception:
-                power_w = DEFAULT_HEATER_POWER_W
+            power_w = cfg.heater_legacy_power_w
         if not power_w or power_w <= 0:
             power_w = DEFAULT_HEATER_POWER_W
 
@@ -1461,11 +1591,11 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
 
     async def async_migrate_legacy_timers(self):
         """Best-effort Migration: alte Timer-Optionen auf neue Keys umlegen und alte Keys entfernen."""
-        if self._did_migrate_timers or not self.entry or not self.entry.options:
+        if self._did_migrate_timers or not self.entry or not self._options_snapshot():
             return
 
         now = dt_util.now()
-        opts = dict(self.entry.options)
+        opts = self._options_snapshot()
         changed = False
 
         def _parse_dt(val):
@@ -1559,13 +1689,13 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         self.manual_timer_duration = minutes
 
         # reschedule next auto filter start when manual filter started
-        new_opts = {**self.entry.options}
+        new_opts = self._options_snapshot()
         new_opts[OPT_KEY_MANUAL_UNTIL] = until.isoformat()
         new_opts[OPT_KEY_MANUAL_TYPE] = timer_type
         new_opts[OPT_KEY_MANUAL_DURATION] = minutes
         if timer_type in ("bathing", "chlorine"):
             try:
-                merged = {**(self.entry.data or {}), **(self.entry.options or {})}
+                merged = {**(self.entry.data or {}), **self._options_snapshot()}
                 cooldown_minutes = int(merged.get(CONF_CHEM_COOLDOWN_MINUTES, DEFAULT_CHEM_COOLDOWN_MINUTES))
                 sanitizer_mode = (merged.get(CONF_SANITIZER_MODE) or "").strip().lower()
                 sanitizer_product = (merged.get(CONF_SANITIZER_PRODUCT) or "").strip().lower()
@@ -1595,7 +1725,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         self.manual_timer_type = None
         self.manual_timer_duration = None
         try:
-            new_opts = {**self.entry.options}
+            new_opts = self._options_snapshot()
             new_opts.pop(OPT_KEY_MANUAL_UNTIL, None)
             new_opts.pop(OPT_KEY_MANUAL_TYPE, None)
             new_opts.pop(OPT_KEY_MANUAL_DURATION, None)
@@ -1613,7 +1743,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         self.pause_until = until
         self.pause_duration = minutes
         try:
-            new_opts = {**self.entry.options, OPT_KEY_PAUSE_UNTIL: until.isoformat(), OPT_KEY_PAUSE_DURATION: minutes}
+            new_opts = {**self._options_snapshot(), OPT_KEY_PAUSE_UNTIL: until.isoformat(), OPT_KEY_PAUSE_DURATION: minutes}
             await self._async_update_entry_options(new_opts)
         except Exception:
             _LOGGER.exception("Fehler beim Speichern von pause timer")
@@ -1629,7 +1759,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         self.pause_until = None
         self.pause_duration = None
         try:
-            new_opts = {**self.entry.options}
+            new_opts = self._options_snapshot()
             new_opts.pop(OPT_KEY_PAUSE_UNTIL, None)
             new_opts.pop(OPT_KEY_PAUSE_DURATION, None)
             await self._async_update_entry_options(new_opts)
@@ -1648,7 +1778,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         self.auto_filter_duration = run_minutes
         self.next_filter_start = next_start
         try:
-            new_opts = {**self.entry.options}
+            new_opts = self._options_snapshot()
             new_opts[OPT_KEY_AUTO_FILTER_UNTIL] = until.isoformat()
             new_opts[OPT_KEY_AUTO_FILTER_DURATION] = run_minutes
             new_opts[OPT_KEY_FILTER_NEXT] = next_start.isoformat()
@@ -1667,7 +1797,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         try:
             next_start = now + timedelta(minutes=self.filter_interval)
             self.next_filter_start = next_start
-            new_opts = {**self.entry.options}
+            new_opts = self._options_snapshot()
             new_opts.pop(OPT_KEY_AUTO_FILTER_UNTIL, None)
             new_opts.pop(OPT_KEY_AUTO_FILTER_DURATION, None)
             new_opts[OPT_KEY_FILTER_NEXT] = next_start.isoformat()
@@ -1683,7 +1813,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
 
         self.maintenance_active = active
         try:
-            new_opts = {**self.entry.options}
+            new_opts = self._options_snapshot()
             if active:
                 new_opts[OPT_KEY_MAINTENANCE_ACTIVE] = True
                 # Maintenance is a hard lockout: disable HVAC + clear timers so we don't auto-resume.
@@ -1737,7 +1867,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
             return
 
         self.away_active = active
-        merged = {**(self.entry.data or {}), **(self.entry.options or {})}
+        merged = {**(self.entry.data or {}), **self._options_snapshot()}
         try:
             away_temp = float(merged.get(CONF_AWAY_TEMP, DEFAULT_AWAY_TEMP))
         except Exception:
@@ -1753,7 +1883,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         away_temp = max(min_t, min(max_t, away_temp))
 
         try:
-            new_opts = {**self.entry.options}
+            new_opts = self._options_snapshot()
 
             if active:
                 # Ensure maintenance is off so filter/frost can run.
@@ -1829,14 +1959,14 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         ):
             return
 
-        merged = {**(self.entry.data or {}), **(self.entry.options or {})}
+        merged = {**(self.entry.data or {}), **self._options_snapshot()}
         if active and (not self._power_saving_config_ready(merged)):
             _LOGGER.warning("Power-saving mode cannot be enabled: required sensors not configured")
             return
 
         self.power_saving_active = active
         try:
-            new_opts = {**self.entry.options}
+            new_opts = self._options_snapshot()
             if active:
                 self.maintenance_active = False
                 self.away_active = False
@@ -1872,7 +2002,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
 
         self.manual_mode_active = active
         try:
-            new_opts = {**self.entry.options}
+            new_opts = self._options_snapshot()
             if active:
                 # Manual mode is mutually exclusive with automation presets.
                 self.maintenance_active = False
@@ -1903,7 +2033,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
 
         self.boost_active = active
         try:
-            new_opts = {**self.entry.options}
+            new_opts = self._options_snapshot()
             if active:
                 # Boost activates heating until target temperature is reached.
                 # Initialize boost_until as a sentinel (will be checked in _async_update_data).
@@ -1939,7 +2069,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
             return
         self.hvac_enabled = enabled
         try:
-            new_opts = {**(self.entry.options or {})}
+            new_opts = self._options_snapshot()
             if enabled:
                 new_opts[OPT_KEY_HVAC_ENABLED] = True
             else:
@@ -1952,7 +2082,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         """User-triggered heat-to-target: uses the bathing manual timer with an estimated duration."""
         if not self.entry:
             return
-        conf = {**(self.entry.data or {}), **(self.entry.options or {})}
+        conf = {**(self.entry.data or {}), **self._options_snapshot()}
         water_temp = self._get_float(conf.get(CONF_TEMP_WATER))
         est = self._estimate_minutes_to_target(conf, water_temp)
         # If we can't estimate, fall back to a sensible default.
@@ -1972,7 +2102,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         now = dt_util.now()
         block_until = None
         try:
-            conf = {**(self.entry.data or {}), **(self.entry.options or {})}
+            conf = {**(self.entry.data or {}), **self._options_snapshot()}
             cal = await self._get_next_event(conf.get(CONF_POOL_CALENDAR))
             cal_ongoing = (cal or {}).get("ongoing") or {}
             start = cal_ongoing.get("start")
@@ -1984,7 +2114,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
 
         self.bathing_block_until = block_until
         try:
-            new_opts = {**(self.entry.options or {})}
+            new_opts = self._options_snapshot()
             if block_until:
                 new_opts[OPT_KEY_BATHING_BLOCK_UNTIL] = block_until.isoformat()
             else:
@@ -2001,20 +2131,387 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
             return
         self.target_temp = temperature
         try:
-            new_opts = {**(self.entry.options or {})}
+            new_opts = self._options_snapshot()
             new_opts[OPT_KEY_TARGET_TEMP] = temperature
             await self._async_update_entry_options(new_opts)
         except Exception:
             _LOGGER.exception("Fehler beim Speichern von target_temp")
 
+    @staticmethod
+    def _update_interval_for_mode(event_driven: bool) -> timedelta:
+        if event_driven:
+            return timedelta(seconds=DEFAULT_HEARTBEAT_INTERVAL_SECONDS)
+        return timedelta(seconds=DEFAULT_UPDATE_INTERVAL_SECONDS)
+
+    def _event_input_entities(self, conf: dict) -> frozenset[str]:
+        """Entities whose state changes should trigger an immediate recompute.
+
+        Power meters (main/aux power, house load) report every few seconds and only feed
+        cost accounting; they are read on the next cycle instead of triggering one.
+        """
+        entities = set()
+        for key in (
+            CONF_TEMP_WATER,
+            CONF_TEMP_OUTDOOR,
+            CONF_PV_SURPLUS_SENSOR,
+            CONF_ELECTRICITY_PRICE_ENTITY,
+            CONF_FEED_IN_TARIFF_ENTITY,
+            CONF_PH_SENSOR,
+            CONF_CHLORINE_SENSOR,
+            CONF_SALT_SENSOR,
+            CONF_TDS_SENSOR,
+        ):
+            eid = conf.get(key)
+            if eid and isinstance(eid, str):
+                entities.add(eid)
+        for key in (CONF_MAIN_SWITCH, CONF_PUMP_SWITCH, CONF_AUX_HEATING_SWITCH):
+            try:
+                eid = self._resolve_external_actuator_entity(conf, key)
+            except Exception:
+                eid = None
+            if eid and isinstance(eid, str):
+                entities.add(eid)
+        return frozenset(entities)
+
+    @callback
+    def async_sync_input_listeners(self, conf: dict | None = None) -> None:
+        """(Re-)subscribe to input state changes when mode or configured entities changed."""
+        try:
+            if conf is None:
+                conf = {**(self.entry.data or {}), **self._options_snapshot()}
+            event_driven = bool(conf.get(CONF_ENABLE_EVENT_DRIVEN_UPDATES, DEFAULT_ENABLE_EVENT_DRIVEN_UPDATES))
+            if event_driven != self.event_driven:
+                self.event_driven = event_driven
+                self.update_interval = self._update_interval_for_mode(event_driven)
+            wanted = self._event_input_entities(conf) if event_driven else frozenset()
+            pv_surplus_id = conf.get(CONF_PV_SURPLUS_SENSOR)
+            self._input_deadbands = (
+                {pv_surplus_id: EVENT_PV_SURPLUS_DEADBAND_W} if pv_surplus_id and pv_surplus_id in wanted else {}
+            )
+            if wanted == self._input_listener_entities and (self._unsub_input_listener is not None or not wanted):
+                return
+            if self._unsub_input_listener is not None:
+                self._unsub_input_listener()
+                self._unsub_input_listener = None
+            self._input_listener_entities = wanted
+            if wanted:
+                self._unsub_input_listener = async_track_state_change_event(
+                    self.hass, sorted(wanted), self._async_handle_input_event
+                )
+                _LOGGER.debug("Event-driven updates for %s: %s", getattr(self.entry, "entry_id", None), sorted(wanted))
+        except Exception:
+            _LOGGER.exception("Fehler beim Einrichten der Event-Listener")
+
+    @callback
+    def async_stop_input_listeners(self) -> None:
+        """Remove state-change subscriptions and pending wake-ups (called on unload)."""
+        if self._unsub_input_listener is not None:
+            self._unsub_input_listener()
+            self._unsub_input_listener = None
+        self._input_listener_entities = frozenset()
+        self._input_trigger_values.clear()
+        self._calendar_cache.async_release(self._calendar_owner)
+        self._snapshot_waits.clear()
+        self._actuators.async_stop()
+        if self._unsub_deadline_wakeup is not None:
+            self._unsub_deadline_wakeup()
+            self._unsub_deadline_wakeup = None
+        self._deadline_wakeup_at = None
+
+    @callback
+    def _async_handle_input_event(self, event) -> None:
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        # Attribute-only updates do not change any input value we read.
+        if old_state is not None and new_state is not None and old_state.state == new_state.state:
+            return
+        entity_id = event.data.get("entity_id")
+        deadband = self._input_deadbands.get(entity_id)
+        if deadband is not None and new_state is not None:
+            try:
+                value = float(new_state.state)
+            except (TypeError, ValueError):
+                value = None
+            if value is not None:
+                last = self._input_trigger_values.get(entity_id)
+                if last is not None and abs(value - last) < deadband:
+                    return
+                self._input_trigger_values[entity_id] = value
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_schedule_deadline_wakeup(self, now: datetime) -> None:
+        """Wake up exactly at the next timer deadline when it falls before the next heartbeat."""
+        if not self.event_driven:
+            return
+        try:
+            horizon = now + (self.update_interval or timedelta(seconds=DEFAULT_HEARTBEAT_INTERVAL_SECONDS))
+            candidates = [
+                getattr(self, name, None)
+                for name in (
+                    "manual_timer_until",
+                    "auto_filter_until",
+                    "pause_until",
+                    "boost_until",
+                    "frost_timer_until",
+                    "bathing_block_until",
+                    "next_filter_start",
+                )
+            ]
+            deadline = None
+            for cand in candidates:
+                if not isinstance(cand, datetime) or cand <= now or cand >= horizon:
+                    continue
+                if deadline is None or cand < deadline:
+                    deadline = cand
+            if deadline == self._deadline_wakeup_at:
+                return
+            if self._unsub_deadline_wakeup is not None:
+                self._unsub_deadline_wakeup()
+                self._unsub_deadline_wakeup = None
+            self._deadline_wakeup_at = deadline
+            if deadline is None:
+                return
+
+            @callback
+            def _wakeup(_now) -> None:
+                self._unsub_deadline_wakeup = None
+                self._deadline_wakeup_at = None
+                self.hass.async_create_task(self.async_request_refresh())
+
+            self._unsub_deadline_wakeup = async_track_point_in_utc_time(
+                self.hass, _wakeup, dt_util.as_utc(deadline) + timedelta(seconds=1)
+            )
+        except Exception:
+            _LOGGER.debug("Could not schedule timer wake-up for %s", getattr(self.entry, "entry_id", None))
+
+    @property
+    def config(self) -> ConfigSnapshot:
+        """Parsed configuration; rebuilt only when entry data or options were replaced."""
+        data = self.entry.data if self.entry else None
+        options = self.entry.options if self.entry else None
+        source = self._config_source
+        if self._config is None or source is None or source[0] is not data or source[1] is not options:
+            self._config = ConfigSnapshot.from_conf({**(data or {}), **(options or {})})
+            self._config_source = (data, options)
+        return self._config
+
+    def invalidate_config(self) -> None:
+        """Drop the config snapshot and all cached stage outputs after an options change."""
+        self._config = None
+        self._config_source = None
+        self._pipeline.invalidate()
+        # Entities may render options directly (config sensors); publish everything once.
+        self._published_data = None
+
+    def _quiet_calendar_for(self, conf: dict, now: datetime, holidays: frozenset[date]) -> QuietCalendar:
+        """Quiet-time calendar for the coming days; rebuilt on config, day or holiday change."""
+        calendar = self._quiet_calendar
+        if calendar is None or calendar.key != QuietCalendar.cache_key(conf, now, holidays):
+            calendar = self._quiet_calendar = QuietCalendar.from_conf(conf, now, holidays)
+        return calendar
+
+    def _schedule_timeline(self, now: datetime, inputs: TimelineInputs, quiet: QuietCalendar) -> ScheduleTimeline:
+        """Planned runs for the next 48 h; rebuilt only when an input changed or the horizon rolled on."""
+        timeline = self._timeline
+        if timeline is None or timeline.stale(now) or timeline.key != ScheduleTimeline.cache_key(inputs, quiet):
+            timeline = self._timeline = ScheduleTimeline.build(now, inputs, quiet)
+        return timeline
+
+    def _cost_plan_for(
+        self,
+        conf: dict,
+        now: datetime,
+        inputs: TimelineInputs,
+        quiet: QuietCalendar,
+        timeline: ScheduleTimeline,
+        fallback_price: float | None,
+        *,
+        filter_power_w: float,
+        heat_power_w: float,
+        min_gap_minutes: int,
+    ) -> CostPlan:
+        """Cheapest feasible filter/preheat placement for the next 24 h; replanned per slot or input change.
+
+        Starts that are reached (or fall into the current slot) are kept: the replan at each
+        slot boundary would otherwise push them into the next slot again and again.
+        """
+        # The heuristic start stays the baseline until something else (manual run, stop, merge) moved the filter.
+        if self._cost_plan_applied_start is not None and self.next_filter_start != self._cost_plan_applied_start:
+            self._cost_plan_heuristic_start = None
+            self._cost_plan_applied_start = None
+        if inputs.next_filter_start is not None and inputs.next_filter_start < self._cost_slot_end(now):
+            base_inputs = inputs
+        else:
+            base_inputs = replace(inputs, next_filter_start=self._cost_plan_heuristic_start or inputs.next_filter_start)
+
+        event_start = inputs.event_start
+        committed = self._cost_plan_preheat
+        if committed is not None and (committed[0] != event_start or now >= committed[0]):
+            committed = None
+        previous = self._cost_plan
+        if (
+            committed is None
+            and event_start is not None
+            and previous is not None
+            and previous.preheat is not None
+            and previous.preheat_planned
+            and previous.complete
+            and previous.savings > 0
+            and previous.preheat[1] == event_start
+            and previous.preheat[0] <= now < event_start
+        ):
+            committed = (event_start, previous.preheat[0])
+        self._cost_plan_preheat = committed
+
+        price_entity = conf.get(CONF_ELECTRICITY_PRICE_ENTITY)
+        pv_entity = conf.get(CONF_PV_FORECAST_ENTITY)
+        price_state = self.hass.states.get(price_entity) if price_entity else None
+        pv_state = self.hass.states.get(pv_entity) if pv_entity else None
+        key = (
+            base_inputs,
+            quiet.key,
+            int(now.timestamp() // (SLOT_MINUTES * 60)),
+            getattr(price_state, "last_updated", None),
+            getattr(pv_state, "last_updated", None),
+            fallback_price,
+            round(float(filter_power_w or 0.0), -1),
+            round(float(heat_power_w or 0.0), -1),
+            int(min_gap_minutes or 0),
+            committed,
+        )
+        if self._cost_plan is not None and self._cost_plan_key == key:
+            return self._cost_plan
+
+        # Baseline = the cycle's timeline unless the heuristic filter start differs from the applied one.
+        baseline = timeline if timeline.key == ScheduleTimeline.cache_key(base_inputs, quiet) else self._cost_baseline
+        if baseline is None or baseline.stale(now) or baseline.key != ScheduleTimeline.cache_key(base_inputs, quiet):
+            baseline = self._cost_baseline = ScheduleTimeline.build(now, base_inputs, quiet)
+        # A reused timeline may start before now: only what is still open counts.
+        start = now.replace(second=0, microsecond=0)
+        optimizer = CostOptimizer(
+            now,
+            price_points(price_state.attributes, now) if price_state is not None else [],
+            pv_points(pv_state.attributes) if pv_state is not None else [],
+            fallback_price,
+        )
+        plan = optimizer.solve(
+            CostPlanInputs(
+                filter_power_w=float(filter_power_w or 0.0),
+                heat_power_w=float(heat_power_w or 0.0),
+                min_gap_minutes=int(min_gap_minutes or 0),
+                preheat_minutes=int(inputs.preheat_minutes or 0),
+                event_start=inputs.event_start,
+                preheat_start=committed[1] if committed is not None else None,
+                baseline_filter=baseline.spans(("filter",), start),
+                blocked=baseline.spans(("quiet", "pause"), start),
+                frost_runs=baseline.spans(("frost",), start),
+            )
+        )
+        self._cost_plan = plan
+        self._cost_plan_key = key
+        return plan
+
+    @staticmethod
+    def _cost_slot_end(now: datetime) -> datetime:
+        slot_s = SLOT_MINUTES * 60
+        return dt_util.as_local(dt_util.utc_from_timestamp((now.timestamp() // slot_s + 1) * slot_s))
+
+    @property
+    def timeline(self) -> ScheduleTimeline | None:
+        return self._timeline
+
+    @staticmethod
+    def _changed_data_keys(previous: dict, current: dict) -> frozenset[str]:
+        missing = object()
+        changed = {key for key, value in current.items() if previous.get(key, missing) != value}
+        changed.update(key for key in previous if key not in current)
+        return frozenset(changed)
+
+    def _update_publish_policies(self, conf: dict) -> None:
+        enabled = bool(conf.get(CONF_ENABLE_PUBLISH_DEADBANDS, DEFAULT_ENABLE_PUBLISH_DEADBANDS))
+        overrides = conf.get(CONF_PUBLISH_POLICIES)
+        key = (enabled, repr(overrides))
+        if key != self._publish_policies_key:
+            self.publish_policies = publish_policies(enabled, overrides)
+            self._publish_policies_key = key
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Fan out to the entities; each entity skips the write if none of its keys changed."""
+        data = self.data if isinstance(self.data, dict) else None
+        if (
+            data is None
+            or self._published_data is None
+            or self._published_success != self.last_update_success
+        ):
+            self.changed_keys = None
+        else:
+            self.changed_keys = self._changed_data_keys(self._published_data, data)
+        self._published_data = dict(data) if data is not None else None
+        self._published_success = self.last_update_success
+        super().async_update_listeners()
+
+    def _perf_data(self) -> dict:
+        """Timing of the last completed cycle (None while instrumentation is off)."""
+        perf = self._perf
+        if not perf.enabled or not perf.cycles:
+            return {
+                "update_cycle_ms": None,
+                "update_cycle_p95_ms": None,
+                "update_options_writes": None,
+                "update_service_calls": None,
+                "update_perf": None,
+            }
+        stats = perf.stats()
+        counts = perf.last_counts()
+        return {
+            "update_cycle_ms": stats["cycle_ms"]["last"],
+            "update_cycle_p95_ms": stats["cycle_ms"]["p95"],
+            "update_options_writes": counts.get("options_writes"),
+            "update_service_calls": counts.get("service_calls"),
+            "update_perf": stats,
+        }
+
+    @property
+    def perf(self) -> CycleProfiler:
+        return self._perf
+
+    def _options_snapshot(self) -> dict:
+        """entry.options overlaid with the runtime state (timers, modes, counters)."""
+        options = dict((self.entry.options or {}) if self.entry else {})
+        options.update(self._runtime_state.data)
+        return options
+
+    async def async_flush_runtime_state(self) -> None:
+        # Chemistry history is persisted with a coarser cadence; write the tail now.
+        if self.entry and self._chem_history.seq != self._chem_history_saved_seq:
+            self._runtime_state.update({OPT_KEY_CHEMISTRY_HISTORY: self._chem_history.as_dict()})
+            self._chem_history_saved_seq = self._chem_history.seq
+        await self._runtime_state.async_flush()
+
     async def _async_update_entry_options(self, options: dict) -> None:
-        """Compat wrapper for config entry updates.
+        """Persist an options view built from `_options_snapshot()`.
+
+        Runtime keys are routed to the runtime state store (debounced disk write);
+        the config entry is only updated when real configuration keys changed.
+        Runtime keys missing from `options` are removed from the store.
 
         Home Assistant's `async_update_entry` has historically been a callback returning bool
         in some versions, while other versions may return an awaitable.
         """
         if not self.entry:
             return
+        self._perf.count("options_writes")
+        with self._perf.within("persistence"):
+            await self._async_write_entry_options(options)
+
+    async def _async_write_entry_options(self, options: dict) -> None:
+        runtime_values = {k: v for k, v in options.items() if k in RUNTIME_STATE_KEYS}
+        runtime_removed = [k for k in self._runtime_state.data if k not in options]
+        self._runtime_state.update(runtime_values, removed=runtime_removed)
+
+        config_options = {k: v for k, v in options.items() if k not in RUNTIME_STATE_KEYS}
         # Preserve sticky config keys (calendar/weather guard) when updating options.
         try:
             merged = {**(self.entry.data or {}), **(self.entry.options or {})}
@@ -2029,11 +2526,13 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
                 CONF_QUIET_START_WEEKEND,
                 CONF_QUIET_END_WEEKEND,
             ):
-                if key in merged and key not in options:
-                    options[key] = merged.get(key)
+                if key in merged and key not in config_options:
+                    config_options[key] = merged.get(key)
         except Exception:
             pass
-        res = self.hass.config_entries.async_update_entry(self.entry, options=options)
+        if config_options == dict(self.entry.options or {}):
+            return
+        res = self.hass.config_entries.async_update_entry(self.entry, options=config_options)
         if inspect.isawaitable(res):
             await res
 
@@ -2048,6 +2547,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         domain = str(entity_id).split(".", 1)[0]
         service = "turn_on" if turn_on else "turn_off"
         call_domain = domain if self.hass.services.has_service(domain, service) else "homeassistant"
+        self._perf.count("service_calls")
         await self.hass.services.async_call(call_domain, service, {"entity_id": entity_id}, blocking=True)
 
     def _is_pool_controller_entity(self, entity_id: str | None) -> bool:
@@ -2082,7 +2582,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         return configured
 
     async def _async_force_pause_off(self) -> None:
-        conf = {**(self.entry.data or {}), **(self.entry.options or {})}
+        conf = {**(self.entry.data or {}), **self._options_snapshot()}
         demo = bool(conf.get(CONF_DEMO_MODE, False))
         if demo:
             return
@@ -2092,16 +2592,18 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         aux_id = self._resolve_external_actuator_entity(conf, CONF_AUX_HEATING_SWITCH)
 
         seen: set[str] = set()
-        for eid in (main_id, pump_id, aux_id):
+        commands = []
+        for role, eid in ((ROLE_MAIN, main_id), (ROLE_PUMP, pump_id), (ROLE_AUX, aux_id)):
             if not eid or eid in seen:
                 continue
             seen.add(eid)
             if self._is_pool_controller_entity(eid):
                 continue
-            try:
-                await self._async_turn_entity(eid, False)
-            except Exception:
-                _LOGGER.exception("Fehler beim Pause-Hard-Off für %s", eid)
+            commands.append(ActuatorCommand(role, eid, False))
+        try:
+            await self._actuators.async_apply(commands)
+        except Exception:
+            _LOGGER.exception("Fehler beim Pause-Hard-Off")
 
     def _thermostat_demand(self, current_temp: float | None, target_temp: float, cold_tolerance: float, hot_tolerance: float, prev_on: bool) -> bool:
         """Simple hysteresis: turn ON below (target-cold), turn OFF at/above (target+hot)."""
@@ -2232,7 +2734,7 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
             )
 
     async def _maybe_persist_credit_state(self, now: datetime) -> None:
-        if not self.entry or self.entry.options is None:
+        if not self.entry:
             return
 
         filter_minutes = float(self._filter_credit_minutes or 0.0)
@@ -2246,32 +2748,22 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         if self._credit_persist_snapshot == snapshot:
             return
 
-        # Throttle saves to reduce churn.
-        try:
-            last_saved = self._credit_persist_last_saved
-            if last_saved and (now - last_saved).total_seconds() < 5 * 60:
-                return
-        except Exception:
-            pass
-
-        opts = {**self.entry.options}
-        opts[OPT_KEY_FILTER_CREDIT_MINUTES] = filter_minutes
-        opts[OPT_KEY_FROST_CREDIT_MINUTES] = frost_minutes
-        opts[OPT_KEY_CREDIT_STREAK_MINUTES] = streak_minutes
-        if streak_source:
-            opts[OPT_KEY_CREDIT_STREAK_SOURCE] = streak_source
-        else:
-            opts.pop(OPT_KEY_CREDIT_STREAK_SOURCE, None)
-        if filter_exp:
-            opts[OPT_KEY_FILTER_CREDIT_EXPIRES_AT] = filter_exp
-        else:
-            opts.pop(OPT_KEY_FILTER_CREDIT_EXPIRES_AT, None)
-        if frost_exp:
-            opts[OPT_KEY_FROST_CREDIT_EXPIRES_AT] = frost_exp
-        else:
-            opts.pop(OPT_KEY_FROST_CREDIT_EXPIRES_AT, None)
-
-        await self._async_update_entry_options(opts)
+        values = {
+            OPT_KEY_FILTER_CREDIT_MINUTES: filter_minutes,
+            OPT_KEY_FROST_CREDIT_MINUTES: frost_minutes,
+            OPT_KEY_CREDIT_STREAK_MINUTES: streak_minutes,
+        }
+        removed = []
+        for key, value in (
+            (OPT_KEY_CREDIT_STREAK_SOURCE, streak_source),
+            (OPT_KEY_FILTER_CREDIT_EXPIRES_AT, filter_exp),
+            (OPT_KEY_FROST_CREDIT_EXPIRES_AT, frost_exp),
+        ):
+            if value:
+                values[key] = value
+            else:
+                removed.append(key)
+        self._runtime_state.update(values, removed=removed)
         self._credit_persist_last_saved = now
         self._credit_persist_snapshot = snapshot
 
@@ -2285,2465 +2777,2598 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
 
         try:
             _LOGGER.debug("Coordinator update start (%s)", getattr(self.entry, "entry_id", None))
-            now = dt_util.now()
-            conf = {**self.entry.data, **self.entry.options}
-
+            # Stages run in order and only see their declared inputs (see pipeline.py).
+            cycle = UpdateCycle()
+            for handler in self._CYCLE_STAGES:
+                stage = handler.cycle_stage
+                cycle.provide(stage, await handler(self, **cycle.inputs(stage)))
+            data = cycle.values["data"]
+            self._perf.finish()
+            data.update(self._perf_data())
+            return data
+        except asyncio.CancelledError:
+            # Update was cancelled (e.g., overlapping refresh). Keep cached data to
+            # avoid entities flipping to unavailable without a useful log trail.
+            _LOGGER.warning(
+                "Coordinator update cancelled for %s; returning cached data",
+                getattr(self.entry, "entry_id", None),
+            )
+            if getattr(self, "data", None):
+                return self.data
+            self.data = _safe_defaults
+            return self.data
+        except Exception as err:
+            # Prefer to keep last known good data to avoid entities becoming
+            # unavailable on transient errors (reduces UI/sensor flapping).
             try:
-                ent_reg = er.async_get(self.hass)
+                _LOGGER.exception("Update Error (using cached data if available): %s", err)
             except Exception:
-                ent_reg = None
+                _LOGGER.error("Update Error: %s", err)
 
-            def _is_own_integration_entity(entity_id: str | None) -> bool:
-                if not entity_id or not ent_reg:
-                    return False
-                try:
-                    ent = ent_reg.async_get(entity_id)
-                    return bool(ent and ent.config_entry_id == getattr(self.entry, "entry_id", None))
-                except Exception:
-                    return False
+            # If we have previously cached data, return it instead of raising
+            # UpdateFailed so HA doesn't mark entities unavailable.
+            # If we have previously cached data, return it instead of raising
+            if getattr(self, "data", None):
+                _LOGGER.warning(
+                    "Returning cached coordinator.data for %s after transient error",
+                    getattr(self.entry, "entry_id", None),
+                )
+                return self.data
 
-            def _resolve_actuator_entity(conf_key: str) -> str | None:
-                configured = conf.get(conf_key)
-                options = self.entry.options or {}
-                has_option_override = conf_key in options
-
-                if has_option_override and (configured is None or str(configured).strip() == ""):
-                    return None
-
-                if configured and not _is_own_integration_entity(configured):
-                    return configured
-
-                # If options accidentally point to this integration's proxy switch,
-                # prefer the original setup value from entry.data when available.
-                if not has_option_override:
-                    fallback = (self.entry.data or {}).get(conf_key)
-                    if fallback and (fallback != configured) and (not _is_own_integration_entity(fallback)):
-                        _LOGGER.warning(
-                            "Ignoring invalid %s=%s (pool_controller entity); using %s from setup data",
-                            conf_key,
-                            configured,
-                            fallback,
-                        )
-                        return fallback
-                return configured
+            # No cached data available: return safe defaults to avoid immediate entity unavailability
+            _LOGGER.warning(
+                "No cached coordinator.data available for %s; returning safe defaults",
+                getattr(self.entry, "entry_id", None),
+            )
+            # also persist so subsequent failures return this
+            self.data = _safe_defaults
+            return self.data
 
-            def _entity_reachable(entity_id: str | None) -> bool | None:
-                if not entity_id:
-                    return None
-                state = self.hass.states.get(entity_id)
-                if state is None:
-                    return False
-                raw = str(state.state or "").strip().lower()
-                if raw in ("unknown", "unavailable"):
-                    return False
-                if raw in ("on", "home", "connected", "true", "1"):
-                    return True
-                if raw in ("off", "not_home", "disconnected", "false", "0"):
-                    return False
-                return True
+    @cycle_stage(
+        "inputs",
+        outputs=(
+            "now", "conf", "cfg", "main_switch_id", "pump_switch_id", "aux_switch_id", "demo",
+            "main_switch_on", "pump_switch_on", "aux_heating_switch_on", "maintenance_active", "holidays",
+            "we_or_holiday", "pause_active", "manual_active", "manual_mins", "auto_filter_active",
+            "auto_filter_mins", "water_temp", "outdoor_temp", "blueriiot_enabled", "blueriiot_reading",
+            "blueriiot_interval", "blueriiot_night_active", "use_blueriiot_reading", "sensor_health_esp32_ok",
+            "sensor_health_water_sensor_ok", "sensor_health_status", "sensor_health_message", "dynamic_target",
+            "target_temp_base", "target_temp_effective",
+        ),
+    )
+    async def _async_cycle_inputs(self) -> dict:
+        """Options, modes, timers, switch and sensor states, BlueRiiot, target temperature."""
+        now = dt_util.now()
+        conf = {**self.entry.data, **self._options_snapshot()}
+        perf = self._perf
+        perf.start(bool(conf.get(CONF_ENABLE_PERF_INSTRUMENTATION, DEFAULT_ENABLE_PERF_INSTRUMENTATION)))
+        cfg = self.config
+        self._snapshot_ages = {}
+        self.async_sync_input_listeners(conf)
+        self._update_publish_policies(conf)
+        self._calendar_cache.async_track(
+            self._calendar_owner, (conf.get(CONF_POOL_CALENDAR), conf.get(CONF_HOLIDAY_CALENDAR))
+        )
 
-            def _device_reachable(device_id: str | None) -> bool | None:
-                if not device_id or not ent_reg:
-                    return None
-                try:
-                    entries = er.async_entries_for_device(ent_reg, device_id, include_disabled_entities=False)
-                except Exception:
-                    entries = []
-                seen = False
-                for entry in entries:
-                    state = self.hass.states.get(entry.entity_id)
-                    if state is None:
-                        continue
-                    seen = True
-                    if str(state.state or "").strip().lower() not in ("unknown", "unavailable"):
-                        return True
-                return False if seen else None
+        try:
+            ent_reg = er.async_get(self.hass)
+        except Exception:
+            ent_reg = None
 
-            # Keep aux_allowed in sync with persisted options.
-            aux_feature_enabled = bool(
-                conf.get(
-                    CONF_ENABLE_AUX_HEATING,
-                    getattr(self, "aux_allowed", getattr(self, "aux_enabled", False)),
-                )
-            )
-            persisted_aux_allowed = conf.get(OPT_KEY_AUX_ALLOWED)
-            if persisted_aux_allowed is None:
-                self.aux_allowed = aux_feature_enabled
-            else:
-                self.aux_allowed = aux_feature_enabled and bool(persisted_aux_allowed)
-            # Keep legacy alias in sync
-            self.aux_enabled = self.aux_allowed
-
-            # Physical switch entity IDs (may be external entities). Used for state mirroring.
-            main_switch_id = _resolve_actuator_entity(CONF_MAIN_SWITCH)
-            pump_switch_id = _resolve_actuator_entity(CONF_PUMP_SWITCH) or main_switch_id
-            aux_switch_id = _resolve_actuator_entity(CONF_AUX_HEATING_SWITCH)
-            demo = conf.get(CONF_DEMO_MODE, False)
-
-            # Mirror physical switch states (best-effort; unknown/unavailable -> False).
-            main_sw_state = self.hass.states.get(main_switch_id) if main_switch_id else None
-            pump_sw_state = self.hass.states.get(pump_switch_id) if pump_switch_id else None
-            aux_sw_state = self.hass.states.get(aux_switch_id) if aux_switch_id else None
-            main_switch_on = bool(main_sw_state and main_sw_state.state == "on")
-            pump_switch_on = bool(pump_sw_state and pump_sw_state.state == "on")
-            aux_heating_switch_on = bool(aux_sw_state and aux_sw_state.state == "on")
-
-            maintenance_active = bool(conf.get(OPT_KEY_MAINTENANCE_ACTIVE, False))
-            # Keep attribute in sync so other entities (e.g. climate) can read it.
-            self.maintenance_active = maintenance_active
-
-            # HVAC enabled state (independent from maintenance).
-            self.hvac_enabled = bool(conf.get(OPT_KEY_HVAC_ENABLED, True))
-            # Away mode flag (reduced activity)
-            self.away_active = bool(conf.get(OPT_KEY_AWAY_ACTIVE, False))
-            # Power-saving mode flag (PV-prioritized operation)
-            self.power_saving_active = bool(conf.get(OPT_KEY_POWER_SAVING_ACTIVE, False))
-            # Boost mode flag (rapid heating after water change)
-            self.boost_active = bool(conf.get(OPT_KEY_BOOST_ACTIVE, False))
-            self.manual_mode_active = bool(conf.get(OPT_KEY_MANUAL_MODE_ACTIVE, False))
-
-            # Expire persisted chemistry cooldown block.
+        def _is_own_integration_entity(entity_id: str | None) -> bool:
+            if not entity_id or not ent_reg:
+                return False
             try:
-                if self.chem_block_until and now >= self.chem_block_until:
-                    await self._set_chem_block_until(None)
+                ent = ent_reg.async_get(entity_id)
+                return bool(ent and ent.config_entry_id == getattr(self.entry, "entry_id", None))
             except Exception:
-                pass
-            
-            # Restore boost timer if present
-            bu = conf.get(OPT_KEY_BOOST_UNTIL)
-            if bu:
-                try:
-                    self.boost_until = dt_util.parse_datetime(bu)
-                except Exception:
-                    self.boost_until = None
+                return False
 
-            # First run: migrate legacy timer options (best effort)
-            await self.async_migrate_legacy_timers()
-            
-            # Sensors
-            water_temp = self._get_float(conf.get(CONF_TEMP_WATER))
-            outdoor_temp = self._get_float(conf.get(CONF_TEMP_OUTDOOR))
-
-            blueriiot_enabled = bool(conf.get(CONF_ENABLE_BLUERIIOT, DEFAULT_ENABLE_BLUERIIOT))
-            blueriiot_reading = None
-            blueriiot_interval = DEFAULT_BLUERIIOT_INTERVAL_MINUTES
-            blueriiot_night_active = False
-            blueriiot_last_success_before = self._blueriiot_reader.last_success
-            blueriiot_reading_fresh = False
-            if blueriiot_enabled and str(conf.get(CONF_BLUERIIOT_MAC) or "").strip():
-                try:
-                    blueriiot_interval, blueriiot_night_active = self._blueriiot_interval_for_time(conf, now)
-                    blueriiot_reading = await self._blueriiot_reader.async_read_if_due(
-                        str(conf[CONF_BLUERIIOT_MAC]).strip(), timedelta(minutes=blueriiot_interval)
-                    )
-                    blueriiot_reading_fresh = bool(
-                        blueriiot_reading is not None
-                        and self._blueriiot_reader.last_success != blueriiot_last_success_before
-                    )
-                except Exception:
-                    _LOGGER.exception("BlueRiiot reading failed")
+        def _resolve_actuator_entity(conf_key: str) -> str | None:
+            configured = conf.get(conf_key)
+            options = self.entry.options or {}
+            has_option_override = conf_key in options
 
-            use_blueriiot_reading = bool(
-                blueriiot_reading is not None
-                and self._blueriiot_reader.is_recently_reachable(
-                    timedelta(minutes=blueriiot_interval * 2)
-                )
-            )
+            if has_option_override and (configured is None or str(configured).strip() == ""):
+                return None
 
-            if use_blueriiot_reading:
-                water_temp = blueriiot_reading.temperature
-
-            sensor_health_enabled = bool(conf.get(CONF_ENABLE_SENSOR_HEALTH, DEFAULT_ENABLE_SENSOR_HEALTH))
-            sensor_health_esp32_ok = None
-            sensor_health_water_sensor_ok = None
-            sensor_health_status = "disabled"
-            sensor_health_message = "disabled"
-            if sensor_health_enabled:
-                sensor_health_esp32_ok = _device_reachable(conf.get(CONF_SENSOR_HEALTH_ESP32_DEVICE))
-                if use_blueriiot_reading:
-                    sensor_health_water_sensor_ok = self._blueriiot_reader.is_recently_reachable(
-                        timedelta(minutes=blueriiot_interval * 2)
+            if configured and not _is_own_integration_entity(configured):
+                return configured
+
+            # If options accidentally point to this integration's proxy switch,
+            # prefer the original setup value from entry.data when available.
+            if not has_option_override:
+                fallback = (self.entry.data or {}).get(conf_key)
+                if fallback and (fallback != configured) and (not _is_own_integration_entity(fallback)):
+                    _LOGGER.warning(
+                        "Ignoring invalid %s=%s (pool_controller entity); using %s from setup data",
+                        conf_key,
+                        configured,
+                        fallback,
                     )
-                else:
-                    sensor_health_water_sensor_ok = _entity_reachable(conf.get(CONF_SENSOR_HEALTH_WATER_SENSOR))
-                monitored = [v for v in (sensor_health_esp32_ok, sensor_health_water_sensor_ok) if v is not None]
-                if not monitored:
-                    sensor_health_status = "unknown"
-                    sensor_health_message = "not_configured"
-                elif any(v is False for v in monitored):
-                    sensor_health_status = "problem"
-                    if sensor_health_esp32_ok is False and sensor_health_water_sensor_ok is False:
-                        sensor_health_message = "esp32_and_water_sensor_unreachable"
-                    elif sensor_health_esp32_ok is False:
-                        sensor_health_message = "esp32_unreachable"
-                    else:
-                        sensor_health_message = "water_sensor_unreachable"
-                else:
-                    sensor_health_status = "ok"
-                    sensor_health_message = "ok"
-
-            dynamic_target = await self._compute_dynamic_target(conf, water_temp, outdoor_temp, now)
-            self.target_temp_effective = float(dynamic_target.get("effective", self.target_temp))
-            self.target_temp_offset = float(dynamic_target.get("offset", 0.0))
-            self.target_temp_season_offset = float(dynamic_target.get("season_offset", 0.0))
-            self.target_temp_weather_offset = float(dynamic_target.get("weather_offset", 0.0))
-            self.target_temp_profile = str(dynamic_target.get("profile") or "off")
-            self._dynamic_target_last_calc = now
-
-            target_temp_base = float(dynamic_target.get("base", self.target_temp))
-            target_temp_effective = float(dynamic_target.get("effective", self.target_temp))
-
-            ph_val = self._get_float(conf.get(CONF_PH_SENSOR))
-            chlor_val = self._get_float(conf.get(CONF_CHLORINE_SENSOR))
-            salt_val = self._get_float(conf.get(CONF_SALT_SENSOR))
-            conductivity_val = self._get_float(conf.get(CONF_TDS_SENSOR))  # in μS/cm
-            if use_blueriiot_reading:
-                ph_val = blueriiot_reading.ph
-                chlor_val = blueriiot_reading.orp
-                salt_val = blueriiot_reading.salt
-                conductivity_val = blueriiot_reading.conductivity
-            # TDS-Umrechnung: μS/cm * 0.64 = ppm (Standard-Konversionsfaktor)
-            tds_val = round(conductivity_val * 0.64) if conductivity_val else None
-
-            # Sanitizer mode affects how we interpret TDS:
-            # In saltwater/mixed mode, conductivity/TDS is dominated by salt and would otherwise look "too high".
-            # We therefore compute an "effective" TDS (approx. non-salt dissolved solids) by subtracting the
-            # configured target salt baseline (g/L -> ppm). This value is used for status and water-change
-            # recommendations.
-            sanitizer_mode = (conf.get(CONF_SANITIZER_MODE) or "").strip().lower()
-            if sanitizer_mode not in ("chlorine", "saltwater", "mixed"):
-                sanitizer_mode = "saltwater" if bool(conf.get(CONF_ENABLE_SALTWATER, False)) else DEFAULT_SANITIZER_MODE
-            sanitizer_product = (conf.get(CONF_SANITIZER_PRODUCT) or "").strip().lower()
-            if sanitizer_product not in ("dichlor", "trichlor", "cal_hypo", "liquid_chlorine", "salt_cell", "other"):
-                sanitizer_product = "salt_cell" if sanitizer_mode == "saltwater" else DEFAULT_SANITIZER_PRODUCT
-            saltwater_mode = sanitizer_mode in ("saltwater", "mixed")
-            try:
-                target_salt_g_l = float(conf.get(CONF_TARGET_SALT_G_L, DEFAULT_TARGET_SALT_G_L))
-            except Exception:
-                target_salt_g_l = DEFAULT_TARGET_SALT_G_L
-            salt_baseline_ppm = None
-            if saltwater_mode and target_salt_g_l and target_salt_g_l > 0:
-                salt_baseline_ppm = float(target_salt_g_l) * 1000.0
-            tds_effective = None
-            if tds_val is not None:
-                if salt_baseline_ppm is not None:
-                    try:
-                        tds_effective = max(0, int(round(float(tds_val) - salt_baseline_ppm)))
-                    except Exception:
-                        tds_effective = tds_val
-                else:
-                    tds_effective = tds_val
+                    return fallback
+            return configured
 
-            # 2. Chemie (Ziel pH 7.2, Toleranzbereich 7.0-7.4)
-            vol_f = conf.get(CONF_WATER_VOLUME, DEFAULT_VOL) / 1000
-            vol_l = conf.get(CONF_WATER_VOLUME, DEFAULT_VOL)
+        def _entity_reachable(entity_id: str | None) -> bool | None:
+            if not entity_id:
+                return None
+            state = self.hass.states.get(entity_id)
+            if state is None:
+                return False
+            raw = str(state.state or "").strip().lower()
+            if raw in ("unknown", "unavailable"):
+                return False
+            if raw in ("on", "home", "connected", "true", "1"):
+                return True
+            if raw in ("off", "not_home", "disconnected", "false", "0"):
+                return False
+            return True
 
-            # Salz-Empfehlung (nur in saltwater/mixed): benötigte Salzmenge in Gramm
-            salt_add_g = 0
+        def _device_reachable(device_id: str | None) -> bool | None:
+            if not device_id or not ent_reg:
+                return None
             try:
-                if saltwater_mode and vol_l and salt_val is not None and target_salt_g_l and target_salt_g_l > 0:
-                    missing_g_l = max(0.0, float(target_salt_g_l) - float(salt_val))
-                    # g/L * L => g
-                    salt_add_g = int(round(missing_g_l * float(vol_l)))
+                entries = er.async_entries_for_device(ent_reg, device_id, include_disabled_entities=False)
             except Exception:
-                salt_add_g = 0
-            
-            # TDS-Wartung: Status und Wasserwechsel-Empfehlungen
-            tds_status = None
-            tds_water_change_liters = 0
-            tds_water_change_percent = 0
-            tds_high = False
-            water_safety_status = "unknown"
-            water_safety_reason = "missing_data"
-            water_safety_risk = False
-
-            # Alkalinitäts-Schätzung (ppm als CaCO3):
-            # Heuristik aus effektivem TDS + pH (optional ORP-Korrektur).
-            # Ziel ist eine praktikable Orientierung, keine Labor-Analyse.
-            alkalinity_estimated_ppm = None
-            alkalinity_status = "unknown"
-            alkalinity_raise_dose_g = 0
-            alkalinity_lower_dose_g = 0
-            alkalinity_action = "measure_first"
-            alkalinity_total_dose_g = 0
-            alkalinity_step_dose_g = 0
-            alkalinity_steps = 0
-            alkalinity_wait_minutes = 30
-            alkalinity_water_change_percent = 0
-            alkalinity_target_ppm = 110
-            alkalinity_estimated_ppm_raw = None
-            alkalinity_measurement_valid = False
-            alkalinity_measurement_reason = "insufficient_history"
-            alkalinity_history_samples = 0
+                entries = []
+            seen = False
+            for entry in entries:
+                state = self.hass.states.get(entry.entity_id)
+                if state is None:
+                    continue
+                seen = True
+                if str(state.state or "").strip().lower() not in ("unknown", "unavailable"):
+                    return True
+            return False if seen else None
 
-            # Use effective TDS for maintenance interpretation (see above).
-            tds_for_maintenance = tds_effective if tds_effective is not None else tds_val
-            try:
-                target_tds = int(conf.get(CONF_CHEM_TARGET_TDS_PPM, DEFAULT_CHEM_TARGET_TDS_PPM))
-            except Exception:
-                target_tds = DEFAULT_CHEM_TARGET_TDS_PPM
-            target_tds = max(500, min(3500, int(target_tds)))
+        # Keep aux_allowed in sync with persisted options.
+        aux_feature_enabled = bool(
+            conf.get(
+                CONF_ENABLE_AUX_HEATING,
+                getattr(self, "aux_allowed", getattr(self, "aux_enabled", False)),
+            )
+        )
+        persisted_aux_allowed = conf.get(OPT_KEY_AUX_ALLOWED)
+        if persisted_aux_allowed is None:
+            self.aux_allowed = aux_feature_enabled
+        else:
+            self.aux_allowed = aux_feature_enabled and bool(persisted_aux_allowed)
+        # Keep legacy alias in sync
+        self.aux_enabled = self.aux_allowed
+
+        # Physical switch entity IDs (may be external entities). Used for state mirroring.
+        main_switch_id = _resolve_actuator_entity(CONF_MAIN_SWITCH)
+        pump_switch_id = _resolve_actuator_entity(CONF_PUMP_SWITCH) or main_switch_id
+        aux_switch_id = _resolve_actuator_entity(CONF_AUX_HEATING_SWITCH)
+        demo = conf.get(CONF_DEMO_MODE, False)
+
+        # Mirror physical switch states (best-effort; unknown/unavailable -> False).
+        main_sw_state = self.hass.states.get(main_switch_id) if main_switch_id else None
+        pump_sw_state = self.hass.states.get(pump_switch_id) if pump_switch_id else None
+        aux_sw_state = self.hass.states.get(aux_switch_id) if aux_switch_id else None
+        main_switch_on = bool(main_sw_state and main_sw_state.state == "on")
+        pump_switch_on = bool(pump_sw_state and pump_sw_state.state == "on")
+        aux_heating_switch_on = bool(aux_sw_state and aux_sw_state.state == "on")
+
+        maintenance_active = bool(conf.get(OPT_KEY_MAINTENANCE_ACTIVE, False))
+        # Keep attribute in sync so other entities (e.g. climate) can read it.
+        self.maintenance_active = maintenance_active
+
+        # HVAC enabled state (independent from maintenance).
+        self.hvac_enabled = bool(conf.get(OPT_KEY_HVAC_ENABLED, True))
+        # Away mode flag (reduced activity)
+        self.away_active = bool(conf.get(OPT_KEY_AWAY_ACTIVE, False))
+        # Power-saving mode flag (PV-prioritized operation)
+        self.power_saving_active = bool(conf.get(OPT_KEY_POWER_SAVING_ACTIVE, False))
+        # Boost mode flag (rapid heating after water change)
+        self.boost_active = bool(conf.get(OPT_KEY_BOOST_ACTIVE, False))
+        self.manual_mode_active = bool(conf.get(OPT_KEY_MANUAL_MODE_ACTIVE, False))
+
+        # Expire persisted chemistry cooldown block.
+        try:
+            if self.chem_block_until and now >= self.chem_block_until:
+                await self._set_chem_block_until(None)
+        except Exception:
+            pass
 
+        # Restore boost timer if present
+        bu = conf.get(OPT_KEY_BOOST_UNTIL)
+        if bu:
             try:
-                alkalinity_target_ppm = int(conf.get(CONF_CHEM_TARGET_ALKALINITY_PPM, DEFAULT_CHEM_TARGET_ALKALINITY_PPM))
+                self.boost_until = dt_util.parse_datetime(bu)
             except Exception:
-                alkalinity_target_ppm = DEFAULT_CHEM_TARGET_ALKALINITY_PPM
-            alkalinity_target_ppm = max(70, min(160, int(alkalinity_target_ppm)))
-            alk_low_threshold = max(50, alkalinity_target_ppm - 30)
-            alk_high_threshold = min(220, alkalinity_target_ppm + 30)
+                self.boost_until = None
 
-            try:
-                conf_min_samples = int(conf.get(CONF_CHEM_MIN_STABLE_SAMPLES, DEFAULT_CHEM_MIN_STABLE_SAMPLES))
-            except Exception:
-                conf_min_samples = DEFAULT_CHEM_MIN_STABLE_SAMPLES
-            conf_min_samples = max(2, min(12, int(conf_min_samples)))
+        # First run: migrate legacy timer options (best effort)
+        await self.async_migrate_legacy_timers()
 
-            try:
-                conf_lookback_minutes = int(conf.get(CONF_CHEM_HISTORY_LOOKBACK_MINUTES, DEFAULT_CHEM_HISTORY_LOOKBACK_MINUTES))
-            except Exception:
-                conf_lookback_minutes = DEFAULT_CHEM_HISTORY_LOOKBACK_MINUTES
-            conf_lookback_minutes = max(120, min(24 * 60, int(conf_lookback_minutes)))
+        holidays = self._holiday_dates(
+            self._snapshot(self._calendar_cache, "holiday_calendar", conf.get(CONF_HOLIDAY_CALENDAR)), now
+        )
+        is_holiday = dt_util.as_local(now).date() in holidays
+        we_or_holiday = is_holiday or (now.weekday() >= 5)
 
-            try:
-                chem_cooldown_minutes = int(conf.get(CONF_CHEM_COOLDOWN_MINUTES, DEFAULT_CHEM_COOLDOWN_MINUTES))
-            except Exception:
-                chem_cooldown_minutes = DEFAULT_CHEM_COOLDOWN_MINUTES
-            chem_cooldown_minutes = max(0, min(24 * 60, int(chem_cooldown_minutes)))
+        pause_active = self.pause_until is not None and now < self.pause_until
 
-            if tds_for_maintenance is not None:
-                if tds_for_maintenance < 1500:
-                    tds_status = "optimal"
-                elif tds_for_maintenance < 2000:
-                    tds_status = "good"
-                elif tds_for_maintenance < 2500:
-                    tds_status = "high"
-                    tds_high = True
-                elif tds_for_maintenance < 3000:
-                    tds_status = "critical"
-                    tds_high = True
-                else:
-                    tds_status = "urgent"
-                    tds_high = True
-                
-                # Wasserwechsel-Berechnung: Liter = Volumen × (TDS_aktuell - Ziel) / TDS_aktuell
-                if vol_l and tds_for_maintenance > target_tds:
-                    tds_water_change_liters = round(vol_l * (tds_for_maintenance - target_tds) / tds_for_maintenance)
-                    tds_water_change_percent = round((tds_water_change_liters / vol_l) * 100)
+        manual_active = self.manual_timer_until is not None and now < self.manual_timer_until and self.manual_timer_type in ("bathing", "chlorine", "filter")
+        manual_mins = self._mins_left(self.manual_timer_until, now) if manual_active else 0
 
+        auto_filter_active = self.auto_filter_until is not None and now < self.auto_filter_until
+        auto_filter_mins = self._mins_left(self.auto_filter_until, now) if auto_filter_active else 0
+
+        # Initialisiere next_filter_start wenn nicht gesetzt (z.B. nach Neustart)
+        if not getattr(self, "next_filter_start", None):
+            self.next_filter_start = now + timedelta(minutes=self.filter_interval)
+
+        # Sensors
+        water_temp = self._get_float(conf.get(CONF_TEMP_WATER))
+        outdoor_temp = self._get_float(conf.get(CONF_TEMP_OUTDOOR))
+
+        perf.enter("blueriiot")
+        blueriiot_enabled = bool(conf.get(CONF_ENABLE_BLUERIIOT, DEFAULT_ENABLE_BLUERIIOT))
+        blueriiot_reading = None
+        blueriiot_interval = DEFAULT_BLUERIIOT_INTERVAL_MINUTES
+        blueriiot_night_active = False
+        blueriiot_last_success_before = self._blueriiot_reader.last_success
+        blueriiot_reading_fresh = False
+        if blueriiot_enabled and str(conf.get(CONF_BLUERIIOT_MAC) or "").strip():
             try:
-                ph_float = float(ph_val) if ph_val is not None else None
-            except Exception:
-                ph_float = None
-            try:
-                chlor_float = float(chlor_val) if chlor_val is not None else None
+                blueriiot_interval, blueriiot_night_active = self._blueriiot_interval_for_time(conf, now)
+                self._configure_blueriiot_session(conf)
+                self._blueriiot_reader.async_start_passive(
+                    str(conf[CONF_BLUERIIOT_MAC]).strip(), self._async_handle_blueriiot_advertisement
+                )
+                blueriiot_reading = await self._blueriiot_reader.async_read_if_due(
+                    str(conf[CONF_BLUERIIOT_MAC]).strip(), timedelta(minutes=blueriiot_interval)
+                )
+                blueriiot_reading_fresh = bool(
+                    blueriiot_reading is not None
+                    and self._blueriiot_reader.last_success != blueriiot_last_success_before
+                )
             except Exception:
-                chlor_float = None
-            if ph_float is not None and chlor_float is not None:
-                ph_outside_comfort = ph_float < 7.1 or ph_float > 7.6
-                ph_high = ph_float > 7.8
-                orp_low = chlor_float < 650
-                orp_very_low = chlor_float < 450
-                if orp_very_low:
-                    water_safety_status = "critical"
-                    water_safety_reason = "very_low_orp"
-                elif ph_high and orp_low:
-                    water_safety_status = "critical"
-                    water_safety_reason = "high_ph_low_orp"
-                elif orp_low:
-                    water_safety_status = "warning"
-                    water_safety_reason = "low_orp"
-                elif ph_outside_comfort:
-                    water_safety_status = "warning"
-                    water_safety_reason = "ph_out_of_range"
-                else:
-                    water_safety_status = "ok"
-                    water_safety_reason = "ok"
-                water_safety_risk = water_safety_status in {"warning", "critical"}
-
-            profile = self._chemistry_profile(sanitizer_mode, sanitizer_product)
-            profile["min_samples"] = max(int(profile.get("min_samples", 0) or 0), conf_min_samples)
-            profile["lookback_minutes"] = max(int(profile.get("lookback_minutes", 0) or 0), conf_lookback_minutes)
-            manual_active_now = bool(self.manual_timer_until and now < self.manual_timer_until)
-            manual_type_now = str(self.manual_timer_type or "")
-            pause_active_now = bool(self.pause_until and now < self.pause_until)
-            chem_block_active = bool(self.chem_block_until and now < self.chem_block_until)
-            chem_activity_active = bool(
-                maintenance_active
-                or self.manual_mode_active
-                or self.boost_active
-                or pause_active_now
-                or chem_block_active
-                or (manual_active_now and manual_type_now in ("bathing", "chlorine"))
-            )
+                _LOGGER.exception("BlueRiiot reading failed")
+        else:
+            self._blueriiot_reader.async_stop_passive()
 
-            sensor_jump = False
-            last_sample = (self._chem_history or [])[-1] if self._chem_history else None
-            if isinstance(last_sample, dict):
-                try:
-                    ts_last = dt_util.parse_datetime(str(last_sample.get("ts")))
-                    if ts_last and (now - ts_last).total_seconds() <= max(600, profile["settle_minutes"] * 60):
-                        last_ph = last_sample.get("ph")
-                        last_chlor = last_sample.get("chlor")
-                        last_tds = last_sample.get("tds_effective")
-                        if ph_val is not None and last_ph is not None and abs(float(ph_val) - float(last_ph)) > 0.22:
-                            sensor_jump = True
-                        if chlor_val is not None and last_chlor is not None and abs(float(chlor_val) - float(last_chlor)) > 130:
-                            sensor_jump = True
-                        if tds_for_maintenance is not None and last_tds is not None and abs(float(tds_for_maintenance) - float(last_tds)) > 250:
-                            sensor_jump = True
-                except Exception:
-                    sensor_jump = False
+        use_blueriiot_reading = bool(
+            blueriiot_reading is not None
+            and self._blueriiot_reader.is_recently_reachable(
+                timedelta(minutes=blueriiot_interval * 2)
+            )
+        )
 
-            # Alkalinitäts-Heuristik (Rohwert):
-            # - Basis aus TDS (bzw. effective TDS in Salzbetrieb)
-            # - pH-Korrektur um den Arbeitspunkt 7.2
-            # - kleine ORP-Korrektur, um extremen Oxidationszustand zu berücksichtigen
-            try:
-                if tds_for_maintenance is not None:
-                    tds_ref = max(300.0, min(3000.0, float(tds_for_maintenance)))
-                    alk_base = 40.0 + (0.08 * tds_ref)
+        if use_blueriiot_reading:
+            water_temp = blueriiot_reading.temperature
+
+        perf.enter("sensors")
+        sensor_health_enabled = bool(conf.get(CONF_ENABLE_SENSOR_HEALTH, DEFAULT_ENABLE_SENSOR_HEALTH))
+        sensor_health_esp32_ok = None
+        sensor_health_water_sensor_ok = None
+        sensor_health_status = "disabled"
+        sensor_health_message = "disabled"
+        if sensor_health_enabled:
+            sensor_health_esp32_ok = _device_reachable(conf.get(CONF_SENSOR_HEALTH_ESP32_DEVICE))
+            if use_blueriiot_reading:
+                sensor_health_water_sensor_ok = self._blueriiot_reader.is_recently_reachable(
+                    timedelta(minutes=blueriiot_interval * 2)
+                )
+            else:
+                sensor_health_water_sensor_ok = _entity_reachable(conf.get(CONF_SENSOR_HEALTH_WATER_SENSOR))
+            monitored = [v for v in (sensor_health_esp32_ok, sensor_health_water_sensor_ok) if v is not None]
+            if not monitored:
+                sensor_health_status = "unknown"
+                sensor_health_message = "not_configured"
+            elif any(v is False for v in monitored):
+                sensor_health_status = "problem"
+                if sensor_health_esp32_ok is False and sensor_health_water_sensor_ok is False:
+                    sensor_health_message = "esp32_and_water_sensor_unreachable"
+                elif sensor_health_esp32_ok is False:
+                    sensor_health_message = "esp32_unreachable"
                 else:
-                    alk_base = 95.0
+                    sensor_health_message = "water_sensor_unreachable"
+            else:
+                sensor_health_status = "ok"
+                sensor_health_message = "ok"
 
-                if ph_val is not None:
-                    alk_base += (float(ph_val) - 7.2) * 45.0
+        perf.enter("dynamic_target")
+        dynamic_target = await self._compute_dynamic_target(conf, water_temp, outdoor_temp, now)
+        self.target_temp_effective = float(dynamic_target.get("effective", self.target_temp))
+        self.target_temp_offset = float(dynamic_target.get("offset", 0.0))
+        self.target_temp_season_offset = float(dynamic_target.get("season_offset", 0.0))
+        self.target_temp_weather_offset = float(dynamic_target.get("weather_offset", 0.0))
+        self.target_temp_profile = str(dynamic_target.get("profile") or "off")
+        self._dynamic_target_last_calc = now
 
-                if chlor_val is not None:
-                    alk_base += (float(chlor_val) - 700.0) * 0.015
+        target_temp_base = float(dynamic_target.get("base", self.target_temp))
+        target_temp_effective = float(dynamic_target.get("effective", self.target_temp))
 
-                if (ph_val is not None) or (tds_for_maintenance is not None):
-                    alkalinity_estimated_ppm_raw = int(round(max(20.0, min(240.0, alk_base))))
-            except Exception:
-                alkalinity_estimated_ppm_raw = None
-
-            stable_now = bool((not chem_activity_active) and (not sensor_jump) and (alkalinity_estimated_ppm_raw is not None))
-            if chem_activity_active:
-                alkalinity_measurement_reason = "activity_cooldown" if chem_block_active else "activity"
-            elif sensor_jump:
-                alkalinity_measurement_reason = "sensor_jump"
-            elif alkalinity_estimated_ppm_raw is None:
-                alkalinity_measurement_reason = "missing_data"
-            else:
-                alkalinity_measurement_reason = "insufficient_history"
-
-            should_record_chem_history = not (blueriiot_reading is not None and not use_blueriiot_reading)
-            if should_record_chem_history:
-                self._append_chem_history_sample(
-                    now=now,
-                    ph_val=ph_val,
-                    chlor_val=chlor_val,
-                    tds_effective=tds_for_maintenance,
-                    alk_raw=alkalinity_estimated_ppm_raw,
-                    stable=stable_now,
-                    reason=("ok" if stable_now else alkalinity_measurement_reason),
-                )
+        return {
+            "now": now,
+            "conf": conf,
+            "cfg": cfg,
+            "main_switch_id": main_switch_id,
+            "pump_switch_id": pump_switch_id,
+            "aux_switch_id": aux_switch_id,
+            "demo": demo,
+            "main_switch_on": main_switch_on,
+            "pump_switch_on": pump_switch_on,
+            "aux_heating_switch_on": aux_heating_switch_on,
+            "maintenance_active": maintenance_active,
+            "holidays": holidays,
+            "we_or_holiday": we_or_holiday,
+            "pause_active": pause_active,
+            "manual_active": manual_active,
+            "manual_mins": manual_mins,
+            "auto_filter_active": auto_filter_active,
+            "auto_filter_mins": auto_filter_mins,
+            "water_temp": water_temp,
+            "outdoor_temp": outdoor_temp,
+            "blueriiot_enabled": blueriiot_enabled,
+            "blueriiot_reading": blueriiot_reading,
+            "blueriiot_interval": blueriiot_interval,
+            "blueriiot_night_active": blueriiot_night_active,
+            "use_blueriiot_reading": use_blueriiot_reading,
+            "sensor_health_esp32_ok": sensor_health_esp32_ok,
+            "sensor_health_water_sensor_ok": sensor_health_water_sensor_ok,
+            "sensor_health_status": sensor_health_status,
+            "sensor_health_message": sensor_health_message,
+            "dynamic_target": dynamic_target,
+            "target_temp_base": target_temp_base,
+            "target_temp_effective": target_temp_effective,
+        }
 
+    @cycle_stage(
+        "chemistry",
+        outputs=(
+            "ph_val", "chlor_val", "salt_val", "tds_val", "sanitizer_mode", "sanitizer_product",
+            "tds_effective", "vol_l", "salt_add_g", "tds_status", "tds_water_change_liters",
+            "tds_water_change_percent", "tds_high", "water_safety_status", "water_safety_reason",
+            "water_safety_risk", "alkalinity_estimated_ppm", "alkalinity_status", "alkalinity_action",
+            "alkalinity_total_dose_g", "alkalinity_step_dose_g", "alkalinity_steps", "alkalinity_wait_minutes",
+            "alkalinity_water_change_percent", "alkalinity_target_ppm", "alkalinity_estimated_ppm_raw",
+            "alkalinity_measurement_valid", "alkalinity_measurement_reason", "alkalinity_history_samples",
+            "ph_history_median", "chlor_history_median", "tds_history_median", "ph_minus", "ph_plus",
+            "chlor_spoons",
+        ),
+    )
+    async def _async_cycle_chemistry(
+        self,
+        *,
+        conf, use_blueriiot_reading, blueriiot_reading, cfg, now, maintenance_active,
+    ) -> dict:
+        """Water quality, alkalinity and dosing recommendations."""
+        perf = self._perf
+        perf.enter("chemistry")
+        ph_val = self._get_float(conf.get(CONF_PH_SENSOR))
+        chlor_val = self._get_float(conf.get(CONF_CHLORINE_SENSOR))
+        salt_val = self._get_float(conf.get(CONF_SALT_SENSOR))
+        conductivity_val = self._get_float(conf.get(CONF_TDS_SENSOR))  # in μS/cm
+        if use_blueriiot_reading:
+            ph_val = blueriiot_reading.ph
+            chlor_val = blueriiot_reading.orp
+            salt_val = blueriiot_reading.salt
+            conductivity_val = blueriiot_reading.conductivity
+        # TDS-Umrechnung: μS/cm * 0.64 = ppm (Standard-Konversionsfaktor)
+        tds_val = round(conductivity_val * 0.64) if conductivity_val else None
+
+        # Sanitizer mode affects how we interpret TDS:
+        # In saltwater/mixed mode, conductivity/TDS is dominated by salt and would otherwise look "too high".
+        # We therefore compute an "effective" TDS (approx. non-salt dissolved solids) by subtracting the
+        # configured target salt baseline (g/L -> ppm). This value is used for status and water-change
+        # recommendations.
+        sanitizer_mode = (conf.get(CONF_SANITIZER_MODE) or "").strip().lower()
+        if sanitizer_mode not in ("chlorine", "saltwater", "mixed"):
+            sanitizer_mode = "saltwater" if bool(conf.get(CONF_ENABLE_SALTWATER, False)) else DEFAULT_SANITIZER_MODE
+        sanitizer_product = (conf.get(CONF_SANITIZER_PRODUCT) or "").strip().lower()
+        if sanitizer_product not in ("dichlor", "trichlor", "cal_hypo", "liquid_chlorine", "salt_cell", "other"):
+            sanitizer_product = "salt_cell" if sanitizer_mode == "saltwater" else DEFAULT_SANITIZER_PRODUCT
+        saltwater_mode = sanitizer_mode in ("saltwater", "mixed")
+        target_salt_g_l = cfg.target_salt_g_l
+        salt_baseline_ppm = None
+        if saltwater_mode and target_salt_g_l and target_salt_g_l > 0:
+            salt_baseline_ppm = float(target_salt_g_l) * 1000.0
+        tds_effective = None
+        if tds_val is not None:
+            if salt_baseline_ppm is not None:
                 try:
-                    await self._maybe_persist_chemistry_history(now)
+                    tds_effective = max(0, int(round(float(tds_val) - salt_baseline_ppm)))
                 except Exception:
-                    pass
+                    tds_effective = tds_val
+            else:
+                tds_effective = tds_val
 
-            stable_samples = self._recent_chem_samples(now, profile["lookback_minutes"], stable_only=True)
-            alk_stable_samples = [s for s in stable_samples if s.get("alk_raw") is not None]
-            alkalinity_history_samples = len(alk_stable_samples)
-            alk_hist_median = self._history_median(alk_stable_samples, "alk_raw")
-            alkalinity_estimated_ppm = int(round(alk_hist_median)) if alk_hist_median is not None else alkalinity_estimated_ppm_raw
-
-            if alkalinity_history_samples >= int(profile["min_samples"]) and stable_now and alkalinity_estimated_ppm is not None:
-                alkalinity_measurement_valid = True
-                alkalinity_measurement_reason = "ok"
-
-            if alkalinity_estimated_ppm is not None:
-                if alkalinity_estimated_ppm < max(60, alk_low_threshold - 20):
-                    alkalinity_status = "very_low"
-                elif alkalinity_estimated_ppm < alk_low_threshold:
-                    alkalinity_status = "low"
-                elif alkalinity_estimated_ppm <= alk_high_threshold:
-                    alkalinity_status = "optimal"
-                elif alkalinity_estimated_ppm <= min(220, alk_high_threshold + 40):
-                    alkalinity_status = "high"
-                else:
-                    alkalinity_status = "critical_high"
+        # 2. Chemie (Ziel pH 7.2, Toleranzbereich 7.0-7.4)
+        vol_f = conf.get(CONF_WATER_VOLUME, DEFAULT_VOL) / 1000
+        vol_l = conf.get(CONF_WATER_VOLUME, DEFAULT_VOL)
 
-                # Dosier-Hinweise (grobe Praxiswerte, in g):
-                # - Erhöhen mit Natriumhydrogencarbonat: ~18 g je m³ pro +10 ppm
-                # - Senken mit pH-Minus (Natriumbisulfat): ~15 g je m³ pro -10 ppm
-                try:
-                    volume_m3 = (float(vol_l) / 1000.0) if vol_l else 0.0
-                    if volume_m3 > 0:
-                        if alkalinity_estimated_ppm < alk_low_threshold:
-                            delta_up = max(0.0, float(alkalinity_target_ppm) - float(alkalinity_estimated_ppm))
-                            alkalinity_raise_dose_g = int(round(volume_m3 * (delta_up / 10.0) * 18.0))
-                        elif alkalinity_estimated_ppm > alk_high_threshold:
-                            delta_down = max(0.0, float(alkalinity_estimated_ppm) - float(alkalinity_target_ppm))
-                            alkalinity_lower_dose_g = int(round(volume_m3 * (delta_down / 10.0) * 15.0))
-                except Exception:
-                    alkalinity_raise_dose_g = 0
-                    alkalinity_lower_dose_g = 0
-
-            # Konkrete Handlungsempfehlung aus Alkalinitäts-/TDS-Lage ableiten.
-            # Empfehlung nur bei stabiler, historisch abgesicherter Messlage.
-            if not alkalinity_measurement_valid:
-                alkalinity_action = "measure_first"
-            elif tds_high and int(tds_water_change_percent or 0) >= 10:
-                alkalinity_action = "water_change_then_adjust"
-                alkalinity_water_change_percent = int(tds_water_change_percent or 0)
-            elif alkalinity_estimated_ppm < alk_low_threshold:
-                alkalinity_action = "raise_bicarbonate"
-                alkalinity_total_dose_g = int(alkalinity_raise_dose_g or 0)
-                try:
-                    v_m3 = (float(vol_l) / 1000.0) if vol_l else 0.0
-                except Exception:
-                    v_m3 = 0.0
-                # Maximal ~20 g/m³ pro Schritt, damit Änderungen kontrollierbar bleiben.
-                step_cap = max(100, int(round(v_m3 * 20.0))) if v_m3 > 0 else 100
-                if alkalinity_total_dose_g > 0:
-                    alkalinity_steps = max(1, (alkalinity_total_dose_g + step_cap - 1) // step_cap)
-                    alkalinity_step_dose_g = max(1, (alkalinity_total_dose_g + alkalinity_steps - 1) // alkalinity_steps)
-            elif alkalinity_estimated_ppm > alk_high_threshold:
-                alkalinity_action = "lower_ph_minus"
-                alkalinity_total_dose_g = int(alkalinity_lower_dose_g or 0)
-                try:
-                    v_m3 = (float(vol_l) / 1000.0) if vol_l else 0.0
-                except Exception:
-                    v_m3 = 0.0
-                # Maximal ~15 g/m³ pro Schritt, konservativ wegen pH-Untergrenze.
-                step_cap = max(80, int(round(v_m3 * 15.0))) if v_m3 > 0 else 80
-                if alkalinity_total_dose_g > 0:
-                    alkalinity_steps = max(1, (alkalinity_total_dose_g + step_cap - 1) // step_cap)
-                    alkalinity_step_dose_g = max(1, (alkalinity_total_dose_g + alkalinity_steps - 1) // alkalinity_steps)
-            else:
-                alkalinity_action = "none"
+        # Salz-Empfehlung (nur in saltwater/mixed): benötigte Salzmenge in Gramm
+        salt_add_g = 0
+        try:
+            if saltwater_mode and vol_l and salt_val is not None and target_salt_g_l and target_salt_g_l > 0:
+                missing_g_l = max(0.0, float(target_salt_g_l) - float(salt_val))
+                # g/L * L => g
+                salt_add_g = int(round(missing_g_l * float(vol_l)))
+        except Exception:
+            salt_add_g = 0
 
-            if sensor_jump and (not chem_block_active):
-                try:
-                    jump_block = now + timedelta(minutes=max(15, min(chem_cooldown_minutes, int(profile.get("settle_minutes", 30)))))
-                    await self._set_chem_block_until(jump_block)
-                    chem_block_active = True
-                except Exception:
-                    pass
-            
-            main_power = self._get_float(conf.get(CONF_MAIN_POWER_SENSOR))
-            aux_power = self._get_float(conf.get(CONF_AUX_POWER_SENSOR))
-
-            # Electricity price (fixed or dynamic entity)
-            electricity_price = None
-            price_entity = conf.get(CONF_ELECTRICITY_PRICE_ENTITY)
-            price_from_entity = self._get_float(price_entity) if price_entity else None
-            if price_from_entity is not None:
-                electricity_price = price_from_entity
-            else:
-                try:
-                    raw_price = conf.get(CONF_ELECTRICITY_PRICE) if CONF_ELECTRICITY_PRICE in conf else None
-                    electricity_price = float(raw_price) if raw_price is not None else None
-                except Exception:
-                    electricity_price = None
-
-            # Feed-in tariff (fixed or dynamic entity)
-            feed_in_tariff = None
-            feed_in_entity = conf.get(CONF_FEED_IN_TARIFF_ENTITY)
-            feed_in_from_entity = self._get_float(feed_in_entity) if feed_in_entity else None
-            if feed_in_from_entity is not None:
-                feed_in_tariff = feed_in_from_entity
-            else:
-                try:
-                    raw_tariff = conf.get(CONF_FEED_IN_TARIFF) if CONF_FEED_IN_TARIFF in conf else None
-                    feed_in_tariff = float(raw_tariff) if raw_tariff is not None else None
-                except Exception:
-                    feed_in_tariff = None
+        # TDS-Wartung: Status und Wasserwechsel-Empfehlungen
+        tds_status = None
+        tds_water_change_liters = 0
+        tds_water_change_percent = 0
+        tds_high = False
+        water_safety_status = "unknown"
+        water_safety_reason = "missing_data"
+        water_safety_risk = False
+
+        # Alkalinitäts-Schätzung (ppm als CaCO3):
+        # Heuristik aus effektivem TDS + pH (optional ORP-Korrektur).
+        # Ziel ist eine praktikable Orientierung, keine Labor-Analyse.
+        alkalinity_estimated_ppm = None
+        alkalinity_status = "unknown"
+        alkalinity_action = "measure_first"
+        alkalinity_total_dose_g = 0
+        alkalinity_step_dose_g = 0
+        alkalinity_steps = 0
+        alkalinity_wait_minutes = 30
+        alkalinity_water_change_percent = 0
+        alkalinity_target_ppm = 110
+        alkalinity_estimated_ppm_raw = None
+        alkalinity_measurement_valid = False
+        alkalinity_measurement_reason = "insufficient_history"
+        alkalinity_history_samples = 0
+        ph_history_median = None
+        chlor_history_median = None
+        tds_history_median = None
+
+        # Use effective TDS for maintenance interpretation (see above).
+        tds_for_maintenance = tds_effective if tds_effective is not None else tds_val
+        target_tds = cfg.chem_target_tds_ppm
+        alkalinity_target_ppm = cfg.chem_target_alkalinity_ppm
+        alk_low_threshold = max(50, alkalinity_target_ppm - 30)
+        alk_high_threshold = min(220, alkalinity_target_ppm + 30)
+        conf_min_samples = cfg.chem_min_stable_samples
+        conf_lookback_minutes = cfg.chem_history_lookback_minutes
+        chem_cooldown_minutes = cfg.chem_cooldown_minutes
+
+        wq_inputs = (tds_for_maintenance, target_tds, vol_l, ph_val, chlor_val)
+        water_quality = self._pipeline.stage("chemistry").run(
+            wq_inputs, lambda: self._stage_water_quality(*wq_inputs)
+        )
+        tds_status = water_quality["tds_status"]
+        tds_water_change_liters = water_quality["tds_water_change_liters"]
+        tds_water_change_percent = water_quality["tds_water_change_percent"]
+        tds_high = water_quality["tds_high"]
+        water_safety_status = water_quality["water_safety_status"]
+        water_safety_reason = water_quality["water_safety_reason"]
+        water_safety_risk = water_quality["water_safety_risk"]
+
+        profile = self._chemistry_profile(sanitizer_mode, sanitizer_product)
+        profile["min_samples"] = max(int(profile.get("min_samples", 0) or 0), conf_min_samples)
+        profile["lookback_minutes"] = max(int(profile.get("lookback_minutes", 0) or 0), conf_lookback_minutes)
+        manual_active_now = bool(self.manual_timer_until and now < self.manual_timer_until)
+        manual_type_now = str(self.manual_timer_type or "")
+        pause_active_now = bool(self.pause_until and now < self.pause_until)
+        chem_block_active = bool(self.chem_block_until and now < self.chem_block_until)
+        chem_activity_active = bool(
+            maintenance_active
+            or self.manual_mode_active
+            or self.boost_active
+            or pause_active_now
+            or chem_block_active
+            or (manual_active_now and manual_type_now in ("bathing", "chlorine"))
+        )
 
-            # Pool-only energy sensors (kWh)
-            pool_energy_kwh_base = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY_BASE))
-            pool_energy_kwh_aux = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY_AUX))
-            if pool_energy_kwh_base is not None or pool_energy_kwh_aux is not None:
-                pool_energy_kwh = float(pool_energy_kwh_base or 0.0) + float(pool_energy_kwh_aux or 0.0)
-            else:
-                pool_energy_kwh = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY))
+        sensor_jump = False
+        last_sample = self._chem_history.last()
+        if last_sample is not None:
+            try:
+                if (now.timestamp() - last_sample["ts"]) <= max(600, profile["settle_minutes"] * 60):
+                    last_ph = last_sample.get("ph")
+                    last_chlor = last_sample.get("chlor")
+                    last_tds = last_sample.get("tds_effective")
+                    if ph_val is not None and last_ph is not None and abs(float(ph_val) - float(last_ph)) > 0.22:
+                        sensor_jump = True
+                    if chlor_val is not None and last_chlor is not None and abs(float(chlor_val) - float(last_chlor)) > 130:
+                        sensor_jump = True
+                    if tds_for_maintenance is not None and last_tds is not None and abs(float(tds_for_maintenance) - float(last_tds)) > 250:
+                        sensor_jump = True
+            except Exception:
+                sensor_jump = False
 
-            pool_energy_kwh_daily_base = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY_BASE_DAILY))
-            pool_energy_kwh_daily_aux = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY_AUX_DAILY))
-            if pool_energy_kwh_daily_base is not None or pool_energy_kwh_daily_aux is not None:
-                pool_energy_kwh_daily = float(pool_energy_kwh_daily_base or 0.0) + float(pool_energy_kwh_daily_aux or 0.0)
+        # Alkalinitäts-Heuristik (Rohwert):
+        # - Basis aus TDS (bzw. effective TDS in Salzbetrieb)
+        # - pH-Korrektur um den Arbeitspunkt 7.2
+        # - kleine ORP-Korrektur, um extremen Oxidationszustand zu berücksichtigen
+        try:
+            if tds_for_maintenance is not None:
+                tds_ref = max(300.0, min(3000.0, float(tds_for_maintenance)))
+                alk_base = 40.0 + (0.08 * tds_ref)
             else:
-                pool_energy_kwh_daily = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY_DAILY))
+                alk_base = 95.0
 
-            # Optional pool solar energy (daily) to compute net costs
-            pool_solar_kwh_daily = self._get_float(conf.get(CONF_SOLAR_ENERGY_ENTITY_DAILY))
+            if ph_val is not None:
+                alk_base += (float(ph_val) - 7.2) * 45.0
 
-            # Use pool energy as the basis for cost calculations
-            load_kwh = pool_energy_kwh
-            load_kwh_daily = pool_energy_kwh_daily
-            net_load_kwh_daily = load_kwh_daily
-            if (load_kwh_daily is not None) and (pool_solar_kwh_daily is not None):
-                try:
-                    net_load_kwh_daily = max(0.0, float(load_kwh_daily) - float(pool_solar_kwh_daily))
-                except Exception:
-                    net_load_kwh_daily = load_kwh_daily
-            load_kwh_monthly = None
-            load_kwh_yearly = None
-
-            # Effective PV surplus for pool usage (W):
-            # - default: pv_surplus_sensor already reports surplus/export in W
-            # - if pv_house_load_sensor is configured: treat pv_surplus_sensor as PV production in W
-            #   and compute surplus as production - (house_load - pool_load)
-            pv_power_raw = self._get_float(conf.get(CONF_PV_SURPLUS_SENSOR))
-            pv_house_load_w = self._get_float(conf.get(CONF_PV_HOUSE_LOAD_SENSOR))
-            total_pool_power_w = None
-            if main_power is not None or aux_power is not None:
-                total_pool_power_w = float(main_power or 0.0) + float(aux_power or 0.0)
-            pv_surplus_for_pool_w = None
-            if pv_power_raw is not None:
-                try:
-                    pv_input_w = float(pv_power_raw)
-                    if pv_house_load_w is not None:
-                        house_wo_pool_w = max(0.0, float(pv_house_load_w))
-                        if total_pool_power_w is not None:
-                            house_wo_pool_w = max(0.0, house_wo_pool_w - float(total_pool_power_w))
-                        pv_surplus_for_pool_w = max(0.0, pv_input_w - house_wo_pool_w)
-                    else:
-                        pv_surplus_for_pool_w = max(0.0, pv_input_w)
-                except Exception:
-                    pv_surplus_for_pool_w = None
-
-            # Power-saving mode (PV-prioritized): availability + dynamic thresholds
-            power_saving_available = bool(
-                self._power_saving_config_ready(conf)
-                and (pv_power_raw is not None)
-                and (pv_house_load_w is not None)
-                and (main_power is not None)
-                and (aux_power is not None)
+            if chlor_val is not None:
+                alk_base += (float(chlor_val) - 700.0) * 0.015
+
+            if (ph_val is not None) or (tds_for_maintenance is not None):
+                alkalinity_estimated_ppm_raw = int(round(max(20.0, min(240.0, alk_base))))
+        except Exception:
+            alkalinity_estimated_ppm_raw = None
+
+        stable_now = bool((not chem_activity_active) and (not sensor_jump) and (alkalinity_estimated_ppm_raw is not None))
+        if chem_activity_active:
+            alkalinity_measurement_reason = "activity_cooldown" if chem_block_active else "activity"
+        elif sensor_jump:
+            alkalinity_measurement_reason = "sensor_jump"
+        elif alkalinity_estimated_ppm_raw is None:
+            alkalinity_measurement_reason = "missing_data"
+        else:
+            alkalinity_measurement_reason = "insufficient_history"
+
+        should_record_chem_history = not (blueriiot_reading is not None and not use_blueriiot_reading)
+        if should_record_chem_history:
+            self._append_chem_history_sample(
+                now=now,
+                ph_val=ph_val,
+                chlor_val=chlor_val,
+                tds_effective=tds_for_maintenance,
+                alk_raw=alkalinity_estimated_ppm_raw,
+                stable=stable_now,
+                reason=("ok" if stable_now else alkalinity_measurement_reason),
             )
 
             try:
-                if main_power is not None and float(main_power) > 10.0:
-                    self._power_save_last_main_power_w = float(main_power)
+                with perf.within("persistence"):
+                    await self._maybe_persist_chemistry_history(now)
             except Exception:
                 pass
+
+        chem_window = self._chem_history_window(now, profile["lookback_minutes"])
+        alkalinity_history_samples = chem_window.count("alk_raw")
+        alk_hist_median = chem_window.median("alk_raw")
+        ph_history_median = chem_window.median("ph")
+        chlor_history_median = chem_window.median("chlor")
+        tds_history_median = chem_window.median("tds_effective")
+        alkalinity_estimated_ppm = int(round(alk_hist_median)) if alk_hist_median is not None else alkalinity_estimated_ppm_raw
+
+        if alkalinity_history_samples >= int(profile["min_samples"]) and stable_now and alkalinity_estimated_ppm is not None:
+            alkalinity_measurement_valid = True
+            alkalinity_measurement_reason = "ok"
+
+        alk_inputs = (
+            alkalinity_estimated_ppm,
+            alkalinity_measurement_valid,
+            alkalinity_target_ppm,
+            alk_low_threshold,
+            alk_high_threshold,
+            vol_l,
+            tds_high,
+            tds_water_change_percent,
+        )
+        alkalinity = self._pipeline.stage("alkalinity").run(
+            alk_inputs, lambda: self._stage_alkalinity(*alk_inputs)
+        )
+        alkalinity_status = alkalinity["alkalinity_status"]
+        alkalinity_action = alkalinity["alkalinity_action"]
+        alkalinity_total_dose_g = alkalinity["alkalinity_total_dose_g"]
+        alkalinity_step_dose_g = alkalinity["alkalinity_step_dose_g"]
+        alkalinity_steps = alkalinity["alkalinity_steps"]
+        alkalinity_water_change_percent = alkalinity["alkalinity_water_change_percent"]
+
+        if sensor_jump and (not chem_block_active):
             try:
-                if aux_power is not None and float(aux_power) > 10.0:
-                    self._power_save_last_aux_power_w = float(aux_power)
+                jump_block = now + timedelta(minutes=max(15, min(chem_cooldown_minutes, int(profile.get("settle_minutes", 30)))))
+                await self._set_chem_block_until(jump_block)
+                chem_block_active = True
             except Exception:
                 pass
 
+        # pH-Toleranzbereich: 7.0 - 7.4 (keine Dosierung nötig)
+        # Außerhalb: Differenz zu Zielwert 7.2 berechnen
+        if ph_val and ph_val > 7.4:
+            ph_minus = max(0, round((ph_val - 7.2) * 100 * vol_f))
+            ph_plus = 0
+        elif ph_val and ph_val < 7.0:
+            ph_plus = max(0, round((7.2 - ph_val) * 100 * vol_f))
+            ph_minus = 0
+        else:
+            ph_minus = 0
+            ph_plus = 0
+
+        # Chlor/ORP: Zielwert 700 mV, pro 100 mV unter 700 -> 0.25 Löffel (für 1000L)
+        # Skalierung mit tatsächlicher Wassermenge.
+        # WICHTIG: In reinem Salzwasser-Modus wird kein "Chlor hinzufügen" empfohlen,
+        # da die Chlor-Erzeugung über die Salzumwandlung erfolgen soll.
+        chlor_spoons = 0
+        try:
+            if sanitizer_mode in ("chlorine", "mixed") and chlor_val is not None and float(chlor_val) < 700:
+                quarter_spoons = round((700 - float(chlor_val)) / 100)  # Viertellöffel
+                base_spoons = quarter_spoons / 4.0  # Zu Löffeln umrechnen
+                chlor_spoons = round(base_spoons * (vol_l / 1000.0), 2) if vol_l else 0
+        except Exception:
+            chlor_spoons = 0
+
+        return {
+            "ph_val": ph_val,
+            "chlor_val": chlor_val,
+            "salt_val": salt_val,
+            "tds_val": tds_val,
+            "sanitizer_mode": sanitizer_mode,
+            "sanitizer_product": sanitizer_product,
+            "tds_effective": tds_effective,
+            "vol_l": vol_l,
+            "salt_add_g": salt_add_g,
+            "tds_status": tds_status,
+            "tds_water_change_liters": tds_water_change_liters,
+            "tds_water_change_percent": tds_water_change_percent,
+            "tds_high": tds_high,
+            "water_safety_status": water_safety_status,
+            "water_safety_reason": water_safety_reason,
+            "water_safety_risk": water_safety_risk,
+            "alkalinity_estimated_ppm": alkalinity_estimated_ppm,
+            "alkalinity_status": alkalinity_status,
+            "alkalinity_action": alkalinity_action,
+            "alkalinity_total_dose_g": alkalinity_total_dose_g,
+            "alkalinity_step_dose_g": alkalinity_step_dose_g,
+            "alkalinity_steps": alkalinity_steps,
+            "alkalinity_wait_minutes": alkalinity_wait_minutes,
+            "alkalinity_water_change_percent": alkalinity_water_change_percent,
+            "alkalinity_target_ppm": alkalinity_target_ppm,
+            "alkalinity_estimated_ppm_raw": alkalinity_estimated_ppm_raw,
+            "alkalinity_measurement_valid": alkalinity_measurement_valid,
+            "alkalinity_measurement_reason": alkalinity_measurement_reason,
+            "alkalinity_history_samples": alkalinity_history_samples,
+            "ph_history_median": ph_history_median,
+            "chlor_history_median": chlor_history_median,
+            "tds_history_median": tds_history_median,
+            "ph_minus": ph_minus,
+            "ph_plus": ph_plus,
+            "chlor_spoons": chlor_spoons,
+        }
+
+    @cycle_stage(
+        "costs",
+        outputs=(
+            "main_power", "aux_power", "electricity_price", "feed_in_tariff", "pv_house_load_w",
+            "pv_surplus_for_pool_w", "power_saving_available", "main_known_w", "aux_known_w",
+            "power_saving_pump_threshold_w", "power_saving_aux_threshold_w", "energy_cost_daily",
+            "energy_cost_monthly", "energy_cost_yearly", "energy_feed_in_loss_daily",
+            "energy_feed_in_loss_monthly", "energy_feed_in_loss_yearly", "energy_cost_net_daily",
+            "energy_cost_net_monthly", "energy_cost_net_yearly", "total_power_w", "power_cost_per_hour",
+            "pv_raw", "power_cost_per_hour_net", "power_cost_feed_in_loss_per_hour",
+        ),
+    )
+    async def _async_cycle_costs(
+        self,
+        *,
+        conf, now,
+    ) -> dict:
+        """Power, prices, energy costs and the PV surplus available to the pool."""
+        perf = self._perf
+        perf.enter("costs")
+        main_power = self._get_float(conf.get(CONF_MAIN_POWER_SENSOR))
+        aux_power = self._get_float(conf.get(CONF_AUX_POWER_SENSOR))
+
+        # Electricity price (fixed or dynamic entity)
+        electricity_price = None
+        price_entity = conf.get(CONF_ELECTRICITY_PRICE_ENTITY)
+        price_from_entity = self._get_float(price_entity) if price_entity else None
+        if price_from_entity is not None:
+            electricity_price = price_from_entity
+        else:
             try:
-                main_fallback_w = float(conf.get(CONF_HEATER_BASE_POWER_W, DEFAULT_HEATER_BASE_POWER_W) or DEFAULT_HEATER_BASE_POWER_W)
+                raw_price = conf.get(CONF_ELECTRICITY_PRICE) if CONF_ELECTRICITY_PRICE in conf else None
+                electricity_price = float(raw_price) if raw_price is not None else None
             except Exception:
-                main_fallback_w = float(DEFAULT_HEATER_BASE_POWER_W)
+                electricity_price = None
+
+        # Feed-in tariff (fixed or dynamic entity)
+        feed_in_tariff = None
+        feed_in_entity = conf.get(CONF_FEED_IN_TARIFF_ENTITY)
+        feed_in_from_entity = self._get_float(feed_in_entity) if feed_in_entity else None
+        if feed_in_from_entity is not None:
+            feed_in_tariff = feed_in_from_entity
+        else:
             try:
-                aux_fallback_w = float(conf.get(CONF_HEATER_AUX_POWER_W, DEFAULT_HEATER_AUX_POWER_W) or DEFAULT_HEATER_AUX_POWER_W)
+                raw_tariff = conf.get(CONF_FEED_IN_TARIFF) if CONF_FEED_IN_TARIFF in conf else None
+                feed_in_tariff = float(raw_tariff) if raw_tariff is not None else None
             except Exception:
-                aux_fallback_w = float(DEFAULT_HEATER_AUX_POWER_W)
+                feed_in_tariff = None
+
+        # Pool-only energy sensors (kWh)
+        pool_energy_kwh_base = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY_BASE))
+        pool_energy_kwh_aux = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY_AUX))
+        if pool_energy_kwh_base is not None or pool_energy_kwh_aux is not None:
+            pool_energy_kwh = float(pool_energy_kwh_base or 0.0) + float(pool_energy_kwh_aux or 0.0)
+        else:
+            pool_energy_kwh = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY))
+
+        pool_energy_kwh_daily_base = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY_BASE_DAILY))
+        pool_energy_kwh_daily_aux = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY_AUX_DAILY))
+        if pool_energy_kwh_daily_base is not None or pool_energy_kwh_daily_aux is not None:
+            pool_energy_kwh_daily = float(pool_energy_kwh_daily_base or 0.0) + float(pool_energy_kwh_daily_aux or 0.0)
+        else:
+            pool_energy_kwh_daily = self._get_float(conf.get(CONF_POOL_ENERGY_ENTITY_DAILY))
+
+        # Optional pool solar energy (daily) to compute net costs
+        pool_solar_kwh_daily = self._get_float(conf.get(CONF_SOLAR_ENERGY_ENTITY_DAILY))
 
-            main_known_w = float(self._power_save_last_main_power_w or main_fallback_w or 0.0)
-            aux_known_w = float(self._power_save_last_aux_power_w or aux_fallback_w or 0.0)
+        # Use pool energy as the basis for cost calculations
+        load_kwh = pool_energy_kwh
+        load_kwh_daily = pool_energy_kwh_daily
+        net_load_kwh_daily = load_kwh_daily
+        if (load_kwh_daily is not None) and (pool_solar_kwh_daily is not None):
             try:
-                threshold_factor_percent = float(
-                    conf.get(CONF_POWER_SAVING_THRESHOLD_FACTOR_PERCENT, DEFAULT_POWER_SAVING_THRESHOLD_FACTOR_PERCENT)
-                )
+                net_load_kwh_daily = max(0.0, float(load_kwh_daily) - float(pool_solar_kwh_daily))
+            except Exception:
+                net_load_kwh_daily = load_kwh_daily
+        load_kwh_monthly = None
+        load_kwh_yearly = None
+
+        # Effective PV surplus for pool usage (W):
+        # - default: pv_surplus_sensor already reports surplus/export in W
+        # - if pv_house_load_sensor is configured: treat pv_surplus_sensor as PV production in W
+        #   and compute surplus as production - (house_load - pool_load)
+        pv_power_raw = self._get_float(conf.get(CONF_PV_SURPLUS_SENSOR))
+        pv_house_load_w = self._get_float(conf.get(CONF_PV_HOUSE_LOAD_SENSOR))
+        total_pool_power_w = None
+        if main_power is not None or aux_power is not None:
+            total_pool_power_w = float(main_power or 0.0) + float(aux_power or 0.0)
+        pv_surplus_for_pool_w = None
+        if pv_power_raw is not None:
+            try:
+                pv_input_w = float(pv_power_raw)
+                if pv_house_load_w is not None:
+                    house_wo_pool_w = max(0.0, float(pv_house_load_w))
+                    if total_pool_power_w is not None:
+                        house_wo_pool_w = max(0.0, house_wo_pool_w - float(total_pool_power_w))
+                    pv_surplus_for_pool_w = max(0.0, pv_input_w - house_wo_pool_w)
+                else:
+                    pv_surplus_for_pool_w = max(0.0, pv_input_w)
             except Exception:
-                threshold_factor_percent = float(DEFAULT_POWER_SAVING_THRESHOLD_FACTOR_PERCENT)
-            threshold_factor_percent = max(50.0, min(150.0, threshold_factor_percent))
-            threshold_factor = threshold_factor_percent / 100.0
-
-            power_saving_pump_threshold_w = max(100.0, main_known_w * threshold_factor)
-            power_saving_aux_threshold_w = max(
-                power_saving_pump_threshold_w,
-                (main_known_w + aux_known_w) * threshold_factor,
+                pv_surplus_for_pool_w = None
+
+        # Power-saving mode (PV-prioritized): availability + dynamic thresholds
+        power_saving_available = bool(
+            self._power_saving_config_ready(conf)
+            and (pv_power_raw is not None)
+            and (pv_house_load_w is not None)
+            and (main_power is not None)
+            and (aux_power is not None)
+        )
+
+        try:
+            if main_power is not None and float(main_power) > 10.0:
+                self._power_save_last_main_power_w = float(main_power)
+        except Exception:
+            pass
+        try:
+            if aux_power is not None and float(aux_power) > 10.0:
+                self._power_save_last_aux_power_w = float(aux_power)
+        except Exception:
+            pass
+
+        try:
+            main_fallback_w = float(conf.get(CONF_HEATER_BASE_POWER_W, DEFAULT_HEATER_BASE_POWER_W) or DEFAULT_HEATER_BASE_POWER_W)
+        except Exception:
+            main_fallback_w = float(DEFAULT_HEATER_BASE_POWER_W)
+        try:
+            aux_fallback_w = float(conf.get(CONF_HEATER_AUX_POWER_W, DEFAULT_HEATER_AUX_POWER_W) or DEFAULT_HEATER_AUX_POWER_W)
+        except Exception:
+            aux_fallback_w = float(DEFAULT_HEATER_AUX_POWER_W)
+
+        main_known_w = float(self._power_save_last_main_power_w or main_fallback_w or 0.0)
+        aux_known_w = float(self._power_save_last_aux_power_w or aux_fallback_w or 0.0)
+        try:
+            threshold_factor_percent = float(
+                conf.get(CONF_POWER_SAVING_THRESHOLD_FACTOR_PERCENT, DEFAULT_POWER_SAVING_THRESHOLD_FACTOR_PERCENT)
             )
+        except Exception:
+            threshold_factor_percent = float(DEFAULT_POWER_SAVING_THRESHOLD_FACTOR_PERCENT)
+        threshold_factor_percent = max(50.0, min(150.0, threshold_factor_percent))
+        threshold_factor = threshold_factor_percent / 100.0
+
+        power_saving_pump_threshold_w = max(100.0, main_known_w * threshold_factor)
+        power_saving_aux_threshold_w = max(
+            power_saving_pump_threshold_w,
+            (main_known_w + aux_known_w) * threshold_factor,
+        )
 
-            if power_saving_available:
-                self._power_saving_unavailable_since = None
-            elif self.power_saving_active and self._power_saving_unavailable_since is None:
-                self._power_saving_unavailable_since = now
+        if power_saving_available:
+            self._power_saving_unavailable_since = None
+        elif self.power_saving_active and self._power_saving_unavailable_since is None:
+            self._power_saving_unavailable_since = now
 
-            if self._power_saving_last_available is None or bool(self._power_saving_last_available) != bool(power_saving_available):
-                if self.power_saving_active and (not power_saving_available):
-                    _LOGGER.warning(
-                        "Power-saving mode temporarily unavailable (required live sensor values missing); mode remains active and resumes automatically when values return"
-                    )
-                self._power_saving_last_available = bool(power_saving_available)
-
-            # Derive month/year totals from daily sensors when not provided
-            derived_changed = False
-            if load_kwh_daily is not None and (load_kwh_monthly is None or load_kwh_yearly is None):
-                d_month, d_year, changed = self._update_derived_energy_from_daily("grid", load_kwh_daily, now)
-                derived_changed = derived_changed or changed
-                if load_kwh_monthly is None:
-                    load_kwh_monthly = d_month
-                if load_kwh_yearly is None:
-                    load_kwh_yearly = d_year
-
-            # Persist derived aggregation state (best-effort, throttled)
-            if derived_changed:
-                try:
+        if self._power_saving_last_available is None or bool(self._power_saving_last_available) != bool(power_saving_available):
+            if self.power_saving_active and (not power_saving_available):
+                _LOGGER.warning(
+                    "Power-saving mode temporarily unavailable (required live sensor values missing); mode remains active and resumes automatically when values return"
+                )
+            self._power_saving_last_available = bool(power_saving_available)
+
+        # Derive month/year totals from daily sensors when not provided
+        derived_changed = False
+        if load_kwh_daily is not None and (load_kwh_monthly is None or load_kwh_yearly is None):
+            d_month, d_year, changed = self._update_derived_energy_from_daily("grid", load_kwh_daily, now)
+            derived_changed = derived_changed or changed
+            if load_kwh_monthly is None:
+                load_kwh_monthly = d_month
+            if load_kwh_yearly is None:
+                load_kwh_yearly = d_year
+
+        # Persist derived aggregation state (best-effort, throttled)
+        if derived_changed:
+            try:
+                with perf.within("persistence"):
                     await self._maybe_persist_derived_energy_state(now)
-                except Exception:
-                    pass
+            except Exception:
+                pass
 
-            def _calc_energy_costs(load_kwh):
+        def _calc_energy_costs(load_kwh):
+            cost = None
+            try:
+                if load_kwh is not None and electricity_price is not None:
+                    cost = float(load_kwh) * float(electricity_price)
+            except Exception:
                 cost = None
-                try:
-                    if load_kwh is not None and electricity_price is not None:
-                        cost = float(load_kwh) * float(electricity_price)
-                except Exception:
-                    cost = None
-                return cost
-
-            energy_cost_daily = _calc_energy_costs(load_kwh_daily)
-            energy_cost_monthly = _calc_energy_costs(load_kwh_monthly)
-            energy_cost_yearly = _calc_energy_costs(load_kwh_yearly)
-            energy_feed_in_loss_daily = None
-            energy_feed_in_loss_monthly = None
-            energy_feed_in_loss_yearly = None
-            energy_cost_net_daily = None
-            energy_cost_net_monthly = energy_cost_monthly
-            energy_cost_net_yearly = energy_cost_yearly
-
-            # Time-weighted cost accumulation (daily reset, monotonic within day)
-            # Prefer daily kWh sensors if provided; otherwise fall back to total kWh sensors
-            # and compute deltas within the current day.
-            cost_daily_changed = False
+            return cost
+
+        energy_cost_daily = _calc_energy_costs(load_kwh_daily)
+        energy_cost_monthly = _calc_energy_costs(load_kwh_monthly)
+        energy_cost_yearly = _calc_energy_costs(load_kwh_yearly)
+        energy_feed_in_loss_daily = None
+        energy_feed_in_loss_monthly = None
+        energy_feed_in_loss_yearly = None
+        energy_cost_net_daily = None
+        energy_cost_net_monthly = energy_cost_monthly
+        energy_cost_net_yearly = energy_cost_yearly
+
+        # Time-weighted cost accumulation (daily reset, monotonic within day)
+        # Prefer daily kWh sensors if provided; otherwise fall back to total kWh sensors
+        # and compute deltas within the current day.
+        cost_daily_changed = False
+        try:
+            today = dt_util.as_local(now).date()
+        except Exception:
+            today = now.date()
+
+        last_date = self._cost_daily_date
+        if isinstance(last_date, str):
             try:
-                today = dt_util.as_local(now).date()
+                last_date = datetime.strptime(last_date, "%Y-%m-%d").date()
             except Exception:
-                today = now.date()
+                last_date = None
 
-            last_date = self._cost_daily_date
-            if isinstance(last_date, str):
-                try:
-                    last_date = datetime.strptime(last_date, "%Y-%m-%d").date()
-                except Exception:
-                    last_date = None
+        cost_kwh_value = load_kwh_daily if load_kwh_daily is not None else load_kwh
+        # Gross daily cost should follow live load behavior. Therefore, whenever
+        # power is available we prefer power*time integration for daily gross cost
+        # and keep kWh-delta mode as fallback only when live power is unavailable.
+        use_power_gross_mode = bool(main_power is not None or aux_power is not None)
 
-            cost_kwh_value = load_kwh_daily if load_kwh_daily is not None else load_kwh
-            # Gross daily cost should follow live load behavior. Therefore, whenever
-            # power is available we prefer power*time integration for daily gross cost
-            # and keep kWh-delta mode as fallback only when live power is unavailable.
-            use_power_gross_mode = bool(main_power is not None or aux_power is not None)
+        if last_date != today:
+            self._cost_daily_accum = 0.0
+            self._cost_daily_feed_in_loss_accum = 0.0
+            self._cost_daily_pv_credit_accum = 0.0
+            self._cost_daily_net_accum = 0.0
+            self._cost_daily_date = today.strftime("%Y-%m-%d")
+            self._cost_daily_last_grid_kwh = cost_kwh_value
+            self._cost_daily_last_solar_kwh = pool_solar_kwh_daily
+            self._cost_last_tick_at = now
+            self._cost_net_daily_date = today
+            self._cost_net_daily_last_value = None
+            cost_daily_changed = True
 
-            if last_date != today:
-                self._cost_daily_accum = 0.0
-                self._cost_daily_feed_in_loss_accum = 0.0
-                self._cost_daily_pv_credit_accum = 0.0
-                self._cost_daily_net_accum = 0.0
-                self._cost_daily_date = today.strftime("%Y-%m-%d")
-                self._cost_daily_last_grid_kwh = cost_kwh_value
-                self._cost_daily_last_solar_kwh = pool_solar_kwh_daily
-                self._cost_last_tick_at = now
-                self._cost_net_daily_date = today
-                self._cost_net_daily_last_value = None
+        if cost_kwh_value is not None and self._cost_daily_last_grid_kwh is None:
+            self._cost_daily_last_grid_kwh = cost_kwh_value
+            cost_daily_changed = True
+
+        last_tick = getattr(self, "_cost_last_tick_at", None)
+        elapsed_h = 0.0
+        if last_tick is not None:
+            try:
+                elapsed_h = max(0.0, (now - last_tick).total_seconds() / 3600.0)
+            except Exception:
+                elapsed_h = 0.0
+        self._cost_last_tick_at = now
+
+        total_power_w_for_cost = None
+        if main_power is not None or aux_power is not None:
+            total_power_w_for_cost = float(main_power or 0.0) + float(aux_power or 0.0)
+        pv_surplus_w_for_cost = max(0.0, float(pv_surplus_for_pool_w or 0.0))
+
+        # Single source of truth for daily net costs: integrate the same hourly
+        # net/feed-in rates that power the hourly sensors.
+        hourly_net_rate = None
+        hourly_feed_in_loss_rate = None
+        if total_power_w_for_cost is not None and total_power_w_for_cost > 0.0:
+            if electricity_price is not None:
+                net_grid_w = max(0.0, float(total_power_w_for_cost) - pv_surplus_w_for_cost)
+                hourly_net_rate = (net_grid_w / 1000.0) * float(electricity_price)
+            if feed_in_tariff is not None:
+                overlap_w = min(float(total_power_w_for_cost), pv_surplus_w_for_cost)
+                hourly_feed_in_loss_rate = (overlap_w / 1000.0) * float(feed_in_tariff)
+
+        if elapsed_h > 0.0:
+            net_inc = 0.0
+            if hourly_net_rate is not None and hourly_net_rate > 0.0:
+                net_inc += float(hourly_net_rate) * elapsed_h
+            if hourly_feed_in_loss_rate is not None and hourly_feed_in_loss_rate > 0.0:
+                net_inc += float(hourly_feed_in_loss_rate) * elapsed_h
+            if net_inc > 0.0:
+                self._cost_daily_net_accum = float(self._cost_daily_net_accum or 0.0) + net_inc
                 cost_daily_changed = True
 
-            if cost_kwh_value is not None and self._cost_daily_last_grid_kwh is None:
+        delta_grid = None
+        if cost_kwh_value is not None and self._cost_daily_last_grid_kwh is not None:
+            try:
+                delta_grid = float(cost_kwh_value) - float(self._cost_daily_last_grid_kwh)
+            except Exception:
+                delta_grid = None
+            if delta_grid is not None and delta_grid < 0:
+                # Sensor reset detected; reset baseline for the day
                 self._cost_daily_last_grid_kwh = cost_kwh_value
+                delta_grid = 0.0
                 cost_daily_changed = True
 
-            last_tick = getattr(self, "_cost_last_tick_at", None)
-            elapsed_h = 0.0
-            if last_tick is not None:
-                try:
-                    elapsed_h = max(0.0, (now - last_tick).total_seconds() / 3600.0)
-                except Exception:
-                    elapsed_h = 0.0
-            self._cost_last_tick_at = now
-
-            total_power_w_for_cost = None
-            if main_power is not None or aux_power is not None:
-                total_power_w_for_cost = float(main_power or 0.0) + float(aux_power or 0.0)
-            pv_surplus_w_for_cost = max(0.0, float(pv_surplus_for_pool_w or 0.0))
+        if delta_grid is not None:
+            if (not use_power_gross_mode) and electricity_price is not None and delta_grid > 0:
+                self._cost_daily_accum = float(self._cost_daily_accum or 0.0) + float(delta_grid) * float(electricity_price)
+                cost_daily_changed = True
+            self._cost_daily_last_grid_kwh = cost_kwh_value
 
-            # Single source of truth for daily net costs: integrate the same hourly
-            # net/feed-in rates that power the hourly sensors.
-            hourly_net_rate = None
-            hourly_feed_in_loss_rate = None
-            if total_power_w_for_cost is not None and total_power_w_for_cost > 0.0:
-                if electricity_price is not None:
-                    net_grid_w = max(0.0, float(total_power_w_for_cost) - pv_surplus_w_for_cost)
-                    hourly_net_rate = (net_grid_w / 1000.0) * float(electricity_price)
-                if feed_in_tariff is not None:
-                    overlap_w = min(float(total_power_w_for_cost), pv_surplus_w_for_cost)
-                    hourly_feed_in_loss_rate = (overlap_w / 1000.0) * float(feed_in_tariff)
-
-            if elapsed_h > 0.0:
-                net_inc = 0.0
-                if hourly_net_rate is not None and hourly_net_rate > 0.0:
-                    net_inc += float(hourly_net_rate) * elapsed_h
-                if hourly_feed_in_loss_rate is not None and hourly_feed_in_loss_rate > 0.0:
-                    net_inc += float(hourly_feed_in_loss_rate) * elapsed_h
-                if net_inc > 0.0:
-                    self._cost_daily_net_accum = float(self._cost_daily_net_accum or 0.0) + net_inc
-                    cost_daily_changed = True
-
-            delta_grid = None
-            if cost_kwh_value is not None and self._cost_daily_last_grid_kwh is not None:
-                try:
-                    delta_grid = float(cost_kwh_value) - float(self._cost_daily_last_grid_kwh)
-                except Exception:
-                    delta_grid = None
-                if delta_grid is not None and delta_grid < 0:
-                    # Sensor reset detected; reset baseline for the day
-                    self._cost_daily_last_grid_kwh = cost_kwh_value
-                    delta_grid = 0.0
-                    cost_daily_changed = True
-
-            if delta_grid is not None:
-                if (not use_power_gross_mode) and electricity_price is not None and delta_grid > 0:
-                    self._cost_daily_accum = float(self._cost_daily_accum or 0.0) + float(delta_grid) * float(electricity_price)
-                    cost_daily_changed = True
-                self._cost_daily_last_grid_kwh = cost_kwh_value
+        delta_solar = None
+        if pool_solar_kwh_daily is not None and self._cost_daily_last_solar_kwh is None:
+            self._cost_daily_last_solar_kwh = pool_solar_kwh_daily
+            cost_daily_changed = True
 
-            delta_solar = None
-            if pool_solar_kwh_daily is not None and self._cost_daily_last_solar_kwh is None:
+        if pool_solar_kwh_daily is not None and self._cost_daily_last_solar_kwh is not None:
+            try:
+                delta_solar = float(pool_solar_kwh_daily) - float(self._cost_daily_last_solar_kwh)
+            except Exception:
+                delta_solar = None
+            if delta_solar is not None and delta_solar < 0:
                 self._cost_daily_last_solar_kwh = pool_solar_kwh_daily
+                delta_solar = 0.0
                 cost_daily_changed = True
 
-            if pool_solar_kwh_daily is not None and self._cost_daily_last_solar_kwh is not None:
-                try:
-                    delta_solar = float(pool_solar_kwh_daily) - float(self._cost_daily_last_solar_kwh)
-                except Exception:
-                    delta_solar = None
-                if delta_solar is not None and delta_solar < 0:
-                    self._cost_daily_last_solar_kwh = pool_solar_kwh_daily
-                    delta_solar = 0.0
-                    cost_daily_changed = True
-
-            if delta_solar is not None:
-                if delta_solar > 0.0:
-                    if electricity_price is not None:
-                        pv_credit_inc = float(delta_solar) * float(electricity_price)
-                        if pv_credit_inc > 0.0:
-                            self._cost_daily_pv_credit_accum = float(self._cost_daily_pv_credit_accum or 0.0) + pv_credit_inc
-                            cost_daily_changed = True
-                    if feed_in_tariff is not None:
-                        feed_in_loss_inc = float(delta_solar) * float(feed_in_tariff)
-                        if feed_in_loss_inc > 0.0:
-                            self._cost_daily_feed_in_loss_accum = float(self._cost_daily_feed_in_loss_accum or 0.0) + feed_in_loss_inc
-                            cost_daily_changed = True
-                self._cost_daily_last_solar_kwh = pool_solar_kwh_daily
+        if delta_solar is not None:
+            if delta_solar > 0.0:
+                if electricity_price is not None:
+                    pv_credit_inc = float(delta_solar) * float(electricity_price)
+                    if pv_credit_inc > 0.0:
+                        self._cost_daily_pv_credit_accum = float(self._cost_daily_pv_credit_accum or 0.0) + pv_credit_inc
+                        cost_daily_changed = True
+                if feed_in_tariff is not None:
+                    feed_in_loss_inc = float(delta_solar) * float(feed_in_tariff)
+                    if feed_in_loss_inc > 0.0:
+                        self._cost_daily_feed_in_loss_accum = float(self._cost_daily_feed_in_loss_accum or 0.0) + feed_in_loss_inc
+                        cost_daily_changed = True
+            self._cost_daily_last_solar_kwh = pool_solar_kwh_daily
+
+        # Fallback integration from instantaneous power:
+        # - gross daily cost when no pool kWh sensor is configured
+        # - PV credit/feed-in-loss when no dedicated daily solar kWh sensor is configured
+        needs_power_gross_fallback = (cost_kwh_value is None) or use_power_gross_mode
+        needs_power_pv_fallback = pool_solar_kwh_daily is None
+        if needs_power_gross_fallback or needs_power_pv_fallback:
+            try:
+                if elapsed_h > 0.0:
+                    if total_power_w_for_cost is not None and total_power_w_for_cost > 0.0:
+                        if needs_power_gross_fallback and electricity_price is not None:
+                            gross_cost_inc = (float(total_power_w_for_cost) / 1000.0) * float(electricity_price) * elapsed_h
+                            if gross_cost_inc > 0.0:
+                                self._cost_daily_accum = float(self._cost_daily_accum or 0.0) + gross_cost_inc
+                                cost_daily_changed = True
+
+                        if needs_power_pv_fallback:
+                            overlap_w = min(float(total_power_w_for_cost), pv_surplus_w_for_cost)
+
+                            if overlap_w > 0.0:
+                                if electricity_price is not None:
+                                    pv_credit_inc = (overlap_w / 1000.0) * float(electricity_price) * elapsed_h
+                                    if pv_credit_inc > 0.0:
+                                        self._cost_daily_pv_credit_accum = float(self._cost_daily_pv_credit_accum or 0.0) + pv_credit_inc
+                                        cost_daily_changed = True
+                                if feed_in_tariff is not None:
+                                    feed_in_loss_inc = (overlap_w / 1000.0) * float(feed_in_tariff) * elapsed_h
+                                    if feed_in_loss_inc > 0.0:
+                                        self._cost_daily_feed_in_loss_accum = float(self._cost_daily_feed_in_loss_accum or 0.0) + feed_in_loss_inc
+                                        cost_daily_changed = True
+            except Exception:
+                pass
 
-            # Fallback integration from instantaneous power:
-            # - gross daily cost when no pool kWh sensor is configured
-            # - PV credit/feed-in-loss when no dedicated daily solar kWh sensor is configured
-            needs_power_gross_fallback = (cost_kwh_value is None) or use_power_gross_mode
-            needs_power_pv_fallback = pool_solar_kwh_daily is None
-            if needs_power_gross_fallback or needs_power_pv_fallback:
-                try:
-                    if elapsed_h > 0.0:
-                        if total_power_w_for_cost is not None and total_power_w_for_cost > 0.0:
-                            if needs_power_gross_fallback and electricity_price is not None:
-                                gross_cost_inc = (float(total_power_w_for_cost) / 1000.0) * float(electricity_price) * elapsed_h
-                                if gross_cost_inc > 0.0:
-                                    self._cost_daily_accum = float(self._cost_daily_accum or 0.0) + gross_cost_inc
-                                    cost_daily_changed = True
-
-                            if needs_power_pv_fallback:
-                                overlap_w = min(float(total_power_w_for_cost), pv_surplus_w_for_cost)
-
-                                if overlap_w > 0.0:
-                                    if electricity_price is not None:
-                                        pv_credit_inc = (overlap_w / 1000.0) * float(electricity_price) * elapsed_h
-                                        if pv_credit_inc > 0.0:
-                                            self._cost_daily_pv_credit_accum = float(self._cost_daily_pv_credit_accum or 0.0) + pv_credit_inc
-                                            cost_daily_changed = True
-                                    if feed_in_tariff is not None:
-                                        feed_in_loss_inc = (overlap_w / 1000.0) * float(feed_in_tariff) * elapsed_h
-                                        if feed_in_loss_inc > 0.0:
-                                            self._cost_daily_feed_in_loss_accum = float(self._cost_daily_feed_in_loss_accum or 0.0) + feed_in_loss_inc
-                                            cost_daily_changed = True
-                except Exception:
-                    pass
+        if self._cost_daily_date is not None:
+            try:
+                energy_cost_daily = float(self._cost_daily_accum or 0.0)
+                energy_feed_in_loss_daily = float(self._cost_daily_feed_in_loss_accum or 0.0)
+                net_candidate = float(self._cost_daily_net_accum or 0.0)
 
-            if self._cost_daily_date is not None:
-                try:
-                    energy_cost_daily = float(self._cost_daily_accum or 0.0)
-                    energy_feed_in_loss_daily = float(self._cost_daily_feed_in_loss_accum or 0.0)
-                    net_candidate = float(self._cost_daily_net_accum or 0.0)
+                if getattr(self, "_cost_net_daily_date", None) != today:
+                    self._cost_net_daily_date = today
+                    self._cost_net_daily_last_value = None
 
-                    if getattr(self, "_cost_net_daily_date", None) != today:
-                        self._cost_net_daily_date = today
-                        self._cost_net_daily_last_value = None
+                if self._cost_net_daily_last_value is None:
+                    energy_cost_net_daily = net_candidate
+                else:
+                    energy_cost_net_daily = max(float(self._cost_net_daily_last_value), net_candidate)
+                self._cost_daily_net_accum = float(energy_cost_net_daily)
+                self._cost_net_daily_last_value = float(energy_cost_net_daily)
+            except Exception:
+                pass
 
-                    if self._cost_net_daily_last_value is None:
-                        energy_cost_net_daily = net_candidate
-                    else:
-                        energy_cost_net_daily = max(float(self._cost_net_daily_last_value), net_candidate)
-                    self._cost_daily_net_accum = float(energy_cost_net_daily)
-                    self._cost_net_daily_last_value = float(energy_cost_net_daily)
-                except Exception:
-                    pass
-
-            if cost_daily_changed:
-                try:
+        if cost_daily_changed:
+            try:
+                with perf.within("persistence"):
                     await self._maybe_persist_cost_daily_state(now)
-                except Exception:
-                    pass
+            except Exception:
+                pass
 
-            # Derive month/year costs from daily accumulated costs (monotonic, tariff-weighted)
-            derived_cost_changed = False
-            if energy_cost_daily is not None:
-                d_month, d_year, changed = self._update_derived_energy_from_daily("cost", energy_cost_daily, now)
-                derived_cost_changed = derived_cost_changed or changed
-                if d_month is not None:
-                    energy_cost_monthly = d_month
-                if d_year is not None:
-                    energy_cost_yearly = d_year
-
-            if energy_cost_net_daily is not None:
-                d_month, d_year, changed = self._update_derived_energy_from_daily("cost_net", energy_cost_net_daily, now)
-                derived_cost_changed = derived_cost_changed or changed
-                if d_month is not None:
-                    energy_cost_net_monthly = d_month
-                if d_year is not None:
-                    energy_cost_net_yearly = d_year
-
-            if derived_cost_changed:
-                try:
+        # Derive month/year costs from daily accumulated costs (monotonic, tariff-weighted)
+        derived_cost_changed = False
+        if energy_cost_daily is not None:
+            d_month, d_year, changed = self._update_derived_energy_from_daily("cost", energy_cost_daily, now)
+            derived_cost_changed = derived_cost_changed or changed
+            if d_month is not None:
+                energy_cost_monthly = d_month
+            if d_year is not None:
+                energy_cost_yearly = d_year
+
+        if energy_cost_net_daily is not None:
+            d_month, d_year, changed = self._update_derived_energy_from_daily("cost_net", energy_cost_net_daily, now)
+            derived_cost_changed = derived_cost_changed or changed
+            if d_month is not None:
+                energy_cost_net_monthly = d_month
+            if d_year is not None:
+                energy_cost_net_yearly = d_year
+
+        if derived_cost_changed:
+            try:
+                with perf.within("persistence"):
                     await self._maybe_persist_derived_cost_state(now)
-                except Exception:
-                    pass
+            except Exception:
+                pass
 
-            # Total power and current cost per hour (best effort)
-            total_power_w = None
-            if main_power is not None or aux_power is not None:
-                total_power_w = float(main_power or 0.0) + float(aux_power or 0.0)
+        # Total power and current cost per hour (best effort)
+        total_power_w = None
+        if main_power is not None or aux_power is not None:
+            total_power_w = float(main_power or 0.0) + float(aux_power or 0.0)
+        power_cost_per_hour = None
+        try:
+            if total_power_w is not None and electricity_price is not None:
+                power_cost_per_hour = (float(total_power_w) / 1000.0) * float(electricity_price)
+        except Exception:
             power_cost_per_hour = None
-            try:
-                if total_power_w is not None and electricity_price is not None:
-                    power_cost_per_hour = (float(total_power_w) / 1000.0) * float(electricity_price)
-            except Exception:
-                power_cost_per_hour = None
-            
-            # 1. Frost & Wochenende
-            # Frostschutz nur wenn aktiviert UND Outdoor-Sensor vorhanden
-            enable_frost = conf.get(CONF_ENABLE_FROST_PROTECTION, True)
-            frost_start_temp = conf.get(CONF_FROST_START_TEMP, DEFAULT_FROST_START_TEMP)
-            frost_severe_temp = conf.get(CONF_FROST_SEVERE_TEMP, DEFAULT_FROST_SEVERE_TEMP)
-            frost_mild_interval = conf.get(CONF_FROST_MILD_INTERVAL, DEFAULT_FROST_MILD_INTERVAL)
-            frost_mild_run = conf.get(CONF_FROST_MILD_RUN, DEFAULT_FROST_MILD_RUN)
-            frost_severe_interval = conf.get(CONF_FROST_SEVERE_INTERVAL, DEFAULT_FROST_SEVERE_INTERVAL)
-            frost_severe_run = conf.get(CONF_FROST_SEVERE_RUN, DEFAULT_FROST_SEVERE_RUN)
-            frost_quiet_override_below = conf.get(CONF_FROST_QUIET_OVERRIDE_BELOW_TEMP, DEFAULT_FROST_QUIET_OVERRIDE_BELOW_TEMP)
-
-            # Run credit / merge optimization options
-            try:
-                merge_window_minutes = int(conf.get(CONF_MERGE_WINDOW_MINUTES, DEFAULT_MERGE_WINDOW_MINUTES))
-            except Exception:
-                merge_window_minutes = DEFAULT_MERGE_WINDOW_MINUTES
-            try:
-                min_gap_minutes = int(conf.get(CONF_MIN_GAP_MINUTES, DEFAULT_MIN_GAP_MINUTES))
-            except Exception:
-                min_gap_minutes = DEFAULT_MIN_GAP_MINUTES
-            try:
-                max_merge_run_minutes = int(conf.get(CONF_MAX_MERGE_RUN_MINUTES, DEFAULT_MAX_MERGE_RUN_MINUTES))
-            except Exception:
-                max_merge_run_minutes = DEFAULT_MAX_MERGE_RUN_MINUTES
-            try:
-                min_credit_minutes = float(conf.get(CONF_MIN_CREDIT_MINUTES, DEFAULT_MIN_CREDIT_MINUTES))
-            except Exception:
-                min_credit_minutes = DEFAULT_MIN_CREDIT_MINUTES
-            credit_sources = self._normalize_credit_sources(conf.get(CONF_CREDIT_SOURCES, DEFAULT_CREDIT_SOURCES))
 
-            try:
-                frost_start_temp = float(frost_start_temp)
-            except Exception:
-                frost_start_temp = DEFAULT_FROST_START_TEMP
-            try:
-                frost_severe_temp = float(frost_severe_temp)
-            except Exception:
-                frost_severe_temp = DEFAULT_FROST_SEVERE_TEMP
-            try:
-                frost_quiet_override_below = float(frost_quiet_override_below)
-            except Exception:
-                frost_quiet_override_below = DEFAULT_FROST_QUIET_OVERRIDE_BELOW_TEMP
+        pv_raw = pv_surplus_for_pool_w
 
-            try:
-                frost_mild_interval = int(frost_mild_interval)
-            except Exception:
-                frost_mild_interval = DEFAULT_FROST_MILD_INTERVAL
-            try:
-                frost_mild_run = int(frost_mild_run)
-            except Exception:
-                frost_mild_run = DEFAULT_FROST_MILD_RUN
-            try:
-                frost_severe_interval = int(frost_severe_interval)
-            except Exception:
-                frost_severe_interval = DEFAULT_FROST_SEVERE_INTERVAL
-            try:
-                frost_severe_run = int(frost_severe_run)
-            except Exception:
-                frost_severe_run = DEFAULT_FROST_SEVERE_RUN
+        # Net cost and feed-in loss (best effort). pv_raw is treated as surplus (exportable) power in W.
+        power_cost_per_hour_net = None
+        power_cost_feed_in_loss_per_hour = None
+        try:
+            if total_power_w is not None and electricity_price is not None:
+                pv_surplus_w = float(pv_raw) if pv_raw is not None else 0.0
+                pv_surplus_w = max(0.0, pv_surplus_w)
+                net_grid_w = max(0.0, float(total_power_w) - pv_surplus_w)
+                power_cost_per_hour_net = (net_grid_w / 1000.0) * float(electricity_price)
+
+            if total_power_w is not None and feed_in_tariff is not None:
+                pv_surplus_w = float(pv_raw) if pv_raw is not None else 0.0
+                pv_surplus_w = max(0.0, pv_surplus_w)
+                feed_in_loss_w = min(float(total_power_w), pv_surplus_w)
+                power_cost_feed_in_loss_per_hour = (feed_in_loss_w / 1000.0) * float(feed_in_tariff)
+        except Exception:
+            power_cost_per_hour_net = None
+            power_cost_feed_in_loss_per_hour = None
 
-            frost_danger = False
-            frost_active = False
-            frost_is_severe = False
-            frost_run_mins = 0
-            frost_credit_shift = 0
-            interval = max(1, frost_mild_interval)
-            ot = None
-            if outdoor_temp is not None:
+        return {
+            "main_power": main_power,
+            "aux_power": aux_power,
+            "electricity_price": electricity_price,
+            "feed_in_tariff": feed_in_tariff,
+            "pv_house_load_w": pv_house_load_w,
+            "pv_surplus_for_pool_w": pv_surplus_for_pool_w,
+            "power_saving_available": power_saving_available,
+            "main_known_w": main_known_w,
+            "aux_known_w": aux_known_w,
+            "power_saving_pump_threshold_w": power_saving_pump_threshold_w,
+            "power_saving_aux_threshold_w": power_saving_aux_threshold_w,
+            "energy_cost_daily": energy_cost_daily,
+            "energy_cost_monthly": energy_cost_monthly,
+            "energy_cost_yearly": energy_cost_yearly,
+            "energy_feed_in_loss_daily": energy_feed_in_loss_daily,
+            "energy_feed_in_loss_monthly": energy_feed_in_loss_monthly,
+            "energy_feed_in_loss_yearly": energy_feed_in_loss_yearly,
+            "energy_cost_net_daily": energy_cost_net_daily,
+            "energy_cost_net_monthly": energy_cost_net_monthly,
+            "energy_cost_net_yearly": energy_cost_net_yearly,
+            "total_power_w": total_power_w,
+            "power_cost_per_hour": power_cost_per_hour,
+            "pv_raw": pv_raw,
+            "power_cost_per_hour_net": power_cost_per_hour_net,
+            "power_cost_feed_in_loss_per_hour": power_cost_feed_in_loss_per_hour,
+        }
+
+    @cycle_stage(
+        "pv",
+        outputs=(
+            "enable_pv", "pv_smoothed", "pv_allows", "quiet", "in_quiet",
+            "power_saving_unavailable_grace_active", "power_saving_pump_allows", "power_saving_aux_allows",
+        ),
+    )
+    async def _async_cycle_pv(
+        self,
+        *,
+        conf, cfg, now, holidays, maintenance_active, pause_active, pv_raw, pv_surplus_for_pool_w,
+        power_saving_available, power_saving_pump_threshold_w, power_saving_aux_threshold_w,
+    ) -> dict:
+        """PV smoothing, quiet hours and the power-saving stage."""
+        perf = self._perf
+        perf.enter("pv")
+        # PV sensor logic
+        enable_pv = conf.get(CONF_ENABLE_PV_OPTIMIZATION, False)
+        pv_val = pv_raw if enable_pv else None
+
+        # Compute smoothed PV (exponential moving average) using configured window (seconds).
+        window = cfg.pv_smooth_window_seconds
+        if pv_val is None:
+            # No input -> keep previous smoothed value
+            pv_smoothed = getattr(self, '_pv_smoothed', None)
+        else:
+            if getattr(self, '_pv_smoothed', None) is None or not window or window <= 0:
+                pv_smoothed = pv_val
+            else:
+                # alpha = min(1, dt / window), dt = real time since the last sample
+                # (updates are event-driven, so the interval is not fixed).
                 try:
-                    ot = float(outdoor_temp)
+                    last_at = getattr(self, '_pv_smoothed_at', None)
+                    if last_at is not None:
+                        dt_s = max(0.0, (now - last_at).total_seconds())
+                    else:
+                        dt_s = self.update_interval.total_seconds() if getattr(self, 'update_interval', None) else DEFAULT_UPDATE_INTERVAL_SECONDS
                 except Exception:
-                    ot = None
-
-            if enable_frost and ot is not None and ot < frost_start_temp:
-                frost_danger = True
-                interval = max(1, frost_mild_interval)
-                run_mins = max(0, frost_mild_run)
-                if ot <= frost_severe_temp:
-                    frost_is_severe = True
-                    interval = max(1, frost_severe_interval)
-                    run_mins = max(0, frost_severe_run)
-                frost_run_mins = run_mins
-                # duty-cycle uses epoch minutes to avoid daily "reset" artifacts
-                now_local = dt_util.as_local(now)
-                epoch_minutes = int(now_local.timestamp() // 60)
-                # Apply credit shift (mild frost only): shift the cycle later
-                frost_credit_effective = float(self._frost_credit_minutes or 0.0)
-                if self._credit_streak_source in credit_sources and float(self._credit_streak_minutes or 0.0) >= float(min_credit_minutes or 0):
-                    frost_credit_effective += float(self._credit_streak_minutes or 0.0)
-                frost_credit_shift = 0
-                if frost_danger and (not frost_is_severe) and interval > 0:
-                    frost_credit_shift = int(min(float(interval - 1), max(0.0, frost_credit_effective))) if interval > 1 else 0
-                epoch_minutes_eff = epoch_minutes - frost_credit_shift
-                frost_active = (run_mins > 0) and ((epoch_minutes_eff % interval) < run_mins)
-
-            # Update credit based on previous run (affects frost/filter scheduling)
-            self._update_run_credit(
-                now=now,
-                min_credit=min_credit_minutes,
-                credit_sources=credit_sources,
-                filter_interval=getattr(self, "filter_interval", DEFAULT_FILTER_INTERVAL),
-                frost_interval=interval if frost_danger else None,
-                frost_run_mins=frost_run_mins if frost_danger else None,
-                frost_danger=frost_danger,
-                frost_is_severe=frost_is_severe,
-            )
+                    dt_s = DEFAULT_UPDATE_INTERVAL_SECONDS
+                alpha = float(min(1.0, float(dt_s) / float(window)))
+                pv_smoothed = float(self._pv_smoothed + alpha * (pv_val - float(self._pv_smoothed)))
+        # persist
+        self._pv_smoothed = pv_smoothed
+        if pv_val is not None:
+            self._pv_smoothed_at = now
+
+        # Stability logic: only flip pv_allows after the smoothed value crosses thresholds
+        pv_allows = bool(getattr(self, '_pv_allows_effective', False))
+        on_th = cfg.pv_on_threshold
+        off_th = cfg.pv_off_threshold
+
+        desired = None
+        if pv_smoothed is not None:
+            if pv_smoothed >= on_th:
+                desired = True
+            elif pv_smoothed <= off_th:
+                desired = False
+        # Stability window (seconds)
+        stability = cfg.pv_stability_seconds
+        now_dt = now
+        # Candidate handling
+        if desired is None:
+            # no definitive crossing -> do not change candidate timer
+            pass
+        else:
+            if desired != pv_allows:
+                # Start candidate timer if not set
+                if not getattr(self, '_pv_candidate_since', None):
+                    self._pv_candidate_since = now_dt
+                else:
+                    # If candidate lasted long enough, commit change
+                    if (now_dt - self._pv_candidate_since).total_seconds() >= stability:
+                        # If turning ON -> commit and record start time
+                        if desired:
+                            pv_allows = True
+                            self._pv_last_start = now_dt
+                            self._pv_allows_effective = True
+                            self._pv_candidate_since = None
+                        else:
+                            # Turning OFF: respect minimum run minutes if set
+                            min_run = cfg.pv_min_run_minutes
+                            if self._pv_last_start and (now_dt - self._pv_last_start).total_seconds() < (min_run * 60):
+                                # not enough run time yet; keep pv_allows True and continue waiting
+                                pv_allows = True
+                                # keep candidate_since to re-evaluate later
+                            else:
+                                pv_allows = False
+                                self._pv_allows_effective = False
+                                self._pv_candidate_since = None
+            else:
+                # desired == pv_allows -> clear candidate if any
+                self._pv_candidate_since = None
 
-            # Persist run credit state (best effort, throttled)
-            try:
-                await self._maybe_persist_credit_state(now)
-            except Exception:
-                pass
+        # quiet time check: C and E should not activate during quiet; A/B/D always allowed
+        quiet = self._quiet_calendar_for(conf, now, holidays)
+        in_quiet = quiet.is_quiet(now)
 
-            # Frost-Timer: Wenn frost_active, berechne Restlaufzeit und setze Timer-Attribute
-            frost_timer_mins = None
-            frost_timer_active = False
-            frost_timer_duration = None
-            frost_timer_type = None
-            if frost_active and frost_danger and frost_run_mins > 0:
-                now_local = dt_util.as_local(now)
-                epoch_minutes = int(now_local.timestamp() // 60)
-                epoch_minutes_eff = epoch_minutes - (frost_credit_shift if frost_danger and (not frost_is_severe) else 0)
-                rem = frost_run_mins - (epoch_minutes_eff % max(1, interval))
-                frost_timer_mins = max(0, rem)
-                frost_timer_active = True
-                frost_timer_duration = frost_run_mins
-                frost_timer_type = "frost"
-                self.frost_timer_until = now + timedelta(minutes=frost_timer_mins)
-                self.frost_timer_duration = frost_run_mins
-            else:
-                self.frost_timer_until = None
-                self.frost_timer_duration = None
-            is_holiday = await self._check_holiday(conf.get(CONF_HOLIDAY_CALENDAR))
-            we_or_holiday = is_holiday or (now.weekday() >= 5)
-
-            # pH-Toleranzbereich: 7.0 - 7.4 (keine Dosierung nötig)
-            # Außerhalb: Differenz zu Zielwert 7.2 berechnen
-            if ph_val and ph_val > 7.4:
-                ph_minus = max(0, round((ph_val - 7.2) * 100 * vol_f))
-                ph_plus = 0
-            elif ph_val and ph_val < 7.0:
-                ph_plus = max(0, round((7.2 - ph_val) * 100 * vol_f))
-                ph_minus = 0
-            else:
-                ph_minus = 0
-                ph_plus = 0
+        # Use smoothed PV surplus for power-saving stage thresholds to avoid
+        # reacting to very short PV spikes/dips. Fall back to raw surplus
+        # until a smoothed value is available.
+        try:
+            pv_surplus_for_stage_w = pv_smoothed if pv_smoothed is not None else pv_surplus_for_pool_w
+            pv_surplus_now_w = max(0.0, float(pv_surplus_for_stage_w or 0.0))
+        except Exception:
+            pv_surplus_now_w = max(0.0, float(pv_surplus_for_pool_w or 0.0))
 
-            # Chlor/ORP: Zielwert 700 mV, pro 100 mV unter 700 -> 0.25 Löffel (für 1000L)
-            # Skalierung mit tatsächlicher Wassermenge.
-            # WICHTIG: In reinem Salzwasser-Modus wird kein "Chlor hinzufügen" empfohlen,
-            # da die Chlor-Erzeugung über die Salzumwandlung erfolgen soll.
-            chlor_spoons = 0
-            try:
-                if sanitizer_mode in ("chlorine", "mixed") and chlor_val is not None and float(chlor_val) < 700:
-                    quarter_spoons = round((700 - float(chlor_val)) / 100)  # Viertellöffel
-                    base_spoons = quarter_spoons / 4.0  # Zu Löffeln umrechnen
-                    chlor_spoons = round(base_spoons * (vol_l / 1000.0), 2) if vol_l else 0
-            except Exception:
-                chlor_spoons = 0
-
-            # 3. Kalender & Aufheizzeit
-            # Heizleistung ist eine Konstante (W) und darf NICHT aus einem Live-Pumpen-Power-Sensor abgeleitet werden.
-            # Sonst wird die Preheat-Berechnung massiv falsch und startet u.U. Tage zu früh.
-            # Calendar preheat timing can be user-tuned in power-saving mode:
-            # - enabled  -> include aux heater power in the estimate (shorter preheat window)
-            # - disabled -> conservative estimate with base power only
-            # Outside power-saving mode we keep the normal behavior.
-            preheat_use_aux_in_power_saving = bool(
-                conf.get(
-                    CONF_POWER_SAVING_PREHEAT_USE_AUX_ESTIMATE,
-                    DEFAULT_POWER_SAVING_PREHEAT_USE_AUX_ESTIMATE,
-                )
-            )
-            include_aux_for_preheat = (
-                preheat_use_aux_in_power_saving if self.power_saving_active else None
-            )
-            power_w = self._effective_heating_power(
-                conf,
-                water_temp,
-                outdoor_temp,
-                include_aux=include_aux_for_preheat,
-            )
+        power_saving_unavailable_grace_active = False
+        try:
+            if self.power_saving_active and (not power_saving_available) and self._power_saving_unavailable_since is not None:
+                power_saving_unavailable_grace_active = (now - self._power_saving_unavailable_since).total_seconds() <= 180
+        except Exception:
+            power_saving_unavailable_grace_active = False
 
-            # Temperaturdifferenz (DeltaT).
-            # Wenn Wassertemperatur fehlt, konservativer Default 20°C (statt Fehler)
-            measured_temp = water_temp if water_temp is not None else 20.0
-            delta_t = max(0.0, target_temp_effective - measured_temp)
+        power_saving_pump_allows = bool(
+            self.power_saving_active
+            and power_saving_available
+            and (not in_quiet)
+            and (not maintenance_active)
+            and (not pause_active)
+            and (not self.away_active)
+            and (pv_surplus_now_w >= float(power_saving_pump_threshold_w))
+        )
+        power_saving_aux_allows = bool(
+            self.power_saving_active
+            and power_saving_available
+            and (not in_quiet)
+            and (not maintenance_active)
+            and (not pause_active)
+            and (not self.away_active)
+            and (pv_surplus_now_w >= float(power_saving_aux_threshold_w))
+        )
 
-            # Thermostat-like tolerances (hysteresis)
-            try:
-                cold_tol = float(conf.get(CONF_COLD_TOLERANCE, DEFAULT_COLD_TOLERANCE))
-            except Exception:
-                cold_tol = DEFAULT_COLD_TOLERANCE
-            try:
-                hot_tol = float(conf.get(CONF_HOT_TOLERANCE, DEFAULT_HOT_TOLERANCE))
-            except Exception:
-                hot_tol = DEFAULT_HOT_TOLERANCE
+        # Hold current power-saving state for short sensor outages to avoid OFF/ON flapping.
+        if power_saving_unavailable_grace_active:
+            power_saving_pump_allows = bool(getattr(self, "_last_should_pump_on", False))
+            power_saving_aux_allows = bool(getattr(self, "_last_should_aux_on", False))
 
-            heat_time = None
-            if vol_l is not None and power_w > 0 and delta_t > 0:
-                # t_min in Minuten: V * 1.16 * deltaT / P * 60
-                t_min = (vol_l * 1.16 * delta_t) / float(power_w) * 60.0
-                try:
-                    base = max(0, int(round(t_min)))
-                    offset = float(self.heat_startup_offset_minutes or 0.0)
-                    heat_time = max(0, int(round(base + offset)))
-                except Exception:
-                    heat_time = None
+        # Optional anti-flapping hold: keep current power-saving stage for a minimum runtime
+        # before allowing automatic downshifts caused by transient PV dips.
+        try:
+            min_runtime_minutes = int(
+                conf.get(
+                    CONF_POWER_SAVING_MIN_RUN_MINUTES,
+                    DEFAULT_POWER_SAVING_MIN_RUN_MINUTES,
+                )
+            )
+        except Exception:
+            min_runtime_minutes = int(DEFAULT_POWER_SAVING_MIN_RUN_MINUTES)
+        min_runtime_minutes = max(0, min(24 * 60, min_runtime_minutes))
+        min_runtime_seconds = float(min_runtime_minutes) * 60.0
+
+        desired_stage = 2 if power_saving_aux_allows else (1 if power_saving_pump_allows else 0)
+        stage_active = int(getattr(self, "_power_saving_stage_active", 0) or 0)
+        stage_since = getattr(self, "_power_saving_stage_since", None)
+
+        stage_hold_blocked = bool(
+            (not self.power_saving_active)
+            or maintenance_active
+            or pause_active
+            or self.away_active
+            or in_quiet
+            or (not power_saving_available)
+        )
 
-            cal = await self._get_next_event(conf.get(CONF_POOL_CALENDAR))
-            cal_next = (cal or {}).get("next") or {}
-            cal_ongoing = (cal or {}).get("ongoing") or {}
+        effective_stage = desired_stage
+        if stage_hold_blocked:
+            effective_stage = desired_stage
+        elif (
+            min_runtime_seconds > 0
+            and stage_active > 0
+            and desired_stage < stage_active
+            and stage_since is not None
+        ):
+            elapsed = max(0.0, (now - stage_since).total_seconds())
+            if elapsed < min_runtime_seconds:
+                effective_stage = stage_active
 
-            # Expire temporary suppression for calendar-driven bathing restarts.
-            try:
-                if self.bathing_block_until and now >= self.bathing_block_until:
-                    self.bathing_block_until = None
-                    new_opts = {**self.entry.options}
-                    new_opts.pop(OPT_KEY_BATHING_BLOCK_UNTIL, None)
-                    await self._async_update_entry_options(new_opts)
-            except Exception:
-                pass
+        if effective_stage != stage_active:
+            self._power_saving_stage_active = int(effective_stage)
+            self._power_saving_stage_since = now if effective_stage > 0 else None
+        elif effective_stage > 0 and stage_since is None:
+            self._power_saving_stage_since = now
 
-            bathing_block_active = bool(self.bathing_block_until and now < self.bathing_block_until)
+        power_saving_pump_allows = effective_stage >= 1
+        power_saving_aux_allows = effective_stage >= 2
 
-            _LOGGER.debug(
-                "Calendar snapshot (%s) next=%s ongoing=%s",
-                getattr(self.entry, "entry_id", None),
-                {
-                    "start": cal_next.get("start"),
-                    "end": cal_next.get("end"),
-                    "summary": cal_next.get("summary"),
-                }
-                if cal_next
-                else None,
-                {
-                    "start": cal_ongoing.get("start"),
-                    "end": cal_ongoing.get("end"),
-                    "summary": cal_ongoing.get("summary"),
-                }
-                if cal_ongoing
-                else None,
-            )
+        return {
+            "enable_pv": enable_pv,
+            "pv_smoothed": pv_smoothed,
+            "pv_allows": pv_allows,
+            "quiet": quiet,
+            "in_quiet": in_quiet,
+            "power_saving_unavailable_grace_active": power_saving_unavailable_grace_active,
+            "power_saving_pump_allows": power_saving_pump_allows,
+            "power_saving_aux_allows": power_saving_aux_allows,
+        }
 
-            # Weather guard for calendar events (optional)
-            enable_event_weather_guard = bool(conf.get(CONF_ENABLE_EVENT_WEATHER_GUARD, False))
-            weather_entity = conf.get(CONF_EVENT_WEATHER_ENTITY)
-            try:
-                rain_threshold = int(conf.get(CONF_EVENT_RAIN_PROBABILITY, DEFAULT_EVENT_RAIN_PROBABILITY))
-            except Exception:
-                rain_threshold = DEFAULT_EVENT_RAIN_PROBABILITY
-
-            event_rain_probability = None
-            event_rain_blocked = False
-            if enable_event_weather_guard and weather_entity and (cal_next.get("start") or cal_ongoing.get("start")):
-                forecast = await self._get_hourly_forecast(weather_entity)
-                if cal_next.get("start"):
-                    prob, blocked = self._event_rain_check(cal_next.get("start"), cal_next.get("end"), forecast, rain_threshold)
-                    if prob is not None:
-                        event_rain_probability = prob
-                    if blocked:
-                        event_rain_blocked = True
-                if cal_ongoing.get("start"):
-                    prob_now, blocked_now = self._event_rain_check(cal_ongoing.get("start"), cal_ongoing.get("end"), forecast, rain_threshold)
-                    if event_rain_probability is None and prob_now is not None:
-                        event_rain_probability = prob_now
-                    if blocked_now:
-                        event_rain_blocked = True
-
-            # Next start (preheat start): if we can't compute a heat_time (e.g. delta_t == 0 because
-            # water is already at/above target), still expose a meaningful countdown to the event.
-            # In that case, we treat heat_time as 0 minutes => next_start_mins == minutes until event start.
-            next_start_mins = None
-            if cal_next.get("start"):
-                effective_heat_time = heat_time if heat_time is not None else 0
-                preheat_time = cal_next["start"] - timedelta(minutes=effective_heat_time)
-                next_start_mins = max(0, round((preheat_time - now).total_seconds() / 60))
-            def _mins_left(until_dt: datetime | None):
-                if until_dt is None:
-                    return 0
-                if until_dt <= now:
-                    return 0
-                return max(0, int(((until_dt - now).total_seconds() + 59) // 60))
-
-            pause_active = self.pause_until is not None and now < self.pause_until
-
-            manual_active = self.manual_timer_until is not None and now < self.manual_timer_until and self.manual_timer_type in ("bathing", "chlorine", "filter")
-            manual_mins = _mins_left(self.manual_timer_until) if manual_active else 0
-
-            auto_filter_active = self.auto_filter_until is not None and now < self.auto_filter_until
-            auto_filter_mins = _mins_left(self.auto_filter_until) if auto_filter_active else 0
-            
-            # Initialisiere next_filter_start wenn nicht gesetzt (z.B. nach Neustart)
-            if not getattr(self, "next_filter_start", None):
-                self.next_filter_start = now + timedelta(minutes=self.filter_interval)
-
-            # PV sensor logic
-            enable_pv = conf.get(CONF_ENABLE_PV_OPTIMIZATION, False)
-            pv_raw = pv_surplus_for_pool_w
-            pv_val = pv_raw if enable_pv else None
-
-            # Net cost and feed-in loss (best effort). pv_raw is treated as surplus (exportable) power in W.
-            power_cost_per_hour_net = None
-            power_cost_feed_in_loss_per_hour = None
+    @cycle_stage(
+        "schedule",
+        outputs=(
+            "frost_danger", "frost_active", "frost_credit_shift", "frost_credit_effective", "frost_timer_mins",
+            "frost_timer_active", "frost_timer_duration", "frost_timer_type",
+            "preheat_use_aux_in_power_saving", "cold_tol", "hot_tol", "cal_next", "event_rain_probability",
+            "event_rain_blocked", "timeline_inputs", "next_start_mins", "cost_plan", "next_frost_mins",
+            "filter_credit_effective", "next_filter_mins", "filter_missing_minutes", "manual_active",
+            "manual_mins", "auto_filter_active", "auto_filter_mins",
+        ),
+    )
+    async def _async_cycle_schedule(
+        self,
+        *,
+        cfg, conf, outdoor_temp, now, water_temp, target_temp_effective, maintenance_active, pause_active,
+        auto_filter_active, manual_active, manual_mins, auto_filter_mins, vol_l, electricity_price,
+        main_known_w, aux_known_w, power_saving_available, quiet, in_quiet, power_saving_pump_allows,
+    ) -> dict:
+        """Frost, run credit, calendar, timeline, cost plan and automatic starts."""
+        perf = self._perf
+        perf.enter("schedule")
+        # 1. Frost & Wochenende
+        # Frostschutz nur wenn aktiviert UND Outdoor-Sensor vorhanden
+        enable_frost = cfg.enable_frost_protection
+        frost_start_temp = cfg.frost_start_temp
+        frost_severe_temp = cfg.frost_severe_temp
+        frost_mild_interval = cfg.frost_mild_interval
+        frost_mild_run = cfg.frost_mild_run
+        frost_severe_interval = cfg.frost_severe_interval
+        frost_severe_run = cfg.frost_severe_run
+        frost_quiet_override_below = cfg.frost_quiet_override_below
+
+        # Run credit / merge optimization options
+        merge_window_minutes = cfg.merge_window_minutes
+        min_gap_minutes = cfg.min_gap_minutes
+        max_merge_run_minutes = cfg.max_merge_run_minutes
+        min_credit_minutes = cfg.min_credit_minutes
+        credit_sources = self._normalize_credit_sources(conf.get(CONF_CREDIT_SOURCES, DEFAULT_CREDIT_SOURCES))
+
+        frost_danger = False
+        frost_active = False
+        frost_is_severe = False
+        frost_run_mins = 0
+        frost_credit_shift = 0
+        interval = max(1, frost_mild_interval)
+        ot = None
+        if outdoor_temp is not None:
             try:
-                if total_power_w is not None and electricity_price is not None:
-                    pv_surplus_w = float(pv_raw) if pv_raw is not None else 0.0
-                    pv_surplus_w = max(0.0, pv_surplus_w)
-                    net_grid_w = max(0.0, float(total_power_w) - pv_surplus_w)
-                    power_cost_per_hour_net = (net_grid_w / 1000.0) * float(electricity_price)
-
-                if total_power_w is not None and feed_in_tariff is not None:
-                    pv_surplus_w = float(pv_raw) if pv_raw is not None else 0.0
-                    pv_surplus_w = max(0.0, pv_surplus_w)
-                    feed_in_loss_w = min(float(total_power_w), pv_surplus_w)
-                    power_cost_feed_in_loss_per_hour = (feed_in_loss_w / 1000.0) * float(feed_in_tariff)
+                ot = float(outdoor_temp)
             except Exception:
-                power_cost_per_hour_net = None
-                power_cost_feed_in_loss_per_hour = None
+                ot = None
 
-            # Compute smoothed PV (exponential moving average) using configured window (seconds).
-            try:
-                window = int(conf.get(CONF_PV_SMOOTH_WINDOW_SECONDS, getattr(self, 'pv_smooth_window', DEFAULT_PV_SMOOTH_WINDOW_SECONDS)))
-            except Exception:
-                window = DEFAULT_PV_SMOOTH_WINDOW_SECONDS
-            if pv_val is None:
-                # No input -> keep previous smoothed value
-                pv_smoothed = getattr(self, '_pv_smoothed', None)
-            else:
-                if getattr(self, '_pv_smoothed', None) is None or not window or window <= 0:
-                    pv_smoothed = pv_val
-                else:
-                    # alpha = min(1, dt / window)
-                    try:
-                        dt_s = self.update_interval.total_seconds() if getattr(self, 'update_interval', None) else 30
-                    except Exception:
-                        dt_s = 30
-                    alpha = float(min(1.0, float(dt_s) / float(window)))
-                    pv_smoothed = float(self._pv_smoothed + alpha * (pv_val - float(self._pv_smoothed)))
-            # persist
-            self._pv_smoothed = pv_smoothed
-
-            # Stability logic: only flip pv_allows after the smoothed value crosses thresholds
-            pv_allows = bool(getattr(self, '_pv_allows_effective', False))
-            try:
-                on_th = int(conf.get(CONF_PV_ON_THRESHOLD, getattr(self, 'pv_on_threshold', DEFAULT_PV_ON)))
-            except Exception:
-                on_th = DEFAULT_PV_ON
-            try:
-                off_th = int(conf.get(CONF_PV_OFF_THRESHOLD, getattr(self, 'pv_off_threshold', DEFAULT_PV_OFF)))
-            except Exception:
-                off_th = DEFAULT_PV_OFF
-
-            desired = None
-            if pv_smoothed is not None:
-                if pv_smoothed >= on_th:
-                    desired = True
-                elif pv_smoothed <= off_th:
-                    desired = False
-            # Stability window (seconds)
-            try:
-                stability = int(conf.get(CONF_PV_STABILITY_SECONDS, getattr(self, 'pv_stability_seconds', DEFAULT_PV_STABILITY_SECONDS)))
-            except Exception:
-                stability = DEFAULT_PV_STABILITY_SECONDS
-            now_dt = now
-            # Candidate handling
-            if desired is None:
-                # no definitive crossing -> do not change candidate timer
-                pass
-            else:
-                if desired != pv_allows:
-                    # Start candidate timer if not set
-                    if not getattr(self, '_pv_candidate_since', None):
-                        self._pv_candidate_since = now_dt
-                    else:
-                        # If candidate lasted long enough, commit change
-                        if (now_dt - self._pv_candidate_since).total_seconds() >= stability:
-                            # If turning ON -> commit and record start time
-                            if desired:
-                                pv_allows = True
-                                self._pv_last_start = now_dt
-                                self._pv_allows_effective = True
-                                self._pv_candidate_since = None
-                            else:
-                                # Turning OFF: respect minimum run minutes if set
-                                try:
-                                    min_run = int(conf.get(CONF_PV_MIN_RUN_MINUTES, getattr(self, 'pv_min_run_minutes', DEFAULT_PV_MIN_RUN_MINUTES)))
-                                except Exception:
-                                    min_run = DEFAULT_PV_MIN_RUN_MINUTES
-                                if self._pv_last_start and (now_dt - self._pv_last_start).total_seconds() < (min_run * 60):
-                                    # not enough run time yet; keep pv_allows True and continue waiting
-                                    pv_allows = True
-                                    # keep candidate_since to re-evaluate later
-                                else:
-                                    pv_allows = False
-                                    self._pv_allows_effective = False
-                                    self._pv_candidate_since = None
-                else:
-                    # desired == pv_allows -> clear candidate if any
-                    self._pv_candidate_since = None
-
-            # quiet time check: C and E should not activate during quiet; A/B/D always allowed
-            def _in_quiet_period(cfg):
-                try:
-                    now_local = dt_util.as_local(now)
-                    t = now_local.time()
-                    weekday = now_local.weekday()
-                    if weekday >= 5 or is_holiday:
-                        start_s = cfg.get(CONF_QUIET_START_WEEKEND, DEFAULT_Q_START_WE)
-                        end_s = cfg.get(CONF_QUIET_END_WEEKEND, DEFAULT_Q_END_WE)
-                    else:
-                        start_s = cfg.get(CONF_QUIET_START, DEFAULT_Q_START)
-                        end_s = cfg.get(CONF_QUIET_END, DEFAULT_Q_END)
-                    fmt = lambda s: dt_util.parse_time(s)
-                    start_t = fmt(start_s)
-                    end_t = fmt(end_s)
-                    if start_t <= end_t:
-                        return start_t <= t <= end_t
-                    # overnight (e.g., 22:00 - 08:00)
-                    return t >= start_t or t <= end_t
-                except Exception:
-                    return False
-
-            def _next_quiet_start(cfg):
-                """Returns the next quiet-start datetime in local time, based on today's weekday/holiday settings."""
-                try:
-                    now_local = dt_util.as_local(now)
-                    t = now_local.time()
-                    weekday = now_local.weekday()
-                    if weekday >= 5 or is_holiday:
-                        start_s = cfg.get(CONF_QUIET_START_WEEKEND, DEFAULT_Q_START_WE)
-                        end_s = cfg.get(CONF_QUIET_END_WEEKEND, DEFAULT_Q_END_WE)
-                    else:
-                        start_s = cfg.get(CONF_QUIET_START, DEFAULT_Q_START)
-                        end_s = cfg.get(CONF_QUIET_END, DEFAULT_Q_END)
-
-                    start_t = dt_util.parse_time(start_s)
-                    end_t = dt_util.parse_time(end_s)
-                    if start_t is None or end_t is None:
-                        return None
-
-                    start_today = now_local.replace(hour=start_t.hour, minute=start_t.minute, second=0, microsecond=0)
-                    start_tomorrow = (now_local + timedelta(days=1)).replace(hour=start_t.hour, minute=start_t.minute, second=0, microsecond=0)
-
-                    if start_t <= end_t:
-                        # same-day window
-                        if t < start_t:
-                            return start_today
-                        if t > end_t:
-                            return start_tomorrow
-                        # currently in quiet
-                        return start_today
-
-                    # overnight window
-                    # not-in-quiet means we're between end_t and start_t (daytime)
-                    if t < start_t and t > end_t:
-                        return start_today
-                    # in quiet -> next start is later today (morning case) or already started (evening case)
-                    return start_today if t <= end_t else start_tomorrow
-                except Exception:
-                    return None
-
-            def _quiet_times_for(dt_obj, cfg):
-                dt_local = dt_util.as_local(dt_obj)
-                weekday = dt_local.weekday()
-                if weekday >= 5:
-                    start_s = cfg.get(CONF_QUIET_START_WEEKEND, DEFAULT_Q_START_WE)
-                    end_s = cfg.get(CONF_QUIET_END_WEEKEND, DEFAULT_Q_END_WE)
-                else:
-                    start_s = cfg.get(CONF_QUIET_START, DEFAULT_Q_START)
-                    end_s = cfg.get(CONF_QUIET_END, DEFAULT_Q_END)
-                return dt_util.parse_time(start_s), dt_util.parse_time(end_s)
+        if enable_frost and ot is not None and ot < frost_start_temp:
+            frost_danger = True
+            interval = max(1, frost_mild_interval)
+            run_mins = max(0, frost_mild_run)
+            if ot <= frost_severe_temp:
+                frost_is_severe = True
+                interval = max(1, frost_severe_interval)
+                run_mins = max(0, frost_severe_run)
+            frost_run_mins = run_mins
+            # duty-cycle uses epoch minutes to avoid daily "reset" artifacts
+            now_local = dt_util.as_local(now)
+            epoch_minutes = int(now_local.timestamp() // 60)
+            # Apply credit shift (mild frost only): shift the cycle later
+            frost_credit_effective = float(self._frost_credit_minutes or 0.0)
+            if self._credit_streak_source in credit_sources and float(self._credit_streak_minutes or 0.0) >= float(min_credit_minutes or 0):
+                frost_credit_effective += float(self._credit_streak_minutes or 0.0)
+            frost_credit_shift = 0
+            if frost_danger and (not frost_is_severe) and interval > 0:
+                frost_credit_shift = int(min(float(interval - 1), max(0.0, frost_credit_effective))) if interval > 1 else 0
+            epoch_minutes_eff = epoch_minutes - frost_credit_shift
+            frost_active = (run_mins > 0) and ((epoch_minutes_eff % interval) < run_mins)
+
+        # Update credit based on previous run (affects frost/filter scheduling)
+        self._update_run_credit(
+            now=now,
+            min_credit=min_credit_minutes,
+            credit_sources=credit_sources,
+            filter_interval=getattr(self, "filter_interval", DEFAULT_FILTER_INTERVAL),
+            frost_interval=interval if frost_danger else None,
+            frost_run_mins=frost_run_mins if frost_danger else None,
+            frost_danger=frost_danger,
+            frost_is_severe=frost_is_severe,
+        )
 
-            def _is_in_quiet_at(dt_obj, cfg):
-                try:
-                    dt_local = dt_util.as_local(dt_obj)
-                    t = dt_local.time()
-                    start_t, end_t = _quiet_times_for(dt_obj, cfg)
-                    if start_t <= end_t:
-                        return start_t <= t <= end_t
-                    return t >= start_t or t <= end_t
-                except Exception:
-                    return False
+        # Persist run credit state (best effort, throttled)
+        try:
+            with perf.within("persistence"):
+                await self._maybe_persist_credit_state(now)
+        except Exception:
+            pass
 
-            def _quiet_end_for(dt_obj, cfg):
-                dt_local = dt_util.as_local(dt_obj)
-                start_t, end_t = _quiet_times_for(dt_obj, cfg)
-                end_today = dt_local.replace(hour=end_t.hour, minute=end_t.minute, second=0, microsecond=0)
-                end_tomorrow = (dt_local + timedelta(days=1)).replace(hour=end_t.hour, minute=end_t.minute, second=0, microsecond=0)
+        # Frost-Timer: Wenn frost_active, berechne Restlaufzeit und setze Timer-Attribute
+        frost_timer_mins = None
+        frost_timer_active = False
+        frost_timer_duration = None
+        frost_timer_type = None
+        if frost_active and frost_danger and frost_run_mins > 0:
+            now_local = dt_util.as_local(now)
+            epoch_minutes = int(now_local.timestamp() // 60)
+            epoch_minutes_eff = epoch_minutes - (frost_credit_shift if frost_danger and (not frost_is_severe) else 0)
+            rem = frost_run_mins - (epoch_minutes_eff % max(1, interval))
+            frost_timer_mins = max(0, rem)
+            frost_timer_active = True
+            frost_timer_duration = frost_run_mins
+            frost_timer_type = "frost"
+            self.frost_timer_until = now + timedelta(minutes=frost_timer_mins)
+            self.frost_timer_duration = frost_run_mins
+        else:
+            self.frost_timer_until = None
+            self.frost_timer_duration = None
 
-                if start_t <= end_t:
-                    # same-day window
-                    return end_today if dt_local <= end_today else end_tomorrow
+        # 3. Kalender & Aufheizzeit
+        # Heizleistung ist eine Konstante (W) und darf NICHT aus einem Live-Pumpen-Power-Sensor abgeleitet werden.
+        # Sonst wird die Preheat-Berechnung massiv falsch und startet u.U. Tage zu früh.
+        # Calendar preheat timing can be user-tuned in power-saving mode:
+        # - enabled  -> include aux heater power in the estimate (shorter preheat window)
+        # - disabled -> conservative estimate with base power only
+        # Outside power-saving mode we keep the normal behavior.
+        preheat_use_aux_in_power_saving = bool(
+            conf.get(
+                CONF_POWER_SAVING_PREHEAT_USE_AUX_ESTIMATE,
+                DEFAULT_POWER_SAVING_PREHEAT_USE_AUX_ESTIMATE,
+            )
+        )
+        include_aux_for_preheat = (
+            preheat_use_aux_in_power_saving if self.power_saving_active else None
+        )
+        power_w = self._effective_heating_power(
+            conf,
+            water_temp,
+            outdoor_temp,
+            include_aux=include_aux_for_preheat,
+        )
 
-                # overnight window
-                if dt_local.time() >= start_t:
-                    return end_tomorrow
-                if dt_local.time() <= end_t:
-                    return end_today
-                return end_tomorrow
+        # Temperaturdifferenz (DeltaT).
+        # Wenn Wassertemperatur fehlt, konservativer Default 20°C (statt Fehler)
+        measured_temp = water_temp if water_temp is not None else 20.0
+        delta_t = max(0.0, target_temp_effective - measured_temp)
 
-            in_quiet = _in_quiet_period(conf)
+        # Thermostat-like tolerances (hysteresis)
+        cold_tol = cfg.cold_tolerance
+        hot_tol = cfg.hot_tolerance
 
-            # Use smoothed PV surplus for power-saving stage thresholds to avoid
-            # reacting to very short PV spikes/dips. Fall back to raw surplus
-            # until a smoothed value is available.
+        heat_time = None
+        if vol_l is not None and power_w > 0 and delta_t > 0:
+            # t_min in Minuten: V * 1.16 * deltaT / P * 60
+            t_min = (vol_l * 1.16 * delta_t) / float(power_w) * 60.0
             try:
-                pv_surplus_for_stage_w = pv_smoothed if pv_smoothed is not None else pv_surplus_for_pool_w
-                pv_surplus_now_w = max(0.0, float(pv_surplus_for_stage_w or 0.0))
+                base = max(0, int(round(t_min)))
+                offset = float(self.heat_startup_offset_minutes or 0.0)
+                heat_time = max(0, int(round(base + offset)))
             except Exception:
-                pv_surplus_now_w = max(0.0, float(pv_surplus_for_pool_w or 0.0))
+                heat_time = None
 
-            power_saving_unavailable_grace_active = False
-            try:
-                if self.power_saving_active and (not power_saving_available) and self._power_saving_unavailable_since is not None:
-                    power_saving_unavailable_grace_active = (now - self._power_saving_unavailable_since).total_seconds() <= 180
-            except Exception:
-                power_saving_unavailable_grace_active = False
+        cal = self._calendar_events(self._snapshot(self._calendar_cache, "calendar", conf.get(CONF_POOL_CALENDAR)), now)
+        cal_next = (cal or {}).get("next") or {}
+        cal_ongoing = (cal or {}).get("ongoing") or {}
 
-            power_saving_pump_allows = bool(
-                self.power_saving_active
-                and power_saving_available
-                and (not in_quiet)
-                and (not maintenance_active)
-                and (not pause_active)
-                and (not self.away_active)
-                and (pv_surplus_now_w >= float(power_saving_pump_threshold_w))
-            )
-            power_saving_aux_allows = bool(
-                self.power_saving_active
-                and power_saving_available
-                and (not in_quiet)
-                and (not maintenance_active)
-                and (not pause_active)
-                and (not self.away_active)
-                and (pv_surplus_now_w >= float(power_saving_aux_threshold_w))
-            )
+        # Expire temporary suppression for calendar-driven bathing restarts.
+        try:
+            if self.bathing_block_until and now >= self.bathing_block_until:
+                self.bathing_block_until = None
+                new_opts = self._options_snapshot()
+                new_opts.pop(OPT_KEY_BATHING_BLOCK_UNTIL, None)
+                await self._async_update_entry_options(new_opts)
+        except Exception:
+            pass
 
-            # Hold current power-saving state for short sensor outages to avoid OFF/ON flapping.
-            if power_saving_unavailable_grace_active:
-                power_saving_pump_allows = bool(getattr(self, "_last_should_pump_on", False))
-                power_saving_aux_allows = bool(getattr(self, "_last_should_aux_on", False))
+        bathing_block_active = bool(self.bathing_block_until and now < self.bathing_block_until)
 
-            # Optional anti-flapping hold: keep current power-saving stage for a minimum runtime
-            # before allowing automatic downshifts caused by transient PV dips.
+        _LOGGER.debug(
+            "Calendar snapshot (%s) next=%s ongoing=%s",
+            getattr(self.entry, "entry_id", None),
+            {
+                "start": cal_next.get("start"),
+                "end": cal_next.get("end"),
+                "summary": cal_next.get("summary"),
+            }
+            if cal_next
+            else None,
+            {
+                "start": cal_ongoing.get("start"),
+                "end": cal_ongoing.get("end"),
+                "summary": cal_ongoing.get("summary"),
+            }
+            if cal_ongoing
+            else None,
+        )
+
+        # Weather guard for calendar events (optional)
+        enable_event_weather_guard = bool(conf.get(CONF_ENABLE_EVENT_WEATHER_GUARD, False))
+        weather_entity = conf.get(CONF_EVENT_WEATHER_ENTITY)
+        rain_threshold = cfg.event_rain_probability
+
+        event_rain_probability = None
+        event_rain_blocked = False
+        if enable_event_weather_guard and weather_entity and (cal_next.get("start") or cal_ongoing.get("start")):
+            forecast = self._snapshot(self._forecast_cache, "forecast", weather_entity, "hourly")
+            (prob, blocked), (prob_now, blocked_now) = self._event_rain_checks(
+                (
+                    (cal_next.get("start"), cal_next.get("end")),
+                    (cal_ongoing.get("start"), cal_ongoing.get("end")),
+                ),
+                forecast,
+                rain_threshold,
+            )
+            event_rain_probability = prob if prob is not None else prob_now
+            event_rain_blocked = blocked or blocked_now
+        # Schedule timeline (filter cycles, frost duty cycle, preheat, quiet, pause) for the next 48 h.
+        enable_auto_filter = conf.get(CONF_ENABLE_AUTO_FILTER, True)
+        timeline_inputs = TimelineInputs(
+            auto_filter=bool(enable_auto_filter) and (not maintenance_active),
+            next_filter_start=getattr(self, "next_filter_start", None),
+            filter_interval_minutes=int(getattr(self, "filter_interval", DEFAULT_FILTER_INTERVAL) or 0),
+            filter_minutes=int(getattr(self, "filter_minutes", DEFAULT_FILTER_DURATION) or 0),
+            frost_danger=bool(frost_danger and (not maintenance_active)),
+            frost_severe=frost_is_severe,
+            frost_interval_minutes=int(interval),
+            frost_run_minutes=int(frost_run_mins),
+            frost_shift_minutes=int(frost_credit_shift),
+            frost_quiet_suppressed=bool(ot is not None and ot > frost_quiet_override_below),
+            event_start=cal_next.get("start"),
+            event_end=cal_next.get("end"),
+            preheat_minutes=preheat_lead_minutes(heat_time),
+            pause_until=self.pause_until if pause_active else None,
+        )
+        timeline = self._schedule_timeline(now, timeline_inputs, quiet)
+
+        # Next start (preheat start): if we can't compute a heat_time (e.g. delta_t == 0 because
+        # water is already at/above target), still expose a meaningful countdown to the event.
+        # In that case the preheat run is empty => next_start_mins == minutes until event start.
+        next_start_mins = None
+        preheat_run = timeline.first_from("preheat", timeline.start)
+        if preheat_run is not None:
+            next_start_mins = max(0, round((preheat_run.start - now).total_seconds() / 60))
+
+        # Cost-optimal placement of filter runs and preheat over price/PV forecasts (opt-in).
+        cost_plan = None
+        if conf.get(CONF_ENABLE_COST_OPTIMIZATION, DEFAULT_ENABLE_COST_OPTIMIZATION):
             try:
-                min_runtime_minutes = int(
-                    conf.get(
-                        CONF_POWER_SAVING_MIN_RUN_MINUTES,
-                        DEFAULT_POWER_SAVING_MIN_RUN_MINUTES,
-                    )
+                cost_plan = self._cost_plan_for(
+                    conf,
+                    now,
+                    timeline_inputs,
+                    quiet,
+                    timeline,
+                    electricity_price,
+                    filter_power_w=main_known_w,
+                    heat_power_w=main_known_w + (aux_known_w if cfg.enable_aux_heating else 0.0),
+                    min_gap_minutes=min_gap_minutes,
                 )
             except Exception:
-                min_runtime_minutes = int(DEFAULT_POWER_SAVING_MIN_RUN_MINUTES)
-            min_runtime_minutes = max(0, min(24 * 60, min_runtime_minutes))
-            min_runtime_seconds = float(min_runtime_minutes) * 60.0
-
-            desired_stage = 2 if power_saving_aux_allows else (1 if power_saving_pump_allows else 0)
-            stage_active = int(getattr(self, "_power_saving_stage_active", 0) or 0)
-            stage_since = getattr(self, "_power_saving_stage_since", None)
-
-            stage_hold_blocked = bool(
-                (not self.power_saving_active)
-                or maintenance_active
-                or pause_active
-                or self.away_active
-                or in_quiet
-                or (not power_saving_available)
+                _LOGGER.exception("Kostenoptimierte Planung fehlgeschlagen")
+                cost_plan = None
+            if self._cost_plan_preheat is not None and self._cost_plan_preheat[0] == cal_next.get("start"):
+                # Planned preheat has started: keeps running until the event, whatever the replan says.
+                next_start_mins = 0
+            elif cost_plan is not None and cost_plan.preheat is not None and cost_plan.complete and cost_plan.savings > 0:
+                next_start_mins = max(0, round((cost_plan.preheat[0] - now).total_seconds() / 60))
+
+        # A started preheat runs until the target is reached: its start (event - heat_time) moves
+        # later while the water warms and would otherwise switch the pool off every few minutes.
+        if self._preheat_latch is not None and self._preheat_latch[0] != cal_next.get("start"):
+            self._preheat_latch = None
+        if self._preheat_latch is not None:
+            preheat_heating = bool(
+                water_temp is not None
+                and float(water_temp) < float(target_temp_effective)
+                and self._thermostat_demand(water_temp, target_temp_effective, cold_tol, hot_tol, self._preheat_latch[1])
             )
+            self._preheat_latch = (self._preheat_latch[0], preheat_heating)
+            if preheat_heating:
+                next_start_mins = 0
 
-            effective_stage = desired_stage
-            if stage_hold_blocked:
-                effective_stage = desired_stage
-            elif (
-                min_runtime_seconds > 0
-                and stage_active > 0
-                and desired_stage < stage_active
-                and stage_since is not None
-            ):
-                elapsed = max(0.0, (now - stage_since).total_seconds())
-                if elapsed < min_runtime_seconds:
-                    effective_stage = stage_active
+        # Enforce minimum gap between runs (unless severe frost)
+        min_gap_remaining = 0
+        try:
+            if self._last_run_end and min_gap_minutes and min_gap_minutes > 0:
+                min_gap_remaining = max(0, int(((self._last_run_end + timedelta(minutes=min_gap_minutes)) - now).total_seconds() / 60))
+        except Exception:
+            min_gap_remaining = 0
+
+        # =========================
+        # Next frost run (best-effort)
+        # =========================
+        next_frost_mins = None
+        try:
+            enable_frost_effective = bool(enable_frost and (ot is not None) and (ot < frost_start_temp) and (not maintenance_active) and (frost_run_mins > 0))
+            if enable_frost_effective:
+                # Runs suppressed by quiet hours (unless extremely cold) are already cut out of the
+                # timeline, so the next run after quiet is the first remaining frost interval.
+                # We only show the next start when we are currently NOT running.
+                if (in_quiet and timeline_inputs.frost_quiet_suppressed) or (not frost_active):
+                    next_frost_mins = timeline.minutes_until("frost", now)
+        except Exception:
+            next_frost_mins = None
 
-            if effective_stage != stage_active:
-                self._power_saving_stage_active = int(effective_stage)
-                self._power_saving_stage_since = now if effective_stage > 0 else None
-            elif effective_stage > 0 and stage_since is None:
-                self._power_saving_stage_since = now
+        # Wartung = Hard-Lockout: keine Automatik-Aktionen (auch kein Frostschutz)
+        if maintenance_active:
+            frost_active = False
 
-            power_saving_pump_allows = effective_stage >= 1
-            power_saving_aux_allows = effective_stage >= 2
+        # Optional optimization: In severe frost, force one run shortly before quiet hours start
+        # (quiet_start - frost_run_mins .. quiet_start). This reduces the chance of needing runs inside quiet hours.
+        if frost_danger and frost_is_severe and (not in_quiet) and frost_run_mins > 0:
+            if timeline.active("frost", now, reason="frost_pre_quiet") is not None:
+                frost_active = True
 
-            # Enforce minimum gap between runs (unless severe frost)
-            min_gap_remaining = 0
-            try:
-                if self._last_run_end and min_gap_minutes and min_gap_minutes > 0:
-                    min_gap_remaining = max(0, int(((self._last_run_end + timedelta(minutes=min_gap_minutes)) - now).total_seconds() / 60))
-            except Exception:
-                min_gap_remaining = 0
+        # Ruhezeit ist heilig: Frostschutz darf sie nur im "äußersten Notfall" stören.
+        # => Während Ruhezeit nur aktiv, wenn Außentemp <= frost_quiet_override_below
+        if in_quiet and ot is not None and ot > frost_quiet_override_below:
+            frost_active = False
+
+        # Minimum gap between runs (skip mild frost if we just ran recently)
+        if frost_danger and (not frost_is_severe) and min_gap_remaining > 0:
+            frost_active = False
+            if next_frost_mins is None or next_frost_mins < min_gap_remaining:
+                next_frost_mins = min_gap_remaining
 
-            # =========================
-            # Next frost run (best-effort)
-            # =========================
+        # If there is no frost danger, do not expose a "next frost" countdown.
+        if (not enable_frost) or (not frost_danger):
             next_frost_mins = None
-            try:
-                enable_frost_effective = bool(enable_frost and (ot is not None) and (ot < frost_start_temp) and (not maintenance_active) and (frost_run_mins > 0))
-                if enable_frost_effective:
-                    # If frost is currently suppressed by quiet hours (unless extremely cold), skip to the end of quiet.
-                    if in_quiet and (ot is not None) and (ot > frost_quiet_override_below):
-                        qe = _quiet_end_for(now, conf)
-                        if qe is not None:
-                            mins_to_qe = max(0, int(((qe - now).total_seconds() + 59) // 60))
-                            qe_local = dt_util.as_local(qe)
-                            epoch_minutes_qe = int(qe_local.timestamp() // 60)
-                            rem = epoch_minutes_qe % max(1, int(interval))
-                            if rem < frost_run_mins:
-                                next_frost_mins = mins_to_qe
-                            else:
-                                next_frost_mins = mins_to_qe + (max(1, int(interval)) - rem)
-                    else:
-                        now_local = dt_util.as_local(now)
-                        epoch_minutes = int(now_local.timestamp() // 60)
-                        epoch_minutes_eff = epoch_minutes - (frost_credit_shift if frost_danger and (not frost_is_severe) else 0)
-                        rem = epoch_minutes_eff % max(1, int(interval))
-                        # We only show the next start when we are currently NOT running.
-                        if not frost_active:
-                            next_frost_mins = max(0, max(1, int(interval)) - rem)
-            except Exception:
-                next_frost_mins = None
 
-            # Wartung = Hard-Lockout: keine Automatik-Aktionen (auch kein Frostschutz)
-            if maintenance_active:
-                frost_active = False
-
-            # Optional optimization: In severe frost, force one run shortly before quiet hours start
-            # (quiet_start - frost_run_mins .. quiet_start). This reduces the chance of needing runs inside quiet hours.
-            if frost_danger and frost_is_severe and (not in_quiet) and frost_run_mins > 0:
-                qs = _next_quiet_start(conf)
-                if qs is not None:
-                    mins_to_qs = (qs - now).total_seconds() / 60
-                    if 0 <= mins_to_qs <= frost_run_mins:
-                        frost_active = True
-
-            # Ruhezeit ist heilig: Frostschutz darf sie nur im "äußersten Notfall" stören.
-            # => Während Ruhezeit nur aktiv, wenn Außentemp <= frost_quiet_override_below
-            if in_quiet and ot is not None and ot > frost_quiet_override_below:
-                frost_active = False
-
-            # Minimum gap between runs (skip mild frost if we just ran recently)
-            if frost_danger and (not frost_is_severe) and min_gap_remaining > 0:
-                frost_active = False
-                if next_frost_mins is None or next_frost_mins < min_gap_remaining:
-                    next_frost_mins = min_gap_remaining
-
-            # If there is no frost danger, do not expose a "next frost" countdown.
-            if (not enable_frost) or (not frost_danger):
-                next_frost_mins = None
-
-            # Wenn der geplante Filter-Start in eine Ruhezeit fällt: vorab auf das Ruhezeit-Ende verschieben.
-            enable_auto_filter = conf.get(CONF_ENABLE_AUTO_FILTER, True)
-            if enable_auto_filter and getattr(self, "next_filter_start", None) and _is_in_quiet_at(self.next_filter_start, conf):
-                shifted = _quiet_end_for(self.next_filter_start, conf)
-                if shifted:
-                    # Make sure the scheduled start is strictly after the quiet period end
-                    # to avoid edge cases where the computed time equals or falls
-                    # marginally before the quiet end (off-by-one minute issues).
+        # Wenn der geplante Filter-Start in eine Ruhezeit fällt: vorab auf das Ruhezeit-Ende verschieben.
+        if enable_auto_filter and getattr(self, "next_filter_start", None) and quiet.is_quiet(self.next_filter_start):
+            shifted = quiet.end_for(self.next_filter_start)
+            if shifted:
+                # Make sure the scheduled start is strictly after the quiet period end
+                # to avoid edge cases where the computed time equals or falls
+                # marginally before the quiet end (off-by-one minute issues).
+                try:
+                    shifted = shifted + timedelta(seconds=1)
+                except Exception:
+                    # Best-effort: if timedelta fails for any reason, keep shifted as-is
+                    pass
+                if shifted != self.next_filter_start:
+                    self.next_filter_start = shifted
                     try:
-                        shifted = shifted + timedelta(seconds=1)
+                        new_opts = {**self._options_snapshot(), OPT_KEY_FILTER_NEXT: shifted.isoformat()}
+                        await self._async_update_entry_options(new_opts)
                     except Exception:
-                        # Best-effort: if timedelta fails for any reason, keep shifted as-is
-                        pass
-                    if shifted != self.next_filter_start:
-                        self.next_filter_start = shifted
-                        try:
-                            new_opts = {**self.entry.options, OPT_KEY_FILTER_NEXT: shifted.isoformat()}
-                            await self._async_update_entry_options(new_opts)
-                        except Exception:
-                            _LOGGER.exception("Fehler beim Verschieben von next_filter_start (Ruhezeit)")
-
-            # Credit-aware merge: if next filter start is close to next frost run, shift filter to end at frost start
-            try:
-                if (
-                    enable_auto_filter
-                    and getattr(self, "next_filter_start", None)
-                    and next_frost_mins is not None
-                    and frost_danger
-                    and (not frost_is_severe)
-                ):
-                    next_frost_dt = now + timedelta(minutes=int(max(0, next_frost_mins)))
-                    delta_min = (next_frost_dt - self.next_filter_start).total_seconds() / 60.0
-                    if delta_min >= 0 and delta_min <= max(0, int(merge_window_minutes)):
-                        # Determine combined run length (cap by max_merge_run_minutes)
-                        filter_credit_effective = float(self._filter_credit_minutes or 0.0)
-                        if self._credit_streak_source in credit_sources and float(self._credit_streak_minutes or 0.0) >= float(min_credit_minutes or 0):
-                            filter_credit_effective += float(self._credit_streak_minutes or 0.0)
-                        filter_missing = max(0.0, float(getattr(self, "filter_minutes", DEFAULT_FILTER_DURATION)) - filter_credit_effective)
-                        merge_run = max(float(filter_missing), float(frost_run_mins or 0))
-                        if max_merge_run_minutes and max_merge_run_minutes > 0:
-                            merge_run = min(float(max_merge_run_minutes), merge_run)
-                        if merge_run > 0:
-                            merged_start = next_frost_dt - timedelta(minutes=merge_run)
-                            if merged_start > now and merged_start != self.next_filter_start:
-                                self.next_filter_start = merged_start
-                                try:
-                                    new_opts = {**self.entry.options, OPT_KEY_FILTER_NEXT: merged_start.isoformat()}
-                                    await self._async_update_entry_options(new_opts)
-                                except Exception:
-                                    _LOGGER.exception("Fehler beim Verschieben von next_filter_start (Merge-Frost)")
-            except Exception:
-                pass
-
-            next_filter_mins = None
-            if getattr(self, "next_filter_start", None):
-                next_filter_mins = max(0, round((self.next_filter_start - now).total_seconds() / 60))
-
-            # Effective credit (including current streak) for transparency and scheduling
-            filter_credit_effective = float(self._filter_credit_minutes or 0.0)
-            frost_credit_effective = float(self._frost_credit_minutes or 0.0)
-            if self._credit_streak_source in credit_sources and float(self._credit_streak_minutes or 0.0) >= float(min_credit_minutes or 0):
-                filter_credit_effective += float(self._credit_streak_minutes or 0.0)
-                frost_credit_effective += float(self._credit_streak_minutes or 0.0)
-            filter_missing_minutes = max(0, int(round(float(getattr(self, "filter_minutes", DEFAULT_FILTER_DURATION)) - filter_credit_effective)))
+                        _LOGGER.exception("Fehler beim Verschieben von next_filter_start (Ruhezeit)")
+
+        # Kostenplan: nächsten Auto-Filterstart in das günstigste zulässige Zeitfenster legen.
+        # Only when the plan places the same volume and is actually cheaper, so flat prices
+        # keep the heuristic start (no slot rounding).
+        if (
+            cost_plan is not None
+            and cost_plan.filter_runs
+            and cost_plan.complete
+            and cost_plan.savings > 0
+            and enable_auto_filter
+            and (not auto_filter_active)
+        ):
+            planned_start = cost_plan.filter_runs[0][0]
+            # A start that is due or inside the current slot is kept (see _cost_plan_for).
+            keep_start = self.next_filter_start is not None and self.next_filter_start < self._cost_slot_end(now)
+            if planned_start > now and planned_start != self.next_filter_start and not keep_start:
+                if self._cost_plan_heuristic_start is None:
+                    self._cost_plan_heuristic_start = self.next_filter_start
+                self.next_filter_start = planned_start
+                self._cost_plan_applied_start = planned_start
+                try:
+                    new_opts = {**self._options_snapshot(), OPT_KEY_FILTER_NEXT: planned_start.isoformat()}
+                    await self._async_update_entry_options(new_opts)
+                except Exception:
+                    _LOGGER.exception("Fehler beim Verschieben von next_filter_start (Kostenplan)")
 
-            # =========================
-            # Adaptive heating tuning (loss + startup offset)
-            # =========================
-            try:
-                if water_temp is not None:
-                    # Update loss coefficient while pool is OFF (no pump, no aux heat)
-                    if (not pump_switch_on) and (not aux_heating_switch_on):
-                        if self._last_temp_ts is None or self._last_temp_value is None:
-                            self._last_temp_ts = now
-                            self._last_temp_value = float(water_temp)
-                        else:
-                            dt_min = max(0.0, (now - self._last_temp_ts).total_seconds() / 60.0)
-                            # Use a longer window to handle sparse sensor updates (often 15–30 min).
-                            # This avoids zero-delta samples from short intervals.
-                            if dt_min >= 60:
-                                if outdoor_temp is not None and vol_l:
-                                    dtemp = float(water_temp) - float(self._last_temp_value)
-                                    if dtemp < 0:
-                                        cooling_rate = abs(dtemp) / dt_min  # °C/min
-                                        delta = max(0.0, float(water_temp) - float(outdoor_temp))
-
-                                        # Guardrails for learning: require plausible cooling samples.
-                                        drop_per_hour = cooling_rate * 60.0
-                                        max_temp_drop_per_hour = 1.5
-                                        if 0.02 <= drop_per_hour <= max_temp_drop_per_hour and delta > 0.0:
-                                            # Convert observed cooling to equivalent heat loss power (W).
-                                            # dT/h = cooling_rate * 60
-                                            loss_w = float(vol_l) * 1.16 * float(cooling_rate) * 60.0
-                                            loss_w = max(0.0, min(6000.0, loss_w))
-
-                                            # Online linear fit with forgetting:
-                                            #   loss_w ~= k * delta
-                                            # This avoids per-sample division by tiny delta values.
-                                            decay = 0.995
-                                            self._heat_loss_fit_sum_x2 = decay * float(self._heat_loss_fit_sum_x2 or 0.0) + (delta * delta)
-                                            self._heat_loss_fit_sum_xy = decay * float(self._heat_loss_fit_sum_xy or 0.0) + (delta * loss_w)
-
-                                            if self._heat_loss_fit_sum_x2 >= 9.0:
-                                                est_w_per_c = float(self._heat_loss_fit_sum_xy) / float(self._heat_loss_fit_sum_x2)
-                                                est_w_per_c = max(0.0, min(80.0, est_w_per_c))
-                                                prev = float(self.heat_loss_w_per_c or DEFAULT_HEAT_LOSS_W_PER_C)
-                                                alpha = 0.12
-                                                self.heat_loss_w_per_c = (1.0 - alpha) * prev + alpha * est_w_per_c
-                                # refresh baseline after a full window
-                                self._last_temp_ts = now
-                                self._last_temp_value = float(water_temp)
-
-                    # Update startup offset based on how long it takes to see first warming
-                    # Use the physical aux heater switch state to avoid relying on heat_reason
-                    # (which may not be initialized yet in this update cycle).
-                    heat_active = bool(pump_switch_on and aux_heating_switch_on)
-                    if heat_active and not self._last_heat_active:
-                        self._heat_start_ts = now
-                        self._heat_start_temp = float(water_temp)
-                        self._heat_start_reached = False
-                    if heat_active and (self._heat_start_ts is not None) and (not self._heat_start_reached):
-                        try:
-                            if float(water_temp) >= float(self._heat_start_temp or water_temp) + 0.1:
-                                lag_min = max(0.0, (now - self._heat_start_ts).total_seconds() / 60.0)
-                                if lag_min <= 30:
-                                    alpha = 0.2
-                                    self.heat_startup_offset_minutes = max(0.0, (1 - alpha) * float(self.heat_startup_offset_minutes) + alpha * lag_min)
-                                self._heat_start_reached = True
-                        except Exception:
-                            pass
-                    if not heat_active:
-                        self._heat_start_ts = None
-                        self._heat_start_temp = None
-                        self._heat_start_reached = False
-                    self._last_heat_active = heat_active
-
-                    # Persist tuned values occasionally (best effort)
-                    if self.entry and self.entry.options:
-                        should_save = False
-                        try:
-                            last_save = self._heat_tuning_last_saved
-                            if (last_save is None) or ((now - last_save).total_seconds() >= 15 * 60):
-                                should_save = True
-                        except Exception:
-                            should_save = True
-                        if should_save:
+        # Credit-aware merge: if next filter start is close to next frost run, shift filter to end at frost start
+        # (not for cost-planned starts: the plan already keeps min_gap to frost runs).
+        try:
+            if (
+                enable_auto_filter
+                and getattr(self, "next_filter_start", None)
+                and not (cost_plan is not None and self.next_filter_start == self._cost_plan_applied_start)
+                and next_frost_mins is not None
+                and frost_danger
+                and (not frost_is_severe)
+            ):
+                next_frost_dt = now + timedelta(minutes=int(max(0, next_frost_mins)))
+                delta_min = (next_frost_dt - self.next_filter_start).total_seconds() / 60.0
+                if delta_min >= 0 and delta_min <= max(0, int(merge_window_minutes)):
+                    # Determine combined run length (cap by max_merge_run_minutes)
+                    filter_credit_effective = float(self._filter_credit_minutes or 0.0)
+                    if self._credit_streak_source in credit_sources and float(self._credit_streak_minutes or 0.0) >= float(min_credit_minutes or 0):
+                        filter_credit_effective += float(self._credit_streak_minutes or 0.0)
+                    filter_missing = max(0.0, float(getattr(self, "filter_minutes", DEFAULT_FILTER_DURATION)) - filter_credit_effective)
+                    merge_run = max(float(filter_missing), float(frost_run_mins or 0))
+                    if max_merge_run_minutes and max_merge_run_minutes > 0:
+                        merge_run = min(float(max_merge_run_minutes), merge_run)
+                    if merge_run > 0:
+                        merged_start = next_frost_dt - timedelta(minutes=merge_run)
+                        if merged_start > now and merged_start != self.next_filter_start:
+                            self.next_filter_start = merged_start
                             try:
-                                new_opts = {**self.entry.options}
-                                new_opts[OPT_KEY_HEAT_LOSS_W_PER_C] = float(self.heat_loss_w_per_c)
-                                new_opts[OPT_KEY_HEAT_STARTUP_OFFSET_MINUTES] = float(self.heat_startup_offset_minutes)
+                                new_opts = {**self._options_snapshot(), OPT_KEY_FILTER_NEXT: merged_start.isoformat()}
                                 await self._async_update_entry_options(new_opts)
-                                self._heat_tuning_last_saved = now
                             except Exception:
-                                pass
-            except Exception:
-                pass
+                                _LOGGER.exception("Fehler beim Verschieben von next_filter_start (Merge-Frost)")
+        except Exception:
+            pass
 
-            # Start calendar-driven bathing: if event is ongoing, ensure manual timer active
-            # (in Wartung deaktiviert)
-            if (not maintenance_active) and (not self.away_active) and cal_ongoing.get("start") and cal_ongoing.get("end"):
-                if now >= cal_ongoing["start"] and now < cal_ongoing["end"]:
-                    remaining_min = max(1, int((cal_ongoing["end"] - now).total_seconds() / 60))
-                    if (not pause_active) and (not manual_active) and (not event_rain_blocked) and (not bathing_block_active):
-                        await self.activate_manual_timer(timer_type="bathing", minutes=remaining_min)
-                        _LOGGER.debug(
-                            "Calendar event started -> activate bathing timer (%s) remaining=%smin",
-                            getattr(self.entry, "entry_id", None),
-                            remaining_min,
-                        )
-                        # recompute
-                        manual_active = self.manual_timer_until is not None and now < self.manual_timer_until and self.manual_timer_type in ("bathing", "chlorine", "filter")
-                        manual_mins = _mins_left(self.manual_timer_until) if manual_active else 0
-
-            # Auto-start filter when next_filter_start reached (in Wartung deaktiviert)
-            # Debug: if the scheduled time is reached but auto-start is skipped, log why.
-            if getattr(self, "next_filter_start", None) and now >= self.next_filter_start:
-                reasons = []
-                if maintenance_active:
-                    reasons.append("maintenance_active")
-                if not enable_auto_filter:
-                    reasons.append("auto_filter_disabled")
-                if auto_filter_active:
-                    reasons.append("auto_filter_already_active")
-                if pause_active:
-                    reasons.append("pause_active")
-                if in_quiet:
-                    reasons.append("in_quiet")
-                # Note: PV should not block scheduled filter starts anymore, so we do not
-                # append a pv_not_allowed reason here. Filtering will run regardless of PV
-                # availability unless suppressed by maintenance/pause/quiet.
-                if reasons:
+        next_filter_mins = None
+        if getattr(self, "next_filter_start", None):
+            next_filter_mins = max(0, round((self.next_filter_start - now).total_seconds() / 60))
+
+        # Effective credit (including current streak) for transparency and scheduling
+        filter_credit_effective = float(self._filter_credit_minutes or 0.0)
+        frost_credit_effective = float(self._frost_credit_minutes or 0.0)
+        if self._credit_streak_source in credit_sources and float(self._credit_streak_minutes or 0.0) >= float(min_credit_minutes or 0):
+            filter_credit_effective += float(self._credit_streak_minutes or 0.0)
+            frost_credit_effective += float(self._credit_streak_minutes or 0.0)
+        filter_missing_minutes = max(0, int(round(float(getattr(self, "filter_minutes", DEFAULT_FILTER_DURATION)) - filter_credit_effective)))
+
+        # Start calendar-driven bathing: if event is ongoing, ensure manual timer active
+        # (in Wartung deaktiviert)
+        if (not maintenance_active) and (not self.away_active) and cal_ongoing.get("start") and cal_ongoing.get("end"):
+            if now >= cal_ongoing["start"] and now < cal_ongoing["end"]:
+                remaining_min = max(1, int((cal_ongoing["end"] - now).total_seconds() / 60))
+                if (not pause_active) and (not manual_active) and (not event_rain_blocked) and (not bathing_block_active):
+                    await self.activate_manual_timer(timer_type="bathing", minutes=remaining_min)
                     _LOGGER.debug(
-                        "Auto-filter time reached but skipped: %s -- flags maintenance=%s enable_auto_filter=%s auto_filter_active=%s pause=%s in_quiet=%s next_filter_start=%s now=%s",
-                        ", ".join(reasons),
-                        maintenance_active,
-                        enable_auto_filter,
-                        auto_filter_active,
-                        pause_active,
-                        in_quiet,
-                        getattr(self, "next_filter_start", None),
-                        now,
+                        "Calendar event started -> activate bathing timer (%s) remaining=%smin",
+                        getattr(self.entry, "entry_id", None),
+                        remaining_min,
+                    )
+                    # recompute
+                    manual_active = self.manual_timer_until is not None and now < self.manual_timer_until and self.manual_timer_type in ("bathing", "chlorine", "filter")
+                    manual_mins = self._mins_left(self.manual_timer_until, now) if manual_active else 0
+
+        # Auto-start filter when next_filter_start reached (in Wartung deaktiviert)
+        # Debug: if the scheduled time is reached but auto-start is skipped, log why.
+        if getattr(self, "next_filter_start", None) and now >= self.next_filter_start:
+            reasons = []
+            if maintenance_active:
+                reasons.append("maintenance_active")
+            if not enable_auto_filter:
+                reasons.append("auto_filter_disabled")
+            if auto_filter_active:
+                reasons.append("auto_filter_already_active")
+            if pause_active:
+                reasons.append("pause_active")
+            if in_quiet:
+                reasons.append("in_quiet")
+            # Note: PV should not block scheduled filter starts anymore, so we do not
+            # append a pv_not_allowed reason here. Filtering will run regardless of PV
+            # availability unless suppressed by maintenance/pause/quiet.
+            if reasons:
+                _LOGGER.debug(
+                    "Auto-filter time reached but skipped: %s -- flags maintenance=%s enable_auto_filter=%s auto_filter_active=%s pause=%s in_quiet=%s next_filter_start=%s now=%s",
+                    ", ".join(reasons),
+                    maintenance_active,
+                    enable_auto_filter,
+                    auto_filter_active,
+                    pause_active,
+                    in_quiet,
+                    getattr(self, "next_filter_start", None),
+                    now,
+                )
+
+        # Auto-start filter when next_filter_start reached (in Wartung deaktiviert)
+        # NOTE: Filtering (auto or manual) must run regardless of PV surplus.
+        # Previously this branch could be skipped when PV optimization was enabled
+        # but no PV surplus was present. Adjust logic to always start the auto-filter
+        # when scheduled unless suppressed by quiet hours / maintenance / pause.
+        if (not maintenance_active) and enable_auto_filter and getattr(self, "next_filter_start", None) and now >= self.next_filter_start and (not auto_filter_active) and (not pause_active):
+            if in_quiet:
+                shifted = quiet.end_for(now)
+                if shifted and shifted != self.next_filter_start:
+                    self.next_filter_start = shifted
+                    try:
+                        new_opts = {**self._options_snapshot(), OPT_KEY_FILTER_NEXT: shifted.isoformat()}
+                        await self._async_update_entry_options(new_opts)
+                    except Exception:
+                        _LOGGER.exception("Fehler beim Umplanen von next_filter_start (Ruhezeit, fällig)")
+            elif min_gap_remaining > 0:
+                shifted = now + timedelta(minutes=int(min_gap_remaining))
+                if shifted != self.next_filter_start:
+                    self.next_filter_start = shifted
+                    try:
+                        new_opts = {**self._options_snapshot(), OPT_KEY_FILTER_NEXT: shifted.isoformat()}
+                        await self._async_update_entry_options(new_opts)
+                    except Exception:
+                        _LOGGER.exception("Fehler beim Umplanen von next_filter_start (min gap)")
+            else:
+                deadline_reached = False
+                if self.power_saving_active and power_saving_available and (not power_saving_pump_allows):
+                    now_local = dt_util.as_local(now)
+                    deadline_hour = cfg.power_saving_filter_deadline_hour
+                    deadline = now_local.replace(
+                        hour=int(deadline_hour),
+                        minute=0,
+                        second=0,
+                        microsecond=0,
                     )
+                    deadline_reached = now_local >= deadline
+                    if not deadline_reached:
+                        shifted = now + timedelta(minutes=int(DEFAULT_POWER_SAVING_FILTER_DEFER_MINUTES))
+                        if shifted != self.next_filter_start:
+                            self.next_filter_start = shifted
+                            try:
+                                new_opts = {**self._options_snapshot(), OPT_KEY_FILTER_NEXT: shifted.isoformat()}
+                                await self._async_update_entry_options(new_opts)
+                            except Exception:
+                                _LOGGER.exception("Fehler beim Verschieben von next_filter_start (power saving)")
+                        # defer cycle until next check/deadline
+                        next_filter_mins = max(0, round((self.next_filter_start - now).total_seconds() / 60))
+                        auto_filter_active = False
+                        auto_filter_mins = 0
+                    else:
+                        _LOGGER.info("Power-saving deadline reached; starting filter cycle without sufficient PV")
 
-            # Auto-start filter when next_filter_start reached (in Wartung deaktiviert)
-            # NOTE: Filtering (auto or manual) must run regardless of PV surplus.
-            # Previously this branch could be skipped when PV optimization was enabled
-            # but no PV surplus was present. Adjust logic to always start the auto-filter
-            # when scheduled unless suppressed by quiet hours / maintenance / pause.
-            if (not maintenance_active) and enable_auto_filter and getattr(self, "next_filter_start", None) and now >= self.next_filter_start and (not auto_filter_active) and (not pause_active):
-                if in_quiet:
-                    shifted = _quiet_end_for(now, conf)
-                    if shifted and shifted != self.next_filter_start:
-                        self.next_filter_start = shifted
+                # Always start auto-filter when due (PV should not block filtering)
+                # Apply credit: only run missing minutes; if none missing, skip cycle.
+                if (not self.power_saving_active) or power_saving_pump_allows or deadline_reached:
+                    if filter_missing_minutes <= 0:
                         try:
-                            new_opts = {**self.entry.options, OPT_KEY_FILTER_NEXT: shifted.isoformat()}
+                            next_start = now + timedelta(minutes=self.filter_interval)
+                            self.next_filter_start = next_start
+                            self._filter_credit_minutes = 0.0
+                            self._filter_credit_expires_at = next_start
+                            new_opts = {**self._options_snapshot(), OPT_KEY_FILTER_NEXT: next_start.isoformat()}
                             await self._async_update_entry_options(new_opts)
                         except Exception:
-                            _LOGGER.exception("Fehler beim Umplanen von next_filter_start (Ruhezeit, fällig)")
-                elif min_gap_remaining > 0:
-                    shifted = now + timedelta(minutes=int(min_gap_remaining))
-                    if shifted != self.next_filter_start:
-                        self.next_filter_start = shifted
-                        try:
-                            new_opts = {**self.entry.options, OPT_KEY_FILTER_NEXT: shifted.isoformat()}
-                            await self._async_update_entry_options(new_opts)
-                        except Exception:
-                            _LOGGER.exception("Fehler beim Umplanen von next_filter_start (min gap)")
-                else:
-                    deadline_reached = False
-                    if self.power_saving_active and power_saving_available and (not power_saving_pump_allows):
-                        now_local = dt_util.as_local(now)
-                        try:
-                            deadline_hour = int(conf.get(CONF_POWER_SAVING_FILTER_DEADLINE_HOUR, DEFAULT_POWER_SAVING_FILTER_DEADLINE_HOUR))
-                        except Exception:
-                            deadline_hour = DEFAULT_POWER_SAVING_FILTER_DEADLINE_HOUR
-                        deadline_hour = max(0, min(23, deadline_hour))
-                        deadline = now_local.replace(
-                            hour=int(deadline_hour),
-                            minute=0,
-                            second=0,
-                            microsecond=0,
-                        )
-                        deadline_reached = now_local >= deadline
-                        if not deadline_reached:
-                            shifted = now + timedelta(minutes=int(DEFAULT_POWER_SAVING_FILTER_DEFER_MINUTES))
-                            if shifted != self.next_filter_start:
-                                self.next_filter_start = shifted
-                                try:
-                                    new_opts = {**self.entry.options, OPT_KEY_FILTER_NEXT: shifted.isoformat()}
-                                    await self._async_update_entry_options(new_opts)
-                                except Exception:
-                                    _LOGGER.exception("Fehler beim Verschieben von next_filter_start (power saving)")
-                            # defer cycle until next check/deadline
-                            next_filter_mins = max(0, round((self.next_filter_start - now).total_seconds() / 60))
-                            auto_filter_active = False
-                            auto_filter_mins = 0
-                        else:
-                            _LOGGER.info("Power-saving deadline reached; starting filter cycle without sufficient PV")
+                            _LOGGER.exception("Fehler beim Überspringen von Filterlauf (Credit)")
+                    else:
+                        await self._start_auto_filter(minutes=filter_missing_minutes)
+                        auto_filter_active = self.auto_filter_until is not None and now < self.auto_filter_until
+                        auto_filter_mins = self._mins_left(self.auto_filter_until, now) if auto_filter_active else 0
 
-                    # Always start auto-filter when due (PV should not block filtering)
-                    # Apply credit: only run missing minutes; if none missing, skip cycle.
-                    if (not self.power_saving_active) or power_saving_pump_allows or deadline_reached:
-                        if filter_missing_minutes <= 0:
-                            try:
-                                next_start = now + timedelta(minutes=self.filter_interval)
-                                self.next_filter_start = next_start
-                                self._filter_credit_minutes = 0.0
-                                self._filter_credit_expires_at = next_start
-                                new_opts = {**self.entry.options, OPT_KEY_FILTER_NEXT: next_start.isoformat()}
-                                await self._async_update_entry_options(new_opts)
-                            except Exception:
-                                _LOGGER.exception("Fehler beim Überspringen von Filterlauf (Credit)")
-                        else:
-                            await self._start_auto_filter(minutes=filter_missing_minutes)
-                            auto_filter_active = self.auto_filter_until is not None and now < self.auto_filter_until
-                            auto_filter_mins = _mins_left(self.auto_filter_until) if auto_filter_active else 0
-                    
+        return {
+            "frost_danger": frost_danger,
+            "frost_active": frost_active,
+            "frost_credit_shift": frost_credit_shift,
+            "frost_credit_effective": frost_credit_effective,
+            "frost_timer_mins": frost_timer_mins,
+            "frost_timer_active": frost_timer_active,
+            "frost_timer_duration": frost_timer_duration,
+            "frost_timer_type": frost_timer_type,
+            "preheat_use_aux_in_power_saving": preheat_use_aux_in_power_saving,
+            "cold_tol": cold_tol,
+            "hot_tol": hot_tol,
+            "cal_next": cal_next,
+            "event_rain_probability": event_rain_probability,
+            "event_rain_blocked": event_rain_blocked,
+            "timeline_inputs": timeline_inputs,
+            "next_start_mins": next_start_mins,
+            "cost_plan": cost_plan,
+            "next_frost_mins": next_frost_mins,
+            "filter_credit_effective": filter_credit_effective,
+            "next_filter_mins": next_filter_mins,
+            "filter_missing_minutes": filter_missing_minutes,
+            "manual_active": manual_active,
+            "manual_mins": manual_mins,
+            "auto_filter_active": auto_filter_active,
+            "auto_filter_mins": auto_filter_mins,
+        }
 
-            # Convenience booleans for logic
+    @cycle_stage(
+        "demand",
+        outputs=(
+            "run_reason", "heat_reason", "data",
+        ),
+    )
+    async def _async_cycle_demand(
+        self,
+        *,
+        water_temp, pump_switch_on, aux_heating_switch_on, now, outdoor_temp, target_temp_effective,
+        maintenance_active, pause_active, conf, sensor_health_status, sensor_health_message,
+        sensor_health_esp32_ok, sensor_health_water_sensor_ok, blueriiot_enabled, blueriiot_interval,
+        blueriiot_night_active, use_blueriiot_reading, blueriiot_reading, dynamic_target, target_temp_base,
+        we_or_holiday, main_switch_on, vol_l, sanitizer_mode, sanitizer_product, ph_val, chlor_val, salt_val,
+        salt_add_g, tds_val, tds_effective, tds_status, tds_high, water_safety_status, water_safety_reason,
+        water_safety_risk, tds_water_change_liters, tds_water_change_percent, alkalinity_estimated_ppm,
+        alkalinity_estimated_ppm_raw, alkalinity_status, alkalinity_action, alkalinity_measurement_valid,
+        alkalinity_measurement_reason, alkalinity_history_samples, ph_history_median, chlor_history_median,
+        tds_history_median, alkalinity_total_dose_g, alkalinity_step_dose_g, alkalinity_steps,
+        alkalinity_wait_minutes, alkalinity_water_change_percent, alkalinity_target_ppm, ph_minus, ph_plus,
+        chlor_spoons, power_saving_available, pv_raw, pv_house_load_w, pv_surplus_for_pool_w,
+        power_saving_pump_threshold_w, power_saving_aux_threshold_w, main_power, aux_power, total_power_w,
+        electricity_price, feed_in_tariff, power_cost_per_hour, power_cost_per_hour_net,
+        power_cost_feed_in_loss_per_hour, energy_cost_daily, energy_cost_monthly, energy_cost_yearly,
+        energy_feed_in_loss_daily, energy_feed_in_loss_monthly, energy_feed_in_loss_yearly,
+        energy_cost_net_daily, energy_cost_net_monthly, energy_cost_net_yearly, enable_pv, pv_allows, in_quiet,
+        power_saving_pump_allows, power_saving_aux_allows, power_saving_unavailable_grace_active, quiet,
+        pv_smoothed, manual_active, cold_tol, hot_tol, next_start_mins, cal_next, event_rain_blocked,
+        frost_active, auto_filter_active, preheat_use_aux_in_power_saving, timeline_inputs,
+        filter_credit_effective, filter_missing_minutes, frost_credit_effective, frost_credit_shift,
+        frost_danger, next_frost_mins, frost_timer_mins, frost_timer_active, frost_timer_duration,
+        frost_timer_type, event_rain_probability, manual_mins, auto_filter_mins, next_filter_mins, cost_plan,
+    ) -> dict:
+        """Heating model tuning and the desired main/pump/aux states."""
+        perf = self._perf
+        perf.enter("heat_tuning")
+        # =========================
+        # Adaptive heating tuning (loss + startup offset)
+        # =========================
+        try:
+            if water_temp is not None:
+                # Update loss coefficient while pool is OFF (no pump, no aux heat)
+                if (not pump_switch_on) and (not aux_heating_switch_on):
+                    if self._last_temp_ts is None or self._last_temp_value is None:
+                        self._last_temp_ts = now
+                        self._last_temp_value = float(water_temp)
+                    else:
+                        dt_min = max(0.0, (now - self._last_temp_ts).total_seconds() / 60.0)
+                        # Use a longer window to handle sparse sensor updates (often 15–30 min).
+                        # This avoids zero-delta samples from short intervals.
+                        if dt_min >= 60:
+                            if outdoor_temp is not None and vol_l:
+                                dtemp = float(water_temp) - float(self._last_temp_value)
+                                if dtemp < 0:
+                                    cooling_rate = abs(dtemp) / dt_min  # °C/min
+                                    delta = max(0.0, float(water_temp) - float(outdoor_temp))
+
+                                    # Guardrails for learning: require plausible cooling samples.
+                                    drop_per_hour = cooling_rate * 60.0
+                                    max_temp_drop_per_hour = 1.5
+                                    if 0.02 <= drop_per_hour <= max_temp_drop_per_hour and delta > 0.0:
+                                        # Convert observed cooling to equivalent heat loss power (W).
+                                        # dT/h = cooling_rate * 60
+                                        loss_w = float(vol_l) * 1.16 * float(cooling_rate) * 60.0
+                                        loss_w = max(0.0, min(6000.0, loss_w))
+
+                                        # Online linear fit with forgetting:
+                                        #   loss_w ~= k * delta
+                                        # This avoids per-sample division by tiny delta values.
+                                        decay = 0.995
+                                        self._heat_loss_fit_sum_x2 = decay * float(self._heat_loss_fit_sum_x2 or 0.0) + (delta * delta)
+                                        self._heat_loss_fit_sum_xy = decay * float(self._heat_loss_fit_sum_xy or 0.0) + (delta * loss_w)
+
+                                        if self._heat_loss_fit_sum_x2 >= 9.0:
+                                            est_w_per_c = float(self._heat_loss_fit_sum_xy) / float(self._heat_loss_fit_sum_x2)
+                                            est_w_per_c = max(0.0, min(80.0, est_w_per_c))
+                                            prev = float(self.heat_loss_w_per_c or DEFAULT_HEAT_LOSS_W_PER_C)
+                                            alpha = 0.12
+                                            self.heat_loss_w_per_c = (1.0 - alpha) * prev + alpha * est_w_per_c
+                            # refresh baseline after a full window
+                            self._last_temp_ts = now
+                            self._last_temp_value = float(water_temp)
 
-            # Initialisierung, um UnboundLocalError zu vermeiden
+                # Update startup offset based on how long it takes to see first warming
+                # Use the physical aux heater switch state to avoid relying on heat_reason
+                # (which may not be initialized yet in this update cycle).
+                heat_active = bool(pump_switch_on and aux_heating_switch_on)
+                if heat_active and not self._last_heat_active:
+                    self._heat_start_ts = now
+                    self._heat_start_temp = float(water_temp)
+                    self._heat_start_reached = False
+                if heat_active and (self._heat_start_ts is not None) and (not self._heat_start_reached):
+                    try:
+                        if float(water_temp) >= float(self._heat_start_temp or water_temp) + 0.1:
+                            lag_min = max(0.0, (now - self._heat_start_ts).total_seconds() / 60.0)
+                            if lag_min <= 30:
+                                alpha = 0.2
+                                self.heat_startup_offset_minutes = max(0.0, (1 - alpha) * float(self.heat_startup_offset_minutes) + alpha * lag_min)
+                            self._heat_start_reached = True
+                    except Exception:
+                        pass
+                if not heat_active:
+                    self._heat_start_ts = None
+                    self._heat_start_temp = None
+                    self._heat_start_reached = False
+                self._last_heat_active = heat_active
+
+                # Persist tuned values (best effort); the store only writes changed values, coalesced.
+                if self.entry:
+                    try:
+                        self._runtime_state.update(
+                            {
+                                OPT_KEY_HEAT_LOSS_W_PER_C: float(self.heat_loss_w_per_c),
+                                OPT_KEY_HEAT_STARTUP_OFFSET_MINUTES: float(self.heat_startup_offset_minutes),
+                            }
+                        )
+                    except Exception:
+                        pass
+        except Exception:
+            pass
+        perf.enter("demand")
+        # Convenience booleans for logic
+
+        # Initialisierung, um UnboundLocalError zu vermeiden
+        is_bathing = False
+        is_chlorinating = False
+        is_manual_filter = False
+        is_manual_heat = False
+        if manual_active and self.manual_timer_type is not None:
+            is_bathing = self.manual_timer_type == "bathing"
+            is_chlorinating = self.manual_timer_type == "chlorine"
+            is_manual_filter = self.manual_timer_type == "filter"
+            is_manual_heat = self.manual_timer_type in ("bathing", "chlorine", "filter")
+
+        # Away mode: suppress non-filter manual modes
+        if self.away_active and self.manual_timer_type in ("bathing", "chlorine"):
             is_bathing = False
             is_chlorinating = False
-            is_manual_filter = False
             is_manual_heat = False
-            if manual_active and self.manual_timer_type is not None:
-                is_bathing = self.manual_timer_type == "bathing"
-                is_chlorinating = self.manual_timer_type == "chlorine"
-                is_manual_filter = self.manual_timer_type == "filter"
-                is_manual_heat = self.manual_timer_type in ("bathing", "chlorine", "filter")
-
-            # Away mode: suppress non-filter manual modes
-            if self.away_active and self.manual_timer_type in ("bathing", "chlorine"):
-                is_bathing = False
-                is_chlorinating = False
-                is_manual_heat = False
-
-            # PV-based run should stop once target is reached (with same hysteresis).
+
+        # PV-based run should stop once target is reached (with same hysteresis).
+        try:
+            if water_temp is not None and float(water_temp) >= float(target_temp_effective):
+                pv_heat_demand = False
+            else:
+                pv_heat_demand = self._thermostat_demand(
+                    current_temp=water_temp,
+                    target_temp=target_temp_effective,
+                    cold_tolerance=cold_tol,
+                    hot_tolerance=hot_tol,
+                    prev_on=bool(self._pv_heat_demand),
+                )
+        except Exception:
+            pv_heat_demand = bool(self._pv_heat_demand)
+        self._pv_heat_demand = pv_heat_demand
+        pv_run = bool(enable_pv and pv_allows and (not in_quiet) and (not maintenance_active) and (not self.away_active) and (pv_heat_demand))
+        if self.power_saving_active:
+            pv_run = False
+
+        # Stage 1 (pump) in power-saving is still a heating context.
+        # Do not keep running indefinitely once target temperature is reached.
+        power_saving_pump_run = bool(
+            self.power_saving_active
+            and power_saving_available
+            and power_saving_pump_allows
+            and pv_heat_demand
+        )
+
+        # Optimiert: manuelle Timer erzwingen "heat"-Modus
+        manual_heat_run = is_manual_heat and (not self.away_active)
+
+
+        # "Preheat" ist nur die Phase VOR einem Kalender-Event, in der wir bereits starten dürfen.
+        # Wenn das Event bereits läuft, wird oben automatisch ein bathing-Manual-Timer aktiviert.
+        preheat_active = bool(
+            (next_start_mins is not None and next_start_mins == 0)
+            and cal_next.get("start")
+            and now < cal_next["start"]
+            and (not event_rain_blocked)
+            and (not in_quiet)
+            and (not self.away_active)
+            # Ziel für dieses Event schon erreicht: Neustart nur über die Hysterese (Schedule-Stufe).
+            and not (self._preheat_latch is not None and not self._preheat_latch[1])
+        )
+        if preheat_active:
+            self._preheat_latch = (cal_next["start"], True)
+
+
+        # Thermostat behavior: if PV optimization is disabled, allow heating to maintain target temperature
+        # (similar to a normal climate entity), gated by hvac_enabled.
+        thermostat_run = bool((not enable_pv) and (not self.away_active) and getattr(self, "hvac_enabled", True))
+        if self.power_saving_active:
+            thermostat_run = False
+
+        # Heat is allowed for explicit heating contexts.
+        # Important: in power-saving mode, stage2 (aux threshold reached) must also
+        # open the heating path; otherwise aux stage becomes unreachable.
+        heat_allowed = (not maintenance_active) and (not pause_active) and (not in_quiet) and (
+            is_bathing
+            or preheat_active
+            or pv_run
+            or thermostat_run
+            or manual_heat_run
+            or self.boost_active
+            or (self.power_saving_active and power_saving_aux_allows)
+        )
+
+
+        # Demand flags
+        aux_heat_demand = False
+        if heat_allowed and conf.get(CONF_ENABLE_AUX_HEATING, False):
+            # Aux heater is strictly for heating. Once target is reached, keep it OFF
+            # even if a manual timer (e.g. bathing/filter/chlorine) is active.
             try:
                 if water_temp is not None and float(water_temp) >= float(target_temp_effective):
-                    pv_heat_demand = False
+                    aux_heat_demand = False
                 else:
-                    pv_heat_demand = self._thermostat_demand(
+                    aux_heat_demand = self._thermostat_demand(
                         current_temp=water_temp,
                         target_temp=target_temp_effective,
                         cold_tolerance=cold_tol,
                         hot_tolerance=hot_tol,
-                        prev_on=bool(self._pv_heat_demand),
+                        prev_on=bool(self._aux_heat_demand),
                     )
             except Exception:
-                pv_heat_demand = bool(self._pv_heat_demand)
-            self._pv_heat_demand = pv_heat_demand
-            pv_run = bool(enable_pv and pv_allows and (not in_quiet) and (not maintenance_active) and (not self.away_active) and (pv_heat_demand))
-            if self.power_saving_active:
-                pv_run = False
-
-            # Stage 1 (pump) in power-saving is still a heating context.
-            # Do not keep running indefinitely once target temperature is reached.
-            power_saving_pump_run = bool(
-                self.power_saving_active
-                and power_saving_available
-                and power_saving_pump_allows
-                and pv_heat_demand
-            )
-
-            # Optimiert: manuelle Timer erzwingen "heat"-Modus
-            manual_heat_run = is_manual_heat and (not self.away_active)
-
-
-            # "Preheat" ist nur die Phase VOR einem Kalender-Event, in der wir bereits starten dürfen.
-            # Wenn das Event bereits läuft, wird oben automatisch ein bathing-Manual-Timer aktiviert.
-            preheat_active = bool(
-                (next_start_mins is not None and next_start_mins == 0)
-                and cal_next.get("start")
-                and now < cal_next["start"]
-                and (not event_rain_blocked)
-                and (not in_quiet)
-                and (not self.away_active)
-            )
-
-
-            # Thermostat behavior: if PV optimization is disabled, allow heating to maintain target temperature
-            # (similar to a normal climate entity), gated by hvac_enabled.
-            thermostat_run = bool((not enable_pv) and (not self.away_active) and getattr(self, "hvac_enabled", True))
-            if self.power_saving_active:
-                thermostat_run = False
-
-            # Heat is allowed for explicit heating contexts.
-            # Important: in power-saving mode, stage2 (aux threshold reached) must also
-            # open the heating path; otherwise aux stage becomes unreachable.
-            heat_allowed = (not maintenance_active) and (not pause_active) and (not in_quiet) and (
-                is_bathing
-                or preheat_active
-                or pv_run
-                or thermostat_run
-                or manual_heat_run
-                or self.boost_active
-                or (self.power_saving_active and power_saving_aux_allows)
-            )
-
-
-            # Demand flags
+                aux_heat_demand = bool(self._aux_heat_demand)
+        # Bei manueller Filterung oder Chlorung darf die Zusatzheizung
+        # nur laufen, wenn gleichzeitig PV-basierter Heizbedarf vorhanden ist.
+        if (is_manual_filter or is_chlorinating) and not pv_run:
             aux_heat_demand = False
-            if heat_allowed and conf.get(CONF_ENABLE_AUX_HEATING, False):
-                # Aux heater is strictly for heating. Once target is reached, keep it OFF
-                # even if a manual timer (e.g. bathing/filter/chlorine) is active.
-                try:
-                    if water_temp is not None and float(water_temp) >= float(target_temp_effective):
-                        aux_heat_demand = False
-                    else:
-                        aux_heat_demand = self._thermostat_demand(
-                            current_temp=water_temp,
-                            target_temp=target_temp_effective,
-                            cold_tolerance=cold_tol,
-                            hot_tolerance=hot_tol,
-                            prev_on=bool(self._aux_heat_demand),
-                        )
-                except Exception:
-                    aux_heat_demand = bool(self._aux_heat_demand)
-            # Bei manueller Filterung oder Chlorung darf die Zusatzheizung
-            # nur laufen, wenn gleichzeitig PV-basierter Heizbedarf vorhanden ist.
-            if (is_manual_filter or is_chlorinating) and not pv_run:
-                aux_heat_demand = False
-
-            self._aux_heat_demand = aux_heat_demand
 
+        self._aux_heat_demand = aux_heat_demand
+
+
+        # Transparenz: Warum läuft der Pool (Main/Pumpe) gerade?
+        if maintenance_active:
+            run_reason = "maintenance"
+        elif self.manual_mode_active:
+            run_reason = "manual"
+        elif frost_active:
+            run_reason = "frost"
+        elif pause_active:
+            run_reason = "pause"
+        elif is_bathing:
+            run_reason = "bathing"
+        elif is_chlorinating:
+            run_reason = "chlorine"
+        elif is_manual_filter:
+            run_reason = "filter"
+        elif (auto_filter_active and (not in_quiet)):
+            run_reason = "filter"
+        elif preheat_active:
+            run_reason = "preheat"
+        elif self.boost_active and (not in_quiet):
+            run_reason = "boost"
+        elif power_saving_pump_run:
+            run_reason = "power_saving"
+        elif pv_run:
+            run_reason = "pv"
+        else:
+            run_reason = "idle"
 
-            # Transparenz: Warum läuft der Pool (Main/Pumpe) gerade?
+        power_saving_stage = 0
+        power_saving_reason = "inactive"
+        if self.power_saving_active:
             if maintenance_active:
-                run_reason = "maintenance"
-            elif self.manual_mode_active:
-                run_reason = "manual"
-            elif frost_active:
-                run_reason = "frost"
+                power_saving_reason = "maintenance"
             elif pause_active:
-                run_reason = "pause"
+                power_saving_reason = "pause"
+            elif self.away_active:
+                power_saving_reason = "away"
+            elif in_quiet:
+                power_saving_reason = "quiet"
+            elif power_saving_unavailable_grace_active:
+                power_saving_reason = "sensor_hold"
+                power_saving_stage = 2 if power_saving_aux_allows else (1 if power_saving_pump_allows else 0)
+            elif not power_saving_available:
+                power_saving_reason = "sensors_missing"
+            elif power_saving_aux_allows:
+                power_saving_reason = "stage2"
+                power_saving_stage = 2
+            elif power_saving_pump_allows:
+                power_saving_reason = "stage1"
+                power_saving_stage = 1
+            else:
+                power_saving_reason = "pv_low"
+
+        preheat_force_aux_in_power_saving = bool(
+            self.power_saving_active
+            and preheat_active
+            and preheat_use_aux_in_power_saving
+        )
+
+
+        # Transparenz: Warum darf/soll die Heizung laufen?
+        if not conf.get(CONF_ENABLE_AUX_HEATING, False):
+            heat_reason = "disabled"
+        elif self.manual_mode_active:
+            heat_reason = "off"
+        elif heat_allowed:
+            if self.boost_active:
+                heat_reason = "boost"
             elif is_bathing:
-                run_reason = "bathing"
-            elif is_chlorinating:
-                run_reason = "chlorine"
+                heat_reason = "bathing"
             elif is_manual_filter:
-                run_reason = "filter"
-            elif (auto_filter_active and (not in_quiet)):
-                run_reason = "filter"
+                heat_reason = "filter"
+            elif is_chlorinating:
+                heat_reason = "chlorine"
             elif preheat_active:
-                run_reason = "preheat"
-            elif self.boost_active and (not in_quiet):
-                run_reason = "boost"
-            elif power_saving_pump_run:
-                run_reason = "power_saving"
+                heat_reason = "preheat"
+            elif self.power_saving_active and power_saving_aux_allows:
+                heat_reason = "power_saving"
             elif pv_run:
-                run_reason = "pv"
+                heat_reason = "pv"
+            elif thermostat_run:
+                heat_reason = "thermostat"
             else:
-                run_reason = "idle"
-
-            power_saving_stage = 0
-            power_saving_reason = "inactive"
-            if self.power_saving_active:
-                if maintenance_active:
-                    power_saving_reason = "maintenance"
-                elif pause_active:
-                    power_saving_reason = "pause"
-                elif self.away_active:
-                    power_saving_reason = "away"
-                elif in_quiet:
-                    power_saving_reason = "quiet"
-                elif power_saving_unavailable_grace_active:
-                    power_saving_reason = "sensor_hold"
-                    power_saving_stage = 2 if power_saving_aux_allows else (1 if power_saving_pump_allows else 0)
-                elif not power_saving_available:
-                    power_saving_reason = "sensors_missing"
-                elif power_saving_aux_allows:
-                    power_saving_reason = "stage2"
-                    power_saving_stage = 2
-                elif power_saving_pump_allows:
-                    power_saving_reason = "stage1"
-                    power_saving_stage = 1
-                else:
-                    power_saving_reason = "pv_low"
+                heat_reason = "off"
+        else:
+            heat_reason = "off"
 
-            preheat_force_aux_in_power_saving = bool(
-                self.power_saving_active
-                and preheat_active
-                and preheat_use_aux_in_power_saving
-            )
+        # Filter start may have been moved above (quiet, merge, min gap, auto start).
+        timeline = self._schedule_timeline(
+            now,
+            replace(timeline_inputs, next_filter_start=getattr(self, "next_filter_start", None)),
+            quiet,
+        )
+        next_planned_run = timeline.next_run(now)
+
+        data = {
+            "sanitizer_mode": sanitizer_mode,
+            "sanitizer_product": sanitizer_product,
+            "maintenance_active": maintenance_active,
+            "away_active": bool(self.away_active),
+            "power_saving_active": bool(self.power_saving_active),
+            "manual_mode_active": bool(self.manual_mode_active),
+            "power_saving_available": bool(power_saving_available),
+            "power_saving_stage": int(power_saving_stage),
+            "power_saving_reason": power_saving_reason,
+            "sensor_health_status": sensor_health_status,
+            "sensor_health_message": sensor_health_message,
+            "sensor_health_problem": sensor_health_status == "problem",
+            "sensor_health_esp32_reachable": sensor_health_esp32_ok,
+            "sensor_health_water_sensor_reachable": sensor_health_water_sensor_ok,
+            "blueriiot_enabled": blueriiot_enabled,
+            "blueriiot_interval_minutes": blueriiot_interval,
+            "blueriiot_night_active": blueriiot_night_active,
+            "blueriiot_connected": self._blueriiot_reader.is_recently_reachable(
+                timedelta(minutes=blueriiot_interval * 2)
+            ),
+            "blueriiot_last_success": self._blueriiot_reader.last_success,
+            "blueriiot_error": self._blueriiot_reader.last_error,
+            "blueriiot_battery": round(blueriiot_reading.battery, 0) if use_blueriiot_reading else None,
+            "blueriiot_connect_seconds": self._blueriiot_reader.last_connect_seconds,
+            "blueriiot_session_reuse_percent": (
+                round(self._blueriiot_reader.reuse_rate * 100.0, 1)
+                if self._blueriiot_reader.reuse_rate is not None
+                else None
+            ),
+            "dynamic_target_enabled": bool(dynamic_target.get("enabled", False)),
+            "dynamic_target_profile": self.target_temp_profile,
+            "target_temp_base": round(target_temp_base, 2),
+            "target_temp_offset": round(self.target_temp_offset, 3),
+            "target_temp_season_offset": round(self.target_temp_season_offset, 3),
+            "target_temp_weather_offset": round(self.target_temp_weather_offset, 3),
+            "target_temp_effective": round(target_temp_effective, 2),
+            "run_reason": run_reason,
+            "heat_reason": heat_reason,
+            "run_credit_source": self._credit_streak_source if self._credit_streak_source else None,
+            "run_credit_minutes": int(round(float(self._credit_streak_minutes or 0.0))),
+            "filter_credit_minutes": int(round(float(filter_credit_effective or 0.0))),
+            "filter_missing_minutes": int(round(float(filter_missing_minutes or 0))),
+            "frost_credit_minutes": int(round(float(frost_credit_effective or 0.0))),
+            "frost_credit_shift_minutes": int(round(float(frost_credit_shift or 0))),
+            "water_temp": round(water_temp, 1) if water_temp is not None else None,
+            "outdoor_temp": round(outdoor_temp, 1) if outdoor_temp is not None else None,
+            "ph_val": round(ph_val, 2) if ph_val is not None else None,
+            "chlor_val": int(chlor_val) if chlor_val is not None else None,
+            "salt_val": round(salt_val, 1) if salt_val is not None else None,
+            "salt_add_g": salt_add_g,
+            "tds_val": tds_val,
+            "tds_effective": tds_effective,
+            "tds_status": tds_status,
+            "tds_high": tds_high,
+            "water_safety_status": water_safety_status,
+            "water_safety_reason": water_safety_reason,
+            "water_safety_risk": water_safety_risk,
+            "tds_water_change_liters": tds_water_change_liters,
+            "tds_water_change_percent": tds_water_change_percent,
+            "alkalinity_estimated_ppm": alkalinity_estimated_ppm,
+            "alkalinity_estimated_ppm_raw": alkalinity_estimated_ppm_raw,
+            "alkalinity_status": alkalinity_status,
+            "alkalinity_action": alkalinity_action,
+            "alkalinity_measurement_valid": alkalinity_measurement_valid,
+            "alkalinity_measurement_reason": alkalinity_measurement_reason,
+            "alkalinity_history_samples": alkalinity_history_samples,
+            "ph_history_median": round(ph_history_median, 2) if ph_history_median is not None else None,
+            "chlor_history_median": round(chlor_history_median) if chlor_history_median is not None else None,
+            "tds_history_median": round(tds_history_median) if tds_history_median is not None else None,
+            "alkalinity_total_dose_g": alkalinity_total_dose_g,
+            "alkalinity_step_dose_g": alkalinity_step_dose_g,
+            "alkalinity_steps": alkalinity_steps,
+            "alkalinity_wait_minutes": alkalinity_wait_minutes,
+            "alkalinity_water_change_percent": alkalinity_water_change_percent,
+            "alkalinity_target_ppm": alkalinity_target_ppm,
+            "ph_minus_g": ph_minus,
+            "ph_plus_g": ph_plus,
+            "chlor_spoons": chlor_spoons,
+            "is_we_holiday": we_or_holiday,
+            # Age of the last good background-fetched snapshots (None = not configured/none yet)
+            "calendar_snapshot_age_seconds": self._snapshot_age("calendar"),
+            "holiday_calendar_snapshot_age_seconds": self._snapshot_age("holiday_calendar"),
+            "forecast_snapshot_age_seconds": self._snapshot_age("forecast"),
+            "frost_danger": frost_danger,
+            "frost_active": frost_active,
+            "next_frost_mins": next_frost_mins,
+            # Frost-Timer analog zu manual/auto_filter/pause
+            "frost_timer_mins": frost_timer_mins,
+            "frost_timer_active": frost_timer_active,
+            "frost_timer_duration": frost_timer_duration,
+            "frost_timer_type": frost_timer_type,
+            "next_event": cal_next.get("start"),
+            "next_event_end": cal_next.get("end"),
+            "next_event_summary": cal_next.get("summary"),
+            "event_rain_probability": event_rain_probability,
+            "event_rain_blocked": event_rain_blocked,
+            "next_start_mins": next_start_mins,
+            # Timers: states are remaining minutes
+            "manual_timer_mins": manual_mins,
+            "manual_timer_active": manual_active,
+            "auto_filter_timer_mins": auto_filter_mins,
+            "auto_filter_timer_active": auto_filter_active,
+            "pause_timer_mins": self._mins_left(self.pause_until, now) if pause_active else 0,
+            "pause_timer_active": pause_active,
+            "is_bathing": is_bathing,
+            "next_filter_mins": next_filter_mins,
+            "next_planned_run": next_planned_run.start if next_planned_run else None,
+            "planned_runs": timeline.as_attributes(now),
+            "cost_plan": cost_plan.as_dict() if cost_plan is not None else None,
+            "cost_plan_savings": round(cost_plan.savings, 4) if cost_plan is not None else None,
+            # PV power reading (W) - used for UI display/more-info in the dashboard card
+            "pv_power": pv_raw,
+            "pv_house_load": round(float(pv_house_load_w), 1) if pv_house_load_w is not None else None,
+            "pv_surplus_for_pool": round(float(pv_surplus_for_pool_w), 1) if pv_surplus_for_pool_w is not None else None,
+            "pv_smoothed": round(pv_smoothed, 1) if pv_smoothed is not None else None,
+            "power_saving_pump_threshold": round(float(power_saving_pump_threshold_w), 1) if power_saving_pump_threshold_w is not None else None,
+            "power_saving_aux_threshold": round(float(power_saving_aux_threshold_w), 1) if power_saving_aux_threshold_w is not None else None,
+            "pv_allows": pv_allows,
+            "in_quiet": in_quiet,
+            "main_power": round(main_power, 1) if main_power is not None else None,
+            "aux_power": round(aux_power, 1) if aux_power is not None else None,
+            "power": round(float(total_power_w), 1) if total_power_w is not None else None,
+            "electricity_price": round(float(electricity_price), 4) if electricity_price is not None else None,
+            "feed_in_tariff": round(float(feed_in_tariff), 4) if feed_in_tariff is not None else None,
+            "power_cost_per_hour": round(float(power_cost_per_hour), 4) if power_cost_per_hour is not None else None,
+            "power_cost_per_hour_net": round(float(power_cost_per_hour_net), 4) if power_cost_per_hour_net is not None else None,
+            "power_cost_feed_in_loss_per_hour": round(float(power_cost_feed_in_loss_per_hour), 4) if power_cost_feed_in_loss_per_hour is not None else None,
+            "energy_cost_daily": round(float(energy_cost_daily), 4) if energy_cost_daily is not None else None,
+            "energy_cost_monthly": round(float(energy_cost_monthly), 4) if energy_cost_monthly is not None else None,
+            "energy_cost_yearly": round(float(energy_cost_yearly), 4) if energy_cost_yearly is not None else None,
+            "energy_feed_in_loss_daily": round(float(energy_feed_in_loss_daily), 4) if energy_feed_in_loss_daily is not None else None,
+            "energy_feed_in_loss_monthly": round(float(energy_feed_in_loss_monthly), 4) if energy_feed_in_loss_monthly is not None else None,
+            "energy_feed_in_loss_yearly": round(float(energy_feed_in_loss_yearly), 4) if energy_feed_in_loss_yearly is not None else None,
+            "energy_cost_net_daily": round(float(energy_cost_net_daily), 4) if energy_cost_net_daily is not None else None,
+            "energy_cost_net_monthly": round(float(energy_cost_net_monthly), 4) if energy_cost_net_monthly is not None else None,
+            "energy_cost_net_yearly": round(float(energy_cost_net_yearly), 4) if energy_cost_net_yearly is not None else None,
+            "heat_loss_w_per_c": round(float(self.heat_loss_w_per_c), 2) if self.heat_loss_w_per_c is not None else None,
+            "heat_startup_offset_minutes": round(float(self.heat_startup_offset_minutes), 1) if self.heat_startup_offset_minutes is not None else None,
+            # Stromversorgung an, wenn der Pool laufen muss (inkl. Frost) oder wenn die Pumpe laufen soll.
+            "should_pump_on": (
+                (not maintenance_active)
+                and (not self.manual_mode_active)
+                and (not pause_active)
+                and (
+                    frost_active
+                    or (self.boost_active and not in_quiet)
+                    or is_bathing
+                    or is_chlorinating
+                    or aux_heat_demand
+                    or (is_manual_filter and not in_quiet)
+                    or (auto_filter_active and not in_quiet)
+                    or preheat_active
+                    or power_saving_pump_run
+                    or pv_run
+                )
+            ),
+            "should_main_on": (
+                (not maintenance_active)
+                and (not self.manual_mode_active)
+                and (not pause_active)
+                and (
+                    frost_active
+                    or (self.boost_active and not in_quiet)
+                    or is_bathing
+                    or is_chlorinating
+                    or aux_heat_demand
+                    or (is_manual_filter and not in_quiet)
+                    or (auto_filter_active and not in_quiet)
+                    or preheat_active
+                    or power_saving_pump_run
+                    or pv_run
+                )
+            ),
+            # Aux-Heizung einschalten, wenn aktiviert UND Temperatur signifikant unter Ziel liegt
+            "should_aux_on": (
+                (not maintenance_active)
+                and (not self.manual_mode_active)
+                and conf.get(CONF_ENABLE_AUX_HEATING, False)
+                and aux_heat_demand
+                and (
+                    (not self.power_saving_active)
+                    or power_saving_aux_allows
+                    or preheat_force_aux_in_power_saving
+                )
+            ),
 
+            # Physical switch states (mirror the configured external switches).
+            # These are *not* the desired/required states; they reflect what is currently ON.
+            "main_switch_on": main_switch_on,
+            "pump_switch_on": pump_switch_on,
+            "aux_heating_switch_on": aux_heating_switch_on,
+        }
 
-            # Transparenz: Warum darf/soll die Heizung laufen?
-            if not conf.get(CONF_ENABLE_AUX_HEATING, False):
-                heat_reason = "disabled"
-            elif self.manual_mode_active:
-                heat_reason = "off"
-            elif heat_allowed:
-                if self.boost_active:
-                    heat_reason = "boost"
-                elif is_bathing:
-                    heat_reason = "bathing"
-                elif is_manual_filter:
-                    heat_reason = "filter"
-                elif is_chlorinating:
-                    heat_reason = "chlorine"
-                elif preheat_active:
-                    heat_reason = "preheat"
-                elif self.power_saving_active and power_saving_aux_allows:
-                    heat_reason = "power_saving"
-                elif pv_run:
-                    heat_reason = "pv"
-                elif thermostat_run:
-                    heat_reason = "thermostat"
-                else:
-                    heat_reason = "off"
-            else:
-                heat_reason = "off"
+        return {
+            "run_reason": run_reason,
+            "heat_reason": heat_reason,
+            "data": data,
+        }
 
-            data = {
-                "sanitizer_mode": sanitizer_mode,
-                "sanitizer_product": sanitizer_product,
-                "maintenance_active": maintenance_active,
-                "away_active": bool(self.away_active),
-                "power_saving_active": bool(self.power_saving_active),
-                "manual_mode_active": bool(self.manual_mode_active),
-                "power_saving_available": bool(power_saving_available),
-                "power_saving_stage": int(power_saving_stage),
-                "power_saving_reason": power_saving_reason,
-                "sensor_health_status": sensor_health_status,
-                "sensor_health_message": sensor_health_message,
-                "sensor_health_problem": sensor_health_status == "problem",
-                "sensor_health_esp32_reachable": sensor_health_esp32_ok,
-                "sensor_health_water_sensor_reachable": sensor_health_water_sensor_ok,
-                "blueriiot_enabled": blueriiot_enabled,
-                "blueriiot_interval_minutes": blueriiot_interval,
-                "blueriiot_night_active": blueriiot_night_active,
-                "blueriiot_connected": self._blueriiot_reader.is_recently_reachable(
-                    timedelta(minutes=blueriiot_interval * 2)
-                ),
-                "blueriiot_last_success": self._blueriiot_reader.last_success,
-                "blueriiot_error": self._blueriiot_reader.last_error,
-                "blueriiot_battery": round(blueriiot_reading.battery, 0) if use_blueriiot_reading else None,
-                "dynamic_target_enabled": bool(dynamic_target.get("enabled", False)),
-                "dynamic_target_profile": self.target_temp_profile,
-                "target_temp_base": round(target_temp_base, 2),
-                "target_temp_offset": round(self.target_temp_offset, 3),
-                "target_temp_season_offset": round(self.target_temp_season_offset, 3),
-                "target_temp_weather_offset": round(self.target_temp_weather_offset, 3),
-                "target_temp_effective": round(target_temp_effective, 2),
-                "run_reason": run_reason,
-                "heat_reason": heat_reason,
-                "run_credit_source": self._credit_streak_source if self._credit_streak_source else None,
-                "run_credit_minutes": int(round(float(self._credit_streak_minutes or 0.0))),
-                "filter_credit_minutes": int(round(float(filter_credit_effective or 0.0))),
-                "filter_missing_minutes": int(round(float(filter_missing_minutes or 0))),
-                "frost_credit_minutes": int(round(float(frost_credit_effective or 0.0))),
-                "frost_credit_shift_minutes": int(round(float(frost_credit_shift or 0))),
-                "water_temp": round(water_temp, 1) if water_temp is not None else None,
-                "outdoor_temp": round(outdoor_temp, 1) if outdoor_temp is not None else None,
-                "ph_val": round(ph_val, 2) if ph_val is not None else None,
-                "chlor_val": int(chlor_val) if chlor_val is not None else None,
-                "salt_val": round(salt_val, 1) if salt_val is not None else None,
-                "salt_add_g": salt_add_g,
-                "tds_val": tds_val,
-                "tds_effective": tds_effective,
-                "tds_status": tds_status,
-                "tds_high": tds_high,
-                "water_safety_status": water_safety_status,
-                "water_safety_reason": water_safety_reason,
-                "water_safety_risk": water_safety_risk,
-                "tds_water_change_liters": tds_water_change_liters,
-                "tds_water_change_percent": tds_water_change_percent,
-                "alkalinity_estimated_ppm": alkalinity_estimated_ppm,
-                "alkalinity_estimated_ppm_raw": alkalinity_estimated_ppm_raw,
-                "alkalinity_status": alkalinity_status,
-                "alkalinity_action": alkalinity_action,
-                "alkalinity_measurement_valid": alkalinity_measurement_valid,
-                "alkalinity_measurement_reason": alkalinity_measurement_reason,
-                "alkalinity_history_samples": alkalinity_history_samples,
-                "alkalinity_total_dose_g": alkalinity_total_dose_g,
-                "alkalinity_step_dose_g": alkalinity_step_dose_g,
-                "alkalinity_steps": alkalinity_steps,
-                "alkalinity_wait_minutes": alkalinity_wait_minutes,
-                "alkalinity_water_change_percent": alkalinity_water_change_percent,
-                "alkalinity_target_ppm": alkalinity_target_ppm,
-                "ph_minus_g": ph_minus,
-                "ph_plus_g": ph_plus,
-                "chlor_spoons": chlor_spoons,
-                "is_we_holiday": we_or_holiday,
-                "frost_danger": frost_danger,
-                "frost_active": frost_active,
-                "next_frost_mins": next_frost_mins,
-                # Frost-Timer analog zu manual/auto_filter/pause
-                "frost_timer_mins": frost_timer_mins,
-                "frost_timer_active": frost_timer_active,
-                "frost_timer_duration": frost_timer_duration,
-                "frost_timer_type": frost_timer_type,
-                "next_event": cal_next.get("start"),
-                "next_event_end": cal_next.get("end"),
-                "next_event_summary": cal_next.get("summary"),
-                "event_rain_probability": event_rain_probability,
-                "event_rain_blocked": event_rain_blocked,
-                "next_start_mins": next_start_mins,
-                # Timers: states are remaining minutes
-                "manual_timer_mins": manual_mins,
-                "manual_timer_active": manual_active,
-                "auto_filter_timer_mins": auto_filter_mins,
-                "auto_filter_timer_active": auto_filter_active,
-                "pause_timer_mins": _mins_left(self.pause_until) if pause_active else 0,
-                "pause_timer_active": pause_active,
-                "is_bathing": is_bathing,
-                "next_filter_mins": next_filter_mins,
-                # PV power reading (W) - used for UI display/more-info in the dashboard card
-                "pv_power": pv_raw,
-                "pv_house_load": round(float(pv_house_load_w), 1) if pv_house_load_w is not None else None,
-                "pv_surplus_for_pool": round(float(pv_surplus_for_pool_w), 1) if pv_surplus_for_pool_w is not None else None,
-                "pv_smoothed": round(pv_smoothed, 1) if pv_smoothed is not None else None,
-                "power_saving_pump_threshold": round(float(power_saving_pump_threshold_w), 1) if power_saving_pump_threshold_w is not None else None,
-                "power_saving_aux_threshold": round(float(power_saving_aux_threshold_w), 1) if power_saving_aux_threshold_w is not None else None,
-                "pv_allows": pv_allows,
-                "in_quiet": in_quiet,
-                "main_power": round(main_power, 1) if main_power is not None else None,
-                "aux_power": round(aux_power, 1) if aux_power is not None else None,
-                "power": round(float(total_power_w), 1) if total_power_w is not None else None,
-                "electricity_price": round(float(electricity_price), 4) if electricity_price is not None else None,
-                "feed_in_tariff": round(float(feed_in_tariff), 4) if feed_in_tariff is not None else None,
-                "power_cost_per_hour": round(float(power_cost_per_hour), 4) if power_cost_per_hour is not None else None,
-                "power_cost_per_hour_net": round(float(power_cost_per_hour_net), 4) if power_cost_per_hour_net is not None else None,
-                "power_cost_feed_in_loss_per_hour": round(float(power_cost_feed_in_loss_per_hour), 4) if power_cost_feed_in_loss_per_hour is not None else None,
-                "energy_cost_daily": round(float(energy_cost_daily), 4) if energy_cost_daily is not None else None,
-                "energy_cost_monthly": round(float(energy_cost_monthly), 4) if energy_cost_monthly is not None else None,
-                "energy_cost_yearly": round(float(energy_cost_yearly), 4) if energy_cost_yearly is not None else None,
-                "energy_feed_in_loss_daily": round(float(energy_feed_in_loss_daily), 4) if energy_feed_in_loss_daily is not None else None,
-                "energy_feed_in_loss_monthly": round(float(energy_feed_in_loss_monthly), 4) if energy_feed_in_loss_monthly is not None else None,
-                "energy_feed_in_loss_yearly": round(float(energy_feed_in_loss_yearly), 4) if energy_feed_in_loss_yearly is not None else None,
-                "energy_cost_net_daily": round(float(energy_cost_net_daily), 4) if energy_cost_net_daily is not None else None,
-                "energy_cost_net_monthly": round(float(energy_cost_net_monthly), 4) if energy_cost_net_monthly is not None else None,
-                "energy_cost_net_yearly": round(float(energy_cost_net_yearly), 4) if energy_cost_net_yearly is not None else None,
-                "heat_loss_w_per_c": round(float(self.heat_loss_w_per_c), 2) if self.heat_loss_w_per_c is not None else None,
-                "heat_startup_offset_minutes": round(float(self.heat_startup_offset_minutes), 1) if self.heat_startup_offset_minutes is not None else None,
-                # Stromversorgung an, wenn der Pool laufen muss (inkl. Frost) oder wenn die Pumpe laufen soll.
-                "should_pump_on": (
-                    (not maintenance_active)
-                    and (not self.manual_mode_active)
-                    and (not pause_active)
-                    and (
-                        frost_active
-                        or (self.boost_active and not in_quiet)
-                        or is_bathing
-                        or is_chlorinating
-                        or aux_heat_demand
-                        or (is_manual_filter and not in_quiet)
-                        or (auto_filter_active and not in_quiet)
-                        or preheat_active
-                        or power_saving_pump_run
-                        or pv_run
-                    )
-                ),
-                "should_main_on": (
-                    (not maintenance_active)
-                    and (not self.manual_mode_active)
-                    and (not pause_active)
-                    and (
-                        frost_active
-                        or (self.boost_active and not in_quiet)
-                        or is_bathing
-                        or is_chlorinating
-                        or aux_heat_demand
-                        or (is_manual_filter and not in_quiet)
-                        or (auto_filter_active and not in_quiet)
-                        or preheat_active
-                        or power_saving_pump_run
-                        or pv_run
-                    )
-                ),
-                # Aux-Heizung einschalten, wenn aktiviert UND Temperatur signifikant unter Ziel liegt
-                "should_aux_on": (
-                    (not maintenance_active)
-                    and (not self.manual_mode_active)
-                    and conf.get(CONF_ENABLE_AUX_HEATING, False)
-                    and aux_heat_demand
-                    and (
-                        (not self.power_saving_active)
-                        or power_saving_aux_allows
-                        or preheat_force_aux_in_power_saving
-                    )
-                ),
+    @cycle_stage("actuation")
+    async def _async_cycle_actuation(
+        self,
+        *,
+        main_switch_on, demo, main_switch_id, pump_switch_id, pump_switch_on, aux_switch_id,
+        aux_heating_switch_on, conf, now, data, run_reason, heat_reason,
+    ) -> dict:
+        """Apply the desired states and publish the cycle."""
+        perf = self._perf
+        perf.enter("actuation")
+        # After computing desired states, ensure physical switches follow the desired state
+        try:
+            desired_main = data.get("should_main_on")
+            desired_pump = data.get("should_pump_on")
+            desired_aux = data.get("should_aux_on")
+            now = dt_util.now()
+            # Commands of this cycle; issued together (concurrently) at the end of the block.
+            commands: list[ActuatorCommand] = []
+            self._actuators.check_confirmations()
+
+            if self.manual_mode_active:
+                # Read-only mode: do not apply any automatic actuator toggles.
+                self._last_should_main_on = desired_main
+                self._last_should_pump_on = desired_pump
+                self._last_should_aux_on = desired_aux
+                ent_reg = None
 
-                # Physical switch states (mirror the configured external switches).
-                # These are *not* the desired/required states; they reflect what is currently ON.
-                "main_switch_on": main_switch_on,
-                "pump_switch_on": pump_switch_on,
-                "aux_heating_switch_on": aux_heating_switch_on,
-            }
+                def _can_attempt(entity_id: str, desired_on: bool, allow_integration: bool = False) -> bool:
+                    return False
+            else:
+                # Debounce / retry guard: avoid rapid repeated attempts for the same entity
+                min_retry = timedelta(seconds=getattr(self, "toggle_debounce_seconds", DEFAULT_TOGGLE_DEBOUNCE_SECONDS))
+                # Failed commands back off exponentially starting from the debounce interval.
+                self._actuators.retry_base_seconds = min_retry.total_seconds()
 
-            # After computing desired states, ensure physical switches follow the desired state
-            try:
-                desired_main = data.get("should_main_on")
-                desired_pump = data.get("should_pump_on")
-                desired_aux = data.get("should_aux_on")
-                now = dt_util.now()
-
-                if self.manual_mode_active:
-                    # Read-only mode: do not apply any automatic actuator toggles.
-                    self._last_should_main_on = desired_main
-                    self._last_should_pump_on = desired_pump
-                    self._last_should_aux_on = desired_aux
+                # access entity registry once for source checks
+                try:
+                    ent_reg = er.async_get(self.hass)
+                except Exception:
                     ent_reg = None
 
-                    def _can_attempt(entity_id: str, desired_on: bool, allow_integration: bool = False) -> bool:
+                def _is_available(entity_id: str) -> bool:
+                    if not entity_id:
                         return False
-                else:
-                    # Debounce / retry guard: avoid rapid repeated attempts for the same entity
-                    min_retry = timedelta(seconds=getattr(self, "toggle_debounce_seconds", DEFAULT_TOGGLE_DEBOUNCE_SECONDS))
+                    st = self.hass.states.get(entity_id)
+                    return bool(st and st.state not in ("unknown", "unavailable"))
 
-                    # access entity registry once for source checks
+                def _is_integration_entity(entity_id: str) -> bool:
+                    if not entity_id or not ent_reg:
+                        return False
                     try:
-                        ent_reg = er.async_get(self.hass)
+                        ent = ent_reg.async_get(entity_id)
+                        return bool(ent and ent.config_entry_id == getattr(self.entry, "entry_id", None))
                     except Exception:
-                        ent_reg = None
-
-                    def _is_available(entity_id: str) -> bool:
-                        if not entity_id:
-                            return False
-                        st = self.hass.states.get(entity_id)
-                        return bool(st and st.state not in ("unknown", "unavailable"))
+                        return False
 
-                    def _is_integration_entity(entity_id: str) -> bool:
-                        if not entity_id or not ent_reg:
-                            return False
-                        try:
-                            ent = ent_reg.async_get(entity_id)
-                            return bool(ent and ent.config_entry_id == getattr(self.entry, "entry_id", None))
-                        except Exception:
-                            return False
-
-                    def _can_attempt(entity_id: str, desired_on: bool, allow_integration: bool = False) -> bool:
-                        # No entity configured -> nothing to attempt (caller should handle)
-                        if not entity_id:
-                            return True
-                        # Avoid toggling entities that were created by this integration (would cause feedback loops)
-                        if _is_integration_entity(entity_id) and not allow_integration:
-                            _LOGGER.debug("Skipping toggle for %s: entity created by this integration (avoid recursion)", entity_id)
-                            return False
-                        # Do not attempt when entity is unavailable/unknown
-                        if not _is_available(entity_id):
-                            _LOGGER.warning("Skipping toggle for %s: entity not available", entity_id)
-                            return False
-                        last = self._last_toggle_attempts.get(entity_id)
-                        if isinstance(last, tuple) and len(last) == 2:
-                            last_ts, last_state = last
-                        else:
-                            last_ts, last_state = last, None
-                        if last_ts and (now - last_ts) < min_retry and (
-                            last_state is None or bool(last_state) == bool(desired_on)
-                        ):
-                            _LOGGER.warning(
-                                "Skipping toggle for %s: last attempt %s seconds ago",
-                                entity_id,
-                                int((now - last_ts).total_seconds()),
-                            )
-                            return False
+                def _can_attempt(entity_id: str, desired_on: bool, allow_integration: bool = False) -> bool:
+                    # No entity configured -> nothing to attempt (caller should handle)
+                    if not entity_id:
                         return True
+                    # Avoid toggling entities that were created by this integration (would cause feedback loops)
+                    if _is_integration_entity(entity_id) and not allow_integration:
+                        _LOGGER.debug("Skipping toggle for %s: entity created by this integration (avoid recursion)", entity_id)
+                        return False
+                    # Do not attempt when entity is unavailable/unknown
+                    if not _is_available(entity_id):
+                        _LOGGER.warning("Skipping toggle for %s: entity not available", entity_id)
+                        return False
+                    # In flight, awaiting confirmation, backing off after failures or debounced
+                    allowed, reason = self._actuators.may_command(entity_id, bool(desired_on), now, min_retry)
+                    if not allowed:
+                        _LOGGER.debug("Skipping toggle for %s: %s", entity_id, reason)
+                        return False
+                    return True
 
-                # Toggle main switch according to desired state
-                # Reconcile not only on desired-state changes, but also on mismatch (desired != physical).
-                need_main_reconcile = (desired_main != self._last_should_main_on) or (bool(desired_main) != bool(main_switch_on))
-                if need_main_reconcile:
-                    if desired_main:
-                        if not demo and main_switch_id and _can_attempt(main_switch_id, True):
-                            # record attempt timestamp to avoid immediate retries
-                            self._last_toggle_attempts[main_switch_id] = (now, True)
-                            await self._async_turn_entity(main_switch_id, True)
-                    else:
-                        if not demo and main_switch_id and _can_attempt(main_switch_id, False):
-                            self._last_toggle_attempts[main_switch_id] = (now, False)
-                            await self._async_turn_entity(main_switch_id, False)
-                    self._last_should_main_on = desired_main
-
-                # Toggle pump switch (may be same as main switch)
-                if pump_switch_id and pump_switch_id != main_switch_id:
-                    need_pump_reconcile = (desired_pump != self._last_should_pump_on) or (bool(desired_pump) != bool(pump_switch_on))
-                    if need_pump_reconcile:
-                        if desired_pump:
-                            if not demo and _can_attempt(pump_switch_id, True):
-                                self._last_toggle_attempts[pump_switch_id] = (now, True)
-                                await self._async_turn_entity(pump_switch_id, True)
-                        else:
-                            if not demo and _can_attempt(pump_switch_id, False):
-                                self._last_toggle_attempts[pump_switch_id] = (now, False)
-                                await self._async_turn_entity(pump_switch_id, False)
-                        self._last_should_pump_on = desired_pump
+            # Toggle main switch according to desired state
+            # Reconcile not only on desired-state changes, but also on mismatch (desired != physical).
+            need_main_reconcile = (desired_main != self._last_should_main_on) or (bool(desired_main) != bool(main_switch_on))
+            if need_main_reconcile:
+                if not demo and main_switch_id and _can_attempt(main_switch_id, bool(desired_main)):
+                    commands.append(ActuatorCommand(ROLE_MAIN, main_switch_id, bool(desired_main)))
+                self._last_should_main_on = desired_main
+
+            # Toggle pump switch (may be same as main switch)
+            if pump_switch_id and pump_switch_id != main_switch_id:
+                need_pump_reconcile = (desired_pump != self._last_should_pump_on) or (bool(desired_pump) != bool(pump_switch_on))
+                if need_pump_reconcile:
+                    if not demo and _can_attempt(pump_switch_id, bool(desired_pump)):
+                        commands.append(ActuatorCommand(ROLE_PUMP, pump_switch_id, bool(desired_pump)))
+                    self._last_should_pump_on = desired_pump
+            else:
+                # Keep in sync when both are the same underlying entity
+                self._last_should_pump_on = desired_main
+
+            # Toggle aux switch according to desired_aux AND aux_allowed
+            # aux_allowed ist der Master-Enable: wenn False, bleibt physischer Schalter immer aus
+            if aux_switch_id:
+                aux_aliases_primary = bool(aux_switch_id and (aux_switch_id == main_switch_id or aux_switch_id == pump_switch_id))
+                if aux_aliases_primary:
+                    _LOGGER.debug(
+                        "Ignoring aux actuator toggles because %s is shared with main/pump switch",
+                        aux_switch_id,
+                    )
+                    self._last_should_aux_on = False
                 else:
-                    # Keep in sync when both are the same underlying entity
-                    self._last_should_pump_on = desired_main
-
-                # Toggle aux switch according to desired_aux AND aux_allowed
-                # aux_allowed ist der Master-Enable: wenn False, bleibt physischer Schalter immer aus
-                if aux_switch_id:
-                    aux_aliases_primary = bool(aux_switch_id and (aux_switch_id == main_switch_id or aux_switch_id == pump_switch_id))
-                    if aux_aliases_primary:
-                        _LOGGER.debug(
-                            "Ignoring aux actuator toggles because %s is shared with main/pump switch",
-                            aux_switch_id,
-                        )
-                        self._last_should_aux_on = False
-                    else:
-                        physical_aux_should_be_on = desired_aux and self.aux_allowed
-                        # Prefer toggling the integration's aux switch if present (this calls the physical switch).
-                        aux_entity_id = None
-                        if ent_reg:
-                            try:
-                                cand = ent_reg.async_get_entity_id("switch", DOMAIN, f"{self.entry.entry_id}_aux")
-                                if cand:
-                                    ent = ent_reg.async_get(cand)
-                                    if ent and getattr(ent, "translation_key", None) == "aux":
-                                        aux_entity_id = cand
-                            except Exception:
-                                aux_entity_id = None
-                        target_aux_id = aux_entity_id or aux_switch_id
-                        allow_integration = bool(aux_entity_id)
-
-                        need_aux_reconcile = (physical_aux_should_be_on != self._last_should_aux_on) or (bool(physical_aux_should_be_on) != bool(aux_heating_switch_on))
-                        if need_aux_reconcile:
-                            if physical_aux_should_be_on:
-                                if not demo and _can_attempt(target_aux_id, True, allow_integration=allow_integration):
-                                    self._last_toggle_attempts[target_aux_id] = (now, True)
-                                    await self._async_turn_entity(target_aux_id, True)
-                            else:
-                                if not demo and _can_attempt(target_aux_id, False, allow_integration=allow_integration):
-                                    self._last_toggle_attempts[target_aux_id] = (now, False)
-                                    await self._async_turn_entity(target_aux_id, False)
-                            self._last_should_aux_on = physical_aux_should_be_on
-            except Exception:
-                _LOGGER.exception("Fehler beim Anwenden der gewünschten Schaltzustände")
-
-            # Track run state for credit accounting (next cycle)
-            try:
-                current_run_active = bool(data.get("should_pump_on"))
-                current_run_source = self._credit_source_from_reasons(run_reason, heat_reason)
-                if self._last_run_active and (not current_run_active):
-                    self._last_run_end = now
-                self._last_run_active = current_run_active
-                self._last_run_source = current_run_source
-            except Exception:
-                pass
+                    physical_aux_should_be_on = desired_aux and self.aux_allowed
+                    # Prefer toggling the integration's aux switch if present (this calls the physical switch).
+                    aux_entity_id = None
+                    if ent_reg:
+                        try:
+                            cand = ent_reg.async_get_entity_id("switch", DOMAIN, f"{self.entry.entry_id}_aux")
+                            if cand:
+                                ent = ent_reg.async_get(cand)
+                                if ent and getattr(ent, "translation_key", None) == "aux":
+                                    aux_entity_id = cand
+                        except Exception:
+                            aux_entity_id = None
+                    target_aux_id = aux_entity_id or aux_switch_id
+                    allow_integration = bool(aux_entity_id)
+
+                    need_aux_reconcile = (physical_aux_should_be_on != self._last_should_aux_on) or (bool(physical_aux_should_be_on) != bool(aux_heating_switch_on))
+                    if need_aux_reconcile:
+                        aux_on = bool(physical_aux_should_be_on)
+                        if not demo and _can_attempt(target_aux_id, aux_on, allow_integration=allow_integration):
+                            commands.append(ActuatorCommand(ROLE_AUX, target_aux_id, aux_on))
+                        self._last_should_aux_on = physical_aux_should_be_on
+
+            # Main/pump/aux concurrently (aux after main/pump when switching on, before them when switching off)
+            await self._actuators.async_apply(commands)
+        except Exception:
+            _LOGGER.exception("Fehler beim Anwenden der gewünschten Schaltzustände")
 
-            _LOGGER.debug(
-                "Coordinator update success (%s) run_reason=%s should_main=%s should_aux=%s",
-                getattr(self.entry, "entry_id", None),
-                data.get("run_reason"),
-                data.get("should_main_on"),
-                data.get("should_aux_on"),
-            )
+        # Track run state for credit accounting (next cycle)
+        try:
+            current_run_active = bool(data.get("should_pump_on"))
+            current_run_source = self._credit_source_from_reasons(run_reason, heat_reason)
+            if self._last_run_active and (not current_run_active):
+                self._last_run_end = now
+            self._last_run_active = current_run_active
+            self._last_run_source = current_run_source
+        except Exception:
+            pass
 
-            # Defensive: ensure critical boolean keys are present and normalized
-            for _k in ("should_pump_on", "should_main_on", "should_aux_on"):
-                data[_k] = bool(data.get(_k))
+        _LOGGER.debug(
+            "Coordinator update success (%s) run_reason=%s should_main=%s should_aux=%s",
+            getattr(self.entry, "entry_id", None),
+            data.get("run_reason"),
+            data.get("should_main_on"),
+            data.get("should_aux_on"),
+        )
 
-            # Boost mode auto-disable: stop boost when target temperature is reached
-            if self.boost_active:
-                water_temp = self._get_float(conf.get(CONF_TEMP_WATER))
-                target_temp = self.target_temp_effective
-                if water_temp is not None and target_temp is not None:
-                    try:
-                        wt = float(water_temp)
-                        tt = float(target_temp)
-                        if wt >= tt:
-                            # Target temperature reached: disable boost
-                            _LOGGER.info("Boost mode beendet: Zieltemperatur %.1f°C erreicht.", wt)
-                            await self.set_boost(False)
-                    except Exception:
-                        pass
+        # Defensive: ensure critical boolean keys are present and normalized
+        for _k in ("should_pump_on", "should_main_on", "should_aux_on"):
+            data[_k] = bool(data.get(_k))
 
-            # Cache last good data for fallback
-            self.data = data
-            _LOGGER.debug("Coordinator cached data updated (%s)", getattr(self.entry, "entry_id", None))
-            await self._async_push_blueriiot_proxy_display(data)
-            await self._async_notify_maintenance_alerts(conf, data)
-            return data
-        except asyncio.CancelledError:
-            # Update was cancelled (e.g., overlapping refresh). Keep cached data to
-            # avoid entities flipping to unavailable without a useful log trail.
-            _LOGGER.warning(
-                "Coordinator update cancelled for %s; returning cached data",
-                getattr(self.entry, "entry_id", None),
-            )
-            if getattr(self, "data", None):
-                return self.data
-            self.data = _safe_defaults
-            return self.data
-        except Exception as err:
-            # Prefer to keep last known good data to avoid entities becoming
-            # unavailable on transient errors (reduces UI/sensor flapping).
-            try:
-                _LOGGER.exception("Update Error (using cached data if available): %s", err)
-            except Exception:
-                _LOGGER.error("Update Error: %s", err)
+        # Boost mode auto-disable: stop boost when target temperature is reached
+        if self.boost_active:
+            water_temp = self._get_float(conf.get(CONF_TEMP_WATER))
+            target_temp = self.target_temp_effective
+            if water_temp is not None and target_temp is not None:
+                try:
+                    wt = float(water_temp)
+                    tt = float(target_temp)
+                    if wt >= tt:
+                        # Target temperature reached: disable boost
+                        _LOGGER.info("Boost mode beendet: Zieltemperatur %.1f°C erreicht.", wt)
+                        await self.set_boost(False)
+                except Exception:
+                    pass
 
-            # If we have previously cached data, return it instead of raising
-            # UpdateFailed so HA doesn't mark entities unavailable.
-            # If we have previously cached data, return it instead of raising
-            if getattr(self, "data", None):
-                _LOGGER.warning(
-                    "Returning cached coordinator.data for %s after transient error",
-                    getattr(self.entry, "entry_id", None),
-                )
-                return self.data
+        # Cache last good data for fallback
+        self.data = data
+        _LOGGER.debug("Coordinator cached data updated (%s)", getattr(self.entry, "entry_id", None))
+        await self._async_push_blueriiot_proxy_display(data)
+        await self._async_notify_maintenance_alerts(conf, data)
+        self._async_schedule_deadline_wakeup(now)
+
+        return {}
+
+    _CYCLE_STAGES = (
+        _async_cycle_inputs,
+        _async_cycle_chemistry,
+        _async_cycle_costs,
+        _async_cycle_pv,
+        _async_cycle_schedule,
+        _async_cycle_demand,
+        _async_cycle_actuation,
+    )
 
-            # No cached data available: return safe defaults to avoid immediate entity unavailability
-            _LOGGER.warning(
-                "No cached coordinator.data available for %s; returning safe defaults",
-                getattr(self.entry, "entry_id", None),
-            )
-            # also persist so subsequent failures return this
-            self.data = _safe_defaults
-            return self.data
+    @staticmethod
+    def _mins_left(until_dt: datetime | None, now: datetime) -> int:
+        if until_dt is None or until_dt <= now:
+            return 0
+        return max(0, int(((until_dt - now).total_seconds() + 59) // 60))
 
     def _get_float(self, eid):
         if not eid:
@@ -4771,198 +5396,112 @@ class PoolControllerDataCoordinator(DataUpdateCoordinator):
         except Exception:
             return None
 
-    async def _get_hourly_forecast(self, entity_id: str | None):
-        """Best-effort fetch hourly forecast for the given weather entity with caching."""
-        if not entity_id:
-            return None
-        try:
-            # Cache for 10 minutes to avoid spamming the service.
-            cache = getattr(self, "_weather_forecast_cache", None) or {}
-            now = dt_util.now()
-            fetched_at = cache.get("fetched_at")
-            if (
-                cache.get("entity_id") == entity_id
-                and fetched_at
-                and (now - fetched_at) < timedelta(minutes=10)
-                and cache.get("forecast") is not None
-            ):
-                return cache.get("forecast")
-        except Exception:
-            # ignore cache errors
-            pass
+    def _snapshot(self, cache, name: str, entity_id: str | None, *key):
+        """Last good value of a shared cache (forecast/calendar) without waiting on remote I/O.
 
-        # Ensure the service exists
-        if not self.hass.services.has_service("weather", "get_forecasts"):
+        Due refreshes run in the background; the age of the snapshot ends up in
+        `data` (`<name>_snapshot_age_seconds`).
+        """
+        if not entity_id:
             return None
-
+        before = cache.pending(entity_id, *key)
         try:
-            res = await self.hass.services.async_call(
-                "weather",
-                "get_forecasts",
-                {"entity_id": entity_id, "type": "hourly"},
-                blocking=True,
-                return_response=True,
-            )
+            value, age = cache.peek(entity_id, *key)
         except Exception as err:
-            _LOGGER.warning("Weather forecast fetch failed for %s: %s", entity_id, err)
+            _LOGGER.warning("Snapshot of %s failed: %s", entity_id, err)
             return None
+        task = cache.pending(entity_id, *key)
+        if task is not None and task is not before:
+            # Cache hits are not service calls; only count started fetches.
+            self._perf.count("service_calls")
+        if age is not None:
+            previous = self._snapshot_ages.get(name)
+            self._snapshot_ages[name] = age if previous is None else max(previous, age)
+        if value is None and task is not None and self.event_driven and task not in self._snapshot_waits:
+            # Nothing usable yet: recompute as soon as the fetch finished (polling picks it up anyway).
+            self._snapshot_waits.add(task)
+            task.add_done_callback(self._async_snapshot_fetched)
+        return value
+
+    def _snapshot_age(self, name: str) -> int | None:
+        age = self._snapshot_ages.get(name)
+        return int(round(age)) if age is not None else None
+
+    @callback
+    def _async_snapshot_fetched(self, task) -> None:
+        if task in self._snapshot_waits:
+            self._snapshot_waits.discard(task)
+            self.hass.async_create_task(self.async_request_refresh())
 
-        forecast = None
-        try:
-            block = res.get(entity_id) if isinstance(res, dict) else None
-            if isinstance(block, dict):
-                forecast = block.get("forecast") or block.get("forecasts")
-            if forecast is None and isinstance(res, dict):
-                forecast = res.get("forecast") or res.get("forecasts")
-        except Exception:
-            forecast = None
-
-        if not isinstance(forecast, list):
-            forecast = None
-
+    @staticmethod
+    def _event_window(start_dt: datetime | None, end_dt: datetime | None) -> tuple[float, float] | None:
+        """Forecast window (UTC epoch seconds) of an event; 2 h when the end is unknown."""
+        if not start_dt:
+            return None
         try:
-            self._weather_forecast_cache = {
-                "entity_id": entity_id,
-                "fetched_at": dt_util.now(),
-                "forecast": forecast,
-            }
+            start_ts = dt_util.as_utc(start_dt).timestamp()
+            end_ts = dt_util.as_utc(end_dt).timestamp() if end_dt else start_ts + 2 * 3600
         except Exception:
-            pass
-
-        return forecast
+            return None
+        return start_ts, end_ts
 
-    def _event_rain_check(self, start_dt: datetime | None, end_dt: datetime | None, forecast: list | None, threshold: int):
+    def _event_rain_check(self, start_dt: datetime | None, end_dt: datetime | None, forecast: ParsedForecast | None, threshold: int):
         """Return (max_probability, blocked) for the event time window."""
-        if not start_dt or not forecast:
+        window = self._event_window(start_dt, end_dt) if forecast else None
+        if window is None:
             return None, False
-
-        try:
-            start_utc = dt_util.as_utc(start_dt)
-        except Exception:
-            start_utc = start_dt
-
-        if end_dt:
-            try:
-                end_utc = dt_util.as_utc(end_dt)
-            except Exception:
-                end_utc = end_dt
-        else:
-            end_utc = start_utc + timedelta(hours=2)
-
-        max_prob = None
-        for item in forecast:
-            if not isinstance(item, dict):
-                continue
-            dt_raw = item.get("datetime") or item.get("time") or item.get("forecast_time")
-            if not dt_raw:
-                continue
-            try:
-                dt_obj = dt_util.parse_datetime(dt_raw) if isinstance(dt_raw, str) else dt_raw
-            except Exception:
-                dt_obj = None
-            if not dt_obj:
-                continue
-            try:
-                dt_obj = dt_util.as_utc(dt_obj)
-            except Exception:
-                pass
-            if dt_obj < start_utc or dt_obj > end_utc:
-                continue
-            prob_raw = item.get("precipitation_probability")
-            if prob_raw is None:
-                continue
-            try:
-                prob = float(prob_raw)
-            except Exception:
-                continue
-            max_prob = prob if max_prob is None else max(max_prob, prob)
-
+        max_prob = forecast.query("precipitation_probability", window[0], window[1], "max")
         blocked = (max_prob is not None) and (float(max_prob) >= float(threshold))
         return max_prob, blocked
 
-    async def _check_holiday(self, cal_id):
-        if not cal_id: return False
+    def _event_rain_checks(self, events, forecast: ParsedForecast | None, threshold: int) -> list[tuple[float | None, bool]]:
+        """`_event_rain_check` for many (start, end) events in one forecast query."""
+        windows = [self._event_window(start_dt, end_dt) if forecast else None for start_dt, end_dt in events]
+        valid = [window for window in windows if window is not None]
+        probs = iter(forecast.query_windows("precipitation_probability", valid, "max") if valid else ())
+        results = []
+        for window in windows:
+            max_prob = next(probs) if window is not None else None
+            results.append((max_prob, max_prob is not None and float(max_prob) >= float(threshold)))
+        return results
+
+    async def _get_calendar(self, cal_id) -> ParsedCalendar | None:
+        """Best-effort parsed events of a calendar entity (shared cache)."""
+        if not cal_id:
+            return None
+        fetches = self._calendar_cache.fetches
         try:
-            res = await self.hass.services.async_call("calendar", "get_events", {"entity_id": cal_id, "start_date_time": dt_util.now().replace(hour=0, minute=0), "end_date_time": dt_util.now().replace(hour=23, minute=59)}, blocking=True, return_response=True)
-            return len(res.get(cal_id, {}).get("events", [])) > 0
+            return await self._calendar_cache.async_get(cal_id)
         except Exception as err:
-            _LOGGER.warning("Holiday calendar fetch failed for %s: %s", cal_id, err)
-            return False
+            _LOGGER.warning("Calendar fetch failed for %s: %s", cal_id, err)
+            return None
+        finally:
+            self._perf.count("service_calls", self._calendar_cache.fetches - fetches)
 
-    async def _get_next_event(self, cal_id):
-        if not cal_id:
-            return {}
+    @staticmethod
+    def _holiday_dates(calendar: ParsedCalendar | None, now: datetime) -> frozenset[date]:
+        """Local dates with an event in the holiday calendar, over the quiet-calendar range."""
+        if calendar is None:
+            return frozenset()
+        first_day = dt_util.as_local(now).date() - timedelta(days=1)
+        return calendar.event_days(first_day, QUIET_CALENDAR_DAYS + 1)
 
-        _LOGGER.debug("Calendar fetch start for %s", cal_id)
+    @staticmethod
+    def _calendar_events(calendar: ParsedCalendar | None, now: datetime) -> dict:
+        """{"next": ..., "ongoing": ...} of the pool calendar ({} without events)."""
+        if calendar is None or not len(calendar):
+            return {}
+        # Prefer the next future event (start >= now) over an overlapping one; all-day events are ignored.
+        next_ev = calendar.next_event(now, now + timedelta(days=CALENDAR_LOOKAHEAD_DAYS))
+        # Still keep track of an ongoing event (start <= now < end) for auto-start bathing.
+        ongoing_ev = calendar.ongoing_event(now)
+        if next_ev is None and ongoing_ev is None:
+            return {}
+        return {
+            "next": next_ev.as_dict() if next_ev else {},
+            "ongoing": ongoing_ev.as_dict() if ongoing_ev else {},
+        }
 
-        try:
-            now = dt_util.now()
-            res = await self.hass.services.async_call(
-                "calendar",
-                "get_events",
-                {
-                    "entity_id": cal_id,
-                    "start_date_time": now,
-                    "end_date_time": now + timedelta(days=7),
-                },
-                blocking=True,
-                return_response=True,
-            )
-            raw_events = res.get(cal_id, {}).get("events", [])
-            if not raw_events:
-                _LOGGER.debug("Calendar fetch: no events for %s", cal_id)
-                return {}
-
-            parsed = []
-            for ev in raw_events:
-                start_raw = ev.get("start")
-                end_raw = ev.get("end")
-                start = dt_util.parse_datetime(start_raw) if start_raw else None
-                end = dt_util.parse_datetime(end_raw) if end_raw else None
-                if not start:
-                    continue
-                # Normalize to UTC (dt_util.now() is UTC-aware).
-                try:
-                    start_utc = dt_util.as_utc(start)
-                except Exception:
-                    start_utc = start
-                end_utc = None
-                if end:
-                    try:
-                        end_utc = dt_util.as_utc(end)
-                    except Exception:
-                        end_utc = end
-
-                parsed.append({
-                    "start": start_utc,
-                    "end": end_utc,
-                    "summary": ev.get("summary", ""),
-                })
-
-            if not parsed:
-                return {}
-
-            # Prefer the next future event (start >= now). This avoids showing 0 minutes
-            # just because an overlapping/all-day event is included in the result window.
-            future = [e for e in parsed if e.get("start") and e["start"] >= now]
-            future.sort(key=lambda e: e["start"])
-            next_ev = future[0] if future else None
-
-            # Still keep track of an ongoing event (start <= now < end) for auto-start bathing.
-            ongoing = [e for e in parsed if e.get("start") and e.get("end") and e["start"] <= now < e["end"]]
-            ongoing.sort(key=lambda e: e.get("end") or e.get("start"))
-            ongoing_ev = ongoing[0] if ongoing else None
-
-            def _compact(e):
-                if not e:
-                    return {}
-                # Keep keys stable; omit empty summary.
-                out = {"start": e.get("start"), "end": e.get("end")}
-                if e.get("summary"):
-                    out["summary"] = e.get("summary")
-                return out
-
-            return {"next": _compact(next_ev), "ongoing": _compact(ongoing_ev)}
-        except Exception as err:
-            _LOGGER.warning("Calendar fetch failed for %s: %s", cal_id, err)
-            return {}
\ No newline at end of file
+    async def _get_next_event(self, cal_id):
+        """Like the update cycle's calendar snapshot, but waits for a fresh fetch (service handlers)."""
+        return self._calendar_events(await self._get_calendar(cal_id), dt_util.now())
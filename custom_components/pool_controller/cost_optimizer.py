@@ -0,0 +1,369 @@
+"""Cost-optimal placement of filter runs and calendar preheat over price and PV forecasts."""
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+SLOT_MINUTES = 15
+COST_PLAN_HORIZON_HOURS = 24
+# Preheat may start at most this much earlier than the heuristic (heat losses grow with the advance).
+PREHEAT_MAX_ADVANCE_MINUTES = 240
+
+# Attribute names used by common price integrations (Nord Pool, Tibber, EPEX Spot, ENTSO-e, ...).
+_PRICE_LIST_KEYS = ("raw_today", "raw_tomorrow", "today", "tomorrow", "prices_today", "prices_tomorrow", "prices", "data", "forecast")
+_PRICE_START_KEYS = ("start", "start_time", "startsAt", "from", "datetime", "time")
+_PRICE_VALUE_KEYS = ("value", "price", "total", "price_per_kwh")
+# PV forecast attributes (Solcast detailedForecast in kW, generic lists/dicts in W).
+_PV_LIST_KEYS = ("detailedForecast", "detailedHourly", "forecast", "data")
+_PV_KW_KEYS = ("pv_estimate",)
+_PV_W_KEYS = ("watts", "power", "value")
+
+
+def _to_ts(raw) -> float | None:
+    try:
+        dt_obj = dt_util.parse_datetime(raw) if isinstance(raw, str) else raw
+        if not isinstance(dt_obj, datetime):
+            return None
+        return dt_util.as_utc(dt_obj).timestamp()
+    except Exception:
+        return None
+
+
+def _num(value) -> float | None:
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return None
+    return result if math.isfinite(result) else None
+
+
+def _series(items, start_keys, value_keys, scale: float = 1.0) -> list[tuple[float, float]]:
+    points = []
+    for item in items:
+        if not isinstance(item, Mapping):
+            continue
+        ts = next((_to_ts(item.get(k)) for k in start_keys if item.get(k) is not None), None)
+        value = next((_num(item.get(k)) for k in value_keys if item.get(k) is not None), None)
+        if ts is not None and value is not None:
+            points.append((ts, value * scale))
+    return points
+
+
+def price_points(attributes: Mapping, now: datetime) -> list[tuple[float, float]]:
+    """(epoch, price per kWh) steps from a price entity's forecast attributes."""
+    points: list[tuple[float, float]] = []
+    today = dt_util.as_local(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    for key in _PRICE_LIST_KEYS:
+        items = attributes.get(key)
+        if not isinstance(items, list) or not items:
+            continue
+        if all(_num(v) is not None for v in items):
+            # Plain value list for a whole day (hourly or quarter-hourly).
+            if "today" in key or "tomorrow" in key:
+                day = today + timedelta(days=1) if "tomorrow" in key else today
+                step = 86400.0 / len(items)
+                points.extend((day.timestamp() + i * step, float(v)) for i, v in enumerate(items))
+            continue
+        points.extend(_series(items, _PRICE_START_KEYS, _PRICE_VALUE_KEYS))
+    return sorted(set(points))
+
+
+def pv_points(attributes: Mapping) -> list[tuple[float, float]]:
+    """(epoch, W) steps from a PV forecast entity's attributes."""
+    points: list[tuple[float, float]] = []
+    for key in _PV_LIST_KEYS:
+        items = attributes.get(key)
+        if isinstance(items, list):
+            points.extend(_series(items, ("period_start", *_PRICE_START_KEYS), _PV_KW_KEYS, 1000.0))
+            points.extend(_series(items, ("period_start", *_PRICE_START_KEYS), _PV_W_KEYS))
+    watts = attributes.get("watts")
+    if isinstance(watts, Mapping):
+        for raw_ts, raw_w in watts.items():
+            ts, value = _to_ts(raw_ts), _num(raw_w)
+            if ts is not None and value is not None:
+                points.append((ts, value))
+    return sorted(set(points))
+
+
+def _step_value(points: list[tuple[float, float]], keys: list[float], ts: float) -> float | None:
+    i = bisect_right(keys, ts) - 1
+    return points[i][1] if i >= 0 else None
+
+
+@dataclass(frozen=True, slots=True)
+class CostPlanInputs:
+    filter_power_w: float
+    heat_power_w: float
+    min_gap_minutes: int = 0
+    preheat_minutes: int = 0
+    event_start: datetime | None = None
+    # Preheat that already started (planned or heuristic): kept until the event starts.
+    preheat_start: datetime | None = None
+    # Heuristic schedule for the comparison (and the filter volume to place).
+    baseline_filter: tuple[tuple[datetime, datetime], ...] = ()
+    # Filter runs starting before the next slot are in progress or due and are kept as they are.
+    # Intervals no automatic run may use (quiet hours, pause).
+    blocked: tuple[tuple[datetime, datetime], ...] = ()
+    # Frost duty runs: filter runs keep min_gap_minutes to them (no merged run can
+    # exceed max_merge_run_minutes this way).
+    frost_runs: tuple[tuple[datetime, datetime], ...] = ()
+
+
+@dataclass(slots=True)
+class CostPlan:
+    filter_runs: list[tuple[datetime, datetime]] = field(default_factory=list)
+    preheat: tuple[datetime, datetime] | None = None
+    expected_cost: float = 0.0
+    baseline_cost: float = 0.0
+    unplaced_minutes: int = 0
+    # The heuristic schedule has a preheat that found no admissible window.
+    preheat_unplaced: bool = False
+    # Preheat placed by the optimizer (False: already running, kept as it is).
+    preheat_planned: bool = False
+    solve_ms: float = 0.0
+
+    @property
+    def savings(self) -> float:
+        return self.baseline_cost - self.expected_cost
+
+    @property
+    def complete(self) -> bool:
+        """Whole baseline volume (preheat and filter minutes) placed; only then may the plan be applied."""
+        return not self.preheat_unplaced and self.unplaced_minutes <= 0
+
+    def as_dict(self) -> dict:
+        return {
+            "filter_runs": [{"start": s.isoformat(), "end": e.isoformat()} for s, e in self.filter_runs],
+            "preheat": {"start": self.preheat[0].isoformat(), "end": self.preheat[1].isoformat()} if self.preheat else None,
+            "expected_cost": round(self.expected_cost, 4),
+            "baseline_cost": round(self.baseline_cost, 4),
+            "savings": round(self.savings, 4),
+            "unplaced_minutes": self.unplaced_minutes,
+            "preheat_unplaced": self.preheat_unplaced,
+            "solve_ms": round(self.solve_ms, 3),
+        }
+
+
+class CostOptimizer:
+    """Greedy interval allocator on a fixed slot grid (prefix sums, O(slots x runs))."""
+
+    def __init__(
+        self,
+        now: datetime,
+        prices: list[tuple[float, float]],
+        pv: list[tuple[float, float]],
+        fallback_price: float | None,
+        hours: int = COST_PLAN_HORIZON_HOURS,
+        slot_minutes: int = SLOT_MINUTES,
+    ) -> None:
+        self.slot_s = slot_minutes * 60
+        start_ts = math.floor(now.timestamp() / self.slot_s) * self.slot_s
+        self.start_ts = float(start_ts)
+        self.slots = int(hours * 3600 // self.slot_s)
+        price_keys = [p[0] for p in prices]
+        pv_keys = [p[0] for p in pv]
+        self.price = array("d")
+        self.pv_w = array("d")
+        for i in range(self.slots):
+            ts = self.start_ts + i * self.slot_s
+            value = _step_value(prices, price_keys, ts) if prices else None
+            self.price.append(value if value is not None else (fallback_price or 0.0))
+            pv_value = _step_value(pv, pv_keys, ts) if pv else None
+            self.pv_w.append(max(0.0, pv_value or 0.0))
+
+    def _slot(self, when: datetime) -> int:
+        return int((when.timestamp() - self.start_ts) // self.slot_s)
+
+    def _dt(self, slot: int) -> datetime:
+        return dt_util.as_local(dt_util.utc_from_timestamp(self.start_ts + slot * self.slot_s))
+
+    def slot_costs(self, power_w: float) -> array:
+        """Grid cost per slot for a constant load; PV covers what it can."""
+        hours = self.slot_s / 3600.0
+        return array(
+            "d",
+            (max(0.0, power_w - pv) / 1000.0 * hours * price for price, pv in zip(self.price, self.pv_w)),
+        )
+
+    def interval_cost(self, costs: array, start: datetime, end: datetime) -> float:
+        """Cost of [start, end) with partial slots weighted by overlap."""
+        total = 0.0
+        s_ts, e_ts = start.timestamp(), end.timestamp()
+        first = max(0, self._slot(start))
+        last = min(self.slots - 1, self._slot(end))
+        for i in range(first, last + 1):
+            slot_start = self.start_ts + i * self.slot_s
+            overlap = min(e_ts, slot_start + self.slot_s) - max(s_ts, slot_start)
+            if overlap > 0:
+                total += costs[i] * overlap / self.slot_s
+        return total
+
+    def _blocked_mask(self, blocked) -> array:
+        mask = array("b", bytes(self.slots))
+        for start, end in blocked:
+            first = max(0, self._slot(start))
+            last = min(self.slots - 1, int(math.ceil((end.timestamp() - self.start_ts) / self.slot_s)) - 1)
+            for i in range(first, last + 1):
+                mask[i] = 1
+        # The current slot is partially in the past: no new run may start in it
+        # (runs that already started are passed in and kept, see solve()).
+        if self.slots:
+            mask[0] = 1
+        return mask
+
+    @staticmethod
+    def _prefix(values) -> array:
+        prefix = array("d", [0.0])
+        for value in values:
+            prefix.append(prefix[-1] + value)
+        return prefix
+
+    def _place(
+        self,
+        costs_prefix,
+        blocked_prefix,
+        taken: list[tuple[int, int]],
+        length: int,
+        gap: int,
+        lo: int,
+        hi: int,
+        preferred: int,
+    ):
+        """Cheapest window of `length` slots in [lo, hi) keeping `gap` slots to taken windows.
+
+        Equal costs (flat tariff, no forecast) resolve to the window closest to `preferred`,
+        so the heuristic schedule is kept unless moving actually saves money.
+        """
+        best = None
+        for i in range(max(0, lo), min(hi, self.slots) - length + 1):
+            j = i + length
+            if blocked_prefix[j] - blocked_prefix[i] > 0:
+                continue
+            if any(i < t_end + gap and t_start < j + gap for t_start, t_end in taken):
+                continue
+            cost = costs_prefix[j] - costs_prefix[i]
+            if (
+                best is None
+                or cost < best[0] - 1e-9
+                or (cost <= best[0] + 1e-9 and abs(i - preferred) < abs(best[1] - preferred))
+            ):
+                best = (cost, i, j)
+        return best
+
+    def solve(self, inputs: CostPlanInputs) -> CostPlan:
+        started = time.perf_counter()
+        plan = CostPlan()
+        if self.slots <= 0:
+            return plan
+        mask = self._blocked_mask(inputs.blocked)
+        blocked_prefix = self._prefix(mask)
+        filter_costs = self.slot_costs(inputs.filter_power_w)
+        heat_costs = self.slot_costs(inputs.heat_power_w)
+        slot_min = self.slot_s // 60
+
+        taken: list[tuple[int, int]] = []
+        next_slot = self._dt(1)
+        # Preheat first: it is bound to the event, filter runs can move around it.
+        # Once started, preheat stays active until the event starts, so a placement
+        # is booked from its start up to the event (minus blocked slots, no heating there).
+        if inputs.event_start is not None and inputs.preheat_minutes > 0:
+            length = int(math.ceil(inputs.preheat_minutes / slot_min))
+            event_slot = self._slot(inputs.event_start)
+            event_end_slot = int(math.ceil((inputs.event_start.timestamp() - self.start_ts) / self.slot_s))
+            earliest = max(1, event_slot - length - PREHEAT_MAX_ADVANCE_MINUTES // slot_min)
+            if 0 < event_slot <= self.slots:
+                baseline_start = inputs.event_start - timedelta(minutes=inputs.preheat_minutes)
+                baseline_preheat = self.interval_cost(heat_costs, baseline_start, inputs.event_start)
+                plan.baseline_cost += baseline_preheat
+                fixed_start = inputs.preheat_start
+                if fixed_start is None and baseline_start < next_slot:
+                    fixed_start = baseline_start
+                if fixed_start is not None and fixed_start < next_slot:
+                    plan.preheat = (fixed_start, inputs.event_start)
+                    plan.expected_cost += self.interval_cost(heat_costs, fixed_start, inputs.event_start)
+                    taken.append((0, event_end_slot))
+                else:
+                    open_costs = array("d", (0.0 if blocked else cost for cost, blocked in zip(heat_costs, mask)))
+                    open_prefix = self._prefix(open_costs)
+                    to_event = self.interval_cost(open_costs, self._dt(0), inputs.event_start)
+                    best = None
+                    for i in range(earliest, event_slot - length + 1):
+                        if blocked_prefix[i + length] - blocked_prefix[i] > 0:
+                            continue
+                        cost = to_event - open_prefix[i]
+                        # Equal costs: the latest start (closest to the heuristic).
+                        if best is None or cost <= best[0] + 1e-9:
+                            best = (cost, i)
+                    if best is not None:
+                        cost, i = best
+                        plan.preheat = (self._dt(i), inputs.event_start)
+                        plan.preheat_planned = True
+                        plan.expected_cost += cost
+                        taken.append((i, event_end_slot))
+                    else:
+                        # Not placed: counts at baseline cost, so it cannot show up as savings.
+                        plan.preheat_unplaced = True
+                        plan.expected_cost += baseline_preheat
+
+        # Filter volume: whatever the heuristic schedule would run inside the horizon.
+        horizon_end = self._dt(self.slots)
+        required = 0
+        cycle_len = 0
+        preferred: list[int] = []
+        baseline_filter_cost = 0.0
+        movable_cost = 0.0
+        fixed_filter: list[tuple[datetime, datetime]] = []
+        for start, end in inputs.baseline_filter:
+            end = min(end, horizon_end)
+            if end > start and start < next_slot:
+                # Due or running: not replanned, so a reached start cannot slide into the next slot.
+                fixed_filter.append((start, end))
+                fixed_cost = self.interval_cost(filter_costs, start, end)
+                baseline_filter_cost += fixed_cost
+                plan.expected_cost += fixed_cost
+            elif end > start:
+                minutes = int(round((end - start).total_seconds() / 60))
+                required += minutes
+                cycle_len = max(cycle_len, int(math.ceil(minutes / slot_min)))
+                preferred.append(max(1, self._slot(start)))
+                movable_cost += self.interval_cost(filter_costs, start, end)
+        baseline_filter_cost += movable_cost
+        plan.baseline_cost += baseline_filter_cost
+        remaining = int(math.ceil(required / slot_min))
+        required_slots = remaining
+        # Runs keep the heuristic cycle length (the auto filter runs whole cycles).
+        run_len = max(1, cycle_len)
+        gap = int(math.ceil(max(0, inputs.min_gap_minutes) / slot_min))
+        filter_prefix = self._prefix(filter_costs)
+        filter_taken = list(taken)
+        for start, end in fixed_filter:
+            plan.filter_runs.append((start, end))
+            filter_taken.append((0, int(math.ceil((end.timestamp() - self.start_ts) / self.slot_s))))
+        for start, end in inputs.frost_runs:
+            filter_taken.append((self._slot(start), int(math.ceil((end.timestamp() - self.start_ts) / self.slot_s))))
+        while remaining > 0:
+            length = min(run_len, remaining)
+            target = preferred[min(len(plan.filter_runs) - len(fixed_filter), len(preferred) - 1)] if preferred else 1
+            best = self._place(filter_prefix, blocked_prefix, filter_taken, length, gap, 1, self.slots, target)
+            if best is None:
+                break
+            cost, i, j = best
+            filter_taken.append((i, j))
+            plan.filter_runs.append((self._dt(i), self._dt(j)))
+            plan.expected_cost += cost
+            remaining -= length
+        plan.filter_runs.sort()
+        plan.unplaced_minutes = remaining * slot_min
+        if remaining > 0 and required_slots:
+            # Unplaced filter volume still has to run somewhere: book its share at baseline cost.
+            plan.expected_cost += movable_cost * remaining / required_slots
+        plan.solve_ms = (time.perf_counter() - started) * 1000.0
+        return plan
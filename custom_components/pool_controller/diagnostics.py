@@ -0,0 +1,71 @@
+"""Diagnostics download: configuration, update timing and cache statistics."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_BLUERIIOT_MAC, DOMAIN
+from .coordinator import PoolControllerDataCoordinator
+
+TO_REDACT = {CONF_BLUERIIOT_MAC}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    result: dict[str, Any] = {
+        "entry": {
+            "title": entry.title,
+            "version": entry.version,
+            "data": async_redact_data(dict(entry.data or {}), TO_REDACT),
+            "options": async_redact_data(dict(entry.options or {}), TO_REDACT),
+        },
+    }
+    if not isinstance(coordinator, PoolControllerDataCoordinator):
+        return result
+
+    data = dict(coordinator.data or {})
+    timeline = coordinator.timeline
+    result.update(
+        {
+            "update": {
+                "event_driven": coordinator.event_driven,
+                "update_interval_seconds": (
+                    coordinator.update_interval.total_seconds() if coordinator.update_interval else None
+                ),
+                "last_update_success": coordinator.last_update_success,
+                "perf": coordinator.perf.stats(),
+                "pipeline": coordinator._pipeline.stats(),
+                "publish": {
+                    "entity_writes": coordinator.publish_writes,
+                    "entity_skips": coordinator.publish_skips,
+                    "deadband_skips": coordinator.publish_deadband_skips,
+                    "policies": {key: asdict(policy) for key, policy in coordinator.publish_policies.items()},
+                    "changed_keys": sorted(coordinator.changed_keys) if coordinator.changed_keys is not None else None,
+                },
+            },
+            "runtime_state": {
+                "keys": sorted(coordinator._runtime_state.data),
+                "dirty_sections": sorted(coordinator._runtime_state.dirty_sections),
+                "writes": coordinator._runtime_state.writes,
+            },
+            "forecast_cache": coordinator._forecast_cache.stats(),
+            "calendar_cache": coordinator._calendar_cache.stats(),
+            "actuators": coordinator._actuators.stats(),
+            "blueriiot": coordinator._blueriiot_reader.stats(),
+            "timeline": {
+                "built_at": timeline.built_at.isoformat() if timeline else None,
+                "planned_runs": data.get("planned_runs"),
+            },
+            "cost_plan": data.get("cost_plan"),
+            "data": async_redact_data(
+                {k: v for k, v in data.items() if k not in ("planned_runs", "cost_plan", "update_perf")},
+                TO_REDACT,
+            ),
+        }
+    )
+    return result
@@ -0,0 +1,99 @@
+"""Coordinator entity base with change-based state publishing."""
+
+from __future__ import annotations
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+
+class PoolCoordinatorEntity(CoordinatorEntity):
+    """Write state only when one of the declared `coordinator.data` keys changed.
+
+    `_data_keys` lists every data key the entity renders (state and attributes).
+    `None` keeps the default behaviour (write on every refresh) for entities that
+    also read coordinator attributes or other entities' states directly.
+
+    `_policy_key` opts the entity into the coordinator's publishing policies
+    (deadband, minimum interval, heartbeat; see publish_policy.py).
+    """
+
+    _data_keys: frozenset[str] | None = None
+    _policy_key: str | None = None
+    _published_value = None
+    _published_at: float | None = None
+    _unsub_deferred_publish = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._policy_key is not None:
+            # The platform writes the initial state right after this hook.
+            self._remember_published()
+            self.async_on_remove(self._cancel_deferred_publish)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        changed = self.coordinator.changed_keys
+        keys = self._data_keys
+        if changed is not None and keys is not None:
+            if changed.isdisjoint(keys):
+                # changed_keys is diffed against the previous fan-out: a change held back by the
+                # deadband must still be re-evaluated (heartbeat) while it differs from what was published.
+                if not self._policy_pending():
+                    self.coordinator.publish_skips += 1
+                    return
+                changed = frozenset((self._policy_key,))
+            if self._policy_key is not None and not self._policy_allows_write(changed):
+                self.coordinator.publish_deadband_skips += 1
+                return
+        self._publish()
+
+    @callback
+    def _publish(self) -> None:
+        self.coordinator.publish_writes += 1
+        if self._policy_key is not None:
+            self._cancel_deferred_publish()
+            self._remember_published()
+        super()._handle_coordinator_update()
+
+    def _remember_published(self) -> None:
+        self._published_value = (self.coordinator.data or {}).get(self._policy_key)
+        self._published_at = dt_util.utcnow().timestamp()
+
+    def _policy_pending(self) -> bool:
+        if self._policy_key is None or self._published_at is None:
+            return False
+        if self.coordinator.publish_policies.get(self._policy_key) is None:
+            return False
+        return (self.coordinator.data or {}).get(self._policy_key) != self._published_value
+
+    def _policy_allows_write(self, changed: frozenset[str]) -> bool:
+        policy = self.coordinator.publish_policies.get(self._policy_key)
+        if policy is None:
+            return True
+        # Attribute keys are not subject to the deadband.
+        if any(key != self._policy_key for key in changed.intersection(self._data_keys)):
+            return True
+        value = (self.coordinator.data or {}).get(self._policy_key)
+        publish, defer = policy.decide(
+            self._published_value, self._published_at, value, dt_util.utcnow().timestamp()
+        )
+        if defer is not None and self._unsub_deferred_publish is None and self.hass is not None:
+            self._unsub_deferred_publish = async_call_later(self.hass, defer, self._async_deferred_publish)
+        return publish
+
+    @callback
+    def _async_deferred_publish(self, _now) -> None:
+        """Minimum interval passed: write a change that was held back, if still significant."""
+        self._unsub_deferred_publish = None
+        policy = self.coordinator.publish_policies.get(self._policy_key)
+        value = (self.coordinator.data or {}).get(self._policy_key)
+        if policy is None or policy.significant(self._published_value, value):
+            self._publish()
+
+    @callback
+    def _cancel_deferred_publish(self) -> None:
+        if self._unsub_deferred_publish is not None:
+            self._unsub_deferred_publish()
+            self._unsub_deferred_publish = None
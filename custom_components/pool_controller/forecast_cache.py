@@ -0,0 +1,330 @@
+"""hass-wide weather forecast cache with single-flight fetches and pre-parsed data."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_FORECAST_CACHE = "pool_controller_forecast_cache"
+
+FORECAST_TTL_SECONDS = 600
+# Refresh in the background once an entry is this close to expiry.
+FORECAST_REFRESH_AHEAD_SECONDS = 120
+# Failed fetches are not retried before this delay.
+FORECAST_RETRY_SECONDS = 60
+# A slow weather provider must not hold a fetch open indefinitely.
+FORECAST_FETCH_TIMEOUT_SECONDS = 30
+# Oldest snapshot `peek` still hands out (hourly forecasts stay usable for hours).
+FORECAST_MAX_AGE_SECONDS = 6 * 3600
+
+_NAN = float("nan")
+
+
+def _float_or_nan(value) -> float:
+    if value is None:
+        return _NAN
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return _NAN
+    return result if math.isfinite(result) else _NAN
+
+
+# Numeric forecast attributes kept as columns (HA weather forecast keys).
+FORECAST_COLUMNS = ("temperature", "precipitation_probability", "wind_speed", "uv_index", "cloud_coverage")
+FORECAST_AGGREGATES = ("max", "min", "mean", "percentile")
+
+
+def _aggregate(values: array, lo: int, hi: int, agg: str, q: float) -> float | None:
+    selected = [v for v in values[lo:hi] if v == v]
+    if not selected:
+        return None
+    if agg == "max":
+        return max(selected)
+    if agg == "min":
+        return min(selected)
+    selected.sort()
+    index = min(len(selected) - 1, max(0, int(round(q / 100.0 * (len(selected) - 1)))))
+    return selected[index]
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedForecast:
+    """Forecast as columns sorted by UTC epoch seconds (NaN = missing value).
+
+    Windows are closed (`start_ts <= ts <= end_ts`) and located by bisect;
+    `query_windows` evaluates many windows (events, candidate slots) in one call.
+    """
+
+    entity_id: str
+    forecast_type: str
+    ts: array
+    temperature: array
+    precipitation_probability: array
+    wind_speed: array
+    uv_index: array
+    cloud_coverage: array
+    # Lazily built per column: (prefix sums, prefix counts) of the non-NaN values.
+    _prefix: dict = field(default_factory=dict, compare=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def from_items(cls, entity_id: str, forecast_type: str, items: list) -> ParsedForecast:
+        rows = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            dt_raw = item.get("datetime") or item.get("time") or item.get("forecast_time")
+            if not dt_raw:
+                continue
+            try:
+                dt_obj = dt_util.parse_datetime(dt_raw) if isinstance(dt_raw, str) else dt_raw
+                if dt_obj is None:
+                    continue
+                ts = dt_util.as_utc(dt_obj).timestamp()
+            except Exception:
+                continue
+            rows.append((ts, *(_float_or_nan(item.get(name)) for name in FORECAST_COLUMNS)))
+        rows.sort(key=lambda row: row[0])
+        columns = {
+            name: array("d", [row[index] for row in rows]) for index, name in enumerate(FORECAST_COLUMNS, start=1)
+        }
+        return cls(
+            entity_id=entity_id,
+            forecast_type=forecast_type,
+            ts=array("d", [row[0] for row in rows]),
+            **columns,
+        )
+
+    def column(self, name: str) -> array:
+        if name not in FORECAST_COLUMNS:
+            raise ValueError(f"Unknown forecast column: {name}")
+        return getattr(self, name)
+
+    def window(self, start_ts: float, end_ts: float) -> tuple[int, int]:
+        """Index range [lo, hi) of the forecast points with start_ts <= ts <= end_ts."""
+        return bisect_left(self.ts, start_ts), bisect_right(self.ts, end_ts)
+
+    def _prefix_sums(self, name: str) -> tuple[array, array]:
+        prefix = self._prefix.get(name)
+        if prefix is None:
+            sums = array("d", [0.0])
+            counts = array("l", [0])
+            total = 0.0
+            count = 0
+            for value in self.column(name):
+                if value == value:
+                    total += value
+                    count += 1
+                sums.append(total)
+                counts.append(count)
+            prefix = self._prefix[name] = (sums, counts)
+        return prefix
+
+    def query(self, name: str, start_ts: float, end_ts: float, agg: str = "max", q: float = 50.0) -> float | None:
+        """`agg` ("max", "min", "mean", "percentile" with `q`) of a column over one window; None without values."""
+        if agg == "mean":
+            return self.query_windows(name, ((start_ts, end_ts),), agg)[0]
+        if agg not in FORECAST_AGGREGATES:
+            raise ValueError(f"Unknown forecast aggregate: {agg}")
+        ts = self.ts
+        return _aggregate(self.column(name), bisect_left(ts, start_ts), bisect_right(ts, end_ts), agg, q)
+
+    def query_windows(self, name: str, windows, agg: str = "max", q: float = 50.0) -> list[float | None]:
+        """Like `query` for each (start_ts, end_ts) window, in the given order."""
+        if agg not in FORECAST_AGGREGATES:
+            raise ValueError(f"Unknown forecast aggregate: {agg}")
+        values = self.column(name)
+        ts = self.ts
+        if agg != "mean":
+            return [
+                _aggregate(values, bisect_left(ts, start_ts), bisect_right(ts, end_ts), agg, q)
+                for start_ts, end_ts in windows
+            ]
+        # Means come from prefix sums: O(log n) per window regardless of its length.
+        sums, counts = self._prefix_sums(name)
+        results: list[float | None] = []
+        for start_ts, end_ts in windows:
+            lo, hi = bisect_left(ts, start_ts), bisect_right(ts, end_ts)
+            count = counts[hi] - counts[lo] if hi > lo else 0
+            results.append((sums[hi] - sums[lo]) / count if count else None)
+        return results
+
+    def max_precipitation_probability(self, start_ts: float, end_ts: float) -> float | None:
+        """Highest precipitation probability with start_ts <= ts <= end_ts."""
+        return self.query("precipitation_probability", start_ts, end_ts, "max")
+
+
+class _Entry:
+    __slots__ = ("forecast", "fetched_at", "good_at", "failed", "task")
+
+    def __init__(self) -> None:
+        self.forecast: ParsedForecast | None = None
+        # Last fetch attempt / last successful fetch (monotonic seconds).
+        self.fetched_at: float | None = None
+        self.good_at: float | None = None
+        self.failed = False
+        self.task: asyncio.Task | None = None
+
+
+class ForecastCache:
+    """Forecasts keyed by (weather entity, forecast type), shared by all entries."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self.hits = 0
+        self.fetches = 0
+        self.coalesced = 0
+        self.refresh_ahead = 0
+        self.failures = 0
+        self.timeouts = 0
+
+    @classmethod
+    def for_hass(cls, hass: HomeAssistant) -> ForecastCache:
+        cache = hass.data.get(DATA_FORECAST_CACHE)
+        if cache is None:
+            cache = hass.data[DATA_FORECAST_CACHE] = cls(hass)
+        return cache
+
+    @staticmethod
+    def _due(entry: _Entry, now: float) -> bool:
+        if entry.fetched_at is None:
+            return True
+        ttl = FORECAST_TTL_SECONDS if entry.forecast is not None and not entry.failed else FORECAST_RETRY_SECONDS
+        return now - entry.fetched_at >= ttl
+
+    def _maybe_refresh_ahead(self, entry: _Entry, now: float, entity_id: str, forecast_type: str) -> None:
+        if (
+            entry.task is None
+            and entry.good_at is not None
+            and not entry.failed
+            and now - entry.good_at >= FORECAST_TTL_SECONDS - FORECAST_REFRESH_AHEAD_SECONDS
+        ):
+            self.refresh_ahead += 1
+            self._start_fetch(entry, entity_id, forecast_type)
+
+    async def async_get(self, entity_id: str, forecast_type: str = "hourly") -> ParsedForecast | None:
+        """Return the cached forecast; fetch at most once concurrently per key."""
+        entry = self._entries.setdefault((entity_id, forecast_type), _Entry())
+        now = time.monotonic()
+        if not self._due(entry, now):
+            self.hits += 1
+            self._maybe_refresh_ahead(entry, now, entity_id, forecast_type)
+            return self._valid(entry, now, FORECAST_TTL_SECONDS)
+        if entry.task is None:
+            self._start_fetch(entry, entity_id, forecast_type)
+        else:
+            self.coalesced += 1
+        await asyncio.shield(entry.task)
+        return self._valid(entry, time.monotonic(), FORECAST_TTL_SECONDS)
+
+    def peek(
+        self, entity_id: str, forecast_type: str = "hourly", max_age: float = FORECAST_MAX_AGE_SECONDS
+    ) -> tuple[ParsedForecast | None, float | None]:
+        """Last good forecast and its age in seconds, without waiting.
+
+        A due refresh is started in the background; the caller keeps using the
+        previous snapshot until it has finished. Snapshots older than `max_age`
+        are not returned (the age still is).
+        """
+        entry = self._entries.setdefault((entity_id, forecast_type), _Entry())
+        now = time.monotonic()
+        if self._due(entry, now):
+            if entry.task is None:
+                self._start_fetch(entry, entity_id, forecast_type)
+        else:
+            self.hits += 1
+            self._maybe_refresh_ahead(entry, now, entity_id, forecast_type)
+        if entry.good_at is None:
+            return None, None
+        return self._valid(entry, now, max_age), now - entry.good_at
+
+    def pending(self, entity_id: str, forecast_type: str = "hourly") -> asyncio.Task | None:
+        entry = self._entries.get((entity_id, forecast_type))
+        return entry.task if entry is not None else None
+
+    @staticmethod
+    def _valid(entry: _Entry, now: float, max_age: float) -> ParsedForecast | None:
+        if entry.good_at is None or now - entry.good_at >= max_age:
+            return None
+        return entry.forecast
+
+    def _start_fetch(self, entry: _Entry, entity_id: str, forecast_type: str) -> None:
+        entry.task = self._hass.async_create_task(self._async_fetch(entry, entity_id, forecast_type))
+
+    async def _async_fetch(self, entry: _Entry, entity_id: str, forecast_type: str) -> None:
+        self.fetches += 1
+        try:
+            try:
+                forecast = await asyncio.wait_for(
+                    self._async_call_service(entity_id, forecast_type), FORECAST_FETCH_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                _LOGGER.warning(
+                    "Weather forecast fetch for %s timed out after %ss", entity_id, FORECAST_FETCH_TIMEOUT_SECONDS
+                )
+                forecast = None
+            entry.fetched_at = time.monotonic()
+            entry.failed = forecast is None
+            if forecast is None:
+                # Keep the last good forecast; callers decide by its age.
+                self.failures += 1
+            else:
+                entry.forecast = forecast
+                entry.good_at = entry.fetched_at
+        finally:
+            entry.task = None
+
+    async def _async_call_service(self, entity_id: str, forecast_type: str) -> ParsedForecast | None:
+        if not self._hass.services.has_service("weather", "get_forecasts"):
+            return None
+        try:
+            res = await self._hass.services.async_call(
+                "weather",
+                "get_forecasts",
+                {"entity_id": entity_id, "type": forecast_type},
+                blocking=True,
+                return_response=True,
+            )
+        except Exception as err:
+            _LOGGER.warning("Weather forecast fetch failed for %s: %s", entity_id, err)
+            return None
+
+        forecast = None
+        try:
+            block = res.get(entity_id) if isinstance(res, dict) else None
+            if isinstance(block, dict):
+                forecast = block.get("forecast") or block.get("forecasts")
+            if forecast is None and isinstance(res, dict):
+                forecast = res.get("forecast") or res.get("forecasts")
+        except Exception:
+            forecast = None
+        if not isinstance(forecast, list):
+            return None
+        return ParsedForecast.from_items(entity_id, forecast_type, forecast)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "fetches": self.fetches,
+            "coalesced": self.coalesced,
+            "refresh_ahead": self.refresh_ahead,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "pending": sum(1 for entry in self._entries.values() if entry.task is not None),
+        }
@@ -0,0 +1,183 @@
+"""Opt-in timing of the coordinator update cycle per section."""
+
+from __future__ import annotations
+
+from array import array
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+# Timed blocks of the update stages (`pipeline.UPDATE_STAGES`), in cycle order. A section
+# may be entered several times per cycle (e.g. persistence); its time adds up.
+CYCLE_SECTIONS = (
+    "sensors",
+    "blueriiot",
+    "dynamic_target",
+    "chemistry",
+    "costs",
+    "pv",
+    "schedule",
+    "heat_tuning",
+    "demand",
+    "actuation",
+    "persistence",
+)
+# Per-cycle counters (options writes, outgoing service calls).
+CYCLE_COUNTERS = ("options_writes", "service_calls")
+# Rolling window for p50/p95/max (cycles).
+PERF_WINDOW = 256
+
+
+class RollingStats:
+    """Fixed-size ring buffer of samples; percentiles are computed on demand."""
+
+    __slots__ = ("_samples", "_size", "_next", "count", "last")
+
+    def __init__(self, size: int = PERF_WINDOW) -> None:
+        self._samples = array("d")
+        self._size = max(1, int(size))
+        self._next = 0
+        self.count = 0
+        self.last: float | None = None
+
+    def add(self, value: float) -> None:
+        if len(self._samples) < self._size:
+            self._samples.append(value)
+        else:
+            self._samples[self._next] = value
+        self._next = (self._next + 1) % self._size
+        self.count += 1
+        self.last = value
+
+    def percentile(self, q: float) -> float | None:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(q / 100.0 * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def as_dict(self, digits: int = 3) -> dict:
+        if not self._samples:
+            return {"count": self.count, "last": None, "p50": None, "p95": None, "max": None}
+        ordered = sorted(self._samples)
+        top = len(ordered) - 1
+        return {
+            "count": self.count,
+            "last": round(self.last, digits),
+            "p50": round(ordered[int(round(0.50 * top))], digits),
+            "p95": round(ordered[int(round(0.95 * top))], digits),
+            "max": round(ordered[-1], digits),
+        }
+
+
+class CycleProfiler:
+    """Checkpoint timer for one update cycle.
+
+    `enter(section)` books the time since the previous checkpoint to the section
+    that was active so far. All calls return immediately while disabled, so the
+    markers can stay in the hot path. Counters incremented between cycles
+    (service handlers) are booked to the next finished cycle.
+    """
+
+    __slots__ = (
+        "enabled",
+        "cycles",
+        "total",
+        "sections",
+        "counters",
+        "_section",
+        "_last",
+        "_started",
+        "_current",
+        "_counts",
+    )
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.cycles = 0
+        self.total = RollingStats()
+        self.sections: dict[str, RollingStats] = {name: RollingStats() for name in CYCLE_SECTIONS}
+        self.counters: dict[str, RollingStats] = {name: RollingStats() for name in CYCLE_COUNTERS}
+        self._section: str | None = None
+        self._started = 0.0
+        self._last = 0.0
+        self._current: dict[str, float] = {}
+        self._counts: dict[str, int] = dict.fromkeys(CYCLE_COUNTERS, 0)
+
+    def start(self, enabled: bool) -> None:
+        if enabled != self.enabled:
+            self.reset()
+            self.enabled = enabled
+        if not enabled:
+            return
+        self._started = self._last = perf_counter()
+        self._current = {}
+        self._section = CYCLE_SECTIONS[0]
+
+    def enter(self, section: str) -> str | None:
+        """Switch to `section`; returns the section that was active before."""
+        previous = self._section
+        if not self.enabled or not self._started:
+            return previous
+        now = perf_counter()
+        if previous is not None:
+            self._current[previous] = self._current.get(previous, 0.0) + (now - self._last)
+        self._last = now
+        self._section = section
+        return previous
+
+    def within(self, section: str):
+        """Context manager booking its body to `section` (e.g. persistence inside a block)."""
+        if not self.enabled or not self._started:
+            return nullcontext()
+        return self._within(section)
+
+    @contextmanager
+    def _within(self, section: str):
+        previous = self.enter(section)
+        try:
+            yield
+        finally:
+            if previous is not None:
+                self.enter(previous)
+
+    def count(self, counter: str, n: int = 1) -> None:
+        if self.enabled:
+            self._counts[counter] = self._counts.get(counter, 0) + n
+
+    def finish(self) -> None:
+        if not self.enabled or not self._started:
+            return
+        # Book the tail to the section that is still active.
+        self.enter(self._section)
+        self.total.add((perf_counter() - self._started) * 1000.0)
+        for name, seconds in self._current.items():
+            stats = self.sections.get(name)
+            if stats is None:
+                stats = self.sections[name] = RollingStats()
+            stats.add(seconds * 1000.0)
+        for name, value in self._counts.items():
+            stats = self.counters.get(name)
+            if stats is None:
+                stats = self.counters[name] = RollingStats()
+            stats.add(float(value))
+        self._counts = dict.fromkeys(self._counts, 0)
+        self._started = 0.0
+        self._section = None
+        self.cycles += 1
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def last_counts(self) -> dict[str, int | None]:
+        return {name: (int(stats.last) if stats.last is not None else None) for name, stats in self.counters.items()}
+
+    def stats(self) -> dict:
+        """Rolling statistics in milliseconds (counters as values per cycle)."""
+        return {
+            "enabled": self.enabled,
+            "cycles": self.cycles,
+            "window": PERF_WINDOW,
+            "cycle_ms": self.total.as_dict(),
+            "sections_ms": {name: stats.as_dict() for name, stats in self.sections.items()},
+            "counters": {name: stats.as_dict(1) for name, stats in self.counters.items()},
+        }
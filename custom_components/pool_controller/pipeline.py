@@ -0,0 +1,135 @@
+"""Staged coordinator pipeline with per-stage dirty tracking."""
+
+from __future__ import annotations
+
+import inspect
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+# Order of the update cycle (`_async_cycle_<name>` in the coordinator).
+UPDATE_STAGES = (
+    "inputs",
+    "chemistry",
+    "costs",
+    "pv",
+    "schedule",
+    "demand",
+    "actuation",
+)
+
+# Pure evaluations reused while their inputs are unchanged. The other update stages
+# integrate over time or read live states and run every cycle.
+PIPELINE_STAGES = (
+    "chemistry",
+    "alkalinity",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CycleStage:
+    """One stage of the update cycle: the values it reads and the values it hands on."""
+
+    name: str
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+
+
+def cycle_stage(name: str, outputs: tuple[str, ...] = ()):
+    """Declare an update-cycle stage; its keyword-only parameters are its inputs."""
+
+    def decorate(func):
+        params = inspect.signature(func).parameters.values()
+        inputs = tuple(param.name for param in params if param.kind is param.KEYWORD_ONLY)
+        func.cycle_stage = CycleStage(name, inputs, tuple(outputs))
+        return func
+
+    return decorate
+
+
+def check_stage_order(stages: Iterable[CycleStage]) -> None:
+    """Raise ValueError if a stage reads a value that no earlier stage provides."""
+    provided: set[str] = set()
+    for stage in stages:
+        missing = [name for name in stage.inputs if name not in provided]
+        if missing:
+            raise ValueError(f"stage {stage.name!r} reads {missing} before any stage provides them")
+        provided.update(stage.outputs)
+
+
+class UpdateCycle:
+    """Values handed from stage to stage within one coordinator update."""
+
+    __slots__ = ("values",)
+
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+
+    def inputs(self, stage: CycleStage) -> dict[str, Any]:
+        return {name: self.values[name] for name in stage.inputs}
+
+    def provide(self, stage: CycleStage, outputs: dict[str, Any]) -> None:
+        if outputs.keys() != set(stage.outputs):
+            raise ValueError(f"stage {stage.name!r} returned {sorted(outputs)}, declared {sorted(stage.outputs)}")
+        self.values.update(outputs)
+
+
+class PipelineStage:
+    """Reuse the previous output while the declared inputs are unchanged."""
+
+    __slots__ = ("name", "runs", "skips", "_key", "_output", "_valid")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.runs = 0
+        self.skips = 0
+        self._key: Hashable = None
+        self._output: Any = None
+        self._valid = False
+
+    def is_dirty(self, key: Hashable) -> bool:
+        return (not self._valid) or key != self._key
+
+    def run(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached output for `key`, or compute and cache it."""
+        if not self.is_dirty(key):
+            self.skips += 1
+            return self._output
+        output = compute()
+        self._store(key, output)
+        return output
+
+    def invalidate(self) -> None:
+        self._valid = False
+        self._key = None
+        self._output = None
+
+    def _store(self, key: Hashable, output: Any) -> None:
+        self.runs += 1
+        self._key = key
+        self._output = output
+        self._valid = True
+
+
+class StagedPipeline:
+    """Registry of the coordinator's pipeline stages."""
+
+    def __init__(self, stages: tuple[str, ...] = PIPELINE_STAGES) -> None:
+        self._stages = {name: PipelineStage(name) for name in stages}
+
+    def stage(self, name: str) -> PipelineStage:
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = PipelineStage(name)
+        return stage
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Invalidate one stage or (name=None) all stages, e.g. after an options change."""
+        if name is not None:
+            self.stage(name).invalidate()
+            return
+        for stage in self._stages.values():
+            stage.invalidate()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {name: {"runs": st.runs, "skips": st.skips} for name, st in self._stages.items()}
@@ -0,0 +1,184 @@
+"""On-demand cProfile/tracemalloc capture of coordinator refreshes (`pool_controller.profile`)."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import logging
+import pstats
+import tracemalloc
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import PoolControllerDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_CYCLES = 5
+MAX_PROFILE_CYCLES = 100
+DEFAULT_PROFILE_TOP = 25
+# Frames kept per allocation (tracemalloc); deeper traces cost memory while tracing.
+TRACEMALLOC_FRAMES = 5
+
+# cProfile allows one active profiler per interpreter; serialise service calls.
+_PROFILE_LOCK = asyncio.Lock()
+
+
+def _function_label(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{filename}:{line}({name})"
+
+
+def _top_functions(stats: pstats.Stats, top: int) -> list[dict]:
+    rows = []
+    for func, (_cc, calls, tottime, cumtime, _callers) in stats.stats.items():
+        rows.append((cumtime, tottime, calls, func))
+    rows.sort(key=lambda row: (row[0], row[1]), reverse=True)
+    return [
+        {
+            "function": _function_label(func),
+            "calls": calls,
+            "tottime_ms": round(tottime * 1000.0, 3),
+            "cumtime_ms": round(cumtime * 1000.0, 3),
+        }
+        for cumtime, tottime, calls, func in rows[:top]
+    ]
+
+
+def _allocation_rows(start: tracemalloc.Snapshot, end: tracemalloc.Snapshot, top: int) -> list[dict]:
+    """Largest allocation growth per source line during the capture."""
+    rows = []
+    for diff in end.compare_to(start, "lineno")[:top]:
+        frame = diff.traceback[0]
+        rows.append(
+            {
+                "location": f"{frame.filename}:{frame.lineno}",
+                "size_diff_kib": round(diff.size_diff / 1024.0, 2),
+                "size_kib": round(diff.size / 1024.0, 2),
+                "count_diff": diff.count_diff,
+            }
+        )
+    return rows
+
+
+def _finish_allocations(start: tracemalloc.Snapshot, top: int) -> tuple[list[dict], float]:
+    """End snapshot, diff and peak (executor: snapshots of a large heap take seconds)."""
+    end = tracemalloc.take_snapshot()
+    peak_kib = round(tracemalloc.get_traced_memory()[1] / 1024.0, 2)
+    return _allocation_rows(start, end, top), peak_kib
+
+
+def _write_reports(stats: pstats.Stats, prof_path: str, alloc_path: str | None, header: str, allocations: list[dict]) -> None:
+    stats.dump_stats(prof_path)
+    if alloc_path is None:
+        return
+    with open(alloc_path, "w", encoding="utf-8") as handle:
+        handle.write(header + "\n\n")
+        handle.write(f"{'size_diff_kib':>14} {'size_kib':>12} {'count_diff':>11}  location\n")
+        for row in allocations:
+            handle.write(
+                f"{row['size_diff_kib']:>14.2f} {row['size_kib']:>12.2f} {row['count_diff']:>11}  {row['location']}\n"
+            )
+
+
+async def async_profile_refreshes(
+    hass: HomeAssistant,
+    coordinator: PoolControllerDataCoordinator,
+    cycles: int = DEFAULT_PROFILE_CYCLES,
+    *,
+    trace_allocations: bool = False,
+    top: int = DEFAULT_PROFILE_TOP,
+) -> dict:
+    """Run `cycles` refreshes under cProfile (optionally tracemalloc) and write the reports.
+
+    Refreshes are triggered back to back instead of waiting for the poll interval,
+    so the call returns within seconds. Everything running on the event loop while
+    the profiler is active is captured, which is intended: slowness caused by other
+    tasks interleaving with the refresh shows up as well.
+    """
+    cycles = max(1, min(MAX_PROFILE_CYCLES, int(cycles)))
+    top = max(1, int(top))
+    if _PROFILE_LOCK.locked():
+        return {"error": "profile_running"}
+
+    async with _PROFILE_LOCK:
+        stamp = dt_util.now().strftime("%Y%m%d-%H%M%S")
+        base = hass.config.path(f"{DOMAIN}_profile_{coordinator.entry.entry_id}_{stamp}")
+        prof_path = f"{base}.prof"
+        alloc_path = f"{base}.allocations.txt" if trace_allocations else None
+
+        # Do not stop tracemalloc if someone else (e.g. the profiler integration) started it.
+        started_tracemalloc = False
+        malloc_start = None
+        if trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                started_tracemalloc = True
+                tracemalloc.reset_peak()
+            try:
+                malloc_start = await hass.async_add_executor_job(tracemalloc.take_snapshot)
+            except BaseException:
+                if started_tracemalloc:
+                    tracemalloc.stop()
+                raise
+
+        profiler = cProfile.Profile()
+        cycle_ms: list[float] = []
+        failures = 0
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. the profiler integration) is active.
+            if started_tracemalloc:
+                tracemalloc.stop()
+            return {"error": "profiler_busy"}
+        started = perf_counter()
+        try:
+            for _ in range(cycles):
+                cycle_started = perf_counter()
+                await coordinator.async_refresh()
+                cycle_ms.append(round((perf_counter() - cycle_started) * 1000.0, 3))
+                if not coordinator.last_update_success:
+                    failures += 1
+        finally:
+            profiler.disable()
+            duration_ms = round((perf_counter() - started) * 1000.0, 3)
+
+        allocations: list[dict] = []
+        traced_peak_kib = None
+        if trace_allocations and malloc_start is not None:
+            try:
+                allocations, traced_peak_kib = await hass.async_add_executor_job(_finish_allocations, malloc_start, top)
+            finally:
+                if started_tracemalloc:
+                    tracemalloc.stop()
+
+        stats = pstats.Stats(profiler)
+        header = f"{DOMAIN} allocations: entry {coordinator.entry.entry_id}, {cycles} refreshes, {stamp}"
+        try:
+            await hass.async_add_executor_job(_write_reports, stats, prof_path, alloc_path, header, allocations)
+        except Exception:
+            _LOGGER.warning("Could not write profile reports to %s", base, exc_info=True)
+            prof_path = None
+            alloc_path = None
+
+        return {
+            "entry_id": coordinator.entry.entry_id,
+            "cycles": cycles,
+            "failures": failures,
+            "duration_ms": duration_ms,
+            "cycle_ms": cycle_ms,
+            "profile_path": prof_path,
+            "allocations_path": alloc_path,
+            "top_functions": _top_functions(stats, top),
+            "top_allocations": allocations,
+            "traced_peak_kib": traced_peak_kib,
+        }
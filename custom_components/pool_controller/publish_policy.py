@@ -0,0 +1,128 @@
+"""Significance deadbands for high-churn numeric sensors."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True)
+class PublishPolicy:
+    """When a new value of a data key is worth a state write.
+
+    A change is published if it exceeds `deadband` (absolute) or `relative`
+    (fraction of the last published value), but not more often than every
+    `min_interval` seconds. `heartbeat` > 0 publishes small drifts at least that
+    often. Datetime values are compared in seconds.
+    """
+
+    deadband: float = 0.0
+    relative: float = 0.0
+    min_interval: float = 0.0
+    heartbeat: float = 0.0
+
+    def threshold(self, last: float) -> float:
+        return max(self.deadband, self.relative * abs(last))
+
+    def significant(self, last, value) -> bool:
+        last_num = _as_number(last)
+        value_num = _as_number(value)
+        if last_num is None or value_num is None:
+            # Unknown <-> value, text or type changes are always significant.
+            return last != value
+        if math.isnan(last_num) or math.isnan(value_num):
+            return not (math.isnan(last_num) and math.isnan(value_num))
+        delta = abs(value_num - last_num)
+        threshold = self.threshold(last_num)
+        return delta > 0 if threshold <= 0 else delta >= threshold
+
+    def decide(self, last, last_at: float | None, value, now: float) -> tuple[bool, float | None]:
+        """(publish now, seconds until a deferred publish is due or None)."""
+        if last_at is None or last is None or value is None:
+            # Becoming (un)known is never held back.
+            return last_at is None or last != value, None
+        elapsed = now - last_at
+        if self.min_interval > 0 and elapsed < self.min_interval:
+            # Hold back; a significant change is written when the interval has passed.
+            if self.significant(last, value):
+                return False, self.min_interval - elapsed
+            return False, None
+        if self.significant(last, value):
+            return True, None
+        if self.heartbeat > 0 and last != value and elapsed >= self.heartbeat:
+            return True, None
+        return False, None
+
+
+def _as_number(value) -> float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return None
+
+
+_COST_RATE = PublishPolicy(deadband=0.005, heartbeat=600)
+_COST_TOTAL = PublishPolicy(deadband=0.01, heartbeat=900)
+_PV_POWER = PublishPolicy(deadband=20.0, relative=0.02, heartbeat=300)
+_TARGET_TEMP = PublishPolicy(deadband=0.05, heartbeat=1800)
+
+# Built-in policies (keys of coordinator.data); options can override or drop them.
+DEFAULT_PUBLISH_POLICIES: dict[str, PublishPolicy] = {
+    "power_cost_per_hour": _COST_RATE,
+    "power_cost_per_hour_net": _COST_RATE,
+    "power_cost_feed_in_loss_per_hour": _COST_RATE,
+    "energy_cost_daily": _COST_TOTAL,
+    "energy_cost_monthly": _COST_TOTAL,
+    "energy_cost_yearly": _COST_TOTAL,
+    "energy_cost_net_daily": _COST_TOTAL,
+    "energy_cost_net_monthly": _COST_TOTAL,
+    "energy_cost_net_yearly": _COST_TOTAL,
+    "energy_feed_in_loss_daily": _COST_TOTAL,
+    "energy_feed_in_loss_monthly": _COST_TOTAL,
+    "energy_feed_in_loss_yearly": _COST_TOTAL,
+    "pv_power": _PV_POWER,
+    "pv_surplus_for_pool": _PV_POWER,
+    "pv_smoothed": _PV_POWER,
+    "target_temp_effective": _TARGET_TEMP,
+    "target_temp_offset": _TARGET_TEMP,
+    "target_temp_weather_offset": _TARGET_TEMP,
+}
+
+
+def _policy_from_option(value) -> PublishPolicy | None:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return PublishPolicy(deadband=max(0.0, float(value)))
+    if not isinstance(value, Mapping):
+        return None
+    fields = {}
+    for name in ("deadband", "relative", "min_interval", "heartbeat"):
+        if value.get(name) is not None:
+            fields[name] = max(0.0, float(value[name]))
+    return PublishPolicy(**fields)
+
+
+def publish_policies(enabled: bool, overrides) -> dict[str, PublishPolicy]:
+    """Effective policies: built-in defaults updated by the `publish_policies` option.
+
+    Option format: `{data_key: {deadband, relative, min_interval, heartbeat}}`; a bare
+    number is an absolute deadband, `null`/`false` removes the policy for that key.
+    """
+    if not enabled:
+        return {}
+    policies = dict(DEFAULT_PUBLISH_POLICIES)
+    if isinstance(overrides, Mapping):
+        for key, value in overrides.items():
+            try:
+                policy = _policy_from_option(value)
+            except (TypeError, ValueError):
+                continue
+            if policy is None:
+                policies.pop(str(key), None)
+            else:
+                policies[str(key)] = policy
+    return policies
@@ -0,0 +1,174 @@
+"""Quiet-time calendar: precomputed quiet intervals as sorted UTC epoch arrays."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, tzinfo
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_QUIET_END,
+    CONF_QUIET_END_WEEKEND,
+    CONF_QUIET_START,
+    CONF_QUIET_START_WEEKEND,
+    DEFAULT_Q_END,
+    DEFAULT_Q_END_WE,
+    DEFAULT_Q_START,
+    DEFAULT_Q_START_WE,
+)
+
+# Days covered by one calendar (starting yesterday, so overdue times still resolve).
+QUIET_CALENDAR_DAYS = 8
+
+
+def _parse_time(value, default: str) -> time:
+    try:
+        parsed = dt_util.parse_time(str(value)) if value is not None else None
+    except Exception:
+        parsed = None
+    return parsed or dt_util.parse_time(default)
+
+
+def _epoch(day: date, at: time, tz: tzinfo) -> float:
+    # Local wall-clock time -> UTC; zoneinfo resolves DST gaps/folds per day.
+    return datetime.combine(day, at.replace(second=0, microsecond=0), tzinfo=tz).timestamp()
+
+
+class QuietCalendar:
+    """Quiet windows for a range of local days, merged into disjoint closed intervals.
+
+    Each day uses its own profile (weekday, or weekend for Saturday/Sunday and
+    holidays) for its whole local date: an overnight window contributes the
+    morning part (00:00..end) and the evening part (start..24:00) of that day.
+    """
+
+    __slots__ = ("key", "first_day", "days", "_horizon", "_starts", "_ends")
+
+    def __init__(
+        self,
+        weekday: tuple[time, time],
+        weekend: tuple[time, time],
+        first_day: date,
+        days: int = QUIET_CALENDAR_DAYS,
+        holidays: frozenset[date] = frozenset(),
+        tz: tzinfo | None = None,
+        key=None,
+    ) -> None:
+        tz = tz or dt_util.DEFAULT_TIME_ZONE
+        self.key = key
+        self.first_day = first_day
+        self.days = days
+        self._horizon = (_epoch(first_day, time(0, 0), tz), _epoch(first_day + timedelta(days=days), time(0, 0), tz))
+        raw: list[tuple[float, float]] = []
+        # One extra day so the last evening window does not end at the horizon.
+        for offset in range(days + 1):
+            day = first_day + timedelta(days=offset)
+            start_t, end_t = weekend if (day.weekday() >= 5 or day in holidays) else weekday
+            day_start = _epoch(day, time(0, 0), tz)
+            day_end = _epoch(day + timedelta(days=1), time(0, 0), tz)
+            if start_t <= end_t:
+                raw.append((_epoch(day, start_t, tz), _epoch(day, end_t, tz)))
+            else:
+                raw.append((day_start, _epoch(day, end_t, tz)))
+                raw.append((_epoch(day, start_t, tz), day_end))
+
+        self._starts = array("d")
+        self._ends = array("d")
+        for start, end in raw:
+            if self._ends and start <= self._ends[-1]:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    @classmethod
+    def from_conf(
+        cls,
+        conf: dict,
+        now: datetime,
+        holidays: frozenset[date] = frozenset(),
+        days: int = QUIET_CALENDAR_DAYS,
+    ) -> QuietCalendar:
+        weekday = (
+            _parse_time(conf.get(CONF_QUIET_START, DEFAULT_Q_START), DEFAULT_Q_START),
+            _parse_time(conf.get(CONF_QUIET_END, DEFAULT_Q_END), DEFAULT_Q_END),
+        )
+        weekend = (
+            _parse_time(conf.get(CONF_QUIET_START_WEEKEND, DEFAULT_Q_START_WE), DEFAULT_Q_START_WE),
+            _parse_time(conf.get(CONF_QUIET_END_WEEKEND, DEFAULT_Q_END_WE), DEFAULT_Q_END_WE),
+        )
+        first_day = dt_util.as_local(now).date() - timedelta(days=1)
+        return cls(
+            weekday,
+            weekend,
+            first_day,
+            days=days,
+            holidays=holidays,
+            key=cls.cache_key(conf, now, holidays),
+        )
+
+    @staticmethod
+    def cache_key(conf: dict, now: datetime, holidays: frozenset[date] = frozenset()) -> tuple:
+        return (
+            conf.get(CONF_QUIET_START),
+            conf.get(CONF_QUIET_END),
+            conf.get(CONF_QUIET_START_WEEKEND),
+            conf.get(CONF_QUIET_END_WEEKEND),
+            dt_util.as_local(now).date(),
+            holidays,
+        )
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def covers(self, when: datetime) -> bool:
+        return self._horizon[0] <= when.timestamp() < self._horizon[1]
+
+    def _index(self, ts: float) -> int:
+        """Index of the last interval starting at or before ts (-1 if none)."""
+        return bisect_right(self._starts, ts) - 1
+
+    @staticmethod
+    def _local(ts: float) -> datetime:
+        return dt_util.as_local(dt_util.utc_from_timestamp(ts))
+
+    def is_quiet(self, when: datetime) -> bool:
+        ts = when.timestamp()
+        i = self._index(ts)
+        return i >= 0 and ts <= self._ends[i]
+
+    def next_start(self, when: datetime) -> datetime | None:
+        """Start of the next quiet window at or after `when`."""
+        ts = when.timestamp()
+        i = bisect_left(self._starts, ts)
+        if i >= len(self._starts) or not self.covers(when):
+            return None
+        return self._local(self._starts[i])
+
+    def end_for(self, when: datetime) -> datetime | None:
+        """End of the quiet window containing `when`, else of the next one."""
+        ts = when.timestamp()
+        if not self.covers(when):
+            return None
+        i = self._index(ts)
+        if i < 0 or ts > self._ends[i]:
+            i += 1
+        if i >= len(self._ends):
+            return None
+        return self._local(self._ends[i])
+
+    def windows(self, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+        """Quiet windows overlapping [start, end], clipped to that range."""
+        start_ts = start.timestamp()
+        end_ts = end.timestamp()
+        result = []
+        i = max(0, self._index(start_ts))
+        while i < len(self._starts) and self._starts[i] <= end_ts:
+            lo = max(self._starts[i], start_ts)
+            hi = min(self._ends[i], end_ts)
+            if lo <= hi:
+                result.append((self._local(lo), self._local(hi)))
+            i += 1
+        return result
@@ -1,6 +1,5 @@
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
 from homeassistant.const import EntityCategory, UnitOfTemperature
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import (
     DOMAIN,
     MANUFACTURER,
@@ -15,6 +14,7 @@ from .const import (
     DEFAULT_PV_ON,
     DEFAULT_PV_OFF,
 )
+from .entity import PoolCoordinatorEntity
 
 
 _AUTO_STATE_CLASS = object()
@@ -31,6 +31,12 @@ async def async_setup_entry(hass, entry, async_add_entities):
         PoolTextSensor(coordinator, "blueriiot_error", None),
         PoolTimeSensor(coordinator, "blueriiot_last_success", None),
         PoolChemSensor(coordinator, "blueriiot_battery", None, "%", "mdi:battery", device_class=SensorDeviceClass.BATTERY, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
+        PoolChemSensor(coordinator, "blueriiot_connect_seconds", None, "s", "mdi:bluetooth-connect", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
+        PoolChemSensor(coordinator, "blueriiot_session_reuse_percent", None, "%", "mdi:bluetooth-transfer", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
+        PoolUpdatePerfSensor(coordinator),
+        PoolChemSensor(coordinator, "update_cycle_p95_ms", None, "ms", "mdi:timer-alert-outline", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
+        PoolChemSensor(coordinator, "update_options_writes", None, None, "mdi:content-save-cog", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
+        PoolChemSensor(coordinator, "update_service_calls", None, None, "mdi:api", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
         PoolTextSensor(coordinator, "run_credit_source", None),
         PoolChemSensor(coordinator, "run_credit_minutes", None, "min", "mdi:timer-sand", state_class=None, entity_category=EntityCategory.DIAGNOSTIC),
         PoolChemSensor(coordinator, "filter_credit_minutes", None, "min", "mdi:timer-sand", state_class=None, entity_category=EntityCategory.DIAGNOSTIC),
@@ -39,6 +45,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
         PoolChemSensor(coordinator, "frost_credit_shift_minutes", None, "min", "mdi:timer-sync", state_class=None, entity_category=EntityCategory.DIAGNOSTIC),
         PoolChemSensor(coordinator, "electricity_price", None, "€/kWh", "mdi:currency-eur", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
         PoolChemSensor(coordinator, "feed_in_tariff", None, "€/kWh", "mdi:currency-eur", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
+        PoolCostPlanSensor(coordinator),
         PoolChemSensor(coordinator, "power_cost_per_hour", None, "€/h", "mdi:currency-eur", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
         PoolChemSensor(coordinator, "power_cost_per_hour_net", None, "€/h", "mdi:currency-eur", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
         PoolChemSensor(coordinator, "power_cost_feed_in_loss_per_hour", None, "€/h", "mdi:currency-eur", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
@@ -66,6 +73,10 @@ async def async_setup_entry(hass, entry, async_add_entities):
         PoolChemSensor(coordinator, "salt_val", None, "g/L", "mdi:shaker"),
         PoolChemSensor(coordinator, "tds_val", None, "ppm", "mdi:water-opacity"),
         PoolChemSensor(coordinator, "tds_effective", None, "ppm", "mdi:water-opacity"),
+        # Median of the stable samples in the chemistry lookback window (basis of the recommendations).
+        PoolChemSensor(coordinator, "ph_history_median", None, None, "mdi:ph", device_class=_DEVICE_CLASS_PH, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
+        PoolChemSensor(coordinator, "chlor_history_median", None, "mV", "mdi:pool", entity_category=EntityCategory.DIAGNOSTIC),
+        PoolChemSensor(coordinator, "tds_history_median", None, "ppm", "mdi:water-opacity", entity_category=EntityCategory.DIAGNOSTIC),
         PoolTextSensor(coordinator, "water_safety_status", None),
         PoolTextSensor(coordinator, "water_safety_reason", None),
         PoolChemSensor(coordinator, "alkalinity_estimated_ppm", None, "ppm", "mdi:flask-round-bottom", state_class=SensorStateClass.MEASUREMENT),
@@ -86,7 +97,8 @@ async def async_setup_entry(hass, entry, async_add_entities):
         PoolChemSensor(coordinator, "next_start_mins", None, "min", "mdi:clock-start", device_class=SensorDeviceClass.DURATION),
         PoolChemSensor(coordinator, "next_frost_mins", None, "min", "mdi:clock-start", device_class=SensorDeviceClass.DURATION, state_class=None, entity_category=EntityCategory.DIAGNOSTIC),
         PoolChemSensor(coordinator, "event_rain_probability", None, "%", "mdi:weather-rainy", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
-        PoolTimeSensor(coordinator, "next_event", None)
+        PoolTimeSensor(coordinator, "next_event", None),
+        PoolScheduleSensor(coordinator),
     ]
     # Timer/Status sensors
     entities.extend([
@@ -136,7 +148,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
         # Best-effort: don't crash setup if config sensors fail
         pass
 
-class PoolBaseSensor(CoordinatorEntity, SensorEntity):
+class PoolBaseSensor(PoolCoordinatorEntity, SensorEntity):
     _attr_has_entity_name = True
     def __init__(self, coordinator, name=None):
         super().__init__(coordinator)
@@ -150,6 +162,7 @@ class PoolBaseSensor(CoordinatorEntity, SensorEntity):
 
 class PoolStatusSensor(PoolBaseSensor):
     _attr_translation_key = "status"
+    _data_keys = frozenset({"maintenance_active", "away_active", "frost_danger", "pause_timer_active"})
     @property
     def native_value(self):
         if self.coordinator.data.get("maintenance_active"): return "maintenance"
@@ -161,6 +174,7 @@ class PoolStatusSensor(PoolBaseSensor):
 class PoolRunReasonSensor(PoolBaseSensor):
     _attr_translation_key = "run_reason"
     _attr_icon = "mdi:information-outline"
+    _data_keys = frozenset({"run_reason"})
 
     def __init__(self, coordinator):
         super().__init__(coordinator)
@@ -179,6 +193,7 @@ class PoolRunReasonSensor(PoolBaseSensor):
 class PoolHeatReasonSensor(PoolBaseSensor):
     _attr_translation_key = "heat_reason"
     _attr_icon = "mdi:fire"
+    _data_keys = frozenset({"heat_reason"})
 
     def __init__(self, coordinator):
         super().__init__(coordinator)
@@ -197,6 +212,7 @@ class PoolHeatReasonSensor(PoolBaseSensor):
 class PoolSanitizerModeSensor(PoolBaseSensor):
     _attr_translation_key = "sanitizer_mode"
     _attr_icon = "mdi:water-check"
+    _data_keys = frozenset({"sanitizer_mode"})
 
     def __init__(self, coordinator):
         super().__init__(coordinator)
@@ -210,6 +226,7 @@ class PoolSanitizerModeSensor(PoolBaseSensor):
 class PoolTdsStatusSensor(PoolBaseSensor):
     _attr_translation_key = "tds_status"
     _attr_icon = "mdi:water-check"
+    _data_keys = frozenset({"tds_status"})
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_unique_id = f"{coordinator.entry.entry_id}_tds_status"
@@ -233,6 +250,8 @@ class PoolChemSensor(PoolBaseSensor):
     ):
         super().__init__(coordinator, name)
         self._key = key
+        self._data_keys = frozenset({key})
+        self._policy_key = key
         self._attr_translation_key = key
         # Names are provided via translation keys in strings.json; do not hardcode here
         self._attr_native_unit_of_measurement = unit
@@ -252,11 +271,69 @@ class PoolTimeSensor(PoolBaseSensor):
     def __init__(self, coordinator, key, name):
         super().__init__(coordinator, name)
         self._key = key
+        self._data_keys = frozenset({key})
+        self._policy_key = key
         self._attr_translation_key = key
         self._attr_unique_id = f"{coordinator.entry.entry_id}_{key}"
     @property
     def native_value(self): return self.coordinator.data.get(self._key)
 
+class PoolScheduleSensor(PoolTimeSensor):
+    """Start of the next planned run; the 48 h plan is exposed as attribute."""
+
+    _unrecorded_attributes = frozenset({"planned_runs"})
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "next_planned_run", None)
+        self._attr_icon = "mdi:calendar-clock"
+        self._data_keys = frozenset({"next_planned_run", "planned_runs"})
+
+    @property
+    def extra_state_attributes(self):
+        return {"planned_runs": self.coordinator.data.get("planned_runs") or []}
+
+class PoolCostPlanSensor(PoolChemSensor):
+    """Expected savings of the cost-optimised plan; the plan itself is exposed as attribute."""
+
+    _unrecorded_attributes = frozenset({"cost_plan"})
+
+    def __init__(self, coordinator):
+        super().__init__(
+            coordinator,
+            "cost_plan_savings",
+            None,
+            "€",
+            "mdi:piggy-bank-outline",
+            state_class=None,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        )
+        self._data_keys = frozenset({"cost_plan_savings", "cost_plan"})
+
+    @property
+    def extra_state_attributes(self):
+        return {"cost_plan": self.coordinator.data.get("cost_plan")}
+
+class PoolUpdatePerfSensor(PoolChemSensor):
+    """Duration of the last update cycle; per-section p50/p95/max as attribute (opt-in)."""
+
+    _unrecorded_attributes = frozenset({"update_perf"})
+
+    def __init__(self, coordinator):
+        super().__init__(
+            coordinator,
+            "update_cycle_ms",
+            None,
+            "ms",
+            "mdi:timer-cog-outline",
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        )
+        self._data_keys = frozenset({"update_cycle_ms", "update_perf"})
+
+    @property
+    def extra_state_attributes(self):
+        return {"update_perf": self.coordinator.data.get("update_perf")}
+
 class PoolPowerSensor(PoolBaseSensor):
     _attr_device_class = SensorDeviceClass.POWER
     _attr_native_unit_of_measurement = "W"
@@ -264,6 +341,8 @@ class PoolPowerSensor(PoolBaseSensor):
     def __init__(self, coordinator, key, name):
         super().__init__(coordinator, name)
         self._key = key
+        self._data_keys = frozenset({key})
+        self._policy_key = key
         self._attr_translation_key = key
         self._attr_icon = "mdi:lightning-bolt"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_{key}"
@@ -276,6 +355,7 @@ class PoolTextSensor(PoolBaseSensor):
     def __init__(self, coordinator, key, name):
         super().__init__(coordinator, name)
         self._key = key
+        self._data_keys = frozenset({key})
         self._attr_translation_key = key
         self._attr_icon = "mdi:calendar-text"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_{key}"
@@ -284,6 +364,7 @@ class PoolTextSensor(PoolBaseSensor):
 
 
 class PoolTimerSensor(PoolBaseSensor):
+    # Attributes read the timer durations from the coordinator directly: write on every refresh.
     _attr_native_unit_of_measurement = "min"
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_device_class = SensorDeviceClass.DURATION
@@ -339,8 +420,10 @@ class PoolConfigSensor(PoolBaseSensor):
     """Expose a configured option value as a simple sensor.
 
     This reads from the config entry data/options with a sensible default.
+    Options changes reload the entry or publish all entities, so no data keys.
     """
     _attr_state_class = None
+    _data_keys = frozenset()
 
     def __init__(self, coordinator, option_key, default_value, name=None, *, unit="min", icon="mdi:timer", device_class=None):
         super().__init__(coordinator)
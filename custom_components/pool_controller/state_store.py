@@ -0,0 +1,289 @@
+"""Runtime state persistence (timers, modes, counters) outside the config entry."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from functools import partial
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    OPT_KEY_AUTO_FILTER_DURATION,
+    OPT_KEY_AUTO_FILTER_UNTIL,
+    OPT_KEY_AUX_ALLOWED,
+    OPT_KEY_AWAY_ACTIVE,
+    OPT_KEY_AWAY_PREV_TARGET,
+    OPT_KEY_BATHING_BLOCK_UNTIL,
+    OPT_KEY_BOOST_ACTIVE,
+    OPT_KEY_BOOST_UNTIL,
+    OPT_KEY_CHEM_BLOCK_UNTIL,
+    OPT_KEY_CHEMISTRY_HISTORY,
+    OPT_KEY_COST_DAILY_ACCUM,
+    OPT_KEY_COST_DAILY_DATE,
+    OPT_KEY_COST_DAILY_FEED_IN_LOSS_ACCUM,
+    OPT_KEY_COST_DAILY_LAST_GRID_KWH,
+    OPT_KEY_COST_DAILY_LAST_SOLAR_KWH,
+    OPT_KEY_COST_DAILY_NET_ACCUM,
+    OPT_KEY_COST_DAILY_PV_CREDIT_ACCUM,
+    OPT_KEY_CREDIT_STREAK_MINUTES,
+    OPT_KEY_CREDIT_STREAK_SOURCE,
+    OPT_KEY_DERIVED_COST_DAILY_LAST_DATE,
+    OPT_KEY_DERIVED_COST_DAILY_LAST_VALUE,
+    OPT_KEY_DERIVED_COST_MONTH_ID,
+    OPT_KEY_DERIVED_COST_MONTH_TOTAL,
+    OPT_KEY_DERIVED_COST_NET_DAILY_LAST_DATE,
+    OPT_KEY_DERIVED_COST_NET_DAILY_LAST_VALUE,
+    OPT_KEY_DERIVED_COST_NET_MONTH_ID,
+    OPT_KEY_DERIVED_COST_NET_MONTH_TOTAL,
+    OPT_KEY_DERIVED_COST_NET_YEAR_ID,
+    OPT_KEY_DERIVED_COST_NET_YEAR_TOTAL,
+    OPT_KEY_DERIVED_COST_YEAR_ID,
+    OPT_KEY_DERIVED_COST_YEAR_TOTAL,
+    OPT_KEY_DERIVED_GRID_DAILY_LAST_DATE,
+    OPT_KEY_DERIVED_GRID_DAILY_LAST_VALUE,
+    OPT_KEY_DERIVED_GRID_MONTH_ID,
+    OPT_KEY_DERIVED_GRID_MONTH_TOTAL,
+    OPT_KEY_DERIVED_GRID_YEAR_ID,
+    OPT_KEY_DERIVED_GRID_YEAR_TOTAL,
+    OPT_KEY_DERIVED_SOLAR_DAILY_LAST_DATE,
+    OPT_KEY_DERIVED_SOLAR_DAILY_LAST_VALUE,
+    OPT_KEY_DERIVED_SOLAR_MONTH_ID,
+    OPT_KEY_DERIVED_SOLAR_MONTH_TOTAL,
+    OPT_KEY_DERIVED_SOLAR_YEAR_ID,
+    OPT_KEY_DERIVED_SOLAR_YEAR_TOTAL,
+    OPT_KEY_FILTER_CREDIT_EXPIRES_AT,
+    OPT_KEY_FILTER_CREDIT_MINUTES,
+    OPT_KEY_FILTER_NEXT,
+    OPT_KEY_FROST_CREDIT_EXPIRES_AT,
+    OPT_KEY_FROST_CREDIT_MINUTES,
+    OPT_KEY_HEAT_LOSS_W_PER_C,
+    OPT_KEY_HEAT_STARTUP_OFFSET_MINUTES,
+    OPT_KEY_HVAC_ENABLED,
+    OPT_KEY_MAINTENANCE_ACTIVE,
+    OPT_KEY_MANUAL_DURATION,
+    OPT_KEY_MANUAL_MODE_ACTIVE,
+    OPT_KEY_MANUAL_TYPE,
+    OPT_KEY_MANUAL_UNTIL,
+    OPT_KEY_PAUSE_DURATION,
+    OPT_KEY_PAUSE_UNTIL,
+    OPT_KEY_POWER_SAVING_ACTIVE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# All changes within this window are written to disk in one go.
+STATE_FLUSH_SECONDS = 60
+
+# Runtime state keys grouped into sections. A section is only re-serialized
+# when one of its keys changed. OPT_KEY_TARGET_TEMP is intentionally not part of
+# the runtime state: it shares its key with the configurable CONF_TARGET_TEMP.
+RUNTIME_STATE_SECTIONS: dict[str, tuple[str, ...]] = {
+    "modes": (
+        OPT_KEY_MAINTENANCE_ACTIVE,
+        OPT_KEY_HVAC_ENABLED,
+        OPT_KEY_AWAY_ACTIVE,
+        OPT_KEY_AWAY_PREV_TARGET,
+        OPT_KEY_POWER_SAVING_ACTIVE,
+        OPT_KEY_MANUAL_MODE_ACTIVE,
+        OPT_KEY_BOOST_ACTIVE,
+        OPT_KEY_BOOST_UNTIL,
+        OPT_KEY_AUX_ALLOWED,
+    ),
+    "timers": (
+        OPT_KEY_MANUAL_UNTIL,
+        OPT_KEY_MANUAL_TYPE,
+        OPT_KEY_MANUAL_DURATION,
+        OPT_KEY_AUTO_FILTER_UNTIL,
+        OPT_KEY_AUTO_FILTER_DURATION,
+        OPT_KEY_PAUSE_UNTIL,
+        OPT_KEY_PAUSE_DURATION,
+        OPT_KEY_BATHING_BLOCK_UNTIL,
+        OPT_KEY_FILTER_NEXT,
+        OPT_KEY_CHEM_BLOCK_UNTIL,
+    ),
+    "credit": (
+        OPT_KEY_FILTER_CREDIT_MINUTES,
+        OPT_KEY_FILTER_CREDIT_EXPIRES_AT,
+        OPT_KEY_FROST_CREDIT_MINUTES,
+        OPT_KEY_FROST_CREDIT_EXPIRES_AT,
+        OPT_KEY_CREDIT_STREAK_SOURCE,
+        OPT_KEY_CREDIT_STREAK_MINUTES,
+    ),
+    "chemistry": (
+        OPT_KEY_CHEMISTRY_HISTORY,
+    ),
+    "heat_tuning": (
+        OPT_KEY_HEAT_LOSS_W_PER_C,
+        OPT_KEY_HEAT_STARTUP_OFFSET_MINUTES,
+    ),
+    "energy": (
+        OPT_KEY_DERIVED_GRID_DAILY_LAST_VALUE,
+        OPT_KEY_DERIVED_GRID_DAILY_LAST_DATE,
+        OPT_KEY_DERIVED_GRID_MONTH_TOTAL,
+        OPT_KEY_DERIVED_GRID_YEAR_TOTAL,
+        OPT_KEY_DERIVED_GRID_MONTH_ID,
+        OPT_KEY_DERIVED_GRID_YEAR_ID,
+        OPT_KEY_DERIVED_SOLAR_DAILY_LAST_VALUE,
+        OPT_KEY_DERIVED_SOLAR_DAILY_LAST_DATE,
+        OPT_KEY_DERIVED_SOLAR_MONTH_TOTAL,
+        OPT_KEY_DERIVED_SOLAR_YEAR_TOTAL,
+        OPT_KEY_DERIVED_SOLAR_MONTH_ID,
+        OPT_KEY_DERIVED_SOLAR_YEAR_ID,
+    ),
+    "cost": (
+        OPT_KEY_COST_DAILY_LAST_GRID_KWH,
+        OPT_KEY_COST_DAILY_LAST_SOLAR_KWH,
+        OPT_KEY_COST_DAILY_DATE,
+        OPT_KEY_COST_DAILY_ACCUM,
+        OPT_KEY_COST_DAILY_FEED_IN_LOSS_ACCUM,
+        OPT_KEY_COST_DAILY_PV_CREDIT_ACCUM,
+        OPT_KEY_COST_DAILY_NET_ACCUM,
+    ),
+    "derived_cost": (
+        OPT_KEY_DERIVED_COST_DAILY_LAST_VALUE,
+        OPT_KEY_DERIVED_COST_DAILY_LAST_DATE,
+        OPT_KEY_DERIVED_COST_MONTH_TOTAL,
+        OPT_KEY_DERIVED_COST_YEAR_TOTAL,
+        OPT_KEY_DERIVED_COST_MONTH_ID,
+        OPT_KEY_DERIVED_COST_YEAR_ID,
+        OPT_KEY_DERIVED_COST_NET_DAILY_LAST_VALUE,
+        OPT_KEY_DERIVED_COST_NET_DAILY_LAST_DATE,
+        OPT_KEY_DERIVED_COST_NET_MONTH_TOTAL,
+        OPT_KEY_DERIVED_COST_NET_YEAR_TOTAL,
+        OPT_KEY_DERIVED_COST_NET_MONTH_ID,
+        OPT_KEY_DERIVED_COST_NET_YEAR_ID,
+    ),
+}
+
+_SECTION_BY_KEY = {key: section for section, keys in RUNTIME_STATE_SECTIONS.items() for key in keys}
+RUNTIME_STATE_KEYS = frozenset(_SECTION_BY_KEY)
+
+# High-churn sections live in their own file, so a timer change does not rewrite
+# the 48 h chemistry history (and a new chemistry sample not the timers).
+SEPARATE_STORE_SECTIONS = frozenset({"chemistry"})
+_MAIN_STORE = "main"
+
+
+def _store_for(section: str) -> str:
+    return section if section in SEPARATE_STORE_SECTIONS else _MAIN_STORE
+
+
+class RuntimeStateStore:
+    """Sectioned key/value state with one debounced disk write per file and flush window."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        key = f"{DOMAIN}.{entry_id}.runtime_state"
+        self._stores: dict[str, Store] = {_MAIN_STORE: Store(hass, STORAGE_VERSION, key)}
+        for name in sorted(SEPARATE_STORE_SECTIONS):
+            self._stores[name] = Store(hass, STORAGE_VERSION, f"{key}.{name}")
+        self._sections: dict[str, dict[str, Any]] = {name: {} for name in RUNTIME_STATE_SECTIONS}
+        # Last serialized payload per section; clean sections are reused as-is.
+        self._written: dict[str, dict[str, Any]] = {}
+        self._dirty: set[str] = set()
+        self._flat: dict[str, Any] | None = None
+        self.loaded = False
+        self.had_stored_data = False
+        self.writes = 0
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """Flat view of all runtime keys (options-compatible)."""
+        if self._flat is None:
+            flat: dict[str, Any] = {}
+            for values in self._sections.values():
+                flat.update(values)
+            self._flat = flat
+        return self._flat
+
+    @property
+    def dirty_sections(self) -> frozenset[str]:
+        return frozenset(self._dirty)
+
+    async def async_load(self) -> None:
+        # Main file first: a separate section found there (older layout) is overridden by its own file.
+        for store_name, store in self._stores.items():
+            try:
+                raw = await store.async_load()
+            except Exception:
+                _LOGGER.exception("Fehler beim Laden des Runtime-States (%s)", store_name)
+                raw = None
+            sections = (raw or {}).get("sections") if isinstance(raw, dict) else None
+            if not isinstance(sections, dict):
+                continue
+            self.had_stored_data = True
+            for name, values in sections.items():
+                if name in self._sections and isinstance(values, dict):
+                    self._sections[name] = {k: v for k, v in values.items() if _SECTION_BY_KEY.get(k) == name}
+                    self._written[name] = dict(self._sections[name])
+        self._flat = None
+        self.loaded = True
+
+    async def async_migrate_from_options(self, options: Mapping[str, Any] | None) -> bool:
+        """Seed the store from legacy entry.options once; returns True if keys were moved."""
+        if self.had_stored_data or not options:
+            return False
+        legacy = {k: v for k, v in options.items() if k in RUNTIME_STATE_KEYS}
+        if not legacy:
+            return False
+        self.update(legacy)
+        # Write immediately: the caller removes the keys from entry.options afterwards.
+        await self.async_flush()
+        self.had_stored_data = True
+        return True
+
+    @callback
+    def update(self, values: Mapping[str, Any], removed: Iterable[str] = ()) -> bool:
+        """Apply changed runtime keys; schedules a delayed write if anything changed."""
+        touched: set[str] = set()
+        for key, value in values.items():
+            section = _SECTION_BY_KEY.get(key)
+            if section is None:
+                continue
+            current = self._sections[section]
+            if key in current and current[key] == value:
+                continue
+            current[key] = value
+            self._dirty.add(section)
+            touched.add(_store_for(section))
+        for key in removed:
+            section = _SECTION_BY_KEY.get(key)
+            if section is None or key not in self._sections[section]:
+                continue
+            del self._sections[section][key]
+            self._dirty.add(section)
+            touched.add(_store_for(section))
+        if touched:
+            self._flat = None
+            for store_name in touched:
+                self._stores[store_name].async_delay_save(partial(self._data_to_save, store_name), STATE_FLUSH_SECONDS)
+        return bool(touched)
+
+    @callback
+    def _data_to_save(self, store_name: str = _MAIN_STORE) -> dict[str, Any]:
+        sections = [name for name in self._sections if _store_for(name) == store_name]
+        for name in sections:
+            if name in self._dirty:
+                self._written[name] = dict(self._sections[name])
+                self._dirty.discard(name)
+        self.writes += 1
+        return {"sections": {name: self._written.get(name, {}) for name in sections}}
+
+    async def async_flush(self) -> None:
+        """Write pending changes now (unload/migration)."""
+        for store_name in {_store_for(name) for name in self._dirty}:
+            try:
+                await self._stores[store_name].async_save(self._data_to_save(store_name))
+            except Exception:
+                _LOGGER.exception("Fehler beim Speichern des Runtime-States (%s)", store_name)
+
+    async def async_remove(self) -> None:
+        for store in self._stores.values():
+            try:
+                await store.async_remove()
+            except Exception:
+                _LOGGER.debug("Runtime state file could not be removed")
@@ -1,9 +1,9 @@
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers import entity_registry as er
 from .const import DOMAIN, MANUFACTURER, CONF_MAIN_SWITCH, CONF_PUMP_SWITCH, CONF_AUX_HEATING_SWITCH
 from .const import CONF_DEMO_MODE
 from .const import OPT_KEY_AUX_ALLOWED
+from .entity import PoolCoordinatorEntity
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]
@@ -13,7 +13,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
         entities.append(PoolAuxAllowedSwitch(coordinator))
     async_add_entities(entities)
 
-class PoolBaseSwitch(CoordinatorEntity, SwitchEntity):
+class PoolBaseSwitch(PoolCoordinatorEntity, SwitchEntity):
     _attr_has_entity_name = True
     def __init__(self, coordinator, name=None):
         super().__init__(coordinator)
@@ -38,6 +38,7 @@ class PoolBaseSwitch(CoordinatorEntity, SwitchEntity):
 
 class PoolMainSwitch(PoolBaseSwitch):
     _attr_translation_key = "main"
+    _data_keys = frozenset({"should_main_on"})
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_unique_id = f"{coordinator.entry.entry_id}_main"
@@ -66,6 +67,7 @@ class PoolMainSwitch(PoolBaseSwitch):
 
 class PoolPumpSwitch(PoolBaseSwitch):
     _attr_translation_key = "pump"
+    _data_keys = frozenset({"should_pump_on"})
 
     def __init__(self, coordinator):
         super().__init__(coordinator)
@@ -96,6 +98,8 @@ class PoolPumpSwitch(PoolBaseSwitch):
 
 class PoolAuxSwitch(PoolBaseSwitch):
     _attr_translation_key = "aux"
+    # State is read from the physical switch, mirrored as `aux_heating_switch_on`.
+    _data_keys = frozenset({"aux_heating_switch_on"})
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_unique_id = f"{coordinator.entry.entry_id}_aux"
@@ -136,7 +140,7 @@ class PoolAuxAllowedSwitch(PoolBaseSwitch):
 
     async def _async_persist_aux_allowed(self, allowed: bool) -> None:
         try:
-            new_opts = {**(self.coordinator.entry.options or {})}
+            new_opts = self.coordinator._options_snapshot()
             new_opts[OPT_KEY_AUX_ALLOWED] = bool(allowed)
             await self.coordinator._async_update_entry_options(new_opts)
         except Exception:
@@ -0,0 +1,273 @@
+"""Schedule timeline: planned filter, frost, preheat, quiet and pause intervals."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .quiet_calendar import QuietCalendar
+
+TIMELINE_HORIZON_HOURS = 48
+# Rebuild at least this often even when no input changed (rolling horizon).
+TIMELINE_REBUILD_SECONDS = 3600
+
+RUN_KINDS = ("filter", "frost", "preheat", "event", "quiet", "pause")
+# Preheat lead time in whole steps (rounded up, same as the cost plan's 15-min slots): heat_time
+# follows every water temperature reading and would otherwise change the plan key each cycle.
+PREHEAT_STEP_MINUTES = 15
+
+
+def preheat_lead_minutes(heat_time: int | None) -> int | None:
+    if heat_time is None:
+        return None
+    return int(math.ceil(max(0, heat_time) / PREHEAT_STEP_MINUTES)) * PREHEAT_STEP_MINUTES
+
+
+@dataclass(frozen=True, slots=True)
+class PlannedRun:
+    kind: str
+    start: datetime
+    end: datetime
+    reason: str | None = None
+
+    @property
+    def minutes(self) -> int:
+        return max(0, int(round((self.end - self.start).total_seconds() / 60)))
+
+    def as_dict(self) -> dict:
+        item = {
+            "kind": self.kind,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "minutes": self.minutes,
+        }
+        if self.reason:
+            item["reason"] = self.reason
+        return item
+
+
+@dataclass(frozen=True, slots=True)
+class TimelineInputs:
+    """Everything the plan depends on; equal inputs reuse the previous plan."""
+
+    # Filter cycle
+    auto_filter: bool = False
+    next_filter_start: datetime | None = None
+    filter_interval_minutes: int = 0
+    filter_minutes: int = 0
+    # Frost duty cycle (epoch-minute modulo, see coordinator)
+    frost_danger: bool = False
+    frost_severe: bool = False
+    frost_interval_minutes: int = 0
+    frost_run_minutes: int = 0
+    frost_shift_minutes: int = 0
+    frost_quiet_suppressed: bool = False
+    # Calendar event / preheat
+    event_start: datetime | None = None
+    event_end: datetime | None = None
+    preheat_minutes: int | None = None
+    # Pause
+    pause_until: datetime | None = None
+
+
+def _subtract(start: float, end: float, blocked: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """[start, end] minus the (sorted) blocked intervals."""
+    parts = []
+    cursor = start
+    for b_start, b_end in blocked:
+        if b_end <= cursor:
+            continue
+        if b_start >= end:
+            break
+        if b_start > cursor:
+            parts.append((cursor, b_start))
+        cursor = max(cursor, b_end)
+    if cursor < end:
+        parts.append((cursor, end))
+    return parts
+
+
+class ScheduleTimeline:
+    """Materialised plan for the next hours; lookups per kind use binary search."""
+
+    __slots__ = ("key", "start", "end", "built_at", "runs", "_by_kind", "_starts", "_ends")
+
+    def __init__(self, key, start: datetime, end: datetime, runs: list[PlannedRun]) -> None:
+        self.key = key
+        self.start = start
+        self.end = end
+        self.built_at = start
+        self.runs: tuple[PlannedRun, ...] = tuple(sorted(runs, key=lambda run: (run.start, run.kind)))
+        self._by_kind: dict[str, tuple[PlannedRun, ...]] = {}
+        self._starts: dict[str, array] = {}
+        self._ends: dict[str, array] = {}
+        for kind in RUN_KINDS:
+            kind_runs = tuple(run for run in self.runs if run.kind == kind)
+            self._by_kind[kind] = kind_runs
+            self._starts[kind] = array("d", (run.start.timestamp() for run in kind_runs))
+            self._ends[kind] = array("d", (run.end.timestamp() for run in kind_runs))
+
+    @classmethod
+    def build(
+        cls,
+        now: datetime,
+        inputs: TimelineInputs,
+        quiet: QuietCalendar,
+        hours: int = TIMELINE_HORIZON_HOURS,
+    ) -> ScheduleTimeline:
+        start = now.replace(second=0, microsecond=0)
+        end = start + timedelta(hours=hours)
+        start_ts = start.timestamp()
+        end_ts = end.timestamp()
+        runs: list[PlannedRun] = []
+
+        quiet_windows = quiet.windows(start, end)
+        for q_start, q_end in quiet_windows:
+            runs.append(PlannedRun("quiet", q_start, q_end))
+        quiet_ts = [(q_start.timestamp(), q_end.timestamp()) for q_start, q_end in quiet_windows]
+
+        if inputs.pause_until is not None and inputs.pause_until > start:
+            runs.append(PlannedRun("pause", start, min(end, inputs.pause_until)))
+
+        runs.extend(cls._filter_runs(inputs, quiet, start, end))
+        runs.extend(cls._frost_runs(inputs, quiet_ts, start_ts, end_ts))
+
+        # The next calendar event is kept even beyond the horizon (countdown sensors).
+        if inputs.event_start is not None:
+            event_end = inputs.event_end or inputs.event_start
+            if event_end > start:
+                runs.append(PlannedRun("event", max(start, inputs.event_start), event_end))
+            preheat_start = inputs.event_start - timedelta(minutes=max(0, int(inputs.preheat_minutes or 0)))
+            preheat_start = max(start, preheat_start)
+            runs.append(PlannedRun("preheat", preheat_start, max(preheat_start, inputs.event_start), "calendar"))
+
+        return cls(cls.cache_key(inputs, quiet), start, end, runs)
+
+    @staticmethod
+    def cache_key(inputs: TimelineInputs, quiet: QuietCalendar) -> tuple:
+        return (inputs, quiet.key)
+
+    @staticmethod
+    def _filter_runs(inputs: TimelineInputs, quiet: QuietCalendar, start: datetime, end: datetime) -> list[PlannedRun]:
+        if not inputs.auto_filter or inputs.next_filter_start is None or inputs.filter_minutes <= 0:
+            return []
+        interval = timedelta(minutes=max(1, int(inputs.filter_interval_minutes or 0)))
+        duration = timedelta(minutes=int(inputs.filter_minutes))
+        runs = []
+        cycle = max(inputs.next_filter_start, start)
+        while cycle < end and len(runs) < 256:
+            # Starts inside quiet hours move to the end of the quiet window (same rule as the coordinator).
+            if quiet.is_quiet(cycle):
+                shifted = quiet.end_for(cycle)
+                if shifted is not None:
+                    cycle = shifted + timedelta(seconds=1)
+                    if cycle >= end:
+                        break
+            runs.append(PlannedRun("filter", cycle, cycle + duration, "auto_filter"))
+            # _start_auto_filter schedules the following run relative to the actual start.
+            cycle = cycle + interval
+        return runs
+
+    @staticmethod
+    def _frost_runs(
+        inputs: TimelineInputs,
+        quiet_ts: list[tuple[float, float]],
+        start_ts: float,
+        end_ts: float,
+    ) -> list[PlannedRun]:
+        if not inputs.frost_danger or inputs.frost_run_minutes <= 0:
+            return []
+        interval = max(1, int(inputs.frost_interval_minutes or 0))
+        run = int(inputs.frost_run_minutes)
+        shift = int(inputs.frost_shift_minutes or 0) if not inputs.frost_severe else 0
+        blocked = quiet_ts if inputs.frost_quiet_suppressed else []
+        first_minute = int(start_ts // 60)
+        # Duty cycle: active while (epoch_minute - shift) % interval < run.
+        cycle_minute = first_minute - ((first_minute - shift) % interval)
+        runs = []
+        while cycle_minute * 60 < end_ts:
+            cycle_start = max(start_ts, cycle_minute * 60.0)
+            cycle_end = min(end_ts, (cycle_minute + run) * 60.0)
+            for part_start, part_end in _subtract(cycle_start, cycle_end, blocked):
+                runs.append(
+                    PlannedRun(
+                        "frost",
+                        dt_util.as_local(dt_util.utc_from_timestamp(part_start)),
+                        dt_util.as_local(dt_util.utc_from_timestamp(part_end)),
+                        "frost_severe" if inputs.frost_severe else "frost",
+                    )
+                )
+            cycle_minute += interval
+        if inputs.frost_severe:
+            # One run right before each quiet window reduces runs inside quiet hours.
+            for q_start, _ in quiet_ts:
+                if start_ts < q_start <= end_ts:
+                    runs.append(
+                        PlannedRun(
+                            "frost",
+                            dt_util.as_local(dt_util.utc_from_timestamp(max(start_ts, q_start - run * 60))),
+                            dt_util.as_local(dt_util.utc_from_timestamp(q_start)),
+                            "frost_pre_quiet",
+                        )
+                    )
+        return runs
+
+    def stale(self, now: datetime) -> bool:
+        return (now - self.built_at).total_seconds() >= TIMELINE_REBUILD_SECONDS or now < self.built_at
+
+    def of_kind(self, kind: str) -> tuple[PlannedRun, ...]:
+        return self._by_kind.get(kind, ())
+
+    def active(self, kind: str, at: datetime, reason: str | None = None) -> PlannedRun | None:
+        """Run of `kind` (optionally with `reason`) covering `at`."""
+        ts = at.timestamp()
+        starts = self._starts.get(kind)
+        if not starts:
+            return None
+        i = bisect_right(starts, ts) - 1
+        # Runs of one kind overlap at most pairwise (pre-quiet frost run), so look back two entries.
+        for j in range(i, max(-1, i - 3), -1):
+            run = self._by_kind[kind][j]
+            if ts <= self._ends[kind][j] and (reason is None or run.reason == reason):
+                return run
+        return None
+
+    def spans(self, kinds: tuple[str, ...], at: datetime) -> tuple[tuple[datetime, datetime], ...]:
+        """(start, end) of the runs of `kinds` not over at `at`, starting no earlier than `at`."""
+        return tuple((max(run.start, at), run.end) for run in self.runs if run.kind in kinds and run.end > at)
+
+    def next(self, kind: str, after: datetime) -> PlannedRun | None:
+        """First run of `kind` starting strictly after `after`."""
+        starts = self._starts.get(kind)
+        if not starts:
+            return None
+        i = bisect_right(starts, after.timestamp())
+        return self._by_kind[kind][i] if i < len(starts) else None
+
+    def first_from(self, kind: str, at: datetime) -> PlannedRun | None:
+        """First run of `kind` starting at or after `at`."""
+        starts = self._starts.get(kind)
+        if not starts:
+            return None
+        i = bisect_left(starts, at.timestamp())
+        return self._by_kind[kind][i] if i < len(starts) else None
+
+    def minutes_until(self, kind: str, now: datetime, *, strictly_after: bool = True) -> int | None:
+        run = self.next(kind, now) if strictly_after else self.first_from(kind, now)
+        if run is None:
+            return None
+        return max(0, int(((run.start - now).total_seconds() + 59) // 60))
+
+    def next_run(self, now: datetime, kinds: tuple[str, ...] = ("filter", "frost", "preheat")) -> PlannedRun | None:
+        candidates = [run for run in (self.first_from(kind, now) for kind in kinds) if run is not None]
+        return min(candidates, key=lambda run: run.start) if candidates else None
+
+    def as_attributes(self, now: datetime, limit: int = 24) -> list[dict]:
+        """Upcoming/ongoing runs for entity attributes (quiet windows included)."""
+        upcoming = [run for run in self.runs if run.end > now]
+        return [run.as_dict() for run in upcoming[:limit]]
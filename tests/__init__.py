@@ -0,0 +1 @@
+"""Tests for the pool_controller integration."""
@@ -0,0 +1,28 @@
+"""Shared pytest setup: repo root and `tools/` importable without installing anything."""
+
+from __future__ import annotations
+
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tools"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+@pytest.fixture
+def sim_time_zone():
+    """Time zone of the synthetic scenarios (`tools/simulate.py`)."""
+    import simulate
+
+    from homeassistant.util import dt as dt_util
+
+    previous = dt_util.DEFAULT_TIME_ZONE
+    logging.getLogger("custom_components.pool_controller").setLevel(logging.ERROR)
+    dt_util.set_default_time_zone(dt_util.get_time_zone(simulate.DEFAULT_TIME_ZONE))
+    yield
+    dt_util.set_default_time_zone(previous)
@@ -0,0 +1,44 @@
+"""pytest-benchmark suite for the update pipeline (offline, stub `hass` from `tools/simulate.py`).
+
+The benchmarks themselves live in `tools/benchmark.py`; this module only exposes them
+to pytest-benchmark. Examples:
+
+    pytest tests/test_benchmark.py
+    pytest tests/test_benchmark.py -k cycle --benchmark-autosave
+    pytest tests/test_benchmark.py --benchmark-compare --benchmark-compare-fail=median:20%
+
+`--benchmark-skip` leaves them out of a normal test run.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+import benchmark as pc_benchmark
+import simulate
+
+from homeassistant.util import dt as dt_util
+
+BENCHMARKS = pc_benchmark.benchmarks()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _sim_time_zone():
+    previous = dt_util.DEFAULT_TIME_ZONE
+    logging.getLogger("custom_components.pool_controller").setLevel(logging.ERROR)
+    dt_util.set_default_time_zone(dt_util.get_time_zone(simulate.DEFAULT_TIME_ZONE))
+    yield
+    dt_util.set_default_time_zone(previous)
+
+
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_benchmark(benchmark, name: str) -> None:
+    # Setup (simulator, warm-up day, filled history) runs before timing starts.
+    run, close = BENCHMARKS[name]()
+    benchmark.group = name.split("[", 1)[0]
+    try:
+        benchmark(run, 1)
+    finally:
+        close()
@@ -0,0 +1,51 @@
+"""Update-cycle stages: declared order and inputs/outputs."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.pool_controller.coordinator import PoolControllerDataCoordinator
+from custom_components.pool_controller.pipeline import (
+    UPDATE_STAGES,
+    UpdateCycle,
+    check_stage_order,
+    cycle_stage,
+)
+
+STAGES = [handler.cycle_stage for handler in PoolControllerDataCoordinator._CYCLE_STAGES]
+
+
+def test_update_stages_run_in_declared_order():
+    assert tuple(stage.name for stage in STAGES) == UPDATE_STAGES
+    check_stage_order(STAGES)
+
+
+def test_every_stage_output_is_read_later_or_published():
+    read_later = set()
+    for stage in reversed(STAGES):
+        unused = set(stage.outputs) - read_later - {"data"}
+        assert not unused, f"{stage.name} hands on unused values {sorted(unused)}"
+        read_later.update(stage.inputs)
+
+
+def test_stage_order_rejects_reads_before_provided():
+    @cycle_stage("late", outputs=("b",))
+    async def late(self, *, a): ...
+
+    @cycle_stage("early", outputs=("a",))
+    async def early(self): ...
+
+    check_stage_order([early.cycle_stage, late.cycle_stage])
+    with pytest.raises(ValueError):
+        check_stage_order([late.cycle_stage, early.cycle_stage])
+
+
+def test_cycle_rejects_undeclared_outputs():
+    @cycle_stage("stage", outputs=("a",))
+    async def stage(self): ...
+
+    cycle = UpdateCycle()
+    cycle.provide(stage.cycle_stage, {"a": 1})
+    assert cycle.values == {"a": 1}
+    with pytest.raises(ValueError):
+        cycle.provide(stage.cycle_stage, {"a": 1, "b": 2})
@@ -0,0 +1,168 @@
+"""Scenario tests: synthetic profiles of `tools/simulate.py` run through the real coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from simulate import SIM_MAIN_SWITCH, Simulator, synthetic_scenario
+
+from homeassistant.util import dt as dt_util
+
+pytestmark = pytest.mark.usefixtures("sim_time_zone")
+
+
+def _run(profile: str, start: str, days: float, config: dict | None = None):
+    begin = datetime.fromisoformat(start).replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    scenario = synthetic_scenario(begin, days, profile=profile, config=config)
+    result = asyncio.run(Simulator(scenario).async_run())
+    assert result.failures == 0
+    return result
+
+
+# Thursday to Saturday: synthetic bathing events Fri/Sat 19:00-21:00, quiet hours 22:00-08:00.
+SUMMER = ("2026-06-04", 3)
+WINTER = ("2026-01-10", 2)
+_RUNS: dict[tuple, object] = {}
+
+
+def _profile(profile: str, start: str, days: float):
+    """Profile runs shared by the tests below (each run is a few thousand update cycles)."""
+    key = (profile, start, days)
+    if key not in _RUNS:
+        _RUNS[key] = _run(profile, start, days)
+    return _RUNS[key]
+
+
+def _reason_hours(result) -> dict[str, float]:
+    step = result.virtual_seconds / result.cycles
+    return {reason: round(count * step / 3600.0, 2) for reason, count in Counter(result.trace.columns["run_reason"]).items()}
+
+
+def _switch_calls(result, entity_id: str = SIM_MAIN_SWITCH) -> list[tuple[datetime, str]]:
+    calls = result.trace.calls
+    return [
+        (datetime.fromisoformat(when), service)
+        for when, domain, service, entity in zip(calls["time"], calls["domain"], calls["service"], calls["entity_id"])
+        if domain == "switch" and entity == entity_id
+    ]
+
+
+def _on_minutes(result) -> list[float]:
+    """Length of every switched-on period of the main switch."""
+    periods = []
+    started = None
+    for when, service in _switch_calls(result):
+        if service == "turn_on":
+            started = when
+        elif started is not None:
+            periods.append((when - started).total_seconds() / 60.0)
+            started = None
+    return periods
+
+
+def _at(result, key: str, hhmm: str) -> list:
+    return [value for when, value in zip(result.trace.time, result.trace.columns[key]) if when[11:16] == hhmm]
+
+
+@pytest.mark.parametrize(
+    ("profile", "start", "days"),
+    [("default", *SUMMER), ("pv", *SUMMER), ("power_saving", *SUMMER), ("cost", *SUMMER), ("frost", *WINTER)],
+)
+def test_profile_call_sequence(profile, start, days):
+    result = _profile(profile, start, days)
+    services = [service for _, service in _switch_calls(result)]
+    # Initial sync switches off, then strictly alternating commands (no repeated on/off).
+    assert services[0] == "turn_off"
+    assert all(a != b for a, b in zip(services, services[1:]))
+    columns = result.trace.columns
+    rows = list(zip(columns["run_reason"], columns["should_main_on"], columns["in_quiet"], columns["pv_allows"]))
+    # Nothing runs in quiet hours (outdoor temperatures stay above the frost quiet override).
+    assert not [reason for reason, on, quiet, _ in rows if on and quiet]
+    assert not [reason for reason, _, _, pv_allows in rows if reason == "pv" and not pv_allows]
+    # The simulated pump runs exactly while the coordinator wants it on.
+    on_hours = sum(1 for _, on, _, _ in rows if on) * result.virtual_seconds / result.cycles / 3600.0
+    assert result.physics.on_seconds / 3600.0 == pytest.approx(on_hours, abs=0.1)
+
+
+def test_default_profile_hours_and_preheat():
+    result = _profile("default", *SUMMER)
+    hours = _reason_hours(result)
+    assert hours["filter"] == pytest.approx(0.5, abs=0.05)
+    assert hours["bathing"] == pytest.approx(4.0, abs=0.05)
+    assert 10.0 < hours["preheat"] < 18.0
+    assert set(hours) == {"idle", "filter", "preheat", "bathing"}
+    # Regression: preheat used to switch off every few minutes while the water warmed (~200 starts).
+    assert result.calls[("switch", "turn_on")] <= 15
+    assert min(_on_minutes(result)) >= 15
+    # Events on Friday and Saturday start warm (target 38 °C, cold tolerance 0.5).
+    assert [reason for reason in _at(result, "run_reason", "19:00")] == ["idle", "bathing", "bathing"]
+    assert all(temp >= 37.5 for temp in _at(result, "water_temp", "19:00")[1:])
+
+
+def test_pv_profile_runs_on_surplus():
+    result = _profile("pv", *SUMMER)
+    hours = _reason_hours(result)
+    assert 6.0 < hours["pv"] < 11.0
+    assert hours["bathing"] == pytest.approx(4.0, abs=0.05)
+    # PV heating replaces most of the preheat and the auto filter run.
+    assert hours["preheat"] < _reason_hours(_profile("default", *SUMMER))["preheat"]
+    assert "filter" not in hours
+    pv_starts = [
+        when
+        for when, reason, previous in zip(
+            result.trace.time[1:], result.trace.columns["run_reason"][1:], result.trace.columns["run_reason"]
+        )
+        if reason == "pv" and previous != "pv"
+    ]
+    assert pv_starts and all("08:00" <= when[11:16] < "22:00" for when in pv_starts)
+    assert all(temp >= 37.5 for temp in _at(result, "water_temp", "19:00")[1:])
+
+
+def test_power_saving_profile_only_runs_for_events():
+    result = _profile("power_saving", *SUMMER)
+    assert set(result.trace.columns["power_saving_active"]) == {True}
+    hours = _reason_hours(result)
+    assert set(hours) == {"idle", "preheat", "bathing"}
+    assert hours["bathing"] == pytest.approx(4.0, abs=0.05)
+    # One continuous run (preheat into bathing) per event, nothing else.
+    assert [service for _, service in _switch_calls(result)] == ["turn_off", "turn_on", "turn_off", "turn_on", "turn_off"]
+    assert all(when.hour == 21 for when, service in _switch_calls(result)[1:] if service == "turn_off")
+
+
+def test_cost_profile_matches_heuristic_hours():
+    result = _profile("cost", *SUMMER)
+    hours = _reason_hours(result)
+    assert hours["filter"] == pytest.approx(0.5, abs=0.05)
+    assert hours["bathing"] == pytest.approx(4.0, abs=0.05)
+    assert result.calls[("switch", "turn_on")] <= 15
+    assert min(_on_minutes(result)) >= 15
+    # A plan is computed every cycle; only plans with savings are applied.
+    savings = [value for value in result.trace.columns["cost_plan_savings"] if value is not None]
+    assert len(savings) == result.cycles and max(savings) > 0
+    assert all(temp >= 37.5 for temp in _at(result, "water_temp", "19:00")[1:])
+
+
+def test_frost_profile_runs_frost_cycles():
+    result = _profile("frost", *WINTER)
+    columns = result.trace.columns
+    hours = _reason_hours(result)
+    assert hours["frost"] == pytest.approx(2.0, abs=0.1)
+    assert hours["bathing"] == pytest.approx(2.0, abs=0.05)
+    frost_rows = [danger for reason, danger in zip(columns["run_reason"], columns["frost_danger"]) if reason == "frost"]
+    assert frost_rows and all(frost_rows)
+    assert any(columns["frost_danger"])
+    assert result.calls[("switch", "turn_on")] == 3
+
+
+def test_cost_plan_filter_runs_start():
+    # Regression: the per-slot replan used to push a reached start into the next slot forever.
+    optimized = _run("cost", "2026-06-01", 3)
+    heuristic = _run("cost", "2026-06-01", 3, {"enable_cost_optimization": False})
+    on_hours = optimized.physics.on_seconds / 3600.0
+    assert on_hours > 0
+    assert on_hours == pytest.approx(heuristic.physics.on_seconds / 3600.0, abs=0.25)
+    assert optimized.calls[("switch", "turn_on")] >= 3
@@ -0,0 +1,44 @@
+"""Schedule timeline: cache key and clipped spans."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.pool_controller.quiet_calendar import QuietCalendar
+from custom_components.pool_controller.timeline import (
+    ScheduleTimeline,
+    TimelineInputs,
+    preheat_lead_minutes,
+)
+
+NOW = datetime(2026, 6, 5, 12, 0, tzinfo=timezone.utc)
+
+
+def test_preheat_lead_is_rounded_up_to_steps():
+    assert preheat_lead_minutes(None) is None
+    assert preheat_lead_minutes(0) == 0
+    assert preheat_lead_minutes(1) == 15
+    assert preheat_lead_minutes(15) == 15
+    assert preheat_lead_minutes(118) == 120
+
+
+def test_changing_heat_time_keeps_the_plan_key():
+    quiet = QuietCalendar.from_conf({}, NOW, frozenset())
+    event = NOW + timedelta(hours=7)
+    keys = {
+        ScheduleTimeline.cache_key(TimelineInputs(event_start=event, preheat_minutes=preheat_lead_minutes(minutes)), quiet)
+        for minutes in range(106, 121)
+    }
+    assert len(keys) == 1
+
+
+def test_spans_drop_past_runs_and_clip_to_now():
+    quiet = QuietCalendar.from_conf({}, NOW, frozenset())
+    inputs = TimelineInputs(auto_filter=True, next_filter_start=NOW, filter_interval_minutes=180, filter_minutes=60)
+    timeline = ScheduleTimeline.build(NOW, inputs, quiet)
+    later = NOW + timedelta(minutes=30)
+    spans = timeline.spans(("filter",), later)
+    assert spans[0] == (later, NOW + timedelta(minutes=60))
+    assert all(end > later for _, end in spans)
+    assert len(spans) == len(timeline.of_kind("filter"))
+    assert timeline.spans(("filter",), NOW + timedelta(minutes=90))[0][0] == NOW + timedelta(minutes=180)
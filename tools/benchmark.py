@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""Benchmarks for the coordinator update pipeline and its hot helpers.
+
+Runs offline against the stub `hass` of `tools/simulate.py` and compares the
+results with the stored baseline (`tools/benchmark_baseline.json`).
+
+The same benchmarks run under pytest-benchmark via `tests/test_benchmark.py`
+(`pytest tests/test_benchmark.py`); this script is the standalone wrapper with the
+JSON baseline.
+
+Usage examples:
+    python3 tools/benchmark.py
+    python3 tools/benchmark.py --filter cycle
+    python3 tools/benchmark.py --save
+    python3 tools/benchmark.py --max-regression 25
+
+Benchmarks:
+  cycle[<profile>]      One `_async_update_data` cycle (1 min virtual step) after a
+                        warm-up day; profiles from `tools/simulate.py`.
+  get_float[...]        `_get_float` on a numeric and on a unit-suffixed state.
+  chem_window[...]      Chemistry history window: incremental advance per new
+                        sample and full rebuild (replaced `_recent_chem_samples`
+                        and `_history_median`).
+  event_rain_check      `_event_rain_check` over a 48 h hourly forecast.
+  forecast_query[...]   24 candidate 3 h windows over a 48 h forecast in one
+                        `query_windows` call (max and prefix-sum mean).
+  derived_energy        `_update_derived_energy_from_daily`.
+  quiet_calendar[...]   Quiet-period lookups and calendar build (replaced the
+                        quiet-time closures).
+  timeline_build        48 h schedule timeline.
+  cost_plan_solve       24 h cost-optimal placement.
+
+Timings depend on the machine; the baseline records Python version and platform,
+compare against a baseline from the same machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import simulate  # noqa: E402
+from simulate import PROFILES, SIM_WATER, Simulator, synthetic_scenario  # noqa: E402
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.pool_controller.chem_history import ChemistryHistory, ChemistryWindow  # noqa: E402
+from custom_components.pool_controller.const import (  # noqa: E402
+    CONF_QUIET_END,
+    CONF_QUIET_END_WEEKEND,
+    CONF_QUIET_START,
+    CONF_QUIET_START_WEEKEND,
+)
+from custom_components.pool_controller.cost_optimizer import CostOptimizer, CostPlanInputs  # noqa: E402
+from custom_components.pool_controller.forecast_cache import ParsedForecast  # noqa: E402
+from custom_components.pool_controller.quiet_calendar import QuietCalendar  # noqa: E402
+from custom_components.pool_controller.timeline import ScheduleTimeline, TimelineInputs  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "benchmark_baseline.json"
+DEFAULT_ROUNDS = 7
+DEFAULT_ROUND_SECONDS = 0.1
+DEFAULT_MAX_REGRESSION_PERCENT = 20.0
+
+# Summer for the PV/cost profiles, winter for frost.
+CYCLE_STARTS = {"frost": "2026-01-15T00:00:00", "default": "2026-05-15T00:00:00"}
+QUIET_CONF = {
+    CONF_QUIET_START: "22:00",
+    CONF_QUIET_END: "08:00",
+    CONF_QUIET_START_WEEKEND: "22:00",
+    CONF_QUIET_END_WEEKEND: "10:00",
+}
+
+# A benchmark is a factory that returns `run(n) -> elapsed seconds` (setup excluded).
+Runner = Callable[[int], float]
+
+
+def measure(run: Runner, rounds: int = DEFAULT_ROUNDS, round_seconds: float = DEFAULT_ROUND_SECONDS) -> dict:
+    """Calibrate iterations per round, then report per-iteration statistics in µs."""
+    n = 1
+    while True:
+        elapsed = run(n)
+        if elapsed >= round_seconds or n >= 1 << 20:
+            break
+        n = max(n * 2, int(n * round_seconds / max(elapsed, 1e-9) * 1.1))
+    samples = [run(n) / n * 1e6 for _ in range(rounds)]
+    return {
+        "iterations": n,
+        "rounds": rounds,
+        "min_us": round(min(samples), 3),
+        "median_us": round(statistics.median(samples), 3),
+        "mean_us": round(statistics.fmean(samples), 3),
+        "stddev_us": round(statistics.pstdev(samples), 3),
+        "ops": round(1e6 / statistics.median(samples), 1),
+    }
+
+
+class _Bench:
+    """Simulator plus event loop kept open for the duration of one benchmark."""
+
+    def __init__(self, profile: str, warmup_cycles: int = 1440) -> None:
+        start = dt_util.as_local(
+            datetime.fromisoformat(CYCLE_STARTS.get(profile, CYCLE_STARTS["default"])).replace(
+                tzinfo=dt_util.DEFAULT_TIME_ZONE
+            )
+        )
+        self.sim = Simulator(synthetic_scenario(start, 30, profile=profile), trace=False)
+        self.loop = asyncio.new_event_loop()
+        self._clock = self.sim.clock.installed()
+        self._clock.__enter__()
+        self.loop.run_until_complete(self.sim.async_setup())
+        self.loop.run_until_complete(self.sim.async_advance(warmup_cycles))
+
+    @property
+    def coordinator(self):
+        return self.sim.coordinator
+
+    def close(self) -> None:
+        self._clock.__exit__(None, None, None)
+        self.loop.close()
+
+
+def bench_cycle(profile: str) -> tuple[Runner, Callable[[], None]]:
+    bench = _Bench(profile)
+
+    def run(n: int) -> float:
+        started = time.perf_counter()
+        bench.loop.run_until_complete(bench.sim.async_advance(n))
+        return time.perf_counter() - started
+
+    return run, bench.close
+
+
+def bench_get_float(raw_state: str) -> tuple[Runner, Callable[[], None]]:
+    bench = _Bench("default", warmup_cycles=1)
+    bench.sim.hass.states.async_set(SIM_WATER, raw_state)
+    get_float = bench.coordinator._get_float
+
+    def run(n: int) -> float:
+        started = time.perf_counter()
+        for _ in range(n):
+            get_float(SIM_WATER)
+        return time.perf_counter() - started
+
+    return run, bench.close
+
+
+def _filled_history(now_ts: float, hours: int = 48, cadence_s: int = 30) -> ChemistryHistory:
+    capacity = hours * 3600 // cadence_s
+    history = ChemistryHistory(capacity)
+    for i in range(capacity):
+        ts = now_ts - (capacity - i) * cadence_s
+        history.append(ts, 7.2 + (i % 17) * 0.01, 650 + (i % 23), 900 + (i % 11), 90 + (i % 5), i % 7 != 0, "ok")
+    return history
+
+
+def bench_chem_window(mode: str) -> tuple[Runner, Callable[[], None]]:
+    now_ts = time.time()
+    history = _filled_history(now_ts)
+    window = ChemistryWindow()
+    lookback_s = 6 * 3600.0
+    window.advance(history, now_ts, lookback_s)
+    state = {"ts": now_ts, "i": 0}
+
+    def run(n: int) -> float:
+        elapsed = 0.0
+        for _ in range(n):
+            state["ts"] += 30.0
+            state["i"] += 1
+            i = state["i"]
+            history.append(state["ts"], 7.2 + (i % 17) * 0.01, 650 + (i % 23), 900 + (i % 11), 90, True, "ok")
+            started = time.perf_counter()
+            if mode == "rebuild":
+                # Lookback change forces a full rebuild of the window.
+                window.advance(history, state["ts"], lookback_s + (i % 2))
+            else:
+                window.advance(history, state["ts"], lookback_s)
+            window.median("ph")
+            window.median("chlor")
+            elapsed += time.perf_counter() - started
+        return elapsed
+
+    return run, lambda: None
+
+
+def bench_event_rain_check() -> tuple[Runner, Callable[[], None]]:
+    bench = _Bench("default", warmup_cycles=1)
+    now = dt_util.now().replace(minute=0, second=0, microsecond=0)
+    items = [
+        {"datetime": (now + timedelta(hours=h)).isoformat(), "temperature": 15.0, "precipitation_probability": (h * 7) % 100}
+        for h in range(48)
+    ]
+    forecast = ParsedForecast.from_items("weather.sim_home", "hourly", items)
+    start, end = now + timedelta(hours=19), now + timedelta(hours=21)
+    check = bench.coordinator._event_rain_check
+
+    def run(n: int) -> float:
+        started = time.perf_counter()
+        for _ in range(n):
+            check(start, end, forecast, 50)
+        return time.perf_counter() - started
+
+    return run, bench.close
+
+
+def bench_forecast_query(agg: str) -> tuple[Runner, Callable[[], None]]:
+    now = dt_util.now().replace(minute=0, second=0, microsecond=0)
+    items = [
+        {"datetime": (now + timedelta(hours=h)).isoformat(), "temperature": 15.0 + (h % 12), "precipitation_probability": (h * 7) % 100}
+        for h in range(48)
+    ]
+    forecast = ParsedForecast.from_items("weather.sim_home", "hourly", items)
+    base = now.timestamp()
+    windows = [(base + h * 3600, base + (h + 3) * 3600) for h in range(24)]
+    column = "temperature" if agg == "mean" else "precipitation_probability"
+
+    def run(n: int) -> float:
+        started = time.perf_counter()
+        for _ in range(n):
+            forecast.query_windows(column, windows, agg)
+        return time.perf_counter() - started
+
+    return run, lambda: None
+
+
+def bench_derived_energy() -> tuple[Runner, Callable[[], None]]:
+    bench = _Bench("default", warmup_cycles=1)
+    update = bench.coordinator._update_derived_energy_from_daily
+    now = dt_util.now()
+    state = {"value": 0.0}
+
+    def run(n: int) -> float:
+        started = time.perf_counter()
+        for _ in range(n):
+            state["value"] = (state["value"] + 0.01) % 20.0
+            update("grid", state["value"], now)
+        return time.perf_counter() - started
+
+    return run, bench.close
+
+
+def bench_quiet_calendar(mode: str) -> tuple[Runner, Callable[[], None]]:
+    now = dt_util.now()
+    calendar = QuietCalendar.from_conf(QUIET_CONF, now)
+    probes = [now + timedelta(minutes=37 * i) for i in range(64)]
+
+    def run(n: int) -> float:
+        started = time.perf_counter()
+        for i in range(n):
+            at = probes[i & 63]
+            if mode == "build":
+                QuietCalendar.from_conf(QUIET_CONF, at)
+            else:
+                calendar.is_quiet(at)
+                calendar.end_for(at)
+                calendar.next_start(at)
+        return time.perf_counter() - started
+
+    return run, lambda: None
+
+
+def _timeline_inputs(now: datetime) -> TimelineInputs:
+    return TimelineInputs(
+        auto_filter=True,
+        next_filter_start=now + timedelta(minutes=45),
+        filter_interval_minutes=720,
+        filter_minutes=60,
+        frost_danger=True,
+        frost_interval_minutes=60,
+        frost_run_minutes=5,
+        frost_quiet_suppressed=True,
+        event_start=now + timedelta(hours=10),
+        event_end=now + timedelta(hours=12),
+        preheat_minutes=120,
+    )
+
+
+def bench_timeline_build() -> tuple[Runner, Callable[[], None]]:
+    now = dt_util.now()
+    quiet = QuietCalendar.from_conf(QUIET_CONF, now)
+    inputs = _timeline_inputs(now)
+
+    def run(n: int) -> float:
+        started = time.perf_counter()
+        for _ in range(n):
+            ScheduleTimeline.build(now, inputs, quiet)
+        return time.perf_counter() - started
+
+    return run, lambda: None
+
+
+def bench_cost_plan_solve() -> tuple[Runner, Callable[[], None]]:
+    now = dt_util.now()
+    quiet = QuietCalendar.from_conf(QUIET_CONF, now)
+    timeline = ScheduleTimeline.build(now, _timeline_inputs(now), quiet)
+    hour = now.replace(minute=0, second=0, microsecond=0)
+    prices = [(hour.timestamp() + h * 3600, 0.30 - (0.1 if 10 <= (hour.hour + h) % 24 < 16 else 0.0)) for h in range(48)]
+    pv = [(hour.timestamp() + h * 3600, 3000.0 if 9 <= (hour.hour + h) % 24 < 17 else 0.0) for h in range(48)]
+    inputs = CostPlanInputs(
+        filter_power_w=850.0,
+        heat_power_w=2750.0,
+        min_gap_minutes=45,
+        preheat_minutes=120,
+        event_start=now + timedelta(hours=10),
+        baseline_filter=tuple((run.start, run.end) for run in timeline.of_kind("filter")),
+        blocked=tuple((run.start, run.end) for run in timeline.runs if run.kind in ("quiet", "pause")),
+        frost_runs=tuple((run.start, run.end) for run in timeline.of_kind("frost")),
+    )
+
+    def run(n: int) -> float:
+        started = time.perf_counter()
+        for _ in range(n):
+            CostOptimizer(now, prices, pv, 0.30).solve(inputs)
+        return time.perf_counter() - started
+
+    return run, lambda: None
+
+
+def benchmarks() -> dict[str, Callable[[], tuple[Runner, Callable[[], None]]]]:
+    result: dict[str, Callable[[], tuple[Runner, Callable[[], None]]]] = {}
+    for profile in ("default", "pv", "blueriiot", "power_saving", "frost", "dynamic_target", "cost"):
+        if profile in PROFILES:
+            result[f"cycle[{profile}]"] = lambda profile=profile: bench_cycle(profile)
+    result["get_float[numeric]"] = lambda: bench_get_float("27.4")
+    result["get_float[unit_suffix]"] = lambda: bench_get_float("27,4 °C")
+    result["chem_window[incremental]"] = lambda: bench_chem_window("incremental")
+    result["chem_window[rebuild]"] = lambda: bench_chem_window("rebuild")
+    result["event_rain_check"] = bench_event_rain_check
+    result["forecast_query[max]"] = lambda: bench_forecast_query("max")
+    result["forecast_query[mean]"] = lambda: bench_forecast_query("mean")
+    result["derived_energy"] = bench_derived_energy
+    result["quiet_calendar[lookup]"] = lambda: bench_quiet_calendar("lookup")
+    result["quiet_calendar[build]"] = lambda: bench_quiet_calendar("build")
+    result["timeline_build"] = bench_timeline_build
+    result["cost_plan_solve"] = bench_cost_plan_solve
+    return result
+
+
+def _machine() -> dict:
+    return {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the pool_controller update pipeline (offline).")
+    parser.add_argument("--filter", default="", help="Only benchmarks whose name contains this text")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--round-seconds", type=float, default=DEFAULT_ROUND_SECONDS)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=None,
+        help=f"Exit 1 when a median got slower by more than this percentage (e.g. {DEFAULT_MAX_REGRESSION_PERCENT:g})",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    dt_util.set_default_time_zone(dt_util.get_time_zone(simulate.DEFAULT_TIME_ZONE))
+
+    baseline = {}
+    if args.baseline.exists():
+        with args.baseline.open("r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    base_results = baseline.get("results", {})
+    if baseline and baseline.get("machine") != _machine():
+        print(f"note: baseline was recorded on {baseline.get('machine')}", file=sys.stderr)
+
+    results: dict[str, dict] = {}
+    regressions = []
+    for name, factory in benchmarks().items():
+        if args.filter and args.filter not in name:
+            continue
+        run, close = factory()
+        try:
+            stats = measure(run, args.rounds, args.round_seconds)
+        finally:
+            close()
+        results[name] = stats
+        base = base_results.get(name)
+        delta = None
+        if base and base.get("median_us"):
+            delta = (stats["median_us"] / base["median_us"] - 1.0) * 100.0
+            if args.max_regression is not None and delta > args.max_regression:
+                regressions.append(name)
+        if not args.json:
+            base_txt = f"{base['median_us']:>12.2f}" if base else f"{'-':>12}"
+            delta_txt = f"{delta:+7.1f} %" if delta is not None else ""
+            print(f"{name:<28} {stats['median_us']:>12.2f} µs  ±{stats['stddev_us']:<9.2f} base {base_txt}  {delta_txt}")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if args.save:
+        stored = {"machine": _machine(), "recorded": datetime.now().isoformat(timespec="seconds"), "results": {**base_results, **results}}
+        with args.baseline.open("w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if regressions:
+        print(f"regressions over {args.max_regression:g} %: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
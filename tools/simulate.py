@@ -0,0 +1,991 @@
+#!/usr/bin/env python3
+"""Offline simulator for the pool_controller coordinator.
+
+Drives `PoolControllerDataCoordinator._async_update_data` against a stub `hass`
+(states, services, config entries) in accelerated virtual time and writes a
+columnar trace of every `coordinator.data` key plus every actuator/service call.
+
+Usage examples:
+    python3 tools/simulate.py --synthetic --days 7
+    python3 tools/simulate.py --synthetic --profile frost --start 2026-01-10 --days 14 --out trace.json
+    python3 tools/simulate.py --synthetic --profile pv --days 365 --step 300 --no-trace
+    python3 tools/simulate.py --scenario history.json --config entry.json --out trace.csv
+
+Inputs:
+  --synthetic           Generated weather/PV/price/calendar series; the water
+                        temperature follows a simple thermal model that reacts
+                        to the actuator calls (closed loop).
+  --scenario FILE.json  {"start", "end", "step_seconds", "time_zone", "config",
+                        "options", "series": {entity_id: [[iso, value|{state, attributes}], ...]},
+                        "events": {calendar_entity: [{start, end, summary}, ...]},
+                        "forecasts": {weather_entity: [forecast items]}}.
+                        "series" may also be the raw output of
+                        `tools/ha_api_read.py history ...` (recorded data).
+  --scenario FILE.csv   Wide CSV: first column is the timestamp, every other
+                        column an entity_id (config via --config).
+
+Requires the dev dependencies (`pip install -r requirements-dev.txt`) for the
+`homeassistant` package; no Home Assistant instance is needed. BlueRiiot
+readings (profile `blueriiot`) go through the passive advertisement path; there
+is no BLE stack, so GATT reads are not simulated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import math
+import random
+import sys
+import tempfile
+import time
+import types
+from bisect import bisect_right
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.pool_controller import blueriiot as pc_blueriiot  # noqa: E402
+from custom_components.pool_controller import blueriiot_codec  # noqa: E402
+from custom_components.pool_controller import calendar_cache as pc_calendar_cache  # noqa: E402
+from custom_components.pool_controller import forecast_cache as pc_forecast_cache  # noqa: E402
+from custom_components.pool_controller.const import (  # noqa: E402
+    CONF_BLUERIIOT_MAC,
+    CONF_DYNAMIC_TARGET_WEATHER_ENTITY,
+    CONF_ELECTRICITY_PRICE_ENTITY,
+    CONF_ENABLE_AUTO_FILTER,
+    CONF_ENABLE_BLUERIIOT,
+    CONF_ENABLE_COST_OPTIMIZATION,
+    CONF_ENABLE_DYNAMIC_TARGET,
+    CONF_ENABLE_EVENT_DRIVEN_UPDATES,
+    CONF_ENABLE_FROST_PROTECTION,
+    CONF_ENABLE_PV_OPTIMIZATION,
+    CONF_HEATER_POWER_W,
+    CONF_MAIN_POWER_SENSOR,
+    CONF_MAIN_SWITCH,
+    CONF_PUMP_SWITCH,
+    CONF_POOL_CALENDAR,
+    CONF_PV_SURPLUS_SENSOR,
+    CONF_TEMP_OUTDOOR,
+    CONF_TEMP_WATER,
+    CONF_WATER_VOLUME,
+    DEFAULT_HEAT_LOSS_W_PER_C,
+    DEFAULT_HEATER_POWER_W,
+    DEFAULT_VOL,
+    DOMAIN,
+    OPT_KEY_POWER_SAVING_ACTIVE,
+)
+from custom_components.pool_controller.coordinator import PoolControllerDataCoordinator  # noqa: E402
+from custom_components.pool_controller.state_store import RuntimeStateStore  # noqa: E402
+
+_LOGGER = logging.getLogger("pool_controller.simulate")
+
+DEFAULT_TIME_ZONE = "Europe/Berlin"
+DEFAULT_STEP_SECONDS = 60
+DEFAULT_DAYS = 7
+
+SIM_WATER = "sensor.sim_water_temperature"
+SIM_OUTDOOR = "sensor.sim_outdoor_temperature"
+SIM_MAIN_SWITCH = "switch.sim_pool"
+SIM_MAIN_POWER = "sensor.sim_pool_power"
+SIM_PV_SURPLUS = "sensor.sim_pv_surplus"
+SIM_PRICE = "sensor.sim_electricity_price"
+SIM_CALENDAR = "calendar.sim_pool"
+SIM_WEATHER = "weather.sim_home"
+SIM_BLUERIIOT_MAC = "00:A0:50:00:51:4D"
+
+# Entry data of the synthetic pool; profiles are merged on top.
+SYNTHETIC_CONFIG: dict[str, Any] = {
+    CONF_WATER_VOLUME: DEFAULT_VOL,
+    CONF_MAIN_SWITCH: SIM_MAIN_SWITCH,
+    CONF_PUMP_SWITCH: SIM_MAIN_SWITCH,
+    CONF_TEMP_WATER: SIM_WATER,
+    CONF_TEMP_OUTDOOR: SIM_OUTDOOR,
+    CONF_MAIN_POWER_SENSOR: SIM_MAIN_POWER,
+    CONF_ELECTRICITY_PRICE_ENTITY: SIM_PRICE,
+    CONF_POOL_CALENDAR: SIM_CALENDAR,
+    CONF_HEATER_POWER_W: DEFAULT_HEATER_POWER_W,
+    CONF_ENABLE_AUTO_FILTER: True,
+    CONF_ENABLE_FROST_PROTECTION: False,
+    CONF_ENABLE_PV_OPTIMIZATION: False,
+    # The simulator drives fixed steps; no state-change listeners.
+    CONF_ENABLE_EVENT_DRIVEN_UPDATES: False,
+}
+
+# name -> (entry data overrides, runtime options)
+PROFILES: dict[str, tuple[dict[str, Any], dict[str, Any]]] = {
+    "default": ({}, {}),
+    "pv": ({CONF_ENABLE_PV_OPTIMIZATION: True, CONF_PV_SURPLUS_SENSOR: SIM_PV_SURPLUS}, {}),
+    "frost": ({CONF_ENABLE_FROST_PROTECTION: True}, {}),
+    "power_saving": ({CONF_PV_SURPLUS_SENSOR: SIM_PV_SURPLUS}, {OPT_KEY_POWER_SAVING_ACTIVE: True}),
+    "dynamic_target": ({CONF_ENABLE_DYNAMIC_TARGET: True, CONF_DYNAMIC_TARGET_WEATHER_ENTITY: SIM_WEATHER}, {}),
+    "cost": ({CONF_ENABLE_COST_OPTIMIZATION: True, CONF_PV_SURPLUS_SENSOR: SIM_PV_SURPLUS}, {}),
+    "blueriiot": ({CONF_ENABLE_BLUERIIOT: True, CONF_BLUERIIOT_MAC: SIM_BLUERIIOT_MAC}, {}),
+}
+
+
+def _parse_dt(raw, tz) -> datetime | None:
+    if isinstance(raw, datetime):
+        parsed = raw
+    else:
+        try:
+            parsed = dt_util.parse_datetime(str(raw))
+        except Exception:
+            parsed = None
+        if parsed is None:
+            try:
+                parsed_date = dt_util.parse_date(str(raw))
+            except Exception:
+                parsed_date = None
+            if parsed_date is None:
+                return None
+            parsed = datetime.combine(parsed_date, datetime.min.time())
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=tz)
+    return parsed
+
+
+def encode_blueriiot_frame(
+    temperature: float, ph: float, orp: float, salt: float = 0.0, conductivity: float = 800.0, battery: int = 80
+) -> bytes:
+    """Inverse of `blueriiot_codec.decode_frame` (synthetic probe payloads)."""
+    c = blueriiot_codec
+    return c.FRAME.pack(
+        int(round(temperature * c.TEMP_SCALE)),
+        int(round(c.PH_ZERO - (ph - c.PH_NEUTRAL) * c.PH_SLOPE)),
+        int(round((orp + c.ORP_OFFSET) * c.ORP_SCALE)),
+        int(round(salt * c.SALT_SCALE)),
+        int(round(conductivity * c.CONDUCTIVITY_SCALE)),
+        int(battery),
+    )
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+# ---------------------------------------------------------------------------
+# Virtual time
+# ---------------------------------------------------------------------------
+
+
+class VirtualClock:
+    """Simulated wall clock; also replaces `time.monotonic` for cache TTLs."""
+
+    def __init__(self, start: datetime) -> None:
+        self.start = start
+        self.current = start
+
+    def set(self, when: datetime) -> None:
+        self.current = when
+
+    def now(self, time_zone=None) -> datetime:
+        return self.current.astimezone(time_zone or dt_util.DEFAULT_TIME_ZONE)
+
+    def utcnow(self) -> datetime:
+        return self.current.astimezone(timezone.utc)
+
+    def monotonic(self) -> float:
+        return (self.current - self.start).total_seconds()
+
+    @contextmanager
+    def installed(self):
+        """Route `dt_util.now/utcnow` and the integration's TTL clocks to virtual time."""
+        saved_now, saved_utcnow = dt_util.now, dt_util.utcnow
+        shim = types.SimpleNamespace(monotonic=self.monotonic, time=lambda: self.utcnow().timestamp())
+        saved_time = {module: module.time for module in (pc_calendar_cache, pc_forecast_cache, pc_blueriiot)}
+        dt_util.now = self.now
+        dt_util.utcnow = self.utcnow
+        for module in saved_time:
+            module.time = shim
+        try:
+            yield self
+        finally:
+            dt_util.now, dt_util.utcnow = saved_now, saved_utcnow
+            for module, original in saved_time.items():
+                module.time = original
+
+
+# ---------------------------------------------------------------------------
+# Stub hass
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class SimState:
+    entity_id: str
+    state: str
+    attributes: dict = field(default_factory=dict)
+    last_changed: datetime | None = None
+    last_updated: datetime | None = None
+
+    @property
+    def domain(self) -> str:
+        return self.entity_id.split(".", 1)[0]
+
+    @property
+    def object_id(self) -> str:
+        return self.entity_id.split(".", 1)[1]
+
+    @property
+    def name(self) -> str:
+        return self.attributes.get("friendly_name") or self.object_id
+
+
+class SimStates:
+    def __init__(self, clock: VirtualClock) -> None:
+        self._clock = clock
+        self._states: dict[str, SimState] = {}
+
+    def get(self, entity_id: str) -> SimState | None:
+        return self._states.get(str(entity_id).lower()) if entity_id else None
+
+    def async_all(self, domain: str | None = None) -> list[SimState]:
+        return [st for st in self._states.values() if domain is None or st.domain == domain]
+
+    def async_entity_ids(self, domain: str | None = None) -> list[str]:
+        return [st.entity_id for st in self.async_all(domain)]
+
+    def async_set(self, entity_id: str, new_state, attributes: dict | None = None) -> None:
+        entity_id = str(entity_id).lower()
+        new_state = str(new_state)
+        now = self._clock.now()
+        old = self._states.get(entity_id)
+        if old is None:
+            self._states[entity_id] = SimState(entity_id, new_state, dict(attributes or {}), now, now)
+            return
+        if attributes is None:
+            attributes = old.attributes
+        if old.state == new_state and old.attributes == attributes:
+            return
+        # Attribute-only changes keep last_changed (same as Home Assistant).
+        last_changed = old.last_changed if old.state == new_state else now
+        self._states[entity_id] = SimState(entity_id, new_state, dict(attributes), last_changed, now)
+
+
+class SimServices:
+    """Records every call; switches toggle their state, calendar/weather answer from the scenario."""
+
+    _TOGGLE_DOMAINS = ("switch", "input_boolean", "light", "fan", "homeassistant")
+
+    def __init__(self, sim: Simulator) -> None:
+        self._sim = sim
+        self._services: dict[str, set[str]] = {
+            domain: {"turn_on", "turn_off"} for domain in self._TOGGLE_DOMAINS
+        }
+        self._services["calendar"] = {"get_events"}
+        self._services["weather"] = {"get_forecasts"}
+
+    def has_service(self, domain: str, service: str) -> bool:
+        return service in self._services.get(domain, ())
+
+    def async_services(self) -> dict[str, dict[str, None]]:
+        return {domain: dict.fromkeys(services) for domain, services in self._services.items()}
+
+    async def async_call(
+        self,
+        domain: str,
+        service: str,
+        service_data: dict | None = None,
+        blocking: bool = False,
+        context=None,
+        target: dict | None = None,
+        return_response: bool = False,
+    ):
+        data = {**(service_data or {}), **(target or {})}
+        self._sim.record_call(domain, service, data)
+        if service in ("turn_on", "turn_off") and domain in self._TOGGLE_DOMAINS:
+            entity_ids = data.get("entity_id")
+            if isinstance(entity_ids, str):
+                entity_ids = [entity_ids]
+            for entity_id in entity_ids or ():
+                st = self._sim.hass.states.get(entity_id)
+                self._sim.hass.states.async_set(
+                    entity_id, "on" if service == "turn_on" else "off", st.attributes if st else None
+                )
+            return None
+        if domain == "calendar" and service == "get_events":
+            return self._sim.scenario.calendar_events(data)
+        if domain == "weather" and service == "get_forecasts":
+            return self._sim.scenario.weather_forecasts(data, self._sim.clock.now())
+        return {} if return_response else None
+
+
+class SimConfigEntries:
+    def async_update_entry(self, entry: SimConfigEntry, *, data=None, options=None, **kwargs) -> bool:
+        changed = False
+        # New mapping objects, so identity-based config caches notice the update.
+        if data is not None and dict(data) != entry.data:
+            entry.data = dict(data)
+            changed = True
+        if options is not None and dict(options) != entry.options:
+            entry.options = dict(options)
+            changed = True
+        return changed
+
+    async def async_reload(self, entry_id: str) -> bool:
+        return True
+
+
+class SimConfigEntry:
+    def __init__(self, data: dict, options: dict | None = None, entry_id: str = "sim") -> None:
+        self.entry_id = entry_id
+        self.domain = DOMAIN
+        self.title = "Pool simulation"
+        self.data = dict(data)
+        self.options = dict(options or {})
+        self._on_unload: list[Callable] = []
+
+    def async_on_unload(self, func: Callable) -> None:
+        self._on_unload.append(func)
+
+    def add_update_listener(self, listener: Callable) -> Callable:
+        return lambda: None
+
+
+class SimBus:
+    def async_listen(self, *args, **kwargs) -> Callable:
+        return lambda: None
+
+    def async_listen_once(self, *args, **kwargs) -> Callable:
+        return lambda: None
+
+    def async_fire(self, *args, **kwargs) -> None:
+        return None
+
+
+class SimHass:
+    def __init__(self, sim: Simulator, config_dir: str) -> None:
+        self.data: dict = {}
+        self.states = SimStates(sim.clock)
+        self.services = SimServices(sim)
+        self.config_entries = SimConfigEntries()
+        self.bus = SimBus()
+        self.config = types.SimpleNamespace(
+            config_dir=config_dir,
+            path=lambda *parts: str(Path(config_dir, *parts)),
+            time_zone=str(dt_util.DEFAULT_TIME_ZONE),
+            language="en",
+        )
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    def async_create_task(self, target, name: str | None = None, eager_start: bool = False) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(target)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+    async def async_block_till_done(self) -> None:
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+class _MemoryStore:
+    """In-memory replacement for the runtime state `Store`."""
+
+    def __init__(self) -> None:
+        self.data = None
+        self.saves = 0
+
+    async def async_load(self):
+        return self.data
+
+    async def async_save(self, data) -> None:
+        self.data = data
+        self.saves += 1
+
+    def async_delay_save(self, data_func, delay: float = 0) -> None:
+        self.data = data_func()
+        self.saves += 1
+
+    async def async_remove(self) -> None:
+        self.data = None
+
+
+# ---------------------------------------------------------------------------
+# Scenario inputs
+# ---------------------------------------------------------------------------
+
+
+class Series:
+    """Step function over (epoch, value) samples; the last sample at or before t wins."""
+
+    __slots__ = ("_ts", "_values")
+
+    def __init__(self, points: list[tuple[float, Any]]) -> None:
+        points = sorted(points, key=lambda item: item[0])
+        self._ts = [ts for ts, _ in points]
+        self._values = [value for _, value in points]
+
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def at(self, ts: float):
+        i = bisect_right(self._ts, ts) - 1
+        return self._values[i] if i >= 0 else None
+
+
+class PoolPhysics:
+    """Lumped thermal model: heater input against losses to the outdoor air."""
+
+    def __init__(
+        self,
+        water_temp: float,
+        *,
+        volume_l: float = DEFAULT_VOL,
+        heater_w: float = DEFAULT_HEATER_POWER_W,
+        pump_w: float = 250.0,
+        heat_loss_w_per_c: float = DEFAULT_HEAT_LOSS_W_PER_C,
+        max_temp: float = 40.0,
+    ) -> None:
+        self.water_temp = water_temp
+        self.heat_capacity_wh_per_c = max(1.0, float(volume_l)) * 1.163
+        self.heater_w = heater_w
+        self.pump_w = pump_w
+        self.heat_loss_w_per_c = heat_loss_w_per_c
+        self.max_temp = max_temp
+        self.energy_wh = 0.0
+        self.on_seconds = 0.0
+
+    def step(self, seconds: float, outdoor: float, main_on: bool) -> float:
+        """Advance by `seconds`; returns the electrical power drawn (W)."""
+        heating = main_on and self.water_temp < self.max_temp
+        power = (self.heater_w if heating else (self.pump_w if main_on else 0.0))
+        heat_in = self.heater_w if heating else 0.0
+        loss = self.heat_loss_w_per_c * (self.water_temp - outdoor)
+        self.water_temp += (heat_in - loss) * seconds / 3600.0 / self.heat_capacity_wh_per_c
+        self.energy_wh += power * seconds / 3600.0
+        if main_on:
+            self.on_seconds += seconds
+        return power
+
+
+@dataclass
+class Scenario:
+    start: datetime
+    end: datetime
+    step: timedelta
+    config: dict
+    options: dict = field(default_factory=dict)
+    series: dict[str, Series] = field(default_factory=dict)
+    events: dict[str, list[dict]] = field(default_factory=dict)
+    forecasts: dict[str, list[dict]] = field(default_factory=dict)
+    # Synthetic mode: closed-loop water temperature and generated forecasts.
+    physics: PoolPhysics | None = None
+    weather_fn: Callable[[datetime], dict] | None = None
+    pv_fn: Callable[[datetime], float] | None = None
+    house_load_w: float = 400.0
+
+    def calendar_events(self, data: dict) -> dict:
+        entity_id = data.get("entity_id")
+        tz = dt_util.DEFAULT_TIME_ZONE
+        start = _parse_dt(data.get("start_date_time"), tz) or self.start
+        end = _parse_dt(data.get("end_date_time"), tz) or self.end
+        events = []
+        for event in self.events.get(entity_id, ()):
+            ev_start = _parse_dt(event.get("start"), tz)
+            ev_end = _parse_dt(event.get("end"), tz) or ev_start
+            if ev_start is None or ev_end < start or ev_start > end:
+                continue
+            events.append({**event, "start": ev_start.isoformat(), "end": ev_end.isoformat()})
+        return {entity_id: {"events": events}}
+
+    def weather_forecasts(self, data: dict, now: datetime) -> dict:
+        entity_id = data.get("entity_id")
+        if self.weather_fn is not None:
+            hour = now.replace(minute=0, second=0, microsecond=0)
+            items = []
+            for offset in range(48):
+                at = hour + timedelta(hours=offset)
+                items.append({"datetime": at.isoformat(), **self.weather_fn(at)})
+            return {entity_id: {"forecast": items}}
+        items = [
+            item for item in self.forecasts.get(entity_id, ())
+            if (_parse_dt(item.get("datetime"), dt_util.DEFAULT_TIME_ZONE) or now) >= now - timedelta(hours=1)
+        ]
+        return {entity_id: {"forecast": items}}
+
+
+def _series_from_history(raw: list, tz) -> dict[str, list[tuple[float, Any]]]:
+    """Home Assistant `/api/history/period` output -> per-entity samples."""
+    result: dict[str, list[tuple[float, Any]]] = {}
+    for block in raw:
+        if not isinstance(block, list) or not block:
+            continue
+        entity_id = block[0].get("entity_id")
+        for item in block:
+            entity_id = item.get("entity_id", entity_id)
+            when = _parse_dt(item.get("last_changed") or item.get("last_updated"), tz)
+            if entity_id and when is not None:
+                value = {"state": item.get("state"), "attributes": item.get("attributes") or {}}
+                result.setdefault(entity_id, []).append((when.timestamp(), value))
+    return result
+
+
+def load_scenario(path: Path, config: dict | None = None, step_seconds: int | None = None) -> Scenario:
+    tz = dt_util.DEFAULT_TIME_ZONE
+    raw_series: dict[str, list[tuple[float, Any]]] = {}
+    meta: dict = {}
+    if path.suffix.lower() == ".csv":
+        with path.open("r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            for row in reader:
+                when = _parse_dt(row[0], tz)
+                if when is None:
+                    continue
+                for entity_id, value in zip(header[1:], row[1:]):
+                    if value != "":
+                        raw_series.setdefault(entity_id, []).append((when.timestamp(), value))
+    else:
+        with path.open("r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if isinstance(meta, list):
+            meta = {"series": meta}
+        if meta.get("time_zone"):
+            dt_util.set_default_time_zone(dt_util.get_time_zone(meta["time_zone"]))
+            tz = dt_util.DEFAULT_TIME_ZONE
+        series = meta.get("series") or {}
+        if isinstance(series, list):
+            raw_series = _series_from_history(series, tz)
+        else:
+            for entity_id, points in series.items():
+                samples = []
+                for when_raw, value in points:
+                    when = _parse_dt(when_raw, tz)
+                    if when is not None:
+                        samples.append((when.timestamp(), value))
+                raw_series[entity_id] = samples
+
+    all_ts = [ts for samples in raw_series.values() for ts, _ in samples]
+    start = _parse_dt(meta.get("start"), tz) if meta.get("start") else None
+    end = _parse_dt(meta.get("end"), tz) if meta.get("end") else None
+    if start is None:
+        start = dt_util.as_local(dt_util.utc_from_timestamp(min(all_ts))) if all_ts else dt_util.now()
+    if end is None:
+        end = dt_util.as_local(dt_util.utc_from_timestamp(max(all_ts))) if all_ts else start + timedelta(days=1)
+    entry_config = {CONF_ENABLE_EVENT_DRIVEN_UPDATES: False, **(meta.get("config") or {}), **(config or {})}
+    return Scenario(
+        start=start,
+        end=end,
+        step=timedelta(seconds=int(step_seconds or meta.get("step_seconds") or DEFAULT_STEP_SECONDS)),
+        config=entry_config,
+        options=dict(meta.get("options") or {}),
+        series={entity_id: Series(samples) for entity_id, samples in raw_series.items()},
+        events={k: list(v) for k, v in (meta.get("events") or {}).items()},
+        forecasts={k: list(v) for k, v in (meta.get("forecasts") or {}).items()},
+    )
+
+
+def synthetic_scenario(
+    start: datetime,
+    days: float = DEFAULT_DAYS,
+    *,
+    profile: str = "default",
+    step_seconds: int = DEFAULT_STEP_SECONDS,
+    seed: int = 1,
+    config: dict | None = None,
+) -> Scenario:
+    """Seasonal outdoor temperature, PV bell curve, day-ahead prices and two bathing events per week."""
+    overrides, options = PROFILES[profile]
+    rng = random.Random(seed)
+    end = start + timedelta(days=days)
+    clouds = {}
+
+    def _cloud(day: date) -> float:
+        if day not in clouds:
+            clouds[day] = rng.random()
+        return clouds[day]
+
+    def outdoor(at: datetime) -> float:
+        local = dt_util.as_local(at)
+        doy = local.timetuple().tm_yday
+        seasonal = 10.0 - 10.0 * math.cos(2 * math.pi * (doy - 15) / 365.0)
+        hour = local.hour + local.minute / 60.0
+        daily = -5.0 * math.cos(2 * math.pi * (hour - 5.0) / 24.0)
+        return round(seasonal + daily - 3.0 * _cloud(local.date()), 2)
+
+    def pv(at: datetime) -> float:
+        local = dt_util.as_local(at)
+        doy = local.timetuple().tm_yday
+        day_len = 12.0 + 4.0 * math.sin(2 * math.pi * (doy - 80) / 365.0)
+        sunrise = 13.0 - day_len / 2.0
+        hour = local.hour + local.minute / 60.0
+        if not (sunrise < hour < sunrise + day_len):
+            return 0.0
+        peak = 5000.0 * (0.55 + 0.45 * math.sin(2 * math.pi * (doy - 80) / 365.0))
+        return round(peak * math.sin(math.pi * (hour - sunrise) / day_len) * (1.0 - 0.8 * _cloud(local.date())), 1)
+
+    def price(at: datetime) -> float:
+        local = dt_util.as_local(at)
+        hour = local.hour
+        value = 0.30 + (0.08 if 17 <= hour < 21 else 0.0) - (0.10 if 10 <= hour < 16 else 0.0)
+        return round(value - 0.05 * (1.0 - _cloud(local.date())) * (1 if 10 <= hour < 16 else 0), 4)
+
+    def weather(at: datetime) -> dict:
+        cloud = _cloud(dt_util.as_local(at).date())
+        temp = outdoor(at)
+        return {
+            "temperature": temp,
+            "apparent_temperature": round(temp - 1.5, 1),
+            "wind_speed": round(5.0 + 10.0 * cloud, 1),
+            "uv_index": round(max(0.0, pv(at) / 1000.0), 1),
+            "cloud_coverage": int(cloud * 100),
+            "precipitation_probability": int(max(0.0, cloud - 0.6) * 200),
+            "condition": "rainy" if cloud > 0.8 else ("cloudy" if cloud > 0.4 else "sunny"),
+        }
+
+    step = timedelta(seconds=step_seconds)
+    points: dict[str, list[tuple[float, Any]]] = {SIM_OUTDOOR: [], SIM_PRICE: []}
+    cursor = start
+    while cursor <= end:
+        points[SIM_OUTDOOR].append((cursor.timestamp(), outdoor(cursor)))
+        cursor += timedelta(minutes=15)
+    # Price entity: current value plus today/tomorrow forecast attributes (cost optimiser).
+    day = dt_util.as_local(start).replace(hour=0, minute=0, second=0, microsecond=0)
+    while day <= end:
+        hours = [day + timedelta(hours=h) for h in range(48)]
+        raw = [{"start": h.isoformat(), "value": price(h)} for h in hours]
+        for h in range(24):
+            at = hours[h]
+            points[SIM_PRICE].append(
+                (at.timestamp(), {"state": price(at), "attributes": {"raw_today": raw[:24], "raw_tomorrow": raw[24:]}})
+            )
+        day = dt_util.as_local(day + timedelta(hours=26)).replace(hour=0)
+
+    events = []
+    cal_day = dt_util.as_local(start).date()
+    while cal_day <= dt_util.as_local(end).date():
+        if cal_day.weekday() in (4, 5):
+            ev_start = datetime.combine(cal_day, datetime.min.time(), tzinfo=dt_util.DEFAULT_TIME_ZONE) + timedelta(hours=19)
+            events.append({"start": ev_start.isoformat(), "end": (ev_start + timedelta(hours=2)).isoformat(), "summary": "Baden"})
+        cal_day += timedelta(days=1)
+
+    entry_config = {**SYNTHETIC_CONFIG, **overrides, **(config or {})}
+    return Scenario(
+        start=start,
+        end=end,
+        step=step,
+        config=entry_config,
+        options=dict(options),
+        series={entity_id: Series(samples) for entity_id, samples in points.items()},
+        events={SIM_CALENDAR: events},
+        physics=PoolPhysics(
+            max(outdoor(start) + 8.0, 20.0),
+            volume_l=float(entry_config.get(CONF_WATER_VOLUME) or DEFAULT_VOL),
+            heater_w=float(entry_config.get(CONF_HEATER_POWER_W) or DEFAULT_HEATER_POWER_W),
+        ),
+        weather_fn=weather,
+        pv_fn=pv,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Trace
+# ---------------------------------------------------------------------------
+
+
+class Trace:
+    """Columnar trace: one list per `data` key, aligned with `time`."""
+
+    def __init__(self) -> None:
+        self.time: list[str] = []
+        self.columns: dict[str, list] = {}
+        self.calls: dict[str, list] = {"time": [], "domain": [], "service": [], "entity_id": [], "data": []}
+
+    def add_cycle(self, when: datetime, data: dict) -> None:
+        n = len(self.time)
+        for key, value in data.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * n
+            column.append(value.isoformat() if isinstance(value, datetime) else value)
+        for column in self.columns.values():
+            if len(column) == n:
+                column.append(None)
+        self.time.append(when.isoformat())
+
+    def add_call(self, when: datetime, domain: str, service: str, data: dict) -> None:
+        entity_id = data.get("entity_id")
+        self.calls["time"].append(when.isoformat())
+        self.calls["domain"].append(domain)
+        self.calls["service"].append(service)
+        self.calls["entity_id"].append(entity_id if isinstance(entity_id, str) else json.dumps(entity_id, default=_json_default))
+        self.calls["data"].append({k: v for k, v in data.items() if k != "entity_id"})
+
+    def write(self, path: Path) -> None:
+        if path.suffix.lower() == ".csv":
+            self._write_csv(path, self.time, self.columns)
+            self._write_csv(path.with_name(f"{path.stem}.calls.csv"), self.calls["time"], {k: v for k, v in self.calls.items() if k != "time"})
+            return
+        with path.open("w", encoding="utf-8") as f:
+            json.dump({"time": self.time, "data": self.columns, "calls": self.calls}, f, default=_json_default)
+
+    @staticmethod
+    def _write_csv(path: Path, times: list, columns: dict[str, list]) -> None:
+        keys = list(columns)
+        with path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["time", *keys])
+            for i, when in enumerate(times):
+                row = [when]
+                for key in keys:
+                    value = columns[key][i]
+                    row.append(json.dumps(value, default=_json_default) if isinstance(value, (dict, list)) else ("" if value is None else value))
+                writer.writerow(row)
+
+
+# ---------------------------------------------------------------------------
+# Simulator
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SimResult:
+    cycles: int
+    failures: int
+    wall_seconds: float
+    virtual_seconds: float
+    calls: Counter
+    trace: Trace | None
+    coordinator: PoolControllerDataCoordinator
+    physics: PoolPhysics | None = None
+
+    @property
+    def cycles_per_second(self) -> float:
+        return self.cycles / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def summary(self) -> dict:
+        result = {
+            "cycles": self.cycles,
+            "failures": self.failures,
+            "virtual_hours": round(self.virtual_seconds / 3600.0, 2),
+            "wall_seconds": round(self.wall_seconds, 3),
+            "cycles_per_second": round(self.cycles_per_second, 1),
+            "speedup": round(self.virtual_seconds / self.wall_seconds, 1) if self.wall_seconds > 0 else None,
+            "calls": {f"{domain}.{service}": count for (domain, service), count in sorted(self.calls.items())},
+        }
+        if self.physics is not None:
+            result.update(
+                {
+                    "water_temp_final": round(self.physics.water_temp, 2),
+                    "pool_on_hours": round(self.physics.on_seconds / 3600.0, 2),
+                    "energy_kwh": round(self.physics.energy_wh / 1000.0, 3),
+                }
+            )
+        return result
+
+
+class Simulator:
+    """Owns the stub hass, the config entry and the coordinator for one scenario."""
+
+    def __init__(self, scenario: Scenario, *, trace: bool = True) -> None:
+        self.scenario = scenario
+        self.clock = VirtualClock(scenario.start)
+        self._tmp = tempfile.TemporaryDirectory(prefix="pool_sim_")
+        self.hass = SimHass(self, self._tmp.name)
+        self.entry = SimConfigEntry(scenario.config, scenario.options)
+        self.trace = Trace() if trace else None
+        self.calls: Counter = Counter()
+        self.coordinator: PoolControllerDataCoordinator | None = None
+        self.cycles = 0
+        self.failures = 0
+        self._when = scenario.start
+        self._previous: datetime | None = None
+
+    def record_call(self, domain: str, service: str, data: dict) -> None:
+        self.calls[(domain, service)] += 1
+        if self.trace is not None:
+            self.trace.add_call(self.clock.now(), domain, service, data)
+
+    async def async_setup(self) -> PoolControllerDataCoordinator:
+        """Same order as `async_setup_entry`, minus platforms and services."""
+        runtime_state = RuntimeStateStore(self.hass, self.entry.entry_id)
+        runtime_state._stores = {name: _MemoryStore() for name in runtime_state._stores}
+        await runtime_state.async_load()
+        await runtime_state.async_migrate_from_options(self.entry.options)
+        self.coordinator = PoolControllerDataCoordinator(self.hass, self.entry, runtime_state=runtime_state)
+        self.hass.data.setdefault(DOMAIN, {})[self.entry.entry_id] = self.coordinator
+        return self.coordinator
+
+    def _apply_inputs(self, when: datetime, previous: datetime | None) -> None:
+        ts = when.timestamp()
+        states = self.hass.states
+        for entity_id, series in self.scenario.series.items():
+            value = series.at(ts)
+            if value is None:
+                continue
+            if isinstance(value, dict):
+                states.async_set(entity_id, value.get("state"), value.get("attributes") or {})
+            else:
+                states.async_set(entity_id, value)
+        physics = self.scenario.physics
+        if physics is None:
+            return
+        conf = self.entry.data
+        main_entity = conf.get(CONF_MAIN_SWITCH)
+        main_state = states.get(main_entity) if main_entity else None
+        if main_entity and main_state is None:
+            states.async_set(main_entity, "off")
+            main_state = states.get(main_entity)
+        outdoor_state = states.get(conf.get(CONF_TEMP_OUTDOOR) or SIM_OUTDOOR)
+        try:
+            outdoor = float(outdoor_state.state) if outdoor_state else 10.0
+        except ValueError:
+            outdoor = 10.0
+        seconds = (when - previous).total_seconds() if previous is not None else 0.0
+        power = physics.step(seconds, outdoor, bool(main_state and main_state.state == "on"))
+        states.async_set(conf.get(CONF_TEMP_WATER) or SIM_WATER, round(physics.water_temp, 2), {"unit_of_measurement": "°C"})
+        if conf.get(CONF_MAIN_POWER_SENSOR):
+            states.async_set(conf[CONF_MAIN_POWER_SENSOR], round(power, 1), {"unit_of_measurement": "W"})
+        if conf.get(CONF_ENABLE_BLUERIIOT) and conf.get(CONF_BLUERIIOT_MAC):
+            self._feed_blueriiot(str(conf[CONF_BLUERIIOT_MAC]), physics.water_temp, when)
+        if self.scenario.pv_fn is not None and conf.get(CONF_PV_SURPLUS_SENSOR):
+            # Export meter: PV minus house load minus the pool itself.
+            surplus = self.scenario.pv_fn(when) - self.scenario.house_load_w - power
+            states.async_set(conf[CONF_PV_SURPLUS_SENSOR], round(surplus, 1), {"unit_of_measurement": "W"})
+
+    def _feed_blueriiot(self, address: str, water_temp: float, when: datetime) -> None:
+        """Deliver a probe advertisement through the reader's passive path (no BLE stack)."""
+        if self.coordinator is None:
+            return
+        reader = self.coordinator._blueriiot_reader
+        if reader._unsub_passive is None:
+            # Stands in for the bluetooth callback registration of async_start_passive.
+            reader._passive_address = address.upper()
+            reader._unsub_passive = lambda: None
+        minute = when.timestamp() / 60.0
+        frame = encode_blueriiot_frame(
+            water_temp,
+            7.25 + 0.1 * math.sin(minute / 180.0),
+            690.0 + 40.0 * math.sin(minute / 300.0),
+        )
+        service_info = types.SimpleNamespace(
+            rssi=-72, service_data={pc_blueriiot.SERVICE_UUID.lower(): frame}, manufacturer_data={}
+        )
+        reader._async_handle_advertisement(service_info, None)
+
+    async def async_step(self, when: datetime, previous: datetime | None = None) -> dict | None:
+        """One coordinator cycle at virtual time `when`."""
+        self.clock.set(when)
+        self._apply_inputs(when, previous)
+        try:
+            data = await self.coordinator._async_update_data()
+        except Exception:
+            _LOGGER.exception("Coordinator cycle failed at %s", when.isoformat())
+            await self.hass.async_block_till_done()
+            return None
+        self.coordinator.data = data
+        # Same fan-out as DataUpdateCoordinator._async_refresh (change detection, attached entities).
+        self.coordinator.async_update_listeners()
+        await self.hass.async_block_till_done()
+        if self.trace is not None:
+            self.trace.add_cycle(when, data)
+        return data
+
+    async def async_advance(self, cycles: int) -> int:
+        """Run `cycles` further steps (needs `clock.installed()`); returns the failed cycles."""
+        failures = 0
+        for _ in range(cycles):
+            if await self.async_step(self._when, self._previous) is None:
+                failures += 1
+            self._previous = self._when
+            self._when = self._when + self.scenario.step
+        self.cycles += cycles
+        self.failures += failures
+        return failures
+
+    async def async_run(self) -> SimResult:
+        with self.clock.installed():
+            if self.coordinator is None:
+                await self.async_setup()
+            total = int((self.scenario.end - self.scenario.start) / self.scenario.step) + 1
+            started = time.perf_counter()
+            await self.async_advance(total)
+            wall = time.perf_counter() - started
+            await self.coordinator._runtime_state.async_flush()
+        self._tmp.cleanup()
+        return SimResult(
+            cycles=self.cycles,
+            failures=self.failures,
+            wall_seconds=wall,
+            virtual_seconds=(self.scenario.end - self.scenario.start).total_seconds(),
+            calls=self.calls,
+            trace=self.trace,
+            coordinator=self.coordinator,
+            physics=self.scenario.physics,
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded or synthetic inputs through the pool_controller coordinator.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--scenario", type=Path, help="Scenario JSON, HA history JSON or wide CSV")
+    source.add_argument("--synthetic", action="store_true", help="Generated inputs with a closed-loop thermal model")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default", help="Synthetic configuration profile")
+    parser.add_argument("--start", help="Synthetic start (ISO date/time, local time zone)")
+    parser.add_argument("--days", type=float, default=DEFAULT_DAYS, help="Synthetic duration in days")
+    parser.add_argument("--step", type=int, default=None, help=f"Cycle step in virtual seconds (default {DEFAULT_STEP_SECONDS})")
+    parser.add_argument("--config", type=Path, help="JSON object merged into the entry data")
+    parser.add_argument("--time-zone", default=DEFAULT_TIME_ZONE)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", type=Path, help="Trace output (.json or .csv; calls go to <name>.calls.csv)")
+    parser.add_argument("--no-trace", action="store_true", help="Skip the trace (throughput runs)")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.ERROR, format="%(levelname)s %(name)s: %(message)s")
+    dt_util.set_default_time_zone(dt_util.get_time_zone(args.time_zone))
+    config = None
+    if args.config:
+        with args.config.open("r", encoding="utf-8") as f:
+            config = json.load(f)
+
+    if args.synthetic:
+        start = _parse_dt(args.start, dt_util.DEFAULT_TIME_ZONE) if args.start else None
+        if start is None:
+            start = dt_util.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        scenario = synthetic_scenario(
+            start,
+            args.days,
+            profile=args.profile,
+            step_seconds=args.step or DEFAULT_STEP_SECONDS,
+            seed=args.seed,
+            config=config,
+        )
+    else:
+        scenario = load_scenario(args.scenario, config=config, step_seconds=args.step)
+
+    sim = Simulator(scenario, trace=not args.no_trace and args.out is not None)
+    result = asyncio.run(sim.async_run())
+    if args.out and result.trace is not None:
+        result.trace.write(args.out)
+    print(json.dumps(result.summary(), indent=2))
+    return 1 if result.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())